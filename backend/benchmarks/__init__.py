@@ -0,0 +1,17 @@
+"""
+SEO-NOC Benchmarks
+==================
+
+Performance harnesses. api_latency runs against a local MongoDB seeded
+with the synthetic dataset (services/synthetic_dataset_service.py);
+hot_paths times the CPU-bound routines on in-memory fixtures;
+monitoring_throughput runs availability passes against a local fake
+internet (fake_internet).
+
+Usage (from backend/):
+  python -m benchmarks.api_latency run --mongo-url mongodb://localhost:27017
+  python -m benchmarks.api_latency compare old.json new.json
+  python -m benchmarks.hot_paths run
+  python -m benchmarks.hot_paths compare old.json new.json
+  python -m benchmarks.monitoring_throughput run --concurrency 1 10 50
+"""
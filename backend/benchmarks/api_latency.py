@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+API Latency Benchmark
+=====================
+
+Runs the FastAPI app in-process (httpx ASGITransport, no lifespan - the
+schedulers stay off) against a local mongod seeded with the synthetic
+dataset, and drives each endpoint with concurrent async clients.
+
+Per endpoint it reports p50 / p95 / p99 / mean / max latency, throughput and
+the MongoDB commands and database time per request (from the query monitor,
+services/query_monitor_service.py). Results are written as JSON so runs can
+be diffed between commits:
+
+  python -m benchmarks.api_latency run --mongo-url mongodb://localhost:27017
+  python -m benchmarks.api_latency compare results/old.json results/new.json
+
+The dataset is (re)generated only when the database does not already hold
+one for the same seed and volumes (benchmark_meta collection). Use a
+dedicated database - it is cleared on regeneration.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Callable, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+
+BENCH_ADMIN_EMAIL = "bench-admin@synthetic.example.com"
+BENCH_ADMIN_PASSWORD = "Bench@123!"
+
+# Prefix of domains created by the import scenarios (removed before each run)
+IMPORT_PREFIX = "bench-import-"
+
+# A p95 or DB command increase above this (percent) is flagged by compare
+DEFAULT_REGRESSION_THRESHOLD = 20.0
+
+
+class Scenario:
+    """One benchmarked endpoint: request builder plus its route template.
+
+    rows: CSV rows per request for import endpoints (reported as rows/sec).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        route: str,
+        build: Callable[[int], Dict[str, Any]],
+        requests: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        rows: Optional[int] = None,
+    ):
+        self.name = name
+        self.method = method
+        self.route = route
+        self.build = build
+        self.requests = requests
+        self.concurrency = concurrency
+        self.rows = rows
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ==================== DATASET ====================
+
+
+def prepare_database(mongo_url: str, db_name: str, seed: int, volumes: Dict[str, int], anchor: str):
+    """Seed the benchmark database unless it already holds the same dataset."""
+    import bcrypt
+    from pymongo import MongoClient
+    from services.index_registry_service import apply_indexes_sync
+    from services.synthetic_dataset_service import clear_dataset, generate_dataset
+
+    client = MongoClient(mongo_url)
+    db = client[db_name]
+    try:
+        wanted = {"seed": seed, "volumes": volumes, "anchor": anchor}
+        meta = db.benchmark_meta.find_one({"_id": "dataset"}, {"_id": 0})
+        if meta != wanted:
+            print(f"[INFO] Generating dataset in '{db_name}' (seed {seed})...")
+            started = time.perf_counter()
+            clear_dataset(db)
+            counts = generate_dataset(
+                db, seed=seed, volumes=volumes,
+                anchor=datetime.fromisoformat(anchor).replace(tzinfo=timezone.utc),
+            )
+            db.benchmark_meta.replace_one({"_id": "dataset"}, wanted, upsert=True)
+            print(f"[OK] {sum(counts.values())} documents in {time.perf_counter() - started:.1f}s")
+        else:
+            print(f"[INFO] Reusing dataset in '{db_name}' (seed {seed})")
+
+        apply_indexes_sync(db)
+        db.asset_domains.delete_many({"domain_name": {"$regex": f"^{IMPORT_PREFIX}"}})
+
+        if not db.users.find_one({"email": BENCH_ADMIN_EMAIL}):
+            now = datetime.now(timezone.utc).isoformat()
+            db.users.insert_one({
+                "id": "bench-admin",
+                "email": BENCH_ADMIN_EMAIL,
+                "name": "Benchmark Admin",
+                "password": bcrypt.hashpw(
+                    BENCH_ADMIN_PASSWORD.encode("utf-8"), bcrypt.gensalt()
+                ).decode("utf-8"),
+                "role": "super_admin",
+                "status": "active",
+                "brand_scope_ids": None,
+                "created_at": now,
+                "updated_at": now,
+            })
+
+        # Path parameters, picked deterministically from the dataset
+        networks = list(db.seo_networks.find({}, {"_id": 0, "id": 1}).sort("id", 1))
+        sizes = {
+            row["_id"]: row["count"]
+            for row in db.seo_structure_entries.aggregate([
+                {"$group": {"_id": "$network_id", "count": {"$sum": 1}}}
+            ])
+        }
+        domains = [
+            d["domain_name"]
+            for d in db.asset_domains.find({}, {"_id": 0, "domain_name": 1}).sort("id", 1).limit(2000)
+        ]
+        brands = [b["name"] for b in db.brands.find({}, {"_id": 0, "name": 1}).sort("name", 1)]
+        return {
+            "network_ids": [n["id"] for n in networks],
+            "largest_network_ids": sorted(sizes, key=lambda k: (-sizes[k], k))[:10],
+            "domain_names": domains,
+            "brand_names": brands,
+            "mongo_version": client.server_info().get("version"),
+        }
+    finally:
+        client.close()
+
+
+# ==================== SCENARIOS ====================
+
+
+def build_scenarios(fixtures: Dict[str, Any], seed: int, import_rows: int) -> List[Scenario]:
+    rng = random.Random(seed)
+    networks = fixtures["network_ids"] or ["missing"]
+    largest = fixtures["largest_network_ids"] or networks
+    domains = fixtures["domain_names"] or ["missing.com"]
+    brands = fixtures["brand_names"] or [None]
+
+    def import_rows_for(i, existing_share=0.5):
+        rows = []
+        for j in range(import_rows):
+            if rng.random() < existing_share:
+                name = rng.choice(domains)
+            else:
+                name = f"{IMPORT_PREFIX}{seed}-{i}-{j}.com"
+            rows.append({
+                "domain_name": name,
+                "brand_name": rng.choice(brands),
+                "lifecycle_status": "active",
+                "monitoring_enabled": "OFF",
+                "notes": "benchmark import",
+            })
+        return {"domains": rows}
+
+    return [
+        Scenario("asset-domains list", "GET", "/api/v3/asset-domains",
+                 lambda i: {"params": {"page": rng.randint(1, 40), "limit": 25}}),
+        Scenario("asset-domains search", "GET", "/api/v3/asset-domains",
+                 lambda i: {"params": {"search": rng.choice(["gacor", "slot", "mega", "win"]),
+                                       "limit": 25}}),
+        Scenario("networks list", "GET", "/api/v3/networks", lambda i: {}),
+        Scenario("network detail", "GET", "/api/v3/networks/{network_id}",
+                 lambda i: {"path": {"network_id": rng.choice(networks)}}),
+        Scenario("network detail (largest)", "GET", "/api/v3/networks/{network_id}",
+                 lambda i: {"path": {"network_id": largest[i % len(largest)]}}),
+        Scenario("conflicts report", "GET", "/api/v3/reports/conflicts", lambda i: {}),
+        Scenario("export asset-domains csv", "GET", "/api/v3/export/asset-domains",
+                 lambda i: {"params": {"format": "csv"}}, requests=10, concurrency=2),
+        Scenario("export network json", "GET", "/api/v3/export/networks/{network_id}",
+                 lambda i: {"path": {"network_id": largest[i % len(largest)]},
+                            "params": {"format": "json"}}),
+        Scenario("import preview", "POST", "/api/v3/import/domains/preview",
+                 lambda i: {"json": import_rows_for(i)}, requests=20, concurrency=2,
+                 rows=import_rows),
+        Scenario("import confirm", "POST", "/api/v3/import/domains/confirm",
+                 lambda i: {"json": {**import_rows_for(i), "update_existing": False}},
+                 requests=10, concurrency=1, rows=import_rows),
+    ]
+
+
+# ==================== DRIVER ====================
+
+
+async def run_scenario(client, headers, scenario: Scenario, requests: int, concurrency: int,
+                       warmup: int) -> Dict[str, Any]:
+    from services.query_monitor_service import get_query_monitor
+
+    async def call(i):
+        spec = scenario.build(i)
+        url = scenario.route.format(**spec.get("path", {}))
+        started = time.perf_counter()
+        response = await client.request(
+            scenario.method, url, headers=headers,
+            params=spec.get("params"), json=spec.get("json"),
+        )
+        await response.aread()
+        return time.perf_counter() - started, response.status_code
+
+    for i in range(warmup):
+        await call(-1 - i)
+
+    monitor = get_query_monitor()
+    monitor.reset()
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            elapsed, status = await call(i)
+            latencies.append(elapsed * 1000)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    route = next(
+        (r for r in monitor.get_stats(limit=1000)["routes"]
+         if r["route"] == f"{scenario.method} {scenario.route}"),
+        None,
+    )
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    result = {
+        "method": scenario.method,
+        "route": scenario.route,
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "errors": errors,
+        "statuses": statuses,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "db_commands_per_request": route["avg_commands"] if route else None,
+        "db_time_ms_per_request": route["avg_db_time_ms"] if route else None,
+    }
+    if scenario.rows:
+        result["rows_per_second"] = round(scenario.rows * len(latencies) / wall, 1) if wall else 0.0
+    return result
+
+
+async def run_benchmark(args) -> Dict[str, Any]:
+    from services.synthetic_dataset_service import DEFAULT_VOLUMES
+
+    volumes = {key: getattr(args, key) for key in DEFAULT_VOLUMES}
+    fixtures = await asyncio.to_thread(
+        prepare_database, args.mongo_url, args.db_name, args.seed, volumes, args.anchor
+    )
+
+    # server reads its configuration at import time
+    os.environ["MONGO_URL"] = args.mongo_url
+    os.environ["DB_NAME"] = args.db_name
+    os.environ["QUERY_MONITOR_ENABLED"] = "true"
+    import httpx
+    import server
+
+    await server.initialize_default_categories()
+
+    transport = httpx.ASGITransport(app=server.app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        login = await client.post(
+            "/api/auth/login", json={"email": BENCH_ADMIN_EMAIL, "password": BENCH_ADMIN_PASSWORD}
+        )
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        results = {}
+        for scenario in build_scenarios(fixtures, args.seed, args.import_rows):
+            if args.only and not any(term in scenario.name for term in args.only):
+                continue
+            requests = scenario.requests or args.requests
+            if args.requests_scale != 1.0:
+                requests = max(1, int(requests * args.requests_scale))
+            concurrency = min(scenario.concurrency or args.concurrency, requests)
+            result = await run_scenario(
+                client, headers, scenario, requests, concurrency, min(args.warmup, requests)
+            )
+            results[scenario.name] = result
+            print(
+                f"{scenario.name:<28} p50 {result['p50_ms']:>9.1f} ms  p95 {result['p95_ms']:>9.1f} ms  "
+                f"p99 {result['p99_ms']:>9.1f} ms  {result['throughput_rps']:>7.1f} req/s  "
+                f"{result['db_commands_per_request'] or 0:>6} cmds/req  errors {result['errors']}"
+                + (f"  {result['rows_per_second']:.0f} rows/s" if "rows_per_second" in result else "")
+            )
+
+    server.client.close()
+    return {
+        "meta": {
+            "git_commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "seed": args.seed,
+            "anchor": args.anchor,
+            "volumes": volumes,
+            "concurrency": args.concurrency,
+            "mongo_version": fixtures["mongo_version"],
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "endpoints": results,
+    }
+
+
+# ==================== COMPARE ====================
+
+
+def compare_results(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[str]:
+    """Print a diff table; returns the regressed endpoint names."""
+    regressions = []
+    print(f"\n{'Endpoint':<28} {'p95 old':>10} {'p95 new':>10} {'delta':>8} "
+          f"{'cmds old':>9} {'cmds new':>9}")
+    print("-" * 80)
+    for name, result in new["endpoints"].items():
+        before = old["endpoints"].get(name)
+        if not before:
+            print(f"{name:<28} {'-':>10} {result['p95_ms']:>10.1f}")
+            continue
+        delta = (
+            (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+            if before["p95_ms"] else 0.0
+        )
+        cmds_old = before.get("db_commands_per_request") or 0
+        cmds_new = result.get("db_commands_per_request") or 0
+        regressed = delta > threshold or (
+            cmds_old and (cmds_new - cmds_old) / cmds_old * 100 > threshold
+        )
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<28} {before['p95_ms']:>10.1f} {result['p95_ms']:>10.1f} {delta:>7.1f}% "
+              f"{cmds_old:>9} {cmds_new:>9}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def cmd_run(args):
+    report = asyncio.run(run_benchmark(args))
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"api-latency-{report['meta']['git_commit'] or 'local'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\n[OK] Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_results(json.load(f), report, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+def cmd_compare(args):
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    regressions = compare_results(old, new, args.threshold)
+    if regressions:
+        print(f"\n[ERROR] {len(regressions)} endpoint(s) regressed more than {args.threshold}%")
+        sys.exit(1)
+    print("\n[OK] No regressions")
+
+
+def main():
+    sys.path.insert(0, BACKEND_DIR)
+    from services.synthetic_dataset_service import DEFAULT_VOLUMES
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.api_latency",
+        description="In-process API latency benchmark against a local MongoDB",
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    p_run = subparsers.add_parser("run", help="Seed (if needed) and benchmark the API")
+    p_run.add_argument("--mongo-url", default=os.environ.get("BENCH_MONGO_URL", "mongodb://localhost:27017"))
+    p_run.add_argument("--db-name", default=os.environ.get("BENCH_DB_NAME", "seo_noc_benchmark"))
+    p_run.add_argument("--seed", type=int, default=42)
+    p_run.add_argument("--anchor", default="2026-01-01", help="Dataset anchor date (YYYY-MM-DD)")
+    for key, default in DEFAULT_VOLUMES.items():
+        p_run.add_argument(f"--{key.replace('_', '-')}", dest=key, type=int, default=default,
+                           help=f"Dataset volume (default: {default})")
+    p_run.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    p_run.add_argument("--requests-scale", type=float, default=1.0,
+                       help="Multiply every endpoint's request count (quick runs: 0.1)")
+    p_run.add_argument("--concurrency", type=int, default=10, help="Concurrent clients")
+    p_run.add_argument("--warmup", type=int, default=5, help="Sequential warm-up requests per endpoint")
+    p_run.add_argument("--import-rows", type=int, default=500, help="Rows per import request")
+    p_run.add_argument("--only", nargs="*", help="Only endpoints whose name contains one of these")
+    p_run.add_argument("--output", default=None, help="Result file (default: results/api-latency-<commit>.json)")
+    p_run.add_argument("--baseline", default=None, help="Compare against this result file")
+    p_run.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    p_run.set_defaults(func=cmd_run)
+
+    p_compare = subparsers.add_parser("compare", help="Diff two result files")
+    p_compare.add_argument("old")
+    p_compare.add_argument("new")
+    p_compare.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    p_compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Fake Internet
+=============
+
+Local asyncio HTTP server that simulates thousands of virtual hosts for
+availability-monitoring benchmarks. Every request is answered according to
+the profile encoded in its Host header - "<profile>-<n>.fakenet.example",
+for example "cloudflare-00042.fakenet.example":
+
+- ok: 200 small page
+- slow: 200 after --slow-ms
+- large: 200 with a --large-kb page
+- redirect: 301 to /home, then 200
+- server_error: 500 / 502 / 503
+- not_found: 404
+- timeout: accepts the connection, never answers
+- reset: closes the connection without a response
+- cloudflare: 403 Cloudflare-style JS challenge
+- captcha: 200 page asking for a captcha
+- geo_blocked: 451 "not available in your country"
+
+Each response is delayed by --latency-ms (+/- --jitter-ms). Monitored
+domains are pointed at the server with AVAILABILITY_RESOLVE_OVERRIDE
+(services/monitoring_service.py), so checks keep their real Host header.
+
+  python -m benchmarks.fake_internet serve --port 8099
+  curl -H "Host: captcha-00001.fakenet.example" http://127.0.0.1:8099/
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import sys
+from typing import Dict, Optional, Tuple
+
+FAKE_DOMAIN_SUFFIX = "fakenet.example"
+
+# Classification AvailabilityMonitoringService should reach for each profile
+EXPECTED_STATUS = {
+    "ok": "up",
+    "slow": "up",
+    "large": "up",
+    "redirect": "up",
+    "server_error": "down",
+    "not_found": "down",
+    "timeout": "down",
+    "reset": "down",
+    "cloudflare": "soft_blocked",
+    "captcha": "soft_blocked",
+    "geo_blocked": "soft_blocked",
+}
+
+# Default share of hosts per profile (weights, normalised)
+DEFAULT_MIX = {
+    "ok": 70,
+    "slow": 5,
+    "large": 3,
+    "redirect": 5,
+    "server_error": 4,
+    "not_found": 2,
+    "timeout": 2,
+    "reset": 2,
+    "cloudflare": 3,
+    "captcha": 2,
+    "geo_blocked": 2,
+}
+
+_REASONS = {
+    200: "OK", 301: "Moved Permanently", 403: "Forbidden", 404: "Not Found",
+    421: "Misdirected Request", 451: "Unavailable For Legal Reasons",
+    500: "Internal Server Error", 502: "Bad Gateway", 503: "Service Unavailable",
+}
+
+_OK_PAGE = (
+    "<!doctype html><html><head><title>{host}</title></head>"
+    "<body><h1>{host}</h1><p>Welcome to our site.</p></body></html>"
+)
+_CLOUDFLARE_PAGE = (
+    "<!DOCTYPE html><html><head><title>Just a moment...</title></head><body>"
+    "<h1>Checking your browser before accessing {host}.</h1>"
+    "<script src=\"/cdn-cgi/challenge-platform/h/b/orchestrate/jsch/v1\"></script>"
+    "</body></html>"
+)
+_CAPTCHA_PAGE = (
+    "<html><body><h1>One more step</h1><p>Please complete the security check.</p>"
+    "<div class=\"g-recaptcha\" data-sitekey=\"6Lc-bench\"></div></body></html>"
+)
+_GEO_PAGE = "<html><body><h1>This content is not available in your country</h1></body></html>"
+_LARGE_CHUNK = "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 16 + "</p>\n"
+
+
+def host_name(profile: str, index: int) -> str:
+    return f"{profile.replace('_', '-')}-{index:05d}.{FAKE_DOMAIN_SUFFIX}"
+
+
+def profile_for(host: str) -> Optional[str]:
+    """Profile encoded in a host name, or None for hosts the server does not know."""
+    host = host.split(":", 1)[0].lower()
+    if not host.endswith("." + FAKE_DOMAIN_SUFFIX):
+        return None
+    profile = host.split(".", 1)[0].rsplit("-", 1)[0].replace("-", "_")
+    return profile if profile in EXPECTED_STATUS else None
+
+
+def assign_profiles(count: int, mix: Dict[str, float], seed: int = 42) -> Dict[str, str]:
+    """host -> profile for `count` hosts, split by the mix weights (shuffled)."""
+    total = sum(mix.values())
+    profiles = []
+    for profile, weight in mix.items():
+        profiles.extend([profile] * int(round(count * weight / total)))
+    profiles = (profiles + ["ok"] * count)[:count]
+    random.Random(seed).shuffle(profiles)
+    return {host_name(profile, i): profile for i, profile in enumerate(profiles)}
+
+
+class FakeInternet:
+    """Virtual-host HTTP/1.1 server answering by the Host header's profile."""
+
+    def __init__(
+        self,
+        latency_ms: float = 20,
+        jitter_ms: float = 10,
+        slow_ms: float = 800,
+        hang_seconds: float = 120,
+        large_kb: int = 1024,
+        seed: int = 42,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.slow_ms = slow_ms
+        self.hang_seconds = hang_seconds
+        self.large_body = (_LARGE_CHUNK * (large_kb * 1024 // len(_LARGE_CHUNK) + 1)).encode()[
+            : large_kb * 1024
+        ]
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[str, int]:
+        self._server = await asyncio.start_server(self._handle, host, port, backlog=4096)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _delay(self) -> float:
+        jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        self.requests += 1
+
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ")
+        path = parts[1] if len(parts) > 1 else "/"
+        host = ""
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "host":
+                host = value.strip()
+                break
+
+        try:
+            await asyncio.sleep(self._delay())
+            profile = profile_for(host)
+            if profile == "timeout":
+                await asyncio.sleep(self.hang_seconds)
+                writer.close()
+                return
+            if profile == "reset":
+                writer.transport.abort()
+                return
+            if profile == "slow":
+                await asyncio.sleep(self.slow_ms / 1000)
+
+            status, body, headers = self._respond(profile, host, path)
+            header_lines = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+            writer.write(
+                (
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}\r\n"
+                    f"Content-Type: text/html; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: close\r\n{header_lines}\r\n"
+                ).encode("latin-1")
+                + body
+            )
+            await writer.drain()
+            writer.close()
+        except ConnectionError:
+            writer.transport.abort()
+
+    def _respond(self, profile: Optional[str], host: str, path: str) -> Tuple[int, bytes, Dict[str, str]]:
+        host = host.split(":", 1)[0]
+        if profile is None:
+            return 421, b"unknown host", {}
+        if profile == "large":
+            return 200, self.large_body, {}
+        if profile == "redirect" and path != "/home":
+            return 301, b"", {"Location": f"https://{host}/home"}
+        if profile == "server_error":
+            return self.rng.choice([500, 502, 503]), b"<h1>Server Error</h1>", {}
+        if profile == "not_found":
+            return 404, b"<h1>Not Found</h1>", {}
+        if profile == "cloudflare":
+            return 403, _CLOUDFLARE_PAGE.format(host=host).encode(), {
+                "Server": "cloudflare", "CF-RAY": f"{self.rng.getrandbits(64):016x}-SIN",
+            }
+        if profile == "captcha":
+            return 200, _CAPTCHA_PAGE.encode(), {}
+        if profile == "geo_blocked":
+            return 451, _GEO_PAGE.encode(), {}
+        return 200, _OK_PAGE.format(host=host).encode(), {}
+
+
+# ==================== CHILD PROCESS ====================
+
+
+def _serve_forever(options: Dict, host: str, port: int, ready):
+    async def serve():
+        server = FakeInternet(**options)
+        ready.put(await server.start(host, port))
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+def start_in_process(host: str = "127.0.0.1", port: int = 0, **options):
+    """
+    Run the server in a child process so it does not compete with the
+    checker for the event loop. Returns (process, (host, port)); the caller
+    terminates the process when done.
+    """
+    context = multiprocessing.get_context("spawn")
+    ready = context.Queue()
+    process = context.Process(
+        target=_serve_forever, args=(options, host, port, ready), daemon=True
+    )
+    process.start()
+    address = ready.get(timeout=30)
+    return process, tuple(address)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.fake_internet",
+        description="Virtual-host HTTP server simulating monitored domains",
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    p_serve = subparsers.add_parser("serve", help="Run the server in the foreground")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8099)
+    p_serve.add_argument("--latency-ms", type=float, default=20)
+    p_serve.add_argument("--jitter-ms", type=float, default=10)
+    p_serve.add_argument("--slow-ms", type=float, default=800)
+    p_serve.add_argument("--large-kb", type=int, default=1024)
+
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    async def serve():
+        server = FakeInternet(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                              slow_ms=args.slow_ms, large_kb=args.large_kb)
+        host, port = await server.start(args.host, args.port)
+        print(f"[OK] Fake internet listening on http://{host}:{port} "
+              f"(hosts: <profile>-<n>.{FAKE_DOMAIN_SUFFIX})")
+        print(f"[INFO] Profiles: {', '.join(EXPECTED_STATUS)}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Hot Path Micro-Benchmarks
+=========================
+
+Times the pure-Python routines that scale with network or portfolio size
+on in-memory fixtures of increasing size (100 to 100k nodes by default).
+No database or network access - services are built on an unconnected
+Motor client and only their CPU-bound methods are called.
+
+Benchmarked:
+- tier_bfs: TierCalculationService.compute_tiers (the BFS behind
+  calculate_network_tiers, without the entry load)
+- report_conflicts / stored_conflicts: the two conflict detectors behind
+  ConflictScannerService (given precomputed tiers)
+- authority_chain: SeoTelegramService._build_full_authority_chain for
+  every node of the network
+- template_render: NotificationTemplateEngine.render of the seo_change
+  template with an n-line structure
+- domain_active_status: compute_domain_active_status for n domains
+- soft_block: AvailabilityMonitoringService._detect_soft_block on n
+  response bodies (up to 5KB each, as read by the checker)
+
+Per case and size it reports the best and median time per operation
+(one operation = one node / domain / response), plus the tracemalloc peak
+and retained bytes. The growth exponent is fitted on log(time) vs log(size);
+a fit above the case's expected complexity (linear unless noted) is flagged
+as a complexity regression:
+
+  python -m benchmarks.hot_paths run
+  python -m benchmarks.hot_paths run --sizes 100 1000 10000 --only tier
+  python -m benchmarks.hot_paths compare results/old.json results/new.json
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, Any, Callable, List, Optional
+
+from benchmarks.api_latency import BACKEND_DIR, RESULTS_DIR, git_commit
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+
+# Timing rounds per size: at least MIN_ROUNDS, then until MIN_TIME elapsed
+MIN_ROUNDS = 3
+MAX_ROUNDS = 50
+MIN_TIME = 0.3
+
+# Sizes below this are dominated by constant overhead - left out of the fit
+FIT_MIN_SIZE = 1000
+
+# Fitted exponent may exceed the expected one by this much before flagging
+COMPLEXITY_TOLERANCE = 0.35
+
+# A per-operation time increase above this (percent) is flagged by compare
+DEFAULT_REGRESSION_THRESHOLD = 25.0
+
+# Response bodies for the soft-block detector: clean pages plus one of each
+# block signature, placed at the end so clean pages scan the whole text
+_PAGE_FILLER = "<div class=\"post\"><p>Lorem ipsum dolor sit amet, consectetur.</p></div>\n"
+_BLOCK_SNIPPETS = [
+    "",
+    "",
+    "",
+    "<script src=\"/cdn-cgi/challenge-platform/h/b/orchestrate\"></script>",
+    "<div class=\"g-recaptcha\" data-sitekey=\"x\"></div>",
+    "<h1>This content is not available in your country</h1>",
+    "<p>Bot detected. Please verify you are human.</p>",
+]
+
+
+class Case:
+    """One benchmarked routine; setup(fixture) returns the zero-arg callable to time."""
+
+    def __init__(self, name: str, setup: Callable[[Dict[str, Any]], Callable[[], Any]],
+                 expected_exponent: float = 1.0):
+        self.name = name
+        self.setup = setup
+        self.expected_exponent = expected_exponent
+
+
+# ==================== FIXTURES ====================
+
+
+def build_fixture(size: int, seed: int) -> Dict[str, Any]:
+    """One network of `size` nodes plus its domains, from the synthetic generator."""
+    from services.synthetic_dataset_service import SyntheticDataset
+
+    # ~85% of generated domains are active; paths fill in when roots run out
+    dataset = SyntheticDataset(
+        seed=seed,
+        volumes={"brands": 1, "users": 1, "domains": int(size * 1.1) + 10, "networks": 0},
+        anchor=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+    dataset.generate_masters([{"id": "category-bench"}])
+    domains = list(dataset.generate_domains())
+    pool = [d for d in domains if d["lifecycle_status"] == "active"]
+    dataset.rng.shuffle(pool)
+
+    network = {"id": f"bench-network-{size}", "name": f"Bench Network {size}",
+               "created_at": "2025-01-01T00:00:00+00:00"}
+    entries = dataset._build_graph(network, size, pool, {})
+
+    rng = random.Random(seed)
+    bodies = []
+    for i in range(64):
+        snippet = _BLOCK_SNIPPETS[i % len(_BLOCK_SNIPPETS)]
+        filler = _PAGE_FILLER * rng.randint(5, 5000 // len(_PAGE_FILLER))
+        bodies.append((filler + snippet)[-5000:])
+
+    return {
+        "network": {"id": network["id"], "name": network["name"]},
+        "entries": entries,
+        "domains": domains[:size],
+        "domain_names": {d["id"]: d["domain_name"] for d in domains},
+        "bodies": [bodies[i % len(bodies)] for i in range(size)],
+        "now": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _offline_db():
+    """Database handle for service constructors; never connected or queried."""
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    return AsyncIOMotorClient("mongodb://localhost:27017", connect=False)["seo_noc_microbench"]
+
+
+# ==================== CASES ====================
+
+
+def _setup_tier_bfs(fixture):
+    from services.tier_service import TierCalculationService
+
+    entries = fixture["entries"]
+    return lambda: TierCalculationService.compute_tiers(entries, fixture["network"]["id"])
+
+
+def _setup_report_conflicts(fixture):
+    from services.conflict_scanner_service import _detect_report_conflicts
+    from services.tier_service import TierCalculationService
+
+    tiers = TierCalculationService.compute_tiers(fixture["entries"])
+    return lambda: _detect_report_conflicts(
+        fixture["network"], fixture["entries"], tiers, fixture["domain_names"], fixture["now"]
+    )
+
+
+def _setup_stored_conflicts(fixture):
+    from services.conflict_scanner_service import _detect_stored_conflicts
+    from services.tier_service import TierCalculationService
+
+    tiers = TierCalculationService.compute_tiers(fixture["entries"])
+    return lambda: _detect_stored_conflicts(
+        fixture["network"], fixture["entries"], tiers, fixture["now"]
+    )
+
+
+def _setup_authority_chain(fixture):
+    from services.seo_telegram_service import SeoTelegramService
+
+    service = SeoTelegramService(_offline_db())
+    entries = fixture["entries"]
+    entry_lookup = {e["id"]: e for e in entries}
+    domain_lookup = fixture["domain_names"]
+
+    async def build_all():
+        # Same per-node call pattern as _get_network_structure_with_chains
+        for entry in entries:
+            await service._build_full_authority_chain(entry, domain_lookup, entry_lookup)
+
+    loop = asyncio.new_event_loop()
+    return lambda: loop.run_until_complete(build_all())
+
+
+def _setup_template_render(fixture):
+    from services.notification_template_engine import DEFAULT_TEMPLATES, NotificationTemplateEngine
+
+    engine = NotificationTemplateEngine(_offline_db())
+    template = DEFAULT_TEMPLATES[("telegram", "seo_change")]["template_body"]
+    names = fixture["domain_names"]
+    context = {
+        "user": {"display_name": "Bench User", "email": "bench@synthetic.example.com"},
+        "network": {"name": fixture["network"]["name"]},
+        "brand": {"name": "BENCH"},
+        "change": {"action_label": "Update Node", "reason": "Benchmark",
+                   "details": "• Node: bench.example.com"},
+        "timestamp": {"gmt7": "2026-01-01 07:00"},
+        "structure": {
+            "current": [
+                f"{names.get(e['asset_domain_id'], '')}{e.get('optimized_path') or ''}"
+                for e in fixture["entries"]
+            ]
+        },
+        "telegram": {"leaders": ["@lead_one", "@lead_two"]},
+    }
+    return lambda: engine.render(template, context)
+
+
+def _setup_domain_active_status(fixture):
+    from routers.v3_router import compute_domain_active_status
+
+    dates = [d.get("expiration_date") for d in fixture["domains"]]
+
+    def run():
+        for expiration_date in dates:
+            compute_domain_active_status(expiration_date)
+
+    return run
+
+
+def _setup_soft_block(fixture):
+    from services.monitoring_service import AvailabilityMonitoringService
+
+    service = AvailabilityMonitoringService(_offline_db())
+    bodies = fixture["bodies"]
+
+    def run():
+        for body in bodies:
+            service._detect_soft_block(body, 200)
+
+    return run
+
+
+CASES = [
+    Case("tier_bfs", _setup_tier_bfs),
+    Case("report_conflicts", _setup_report_conflicts),
+    Case("stored_conflicts", _setup_stored_conflicts),
+    Case("authority_chain", _setup_authority_chain),
+    Case("template_render", _setup_template_render),
+    Case("domain_active_status", _setup_domain_active_status),
+    Case("soft_block", _setup_soft_block),
+]
+
+
+# ==================== MEASUREMENT ====================
+
+
+def time_callable(fn: Callable[[], Any]) -> List[float]:
+    """Wall times (seconds) of repeated calls, after one warm-up call."""
+    fn()
+    times: List[float] = []
+    started = time.perf_counter()
+    while len(times) < MIN_ROUNDS or (
+        time.perf_counter() - started < MIN_TIME and len(times) < MAX_ROUNDS
+    ):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def measure_allocations(fn: Callable[[], Any]) -> Dict[str, int]:
+    """tracemalloc peak and retained bytes of one call."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"peak_bytes": peak - before, "retained_bytes": max(0, current - before)}
+
+
+def fit_exponent(points: List[Dict[str, Any]], min_size: int = FIT_MIN_SIZE) -> Optional[float]:
+    """Least-squares slope of log(time) over log(size): ~1 linear, ~2 quadratic."""
+    usable = [p for p in points if p["size"] >= min_size and p["best_s"] > 0]
+    if len(usable) < 2:
+        usable = [p for p in points if p["best_s"] > 0]
+    if len(usable) < 2:
+        return None
+    xs = [math.log(p["size"]) for p in usable]
+    ys = [math.log(p["best_s"]) for p in usable]
+    x_mean, y_mean = statistics.fmean(xs), statistics.fmean(ys)
+    denominator = sum((x - x_mean) ** 2 for x in xs)
+    if not denominator:
+        return None
+    return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / denominator
+
+
+def run_case(case: Case, fixtures: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    points = []
+    for size, fixture in fixtures.items():
+        fn = case.setup(fixture)
+        times = time_callable(fn)
+        allocations = measure_allocations(fn)
+        best, median = min(times), statistics.median(times)
+        points.append({
+            "size": size,
+            "rounds": len(times),
+            "best_s": best,
+            "median_s": median,
+            "best_ns_per_op": best / size * 1e9,
+            "median_ns_per_op": median / size * 1e9,
+            "peak_bytes": allocations["peak_bytes"],
+            "retained_bytes": allocations["retained_bytes"],
+            "peak_bytes_per_op": allocations["peak_bytes"] / size,
+        })
+        print(f"  {case.name:<22} n={size:<7} {best / size * 1e6:>9.2f} us/op  "
+              f"peak {allocations['peak_bytes'] / 1024:>10.1f} KiB  ({len(times)} rounds)")
+
+    exponent = fit_exponent(points)
+    regressed = exponent is not None and exponent > case.expected_exponent + COMPLEXITY_TOLERANCE
+    return {
+        "expected_exponent": case.expected_exponent,
+        "fitted_exponent": round(exponent, 3) if exponent is not None else None,
+        "complexity_regression": regressed,
+        "points": points,
+    }
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    cases = [
+        c for c in CASES
+        if not args.only or any(token in c.name for token in args.only)
+    ]
+    sizes = sorted(set(args.sizes))
+
+    fixtures = {}
+    for size in sizes:
+        started = time.perf_counter()
+        fixtures[size] = build_fixture(size, args.seed)
+        print(f"[INFO] Fixture n={size} built in {time.perf_counter() - started:.1f}s")
+
+    results = {}
+    for case in cases:
+        print(f"\n[INFO] {case.name}")
+        results[case.name] = run_case(case, fixtures)
+        result = results[case.name]
+        print(f"  fitted exponent {result['fitted_exponent']} "
+              f"(expected {case.expected_exponent})"
+              f"{'  COMPLEXITY REGRESSION' if result['complexity_regression'] else ''}")
+
+    return {
+        "meta": {
+            "git_commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "seed": args.seed,
+            "sizes": sizes,
+        },
+        "cases": results,
+    }
+
+
+# ==================== COMPARE ====================
+
+
+def compare_results(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[str]:
+    """Print a diff table; returns the regressed case names."""
+    regressions = []
+    print(f"\n{'Case':<22} {'n':>7} {'ns/op old':>11} {'ns/op new':>11} {'delta':>8} "
+          f"{'exp old':>8} {'exp new':>8}")
+    print("-" * 82)
+    for name, result in new["cases"].items():
+        before = old["cases"].get(name)
+        if not before:
+            print(f"{name:<22} {'(new case)':>7}")
+            continue
+        old_points = {p["size"]: p for p in before["points"]}
+        exp_old, exp_new = before.get("fitted_exponent"), result.get("fitted_exponent")
+        regressed = bool(result.get("complexity_regression")) or (
+            exp_old is not None and exp_new is not None
+            and exp_new - exp_old > COMPLEXITY_TOLERANCE
+        )
+        for point in result["points"]:
+            old_point = old_points.get(point["size"])
+            if not old_point:
+                continue
+            delta = (
+                (point["best_ns_per_op"] - old_point["best_ns_per_op"])
+                / old_point["best_ns_per_op"] * 100
+                if old_point["best_ns_per_op"] else 0.0
+            )
+            slower = delta > threshold
+            regressed = regressed or slower
+            print(f"{name:<22} {point['size']:>7} {old_point['best_ns_per_op']:>11.1f} "
+                  f"{point['best_ns_per_op']:>11.1f} {delta:>7.1f}% "
+                  f"{exp_old if exp_old is not None else '-':>8} "
+                  f"{exp_new if exp_new is not None else '-':>8}"
+                  f"{'  SLOWER' if slower else ''}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def cmd_run(args):
+    report = run_benchmark(args)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"hot-paths-{report['meta']['git_commit'] or 'local'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\n[OK] Results written to {output}")
+
+    regressions = [n for n, r in report["cases"].items() if r["complexity_regression"]]
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = sorted(set(regressions) | set(
+                compare_results(json.load(f), report, args.threshold)
+            ))
+    if regressions:
+        print(f"\n[ERROR] Regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+def cmd_compare(args):
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    regressions = compare_results(old, new, args.threshold)
+    if regressions:
+        print(f"\n[ERROR] {len(regressions)} case(s) regressed: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\n[OK] No regressions")
+
+
+def main():
+    sys.path.insert(0, BACKEND_DIR)
+    # Service modules log per-node details (orphans etc.) - keep the output readable
+    import logging
+    logging.disable(logging.WARNING)
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.hot_paths",
+        description="Micro-benchmarks for size-dependent CPU hot paths",
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    p_run = subparsers.add_parser("run", help="Benchmark every case over the fixture sizes")
+    p_run.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                       help=f"Fixture sizes in nodes (default: {DEFAULT_SIZES})")
+    p_run.add_argument("--seed", type=int, default=42)
+    p_run.add_argument("--only", nargs="*", help="Only cases whose name contains one of these")
+    p_run.add_argument("--output", default=None, help="Result file (default: results/hot-paths-<commit>.json)")
+    p_run.add_argument("--baseline", default=None, help="Compare against this result file")
+    p_run.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    p_run.set_defaults(func=cmd_run)
+
+    p_compare = subparsers.add_parser("compare", help="Diff two result files")
+    p_compare.add_argument("old")
+    p_compare.add_argument("new")
+    p_compare.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    p_compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Availability Monitoring Throughput Benchmark
+============================================
+
+Runs full AvailabilityMonitoringService.check_all_domains passes against
+the fake internet (benchmarks/fake_internet.py) instead of real domains.
+The server runs in a child process; AVAILABILITY_RESOLVE_OVERRIDE points
+every check at it. Domains live in a dedicated database on a local mongod.
+
+For each concurrency setting it reports:
+- pass duration and checks/sec
+- peak RSS growth of the checker process during the pass
+- classification correctness: the up / down / soft_blocked status stored
+  for every domain vs the status its host profile should produce, with a
+  confusion matrix and sample mismatches
+
+  python -m benchmarks.monitoring_throughput run --domains 2000 --concurrency 1 10 50 200
+  python -m benchmarks.monitoring_throughput compare results/old.json results/new.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Any, List
+
+from benchmarks.api_latency import BACKEND_DIR, RESULTS_DIR, git_commit
+from benchmarks.fake_internet import (
+    DEFAULT_MIX,
+    EXPECTED_STATUS,
+    assign_profiles,
+    start_in_process,
+)
+
+# A checks/sec drop or accuracy drop above this (percent) is flagged by compare
+DEFAULT_REGRESSION_THRESHOLD = 20.0
+
+# RSS is sampled this often during a pass
+RSS_SAMPLE_INTERVAL = 0.05
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """"ok=70,timeout=5,..." -> weights; unknown profiles are rejected."""
+    mix = {}
+    for part in value.split(","):
+        profile, _, weight = part.partition("=")
+        profile = profile.strip()
+        if profile not in EXPECTED_STATUS:
+            raise argparse.ArgumentTypeError(
+                f"unknown profile '{profile}' (known: {', '.join(EXPECTED_STATUS)})"
+            )
+        mix[profile] = float(weight)
+    return mix
+
+
+def current_rss() -> int:
+    """Resident set size in bytes (Linux /proc; falls back to the peak)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+async def sample_rss(peak: Dict[str, int], stop: asyncio.Event):
+    while not stop.is_set():
+        peak["rss"] = max(peak["rss"], current_rss())
+        try:
+            await asyncio.wait_for(stop.wait(), RSS_SAMPLE_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+# ==================== DATABASE ====================
+
+
+async def seed_domains(db, profiles: Dict[str, str]):
+    """Replace the benchmark database's domains with one per fake host."""
+    from services.domain_key_service import normalize_domain_key
+    from services.index_registry_service import apply_indexes
+
+    now = datetime.now(timezone.utc).isoformat()
+    await db.asset_domains.delete_many({})
+    await db.alerts.delete_many({})
+    await db.asset_domains.insert_many([
+        {
+            "id": str(uuid.uuid4()),
+            "domain_name": host,
+            "domain_key": normalize_domain_key(host),
+            "brand_id": "bench-brand",
+            "status": "active",
+            "lifecycle_status": "active",
+            "monitoring_enabled": True,
+            "monitoring_interval": "5min",
+            "last_checked_at": None,
+            "last_ping_status": "up",
+            "ping_status": "up",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for host in profiles
+    ])
+    await apply_indexes(db)
+
+
+async def reset_domains(db):
+    """Make every domain due again, previously up, with no alert history."""
+    await db.asset_domains.update_many(
+        {},
+        {
+            "$set": {"last_checked_at": None, "last_ping_status": "up", "ping_status": "up"},
+            "$unset": {
+                "soft_block_type": "", "last_down_alert_at": "", "last_soft_blocked_alert_at": "",
+                "last_http_code": "", "http_status_code": "",
+            },
+        },
+    )
+
+
+async def classification(db, profiles: Dict[str, str]) -> Dict[str, Any]:
+    """Compare the stored status of every domain with its profile's expected status."""
+    confusion: Counter = Counter()
+    mismatches: List[Dict[str, Any]] = []
+    unchecked = 0
+    async for domain in db.asset_domains.find(
+        {}, {"_id": 0, "domain_name": 1, "last_ping_status": 1, "last_checked_at": 1,
+             "last_http_code": 1}
+    ):
+        profile = profiles.get(domain["domain_name"])
+        if not profile:
+            continue
+        if not domain.get("last_checked_at"):
+            unchecked += 1
+            continue
+        expected, actual = EXPECTED_STATUS[profile], domain.get("last_ping_status")
+        confusion[f"{expected}->{actual}"] += 1
+        if expected != actual and len(mismatches) < 20:
+            mismatches.append({
+                "domain": domain["domain_name"], "profile": profile, "expected": expected,
+                "actual": actual, "http_code": domain.get("last_http_code"),
+            })
+
+    checked = sum(confusion.values())
+    correct = sum(n for key, n in confusion.items() if key.split("->")[0] == key.split("->")[1])
+    return {
+        "checked": checked,
+        "unchecked": unchecked,
+        "accuracy": round(correct / checked * 100, 2) if checked else 0.0,
+        "confusion": dict(sorted(confusion.items())),
+        "mismatches": mismatches,
+    }
+
+
+# ==================== BENCHMARK ====================
+
+
+async def run_pass(service, db, profiles: Dict[str, str], concurrency: int) -> Dict[str, Any]:
+    await reset_domains(db)
+    service.check_concurrency = concurrency
+
+    start_rss = current_rss()
+    peak = {"rss": start_rss}
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(peak, stop))
+
+    started = time.perf_counter()
+    summary = await service.check_all_domains()
+    duration = time.perf_counter() - started
+
+    stop.set()
+    await sampler
+
+    result = {
+        "concurrency": concurrency,
+        "duration_s": round(duration, 3),
+        "checks": summary["checked"],
+        "checks_per_sec": round(summary["checked"] / duration, 2) if duration > 0 else 0.0,
+        "up": summary["up"],
+        "down": summary["down"],
+        "soft_blocked": summary["soft_blocked"],
+        "rss_start_mb": round(start_rss / 1024 / 1024, 1),
+        "rss_peak_growth_mb": round((peak["rss"] - start_rss) / 1024 / 1024, 1),
+    }
+    result.update(await classification(db, profiles))
+    return result
+
+
+async def run_benchmark(args) -> Dict[str, Any]:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from services import monitoring_service
+    from services.monitoring_service import AvailabilityMonitoringService, MonitoringSettingsService
+
+    profiles = assign_profiles(args.domains, args.mix, args.seed)
+    print(f"[INFO] {len(profiles)} hosts: " + ", ".join(
+        f"{p}={n}" for p, n in sorted(Counter(profiles.values()).items())
+    ))
+
+    process, (host, port) = start_in_process(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, slow_ms=args.slow_ms,
+        large_kb=args.large_kb, seed=args.seed,
+    )
+    print(f"[OK] Fake internet on {host}:{port} (pid {process.pid})")
+    monitoring_service.AVAILABILITY_RESOLVE_OVERRIDE = f"{host}:{port}"
+
+    client = AsyncIOMotorClient(args.mongo_url)
+    db = client[args.db_name]
+    try:
+        mongo_version = (await client.server_info()).get("version")
+        await seed_domains(db, profiles)
+        await MonitoringSettingsService(db).update_settings({
+            "availability": {"enabled": True, "timeout_seconds": args.timeout,
+                             "follow_redirects": True, "alert_on_down": True},
+        })
+        service = AvailabilityMonitoringService(db)
+
+        passes = {}
+        for concurrency in args.concurrency:
+            print(f"\n[INFO] Pass with concurrency {concurrency}...")
+            result = await run_pass(service, db, profiles, concurrency)
+            passes[str(concurrency)] = result
+            print(f"  {result['checks']} checks in {result['duration_s']:.1f}s "
+                  f"({result['checks_per_sec']:.1f}/s), RSS +{result['rss_peak_growth_mb']} MB, "
+                  f"accuracy {result['accuracy']}%")
+            for mismatch in result["mismatches"][:5]:
+                print(f"    mismatch {mismatch['domain']}: expected {mismatch['expected']}, "
+                      f"got {mismatch['actual']} (HTTP {mismatch['http_code']})")
+    finally:
+        monitoring_service.AVAILABILITY_RESOLVE_OVERRIDE = ""
+        client.close()
+        process.terminate()
+        process.join(timeout=10)
+
+    return {
+        "meta": {
+            "git_commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "mongo_version": mongo_version,
+            "domains": args.domains,
+            "mix": args.mix,
+            "seed": args.seed,
+            "timeout_s": args.timeout,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "slow_ms": args.slow_ms,
+            "large_kb": args.large_kb,
+        },
+        "passes": passes,
+    }
+
+
+# ==================== COMPARE ====================
+
+
+def compare_results(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[str]:
+    """Print a diff table; returns the regressed concurrency settings."""
+    regressions = []
+    print(f"\n{'Concurrency':<12} {'checks/s old':>13} {'checks/s new':>13} {'delta':>8} "
+          f"{'acc old':>8} {'acc new':>8}")
+    print("-" * 68)
+    for key, result in new["passes"].items():
+        before = old["passes"].get(key)
+        if not before:
+            print(f"{key:<12} {'-':>13} {result['checks_per_sec']:>13.1f}")
+            continue
+        delta = (
+            (result["checks_per_sec"] - before["checks_per_sec"]) / before["checks_per_sec"] * 100
+            if before["checks_per_sec"] else 0.0
+        )
+        regressed = -delta > threshold or before["accuracy"] - result["accuracy"] > 0.5
+        if regressed:
+            regressions.append(key)
+        print(f"{key:<12} {before['checks_per_sec']:>13.1f} {result['checks_per_sec']:>13.1f} "
+              f"{delta:>7.1f}% {before['accuracy']:>8} {result['accuracy']:>8}"
+              f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def cmd_run(args):
+    report = asyncio.run(run_benchmark(args))
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"monitoring-{report['meta']['git_commit'] or 'local'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\n[OK] Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_results(json.load(f), report, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+def cmd_compare(args):
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    regressions = compare_results(old, new, args.threshold)
+    if regressions:
+        print(f"\n[ERROR] {len(regressions)} concurrency setting(s) regressed")
+        sys.exit(1)
+    print("\n[OK] No regressions")
+
+
+def main():
+    sys.path.insert(0, BACKEND_DIR)
+    # Every check logs at INFO and every unsent alert at WARNING
+    import logging
+    logging.disable(logging.WARNING)
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.monitoring_throughput",
+        description="Availability monitoring throughput against a local fake internet",
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    p_run = subparsers.add_parser("run", help="Run monitoring passes at each concurrency")
+    p_run.add_argument("--mongo-url", default=os.environ.get("BENCH_MONGO_URL", "mongodb://localhost:27017"))
+    p_run.add_argument("--db-name", default=os.environ.get("BENCH_MONITORING_DB_NAME", "seo_noc_monitoring_benchmark"))
+    p_run.add_argument("--domains", type=int, default=2000, help="Virtual hosts / monitored domains")
+    p_run.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                       help="Profile weights, e.g. ok=70,timeout=10,cloudflare=20")
+    p_run.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200],
+                       help="Concurrency settings, one pass each")
+    p_run.add_argument("--timeout", type=float, default=2.0, help="Check timeout in seconds")
+    p_run.add_argument("--latency-ms", type=float, default=20)
+    p_run.add_argument("--jitter-ms", type=float, default=10)
+    p_run.add_argument("--slow-ms", type=float, default=800, help="Extra delay of 'slow' hosts")
+    p_run.add_argument("--large-kb", type=int, default=1024, help="Page size of 'large' hosts")
+    p_run.add_argument("--seed", type=int, default=42)
+    p_run.add_argument("--output", default=None, help="Result file (default: results/monitoring-<commit>.json)")
+    p_run.add_argument("--baseline", default=None, help="Compare against this result file")
+    p_run.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    p_run.set_defaults(func=cmd_run)
+
+    p_compare = subparsers.add_parser("compare", help="Diff two result files")
+    p_compare.add_argument("old")
+    p_compare.add_argument("new")
+    p_compare.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    p_compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
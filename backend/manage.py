@@ -9,12 +9,16 @@ Usage inside Docker:
   docker exec -it <container_name> python3 manage.py reset-password --email admin@example.com --password NewPass123!
   docker exec -it <container_name> python3 manage.py promote-user --email user@example.com
   docker exec -it <container_name> python3 manage.py list-users
+  docker exec -it <container_name> python3 manage.py sync-indexes [--drop-unregistered]
+  docker exec -it <container_name> python3 manage.py index-advisor [--json]
+  docker exec -it <container_name> python3 manage.py generate-dataset --seed 42 --domains 50000 [--clear]
 
 Usage locally:
   python3 manage.py create-super-admin --email admin@example.com --password MyPass123!
 """
 
 import argparse
+import json
 import os
 import sys
 import uuid
@@ -36,6 +40,15 @@ def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
 
 
+def bump_user_version(db, user_id: str):
+    """Make running servers drop their cached copy of the user."""
+    db.user_cache_versions.update_one(
+        {"user_id": user_id},
+        {"$inc": {"version": 1}, "$currentDate": {"updated_at": True}},
+        upsert=True,
+    )
+
+
 def cmd_create_super_admin(args):
     """Create a new Super Admin or upgrade existing user."""
     client, db = get_db()
@@ -58,6 +71,7 @@ def cmd_create_super_admin(args):
                     "updated_at": now,
                 }},
             )
+            bump_user_version(db, existing["id"])
             print(f"[OK] User '{email}' upgraded to Super Admin with new password.")
         else:
             db.users.insert_one({
@@ -103,6 +117,7 @@ def cmd_reset_password(args):
                 "updated_at": datetime.now(timezone.utc).isoformat(),
             }},
         )
+        bump_user_version(db, user["id"])
         print(f"[OK] Password reset for '{email}'. Status set to active.")
         print(f"  New Password: {password}")
     finally:
@@ -132,6 +147,7 @@ def cmd_promote_user(args):
                 "updated_at": datetime.now(timezone.utc).isoformat(),
             }},
         )
+        bump_user_version(db, user["id"])
         print(f"[OK] '{email}' promoted to Super Admin.")
     finally:
         client.close()
@@ -155,6 +171,105 @@ def cmd_list_users(args):
         client.close()
 
 
+def cmd_sync_indexes(args):
+    """Create the registered indexes (services/index_registry_service.py)."""
+    from services.index_registry_service import (
+        apply_indexes_sync, drop_unregistered_indexes, unregistered_indexes,
+    )
+
+    client, db = get_db()
+    try:
+        result = apply_indexes_sync(db)
+        for name in result["failed"]:
+            print(f"[ERROR] Could not create index {name}")
+        print(f"[OK] {result['indexes']} registered indexes created/verified.")
+
+        if args.drop_unregistered:
+            for name in drop_unregistered_indexes(db):
+                print(f"[OK] Dropped unregistered index {name}")
+        else:
+            for item in unregistered_indexes(db):
+                print(f"[INFO] Unregistered index {item['collection']}.{item['index']} "
+                      f"(drop with --drop-unregistered)")
+    finally:
+        client.close()
+
+
+def cmd_index_advisor(args):
+    """Explain the catalog of hot queries and report index problems."""
+    from services.index_registry_service import run_index_advisor
+
+    client, db = get_db()
+    try:
+        report = run_index_advisor(db)
+        if args.json:
+            print(json.dumps(report, indent=2, default=str))
+            return
+
+        print(f"\n{'Collection':<28} {'Query':<50} {'Plan'}")
+        print("-" * 110)
+        for q in report["queries"]:
+            plan = " > ".join(q.get("stages", [])) or "-"
+            print(f"{q['collection']:<28} {q['name']:<50} {plan}")
+            for finding in q["findings"]:
+                print(f"    [WARN] {finding}")
+
+        for item in report["unused_indexes"]:
+            print(f"[INFO] Unused index {item['collection']}.{item['index']} (since {item['since']})")
+        for item in report["unregistered_indexes"]:
+            print(f"[INFO] Unregistered index {item['collection']}.{item['index']}")
+        for item in report["redundant_registered_indexes"]:
+            print(f"[INFO] Registered index {item['collection']}.{item['index']} "
+                  f"is a prefix of {item['covered_by']}")
+
+        flagged = sum(1 for q in report["queries"] if q["findings"])
+        print(f"\nTotal: {len(report['queries'])} queries, {flagged} with findings")
+    finally:
+        client.close()
+
+
+def cmd_generate_dataset(args):
+    """Bulk insert a deterministic synthetic portfolio for performance testing."""
+    from services.synthetic_dataset_service import (
+        DEFAULT_VOLUMES, clear_dataset, generate_dataset,
+    )
+
+    client, db = get_db()
+    try:
+        if db.asset_domains.estimated_document_count() and not args.clear:
+            print(f"[ERROR] Database '{DB_NAME}' already has asset domains. "
+                  f"Use --clear (on a dedicated database only).")
+            sys.exit(1)
+        if args.clear:
+            clear_dataset(db)
+            print(f"[OK] Cleared generated collections in '{DB_NAME}'.")
+
+        anchor = None
+        if args.anchor:
+            anchor = datetime.fromisoformat(args.anchor).replace(tzinfo=timezone.utc)
+        volumes = {key: getattr(args, key) for key in DEFAULT_VOLUMES}
+
+        started = datetime.now(timezone.utc)
+        counts = generate_dataset(
+            db,
+            seed=args.seed,
+            volumes=volumes,
+            anchor=anchor,
+            batch_size=args.batch_size,
+            progress=lambda name, count: print(f"[OK] {name}: {count} documents"),
+        )
+        elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+        print(f"\nTotal: {sum(counts.values())} documents in {elapsed:.1f}s (seed {args.seed})")
+
+        if not args.skip_indexes:
+            from services.index_registry_service import apply_indexes_sync
+
+            result = apply_indexes_sync(db)
+            print(f"[OK] {result['indexes']} registered indexes created/verified.")
+    finally:
+        client.close()
+
+
 def main():
     parser = argparse.ArgumentParser(
         prog="manage.py",
@@ -184,6 +299,33 @@ def main():
     p_list = subparsers.add_parser("list-users", help="List all users")
     p_list.set_defaults(func=cmd_list_users)
 
+    # sync-indexes
+    p_sync = subparsers.add_parser("sync-indexes", help="Create the registered database indexes")
+    p_sync.add_argument("--drop-unregistered", action="store_true",
+                        help="Drop indexes that are not in the registry")
+    p_sync.set_defaults(func=cmd_sync_indexes)
+
+    # index-advisor
+    p_advisor = subparsers.add_parser("index-advisor", help="Explain hot queries and report index problems")
+    p_advisor.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    p_advisor.set_defaults(func=cmd_index_advisor)
+
+    # generate-dataset
+    from services.synthetic_dataset_service import DEFAULT_VOLUMES
+
+    p_dataset = subparsers.add_parser("generate-dataset", help="Bulk insert a synthetic large portfolio")
+    p_dataset.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    p_dataset.add_argument("--anchor", default=None,
+                           help="Anchor date for timestamps, YYYY-MM-DD (default: today)")
+    for key, default in DEFAULT_VOLUMES.items():
+        p_dataset.add_argument(f"--{key.replace('_', '-')}", dest=key, type=int, default=default,
+                               help=f"Default: {default}")
+    p_dataset.add_argument("--batch-size", type=int, default=5000, help="insert_many batch size")
+    p_dataset.add_argument("--clear", action="store_true",
+                           help="Delete existing data in the generated collections first")
+    p_dataset.add_argument("--skip-indexes", action="store_true", help="Do not sync indexes afterwards")
+    p_dataset.set_defaults(func=cmd_generate_dataset)
+
     args = parser.parse_args()
     if not args.command:
         parser.print_help()
@@ -32,6 +32,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dotenv import load_dotenv
 
+from services.domain_key_service import with_domain_key
+
 load_dotenv(os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env"))
 
 
@@ -99,7 +101,7 @@ def transform_domain_to_asset(domain: dict) -> dict:
         "updated_at": now,
     }
 
-    return asset_domain
+    return with_domain_key(asset_domain)
 
 
 async def validate_prerequisites(db) -> Dict[str, Any]:
@@ -236,6 +238,7 @@ async def execute_migration(db) -> Dict[str, Any]:
     # Create indexes on target collection
     print("[Step 3] Creating indexes...")
     await db.asset_domains.create_index("domain_name", unique=True)
+    await db.asset_domains.create_index("domain_key", unique=True, sparse=True)
     await db.asset_domains.create_index("legacy_id")
     await db.asset_domains.create_index("brand_id")
     await db.asset_domains.create_index("status")
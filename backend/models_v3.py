@@ -918,6 +918,54 @@ class LifecycleChangeRequest(BaseModel):
     reason: Optional[str] = None
 
 
+class BulkDomainOperation(str, Enum):
+    """Operations of POST /asset-domains/bulk"""
+
+    SET_LIFECYCLE = "set_lifecycle"  # Super Admin
+    QUARANTINE = "quarantine"  # Super Admin
+    REMOVE_QUARANTINE = "remove_quarantine"  # Super Admin
+    MARK_RELEASED = "mark_released"  # Super Admin
+    SET_MONITORING = "set_monitoring"
+    MOVE_BRAND = "move_brand"
+
+
+class BulkDomainSelection(BaseModel):
+    """
+    Domains a bulk operation applies to: explicit ids, or the filters of
+    the asset domain list (combined with AND). Always limited to the
+    user's brand scope.
+    """
+    domain_ids: Optional[List[str]] = None
+    brand_id: Optional[str] = None
+    registrar_id: Optional[str] = None
+    category_id: Optional[str] = None
+    network_id: Optional[str] = None
+    lifecycle_status: Optional[DomainLifecycleStatus] = None
+    monitoring_enabled: Optional[bool] = None
+    search: Optional[str] = None
+
+
+class BulkDomainOperationRequest(BaseModel):
+    """
+    Request to change many domains at once.
+
+    The operation fields mirror the single-domain endpoints:
+    - set_lifecycle: lifecycle_status (+ quarantine_category / note)
+    - quarantine: quarantine_category (+ quarantine_note, required for 'other')
+    - set_monitoring: monitoring_enabled
+    - move_brand: target_brand_id
+    """
+    operation: BulkDomainOperation
+    selection: BulkDomainSelection
+    lifecycle_status: Optional[DomainLifecycleStatus] = None
+    quarantine_category: Optional[str] = None
+    quarantine_note: Optional[str] = None
+    monitoring_enabled: Optional[bool] = None
+    target_brand_id: Optional[str] = None
+    reason: Optional[str] = None
+    background: Optional[bool] = None  # None = automatic, by selection size
+
+
 class NetworkUsageInfo(BaseModel):
     """Info about a network that uses this asset domain"""
 
@@ -1325,6 +1373,7 @@ class ConflictType(str, Enum):
     INDEX_NOINDEX_MISMATCH = "index_noindex_mismatch"  # Conflicting index status in link chain
     ORPHAN_NODE = "orphan"  # Node not connected to main hierarchy
     NOINDEX_HIGH_TIER = "noindex_high_tier"  # NOINDEX node in high tier
+    NEAR_DUPLICATE_KEYWORD = "near_duplicate_keyword"  # Similar keyword/ranking URL across the brand
 
 
 class SeoConflict(BaseModel):
@@ -9,14 +9,18 @@ New API endpoints for V3 architecture:
 - /api/v3/monitoring - Domain monitoring settings and controls
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks, Body
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks, Body, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
+from pymongo.errors import DuplicateKeyError
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone, timedelta
+import asyncio
+import json
 import uuid
 import httpx
 import logging
+import time
 
 # Import models
 import sys
@@ -50,7 +54,6 @@ from models_v3 import (
     RegistrarResponse,
     RegistrarStatus,
     SeoConflict,
-    ConflictType,
     ConflictSeverity,
     ConflictStatus,
     StoredConflict,
@@ -92,6 +95,7 @@ from models_v3 import (
     SetQuarantineRequest,
     RemoveQuarantineRequest,
     LifecycleChangeRequest,
+    BulkDomainOperationRequest,
     LifecycleValidationWarning,
     SeoMonitoringCoverageStats,
     TeamResponseCreate,
@@ -118,11 +122,20 @@ from models_v3 import (
 from services.seo_optimization_telegram_service import SeoOptimizationTelegramService
 from services.conflict_optimization_linker_service import get_conflict_linker_service
 from services.conflict_metrics_service import get_conflict_metrics_service
+from services.conflict_scanner_service import get_conflict_scanner_service
+from services.user_cache_service import get_user_cache_service
+from services.presence_service import get_presence_service, ONLINE_THRESHOLD_SECONDS
+from services.event_bus import publish_event
+from services.domain_key_service import domain_search_filter, normalize_domain_key, with_domain_key
+from services import dashboard_stats_service as dashboard_stats
+from services.live_updates_service import get_live_updates_service
+from services.single_flight_service import get_single_flight
+from services.metrics_service import MetricsRoute, observe_notification
 
 logger = logging.getLogger(__name__)
 
 # Router
-router = APIRouter(prefix="/api/v3", tags=["V3 API"])
+router = APIRouter(prefix="/api/v3", tags=["V3 API"], route_class=MetricsRoute)
 
 
 # ==================== DEPENDENCIES ====================
@@ -182,6 +195,7 @@ async def send_v3_telegram_alert(message: str) -> bool:
         logger.warning("Telegram not configured, skipping V3 alert")
         return False
 
+    started = time.perf_counter()
     try:
         url = f"https://api.telegram.org/bot{settings['bot_token']}/sendMessage"
         async with httpx.AsyncClient() as client:
@@ -194,8 +208,10 @@ async def send_v3_telegram_alert(message: str) -> bool:
                 },
                 timeout=10,
             )
+            observe_notification("telegram", started, response.status_code == 200)
             return response.status_code == 200
     except Exception as e:
+        observe_notification("telegram", started, False)
         logger.error(f"Failed to send V3 Telegram alert: {e}")
         return False
 
@@ -563,9 +579,65 @@ async def require_network_access_by_id(network_id: str, user: dict):
     return network
 
 
+async def mark_network_structure_changed(network_id: str):
+    """
+    Bump the network's structure version so the conflict scanner
+    re-detects it. Call after any write to its structure entries.
+    """
+    await get_conflict_scanner_service(db).mark_network_changed(network_id)
+
+
+async def invalidate_metrics_rollups(*docs: Optional[dict]):
+    """
+    Drop the daily metrics rollups of the closed days these conflicts /
+    optimizations (as they were before the write) were counted on, and this
+    worker's coalesced reports built from them.
+    """
+    from services.metrics_rollup_service import get_metrics_rollup_service
+    await get_metrics_rollup_service(db).invalidate_days(*docs)
+    for endpoint in CONFLICT_STATUS_REPORTS:
+        get_single_flight().invalidate(endpoint)
+
+
 # Minimum change note length for SEO changes
 MIN_CHANGE_NOTE_LENGTH = 10
 
+# Expensive report endpoints whose concurrent identical requests share one
+# computation: (ttl_seconds, stale_seconds). Within the stale window the
+# previous result is returned while it is refreshed in the background.
+# Reports over conflict / optimization status serve no stale results and are
+# dropped when a status changes (invalidate_metrics_rollups).
+REPORT_COALESCING = {
+    "reports/conflicts": (5, 0),
+    "metrics/dashboard": (30, 0),
+    "team-evaluation/summary": (30, 0),
+    "monitoring/coverage": (5, 30),
+    "monitoring/seo-domains-summary": (5, 30),
+}
+
+CONFLICT_STATUS_REPORTS = ("metrics/dashboard", "team-evaluation/summary")
+
+
+async def run_coalesced(
+    endpoint: str,
+    compute,
+    params: Optional[dict] = None,
+    brand_scope: Optional[List[str]] = None,
+):
+    """
+    Run a report computation through the single-flight layer.
+    Pass brand_scope when the result depends on the user's brands.
+    """
+    ttl_seconds, stale_seconds = REPORT_COALESCING.get(endpoint, (0, 0))
+    return await get_single_flight().run(
+        endpoint,
+        compute,
+        params=params,
+        brand_scope=brand_scope,
+        ttl_seconds=ttl_seconds,
+        stale_seconds=stale_seconds,
+    )
+
 
 def validate_change_note(change_note: str) -> None:
     """
@@ -1092,6 +1164,7 @@ async def update_user_menu_permissions(
         },
         upsert=True
     )
+    await get_user_cache_service(db).bump_user_version(user_id)
     
     # Log the action
     await db.audit_logs.insert_one({
@@ -1138,6 +1211,7 @@ async def reset_user_menu_permissions(
     
     # Delete custom permissions (will fall back to defaults)
     await db.menu_permissions.delete_one({"user_id": user_id})
+    await get_user_cache_service(db).bump_user_version(user_id)
     
     now = datetime.now(timezone.utc).isoformat()
     
@@ -1236,6 +1310,7 @@ async def bulk_update_menu_permissions(
             },
             upsert=True
         )
+        await get_user_cache_service(db).bump_user_version(user_id)
         results["updated"].append({"user_id": user_id, "email": user.get("email")})
     
     # Log the bulk action
@@ -1336,6 +1411,7 @@ async def bulk_update_brand_access(
                 }
             }
         )
+        await get_user_cache_service(db).bump_user_version(user_id)
         results["updated"].append({
             "user_id": user_id, 
             "email": user.get("email"),
@@ -1617,7 +1693,7 @@ async def get_asset_domains(
     if monitoring_enabled is not None:
         query["monitoring_enabled"] = monitoring_enabled
     if search:
-        query["domain_name"] = {"$regex": search, "$options": "i"}
+        query.update(domain_search_filter(search))
 
     # Lifecycle filter (strategic)
     if lifecycle_status:
@@ -2081,19 +2157,14 @@ async def create_asset_domain(
         if not registrar:
             raise HTTPException(status_code=400, detail="Registrar not found")
 
-    # Check for duplicate domain name
-    existing = await db.asset_domains.find_one({"domain_name": data.domain_name})
-    if existing:
-        raise HTTPException(status_code=400, detail="Domain name already exists")
-
     now = datetime.now(timezone.utc).isoformat()
-    asset = {
+    asset = with_domain_key({
         "id": str(uuid.uuid4()),
         "legacy_id": None,
         **data.model_dump(),
         "created_at": now,
         "updated_at": now,
-    }
+    })
 
     # Convert enums to values
     if asset.get("status") and hasattr(asset["status"], "value"):
@@ -2107,7 +2178,12 @@ async def create_asset_domain(
     if asset.get("domain_lifecycle_status") and hasattr(asset["domain_lifecycle_status"], "value"):
         asset["domain_lifecycle_status"] = asset["domain_lifecycle_status"].value
 
-    await db.asset_domains.insert_one(asset)
+    # The unique domain_key index is the duplicate check (any case)
+    try:
+        await db.asset_domains.insert_one(asset)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Domain name already exists")
+    publish_event("inventory", asset_id=asset["id"])
 
     # Log activity
     if activity_log_service:
@@ -2155,8 +2231,17 @@ async def update_asset_domain(
             update_dict[field] = update_dict[field].value
 
     update_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
+    if "domain_name" in update_dict:
+        with_domain_key(update_dict)
 
-    await db.asset_domains.update_one({"id": asset_id}, {"$set": update_dict})
+    try:
+        await db.asset_domains.update_one({"id": asset_id}, {"$set": update_dict})
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Domain name already exists")
+
+    # Conflict report snapshots label nodes with the domain name
+    if update_dict.get("domain_name", existing.get("domain_name")) != existing.get("domain_name"):
+        await get_conflict_scanner_service(db).mark_domain_changed(asset_id)
 
     # Log activity
     if activity_log_service:
@@ -2197,6 +2282,7 @@ async def delete_asset_domain(
         )
 
     await db.asset_domains.delete_one({"id": asset_id})
+    publish_event("inventory", asset_id=asset_id)
 
     # Log activity
     if activity_log_service:
@@ -2529,6 +2615,92 @@ async def remove_domain_quarantine(
     return AssetDomainResponse(**updated)
 
 
+@router.post("/asset-domains/bulk")
+async def bulk_domain_operation(
+    data: BulkDomainOperationRequest,
+    current_user: dict = Depends(get_current_user_wrapper),
+):
+    """
+    Apply a lifecycle, quarantine, monitoring or brand change to many
+    domains - BRAND SCOPED.
+
+    The selection is explicit domain_ids and/or the filters of the asset
+    domain list; lifecycle and quarantine operations are Super Admin only.
+    Domains the rules exclude (expired, not quarantined, monitoring not
+    allowed, already in the brand) are skipped with a reason.
+
+    Returns the summary, or - for more than BULK_OPERATION_SYNC_LIMIT
+    domains or background=true - the job (follow it on /import/jobs/{id}).
+    """
+    from services.bulk_domain_operation_service import (
+        BULK_OPERATION_SYNC_LIMIT,
+        SUPER_ADMIN_OPERATIONS,
+        BulkDomainOperationService,
+        BulkOperationError,
+        validate_operation,
+    )
+
+    request = data.model_dump(mode="json")
+    try:
+        spec = validate_operation(request)
+    except BulkOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if spec["operation"] in SUPER_ADMIN_OPERATIONS and current_user.get("role") != "super_admin":
+        raise HTTPException(
+            status_code=403,
+            detail="Only Super Admin can change domain lifecycle or quarantine",
+        )
+    if spec["operation"] == "move_brand":
+        brand = await db.brands.find_one({"id": spec["target_brand_id"]}, {"_id": 0, "id": 1})
+        if not brand:
+            raise HTTPException(status_code=400, detail="Brand not found")
+        require_brand_access(spec["target_brand_id"], current_user)
+
+    # Selection -> ids, always within the user's brand scope
+    selection = request["selection"]
+    if not any(value is not None for value in selection.values()):
+        raise HTTPException(
+            status_code=400, detail="Select domains by domain_ids or at least one filter"
+        )
+    conditions = [build_brand_filter(current_user)]
+    if selection["domain_ids"] is not None:
+        conditions.append({"id": {"$in": selection["domain_ids"]}})
+    if selection["brand_id"]:
+        require_brand_access(selection["brand_id"], current_user)
+        conditions.append({"brand_id": selection["brand_id"]})
+    for field in ("registrar_id", "category_id", "lifecycle_status", "monitoring_enabled"):
+        if selection[field] is not None:
+            conditions.append({field: selection[field]})
+    if selection["search"]:
+        conditions.append(domain_search_filter(selection["search"]))
+    if selection["network_id"]:
+        network_domain_ids = await db.seo_structure_entries.distinct(
+            "asset_domain_id", {"network_id": selection["network_id"]}
+        )
+        conditions.append({"id": {"$in": network_domain_ids}})
+    query = {"$and": [c for c in conditions if c]} if any(conditions) else {}
+
+    ids = [
+        d["id"] for d in await db.asset_domains.find(query, {"_id": 0, "id": 1}).to_list(None)
+    ]
+
+    background = data.background
+    if background is None:
+        background = len(ids) > BULK_OPERATION_SYNC_LIMIT
+    if background:
+        return await _get_import_job_service().submit(
+            "domain_operations",
+            [{"id": asset_id} for asset_id in ids],
+            actor=current_user["email"],
+            params={"spec": spec, "actor_id": current_user.get("id"), "selection": selection},
+        )
+
+    return await BulkDomainOperationService(db, activity_log_service).run(
+        ids, spec, current_user["email"], current_user.get("id"), selection=selection
+    )
+
+
 @router.get("/monitoring/coverage", response_model=SeoMonitoringCoverageStats)
 async def get_seo_monitoring_coverage(
     brand_id: Optional[str] = None,
@@ -2537,7 +2709,8 @@ async def get_seo_monitoring_coverage(
     """
     Get SEO Monitoring Coverage statistics.
     
-    This endpoint returns real-time stats without caching:
+    Concurrent requests share one computation (results are at most a few
+    seconds old):
     - Total domains in SEO networks
     - Monitored vs unmonitored counts
     - Coverage percentage
@@ -2550,6 +2723,16 @@ async def get_seo_monitoring_coverage(
         require_brand_access(brand_id, current_user)
         query["brand_id"] = brand_id
     
+    return await run_coalesced(
+        "monitoring/coverage",
+        lambda: _compute_seo_monitoring_coverage(query),
+        params={"brand_id": brand_id},
+        brand_scope=get_user_brand_scope(current_user),
+    )
+
+
+async def _compute_seo_monitoring_coverage(query: dict) -> SeoMonitoringCoverageStats:
+    """Coverage stats of GET /monitoring/coverage for a brand-scoped query."""
     # Get all domains used in SEO networks
     all_structure_entries = await db.seo_structure_entries.find(
         {}, {"_id": 0, "asset_domain_id": 1, "optimized_path": 1, "network_id": 1}
@@ -3307,6 +3490,8 @@ async def create_network(
         "id": network_id,
         "legacy_id": None,
         **network_data,
+        "structure_version": 1,
+        "conflicts_scanned_version": 0,
         "created_at": now,
         "updated_at": now,
     }
@@ -3316,6 +3501,7 @@ async def create_network(
         network["status"] = network["status"].value
 
     await db.seo_networks.insert_one(network)
+    publish_event("inventory", network_id=network_id)
 
     # Create the main node (seo_structure_entry)
     main_entry = {
@@ -3419,6 +3605,14 @@ async def update_network(
 
     await db.seo_networks.update_one({"id": network_id}, {"$set": update_dict})
 
+    # Conflict reports embed the network name; the cannibalization
+    # index is brand-scoped
+    if any(
+        update_dict.get(field) and update_dict[field] != existing.get(field)
+        for field in ("name", "brand_id")
+    ):
+        await mark_network_structure_changed(network_id)
+
     # Log activity
     if activity_log_service:
         await activity_log_service.log(
@@ -3476,11 +3670,15 @@ async def delete_network(
     opt_result = await db.seo_optimizations.delete_many({"network_id": network_id})
     complaint_result = await db.optimization_complaints.delete_many({"network_id": network_id})
     conflict_result = await db.seo_conflicts.delete_many({"network_id": network_id})
+    await get_conflict_scanner_service(db).delete_network_state(network_id)
+    from services.metrics_rollup_service import get_metrics_rollup_service
+    await get_metrics_rollup_service(db).invalidate_network(network_id)
     await db.seo_change_logs.delete_many({"network_id": network_id})
     await db.seo_network_notifications.delete_many({"network_id": network_id})
 
     # Delete the network itself
     await db.seo_networks.delete_one({"id": network_id})
+    publish_event("inventory", network_id=network_id)
 
     # Log activity (keep audit trail)
     if activity_log_service:
@@ -3709,6 +3907,7 @@ async def create_structure_entry(
             entry[field] = entry[field].value
 
     await db.seo_structure_entries.insert_one(entry)
+    await mark_network_structure_changed(entry["network_id"])
 
     # Build node label for logging
     node_label = f"{asset['domain_name']}{normalized_path or ''}"
@@ -3910,6 +4109,7 @@ async def update_structure_entry(
     update_dict["updated_at"] = datetime.now(timezone.utc).isoformat()
 
     await db.seo_structure_entries.update_one({"id": entry_id}, {"$set": update_dict})
+    await mark_network_structure_changed(existing["network_id"])
 
     # Get domain info for node label
     domain = await db.asset_domains.find_one(
@@ -4523,6 +4723,8 @@ async def update_optimization(
 
     # Check if status changed to completed or reverted
     new_status = update_data.get("status", old_status)
+    if new_status != old_status:
+        await invalidate_metrics_rollups(optimization)
     
     # AUTO-SYNC: Update linked conflict status when optimization status changes
     linked_conflict_id = optimization.get("linked_conflict_id")
@@ -4557,10 +4759,12 @@ async def update_optimization(
             conflict_update["resolved_at"] = None
             conflict_update["resolved_by"] = None
         
-        await db.seo_conflicts.update_one(
+        previous_conflict = await db.seo_conflicts.find_one_and_update(
             {"id": linked_conflict_id},
-            {"$set": conflict_update}
+            {"$set": conflict_update},
+            projection={"_id": 0, "detected_at": 1, "resolved_at": 1},
         )
+        await invalidate_metrics_rollups(previous_conflict)
         logger.info(f"Synced conflict {linked_conflict_id} status to match optimization status change to {new_status}")
     
     if new_status != old_status and new_status in ["completed", "reverted"]:
@@ -4635,7 +4839,7 @@ async def delete_optimization(
     # Handle linked conflict - reset it back to detected
     linked_conflict_id = optimization.get("linked_conflict_id")
     if linked_conflict_id:
-        await db.seo_conflicts.update_one(
+        previous_conflict = await db.seo_conflicts.find_one_and_update(
             {"id": linked_conflict_id},
             {"$set": {
                 "status": "detected",
@@ -4643,11 +4847,14 @@ async def delete_optimization(
                 "resolved_at": None,
                 "resolved_by": None,
                 "updated_at": datetime.now(timezone.utc).isoformat()
-            }}
+            }},
+            projection={"_id": 0, "detected_at": 1, "resolved_at": 1},
         )
+        await invalidate_metrics_rollups(previous_conflict)
         logger.info(f"Reset conflict {linked_conflict_id} to 'detected' due to optimization deletion")
 
     await db.seo_optimizations.delete_one({"id": optimization_id})
+    await invalidate_metrics_rollups(optimization)
 
     # Log activity
     if activity_log_service:
@@ -5468,6 +5675,8 @@ async def resolve_complaint(
         }
 
     await db.seo_optimizations.update_one({"id": optimization_id}, {"$set": opt_update})
+    if "status" in opt_update:
+        await invalidate_metrics_rollups(optimization)
 
     # Send Telegram notification
     try:
@@ -5601,6 +5810,7 @@ async def close_optimization(
             }
         },
     )
+    await invalidate_metrics_rollups(optimization)
 
     # Send Telegram notification
     try:
@@ -6526,6 +6736,16 @@ async def get_team_evaluation_users(
     if current_user.get("role") not in ["admin", "super_admin"]:
         raise HTTPException(status_code=403, detail="Admin access required")
 
+    return await _compute_team_evaluation_users(brand_id, network_id, start_date, end_date)
+
+
+async def _compute_team_evaluation_users(
+    brand_id: Optional[str],
+    network_id: Optional[str],
+    start_date: Optional[str],
+    end_date: Optional[str],
+):
+    """Scores of GET /team-evaluation/users."""
     # Build query for optimizations
     query = {}
     if brand_id:
@@ -6627,6 +6847,25 @@ async def get_team_evaluation_summary(
     if current_user.get("role") not in ["admin", "super_admin"]:
         raise HTTPException(status_code=403, detail="Admin access required")
 
+    return await run_coalesced(
+        "team-evaluation/summary",
+        lambda: _compute_team_evaluation_summary(brand_id, network_id, start_date, end_date),
+        params={
+            "brand_id": brand_id,
+            "network_id": network_id,
+            "start_date": start_date,
+            "end_date": end_date,
+        },
+    )
+
+
+async def _compute_team_evaluation_summary(
+    brand_id: Optional[str],
+    network_id: Optional[str],
+    start_date: Optional[str],
+    end_date: Optional[str],
+) -> TeamEvaluationSummary:
+    """Summary of GET /team-evaluation/summary."""
     # Default to last 30 days if no dates provided
     if not end_date:
         end_date = datetime.now(timezone.utc).isoformat()
@@ -6697,8 +6936,8 @@ async def get_team_evaluation_summary(
     # resolved_count is available in resolution_result but not currently used in the response
 
     # Get top contributors
-    top_users = await get_team_evaluation_users(
-        brand_id, network_id, start_date, end_date, current_user
+    top_users = await _compute_team_evaluation_users(
+        brand_id, network_id, start_date, end_date
     )
 
     # Check for repeated issues (>2 complaints in 30 days per user)
@@ -6938,6 +7177,7 @@ async def switch_main_target(
     await db.seo_structure_entries.update_one(
         {"id": data.new_main_entry_id}, {"$set": new_main_update}
     )
+    await mark_network_structure_changed(network_id)
 
     # Log the promotion
     if seo_change_log_service:
@@ -7183,6 +7423,7 @@ async def delete_structure_entry(
     brand_id = network.get("brand_id", "") if network else ""
 
     await db.seo_structure_entries.delete_one({"id": entry_id})
+    await mark_network_structure_changed(existing["network_id"])
 
     # ATOMIC: Log + Telegram notification
     # Skip rate limit for DELETE actions - critical notifications must always be sent
@@ -7432,62 +7673,7 @@ async def get_activity_stats(current_user: dict = Depends(get_current_user_wrapp
 @router.get("/reports/dashboard")
 async def get_v3_dashboard(current_user: dict = Depends(get_current_user_wrapper)):
     """Get V3 dashboard statistics"""
-    asset_count = await db.asset_domains.count_documents({})
-    network_count = await db.seo_networks.count_documents({})
-    structure_count = await db.seo_structure_entries.count_documents({})
-
-    # Status distributions
-    asset_active = await db.asset_domains.count_documents({"status": "active"})
-    asset_inactive = await db.asset_domains.count_documents({"status": "inactive"})
-    asset_expired = await db.asset_domains.count_documents({"status": "expired"})
-
-    main_domains = await db.seo_structure_entries.count_documents(
-        {"domain_role": "main"}
-    )
-    supporting_domains = await db.seo_structure_entries.count_documents(
-        {"domain_role": "supporting"}
-    )
-
-    indexed = await db.seo_structure_entries.count_documents({"index_status": "index"})
-    noindexed = await db.seo_structure_entries.count_documents(
-        {"index_status": "noindex"}
-    )
-
-    # Monitoring stats
-    monitored = await db.asset_domains.count_documents({"monitoring_enabled": True})
-    up = await db.asset_domains.count_documents(
-        {"monitoring_enabled": True, "ping_status": "up"}
-    )
-    down = await db.asset_domains.count_documents(
-        {"monitoring_enabled": True, "ping_status": "down"}
-    )
-
-    return {
-        "collections": {
-            "asset_domains": asset_count,
-            "seo_networks": network_count,
-            "seo_structure_entries": structure_count,
-        },
-        "asset_status": {
-            "active": asset_active,
-            "inactive": asset_inactive,
-            "expired": asset_expired,
-        },
-        "domain_roles": {"main": main_domains, "supporting": supporting_domains},
-        "index_status": {
-            "indexed": indexed,
-            "noindexed": noindexed,
-            "index_rate": (
-                round(indexed / structure_count * 100, 1) if structure_count > 0 else 0
-            ),
-        },
-        "monitoring": {
-            "total_monitored": monitored,
-            "up": up,
-            "down": down,
-            "unknown": monitored - up - down,
-        },
-    }
+    return await dashboard_stats.get_v3_report_stats(db)
 
 
 @router.get("/reports/domains-by-brand")
@@ -7548,373 +7734,28 @@ async def get_v3_conflicts(
     - Type B: Competing Targets (different paths targeting different nodes)
     - Type C: Canonical Mismatch (path A canonical to B, B still indexed)
     - Type D: Tier Inversion (higher tier supports lower tier)
+    - Near-Duplicate Keyword (similar keyword/ranking URL anywhere in the brand)
     - Legacy: NOINDEX in high tier, Orphan nodes
     """
-    conflicts = []
-    now = datetime.now(timezone.utc).isoformat()
+    return await run_coalesced(
+        "reports/conflicts",
+        lambda: _compute_v3_conflicts(network_id),
+        params={"network_id": network_id},
+    )
 
+
+async def _compute_v3_conflicts(network_id: Optional[str]) -> dict:
+    """Conflict report of GET /reports/conflicts."""
     # Filter by network if provided
     query = {"id": network_id} if network_id else {}
-    networks = await db.seo_networks.find(query, {"_id": 0}).to_list(1000)
-
-    for network in networks:
-        if not tier_service:
-            continue
-
-        # Get tiers for network
-        tiers = await tier_service.calculate_network_tiers(network["id"])
-
-        # Get entries
-        entries = await db.seo_structure_entries.find(
-            {"network_id": network["id"]}, {"_id": 0}
-        ).to_list(10000)
-
-        # Build lookup structures
-        domain_entries = {}  # asset_domain_id -> [entries]
-        entry_lookup = {e["id"]: e for e in entries}
-
-        for entry in entries:
-            did = entry["asset_domain_id"]
-            if did not in domain_entries:
-                domain_entries[did] = []
-            domain_entries[did].append(entry)
-
-        # Get all domain names
-        domain_ids = list(domain_entries.keys())
-        domains = await db.asset_domains.find(
-            {"id": {"$in": domain_ids}}, {"_id": 0, "id": 1, "domain_name": 1}
-        ).to_list(10000)
-        domain_name_lookup = {d["id"]: d["domain_name"] for d in domains}
-
-        # Helper to build node label
-        def node_label(entry):
-            dname = domain_name_lookup.get(entry["asset_domain_id"], "")
-            path = entry.get("optimized_path") or ""
-            return f"{dname}{path}" if path else dname
-
-        # ============ CROSS-PATH CONFLICT DETECTION ============
-
-        for domain_id, domain_entry_list in domain_entries.items():
-            domain_name = domain_name_lookup.get(domain_id, domain_id)
-
-            if len(domain_entry_list) < 2:
-                continue  # Need at least 2 paths to have cross-path conflicts
-
-            # TYPE A: Keyword Cannibalization
-            # Same domain, different paths, same or similar primary_keyword
-            keywords = {}
-            for e in domain_entry_list:
-                kw = (e.get("primary_keyword") or "").lower().strip()
-                if kw:
-                    if kw not in keywords:
-                        keywords[kw] = []
-                    keywords[kw].append(e)
-
-            for kw, kw_entries in keywords.items():
-                if len(kw_entries) > 1:
-                    # Multiple paths targeting same keyword
-                    for i, e1 in enumerate(kw_entries):
-                        for e2 in kw_entries[i + 1 :]:
-                            conflicts.append(
-                                {
-                                    "conflict_type": ConflictType.KEYWORD_CANNIBALIZATION.value,
-                                    "severity": ConflictSeverity.HIGH.value,
-                                    "network_id": network["id"],
-                                    "network_name": network["name"],
-                                    "domain_name": domain_name,
-                                    "node_a_id": e1["id"],
-                                    "node_a_path": e1.get("optimized_path"),
-                                    "node_a_label": node_label(e1),
-                                    "node_b_id": e2["id"],
-                                    "node_b_path": e2.get("optimized_path"),
-                                    "node_b_label": node_label(e2),
-                                    "description": f"Both paths target keyword '{kw}'",
-                                    "suggestion": "Consolidate content or differentiate keywords",
-                                    "detected_at": now,
-                                }
-                            )
-
-            # TYPE B: Competing Targets
-            # Different paths of same domain targeting different nodes
-            targets = {}
-            for e in domain_entry_list:
-                target_id = e.get("target_entry_id")
-                if target_id:
-                    if target_id not in targets:
-                        targets[target_id] = []
-                    targets[target_id].append(e)
-
-            if len(targets) > 1:
-                # Multiple different targets from same domain
-                target_entries = list(targets.values())
-                for i, group1 in enumerate(target_entries):
-                    for group2 in target_entries[i + 1 :]:
-                        e1 = group1[0]
-                        e2 = group2[0]
-                        t1 = entry_lookup.get(e1.get("target_entry_id"))
-                        t2 = entry_lookup.get(e2.get("target_entry_id"))
-
-                        conflicts.append(
-                            {
-                                "conflict_type": ConflictType.COMPETING_TARGETS.value,
-                                "severity": ConflictSeverity.MEDIUM.value,
-                                "network_id": network["id"],
-                                "network_name": network["name"],
-                                "domain_name": domain_name,
-                                "node_a_id": e1["id"],
-                                "node_a_path": e1.get("optimized_path"),
-                                "node_a_label": node_label(e1),
-                                "node_b_id": e2["id"],
-                                "node_b_path": e2.get("optimized_path"),
-                                "node_b_label": node_label(e2),
-                                "description": f"Paths target different nodes: {node_label(t1) if t1 else 'unknown'} vs {node_label(t2) if t2 else 'unknown'}",
-                                "suggestion": "Consolidate link strategy for this domain",
-                                "detected_at": now,
-                            }
-                        )
-
-            # TYPE C: Canonical Mismatch
-            # Path A has canonical pointing to Path B, but B is still indexed
-            for e in domain_entry_list:
-                if (
-                    e.get("domain_status") == "redirect_301"
-                    or e.get("domain_status") == "redirect_302"
-                ):
-                    target_id = e.get("target_entry_id")
-                    if target_id:
-                        target = entry_lookup.get(target_id)
-                        if target and target.get("index_status") == "index":
-                            conflicts.append(
-                                {
-                                    "conflict_type": ConflictType.CANONICAL_MISMATCH.value,
-                                    "severity": ConflictSeverity.HIGH.value,
-                                    "network_id": network["id"],
-                                    "network_name": network["name"],
-                                    "domain_name": domain_name,
-                                    "node_a_id": e["id"],
-                                    "node_a_path": e.get("optimized_path"),
-                                    "node_a_label": node_label(e),
-                                    "node_b_id": target["id"],
-                                    "node_b_path": target.get("optimized_path"),
-                                    "node_b_label": node_label(target),
-                                    "description": "Redirects to indexed path",
-                                    "suggestion": "Review canonical chain or noindex the target",
-                                    "detected_at": now,
-                                }
-                            )
-
-            # TYPE D: Tier Inversion (within same domain)
-            # Higher-tier path supports lower-tier path
-            for e in domain_entry_list:
-                if e.get("domain_role") == "supporting":
-                    target_id = e.get("target_entry_id")
-                    if target_id:
-                        target = entry_lookup.get(target_id)
-                        if target:
-                            e_tier = tiers.get(e["id"], 5)
-                            t_tier = tiers.get(target_id, 5)
-
-                            if e_tier < t_tier:
-                                conflicts.append(
-                                    {
-                                        "conflict_type": ConflictType.TIER_INVERSION.value,
-                                        "severity": ConflictSeverity.CRITICAL.value,
-                                        "network_id": network["id"],
-                                        "network_name": network["name"],
-                                        "domain_name": domain_name,
-                                        "node_a_id": e["id"],
-                                        "node_a_path": e.get("optimized_path"),
-                                        "node_a_label": node_label(e),
-                                        "node_b_id": target["id"],
-                                        "node_b_path": target.get("optimized_path"),
-                                        "node_b_label": node_label(target),
-                                        "description": f"Tier {e_tier} ({get_tier_label(e_tier)}) supports Tier {t_tier} ({get_tier_label(t_tier)})",
-                                        "suggestion": "Reverse the relationship or restructure hierarchy",
-                                        "detected_at": now,
-                                    }
-                                )
-
-        # ============ NETWORK-WIDE CONFLICT DETECTION ============
-        
-        # Build reverse lookup: target_entry_id -> list of source entries
-        target_sources = {}  # target_entry_id -> [source entries]
-        for entry in entries:
-            target_id = entry.get("target_entry_id")
-            if target_id:
-                if target_id not in target_sources:
-                    target_sources[target_id] = []
-                target_sources[target_id].append(entry)
-        
-        # TYPE E: Redirect/Canonical Loops
-        # Detect A -> B -> A or A -> B -> C -> A cycles
-        def detect_redirect_loop(start_entry_id, visited=None, path=None):
-            """Detect redirect loops starting from entry"""
-            if visited is None:
-                visited = set()
-            if path is None:
-                path = []
-            
-            if start_entry_id in visited:
-                return path  # Loop found
-            
-            visited.add(start_entry_id)
-            path.append(start_entry_id)
-            
-            entry = entry_lookup.get(start_entry_id)
-            if entry:
-                target_id = entry.get("target_entry_id")
-                # Only follow redirects/canonicals
-                if target_id and entry.get("domain_status") in ["redirect_301", "redirect_302", "canonical"]:
-                    return detect_redirect_loop(target_id, visited, path)
-            
-            return None  # No loop
-        
-        detected_loops = set()
-        for entry in entries:
-            if entry.get("domain_status") in ["redirect_301", "redirect_302", "canonical"]:
-                loop_path = detect_redirect_loop(entry["id"])
-                if loop_path and len(loop_path) > 1:
-                    loop_key = tuple(sorted(loop_path))
-                    if loop_key not in detected_loops:
-                        detected_loops.add(loop_key)
-                        first_entry = entry_lookup.get(loop_path[0])
-                        last_entry = entry_lookup.get(loop_path[-1]) if loop_path else None
-                        conflicts.append({
-                            "conflict_type": ConflictType.REDIRECT_LOOP.value,
-                            "severity": ConflictSeverity.CRITICAL.value,
-                            "network_id": network["id"],
-                            "network_name": network["name"],
-                            "domain_name": domain_name_lookup.get(first_entry["asset_domain_id"], "") if first_entry else "",
-                            "node_a_id": loop_path[0],
-                            "node_a_path": first_entry.get("optimized_path") if first_entry else None,
-                            "node_a_label": node_label(first_entry) if first_entry else "",
-                            "node_b_id": loop_path[-1] if loop_path else None,
-                            "node_b_path": last_entry.get("optimized_path") if last_entry else None,
-                            "node_b_label": node_label(last_entry) if last_entry else "",
-                            "description": f"Redirect/canonical loop detected with {len(loop_path)} nodes",
-                            "suggestion": "Break the loop by removing one redirect",
-                            "detected_at": now,
-                        })
-        
-        # TYPE F: Multiple Parents pointing to Money Site without intent
-        # Find main node
-        main_entries = [e for e in entries if e.get("domain_role") == "main"]
-        for main_entry in main_entries:
-            main_id = main_entry["id"]
-            
-            # Find all entries pointing to this main
-            sources_to_main = target_sources.get(main_id, [])
-            
-            # Filter out expected supporting nodes
-            non_supporting_sources = [
-                s for s in sources_to_main 
-                if s.get("domain_role") != "supporting" and s.get("domain_status") not in ["redirect_301", "redirect_302"]
-            ]
-            
-            if len(non_supporting_sources) > 1:
-                # Multiple non-supporting nodes point to main - potential issue
-                for src in non_supporting_sources:
-                    conflicts.append({
-                        "conflict_type": ConflictType.MULTIPLE_PARENTS_TO_MAIN.value,
-                        "severity": ConflictSeverity.MEDIUM.value,
-                        "network_id": network["id"],
-                        "network_name": network["name"],
-                        "domain_name": domain_name_lookup.get(src["asset_domain_id"], ""),
-                        "node_a_id": src["id"],
-                        "node_a_path": src.get("optimized_path"),
-                        "node_a_label": node_label(src),
-                        "node_b_id": main_id,
-                        "node_b_path": main_entry.get("optimized_path"),
-                        "node_b_label": node_label(main_entry),
-                        "description": f"Non-supporting node pointing to Money Site (total {len(non_supporting_sources)} similar)",
-                        "suggestion": "Change to supporting role or redirect if intentional",
-                        "detected_at": now,
-                    })
-        
-        # TYPE G: Index/Noindex Mismatch in Link Chain
-        # Node A (indexed) links to Node B (noindex) - potential issue
-        for entry in entries:
-            if entry.get("index_status") == "index":
-                target_id = entry.get("target_entry_id")
-                if target_id:
-                    target = entry_lookup.get(target_id)
-                    if target and target.get("index_status") == "noindex":
-                        entry_tier = tiers.get(entry["id"], 5)
-                        target_tier = tiers.get(target_id, 5)
-                        
-                        # Only flag if indexed node is lower tier pointing to noindex higher tier
-                        if entry_tier > target_tier:
-                            conflicts.append({
-                                "conflict_type": ConflictType.INDEX_NOINDEX_MISMATCH.value,
-                                "severity": ConflictSeverity.HIGH.value,
-                                "network_id": network["id"],
-                                "network_name": network["name"],
-                                "domain_name": domain_name_lookup.get(entry["asset_domain_id"], ""),
-                                "node_a_id": entry["id"],
-                                "node_a_path": entry.get("optimized_path"),
-                                "node_a_label": node_label(entry),
-                                "node_b_id": target_id,
-                                "node_b_path": target.get("optimized_path"),
-                                "node_b_label": node_label(target),
-                                "description": "Indexed node links to NOINDEX target in higher tier",
-                                "suggestion": "Index the target or remove the link",
-                                "detected_at": now,
-                            })
-
-        # ============ LEGACY CONFLICT DETECTION ============
-
-        for entry in entries:
-            entry_id = entry["id"]
-            asset_id = entry["asset_domain_id"]
-            tier = tiers.get(entry_id, 5)
-            domain_name = domain_name_lookup.get(asset_id, asset_id)
-
-            # NOINDEX in high tier (0-2)
-            if entry.get("index_status") == "noindex" and tier <= 2:
-                conflicts.append(
-                    {
-                        "conflict_type": "noindex_high_tier",
-                        "severity": ConflictSeverity.HIGH.value,
-                        "network_id": network["id"],
-                        "network_name": network["name"],
-                        "domain_name": domain_name,
-                        "node_a_id": entry_id,
-                        "node_a_path": entry.get("optimized_path"),
-                        "node_a_label": node_label(entry),
-                        "node_b_id": None,
-                        "node_b_path": None,
-                        "node_b_label": None,
-                        "description": f"NOINDEX node in {get_tier_label(tier)}",
-                        "suggestion": "Change to INDEX or move to lower tier",
-                        "detected_at": now,
-                    }
-                )
+    networks = await db.seo_networks.find(
+        query, {"_id": 0, "id": 1, "name": 1, "structure_version": 1}
+    ).to_list(1000)
 
-            # Orphan (no target and not main)
-            if (
-                entry.get("domain_role") != "main"
-                and not entry.get("target_entry_id")
-                and not entry.get("target_asset_domain_id")
-            ):
-                if tier >= 5:
-                    conflicts.append(
-                        {
-                            "conflict_type": "orphan",
-                            "severity": ConflictSeverity.MEDIUM.value,
-                            "network_id": network["id"],
-                            "network_name": network["name"],
-                            "domain_name": domain_name,
-                            "node_a_id": entry_id,
-                            "node_a_path": entry.get("optimized_path"),
-                            "node_a_label": node_label(entry),
-                            "node_b_id": None,
-                            "node_b_path": None,
-                            "node_b_label": None,
-                            "description": "Node not connected to main hierarchy",
-                            "suggestion": "Assign a target node or remove from network",
-                            "detected_at": now,
-                        }
-                    )
+    # Served from per-network snapshots; only networks whose structure
+    # changed since their last scan are re-detected.
+    conflict_scanner = get_conflict_scanner_service(db)
+    conflicts = await conflict_scanner.get_report_conflicts(networks)
 
     # Sort by severity
     severity_order = {
@@ -8046,18 +7887,23 @@ async def get_stored_conflict_detail(
 @router.post("/conflicts/process")
 async def process_and_store_conflicts(
     network_id: Optional[str] = None,
+    force: bool = False,
+    background: bool = False,
     current_user: dict = Depends(get_current_user_wrapper),
 ):
     """
     Detect conflicts and auto-create optimization tasks.
     
     This endpoint:
-    1. Detects all SEO conflicts (like /reports/conflicts)
+    1. Detects SEO conflicts for networks whose structure changed since
+       their last scan (all networks with force=true)
     2. Stores new conflicts in seo_conflicts collection
     3. Auto-creates optimization tasks for each new conflict
     4. Sends Telegram notifications
     
-    Use this for scheduled conflict detection with auto-linking.
+    The same scan runs on a schedule, so this is only needed to
+    pick up changes immediately. With background=true the scan_id is
+    returned right away; follow it via GET /conflicts/scans/{scan_id}.
     """
     # Check permission - only managers or super admin
     user_role = current_user.get("role", "user")
@@ -8067,211 +7913,63 @@ async def process_and_store_conflicts(
             detail="Only managers and super admins can process conflicts"
         )
     
-    conflict_service = get_conflict_linker_service(db)
-    
-    # Get all networks or specific one
-    if network_id:
-        networks = await db.seo_networks.find(
-            {"id": network_id},
-            {"_id": 0}
-        ).to_list(1)
-    else:
-        networks = await db.seo_networks.find({}, {"_id": 0}).to_list(500)
+    conflict_scanner = get_conflict_scanner_service(db)
     
-    total_processed = 0
-    total_new = 0
-    total_recurring = 0
-    total_optimizations = 0
+    if background:
+        started = await conflict_scanner.start_background_scan(
+            network_id=network_id,
+            force=force,
+            triggered_by=current_user.get("id", "system"),
+        )
+        return {"success": True, "status": "running", **started}
     
-    for network in networks:
-        nid = network.get("id")
-        
-        # Detect conflicts for this network (similar to /reports/conflicts)
-        detected_conflicts = await _detect_network_conflicts(nid)
-        
-        if detected_conflicts:
-            result = await conflict_service.process_detected_conflicts(
-                conflicts=detected_conflicts,
-                network_id=nid,
-                triggered_by=current_user.get("id", "system")
-            )
-            
-            total_processed += result.get("processed", 0)
-            total_new += result.get("new_conflicts", 0)
-            total_recurring += result.get("recurring_conflicts", 0)
-            total_optimizations += result.get("optimizations_created", 0)
+    result = await conflict_scanner.scan_dirty_networks(
+        network_id=network_id,
+        force=force,
+        triggered_by=current_user.get("id", "system"),
+    )
     
-    return {
-        "success": True,
-        "networks_scanned": len(networks),
-        "conflicts_processed": total_processed,
-        "new_conflicts": total_new,
-        "recurring_conflicts": total_recurring,
-        "optimizations_created": total_optimizations,
-    }
+    return {"success": True, **result}
 
 
-async def _detect_network_conflicts(network_id: str) -> List[Dict[str, Any]]:
-    """
-    Helper to detect conflicts for a single network.
-    Returns list of conflict dictionaries.
-    """
-    conflicts = []
-    
-    # Get network
-    network = await db.seo_networks.find_one(
-        {"id": network_id},
-        {"_id": 0, "id": 1, "name": 1}
-    )
-    if not network:
-        return []
-    
-    network_name = network.get("name", "Unknown")
-    
-    # Get tier service
-    from services.tier_service import get_tier_service
-    tier_svc = get_tier_service()
-    
-    tiers = await tier_svc.calculate_network_tiers(network_id)
-    entries = await db.seo_structure_entries.find(
-        {"network_id": network_id},
-        {"_id": 0}
-    ).to_list(1000)
-    
-    if not entries:
-        return []
-    
-    # Build node map
-    node_map = {}
-    for e in entries:
-        node_id = e.get("id")
-        tier = tiers.get(node_id, 99)
-        e["tier"] = tier
-        node_map[node_id] = e
-    
-    now_str = datetime.now(timezone.utc).isoformat()
-    
-    # Group entries by domain
-    by_domain = {}
-    for e in entries:
-        domain = e.get("optimized_domain") or e.get("asset_domain_name") or ""
-        if domain:
-            if domain not in by_domain:
-                by_domain[domain] = []
-            by_domain[domain].append(e)
-    
-    # Detect conflicts (simplified version of the main detection logic)
-    for domain, domain_entries in by_domain.items():
-        if len(domain_entries) < 2:
-            continue
-        
-        # Check for competing targets
-        targets = {}
-        for e in domain_entries:
-            target = e.get("target_node_id")
-            if target:
-                if target not in targets:
-                    targets[target] = []
-                targets[target].append(e)
-        
-        # Cross-path conflicts
-        for target_id, target_entries in targets.items():
-            if len(target_entries) >= 2:
-                # Multiple paths targeting same node
-                entry_a = target_entries[0]
-                entry_b = target_entries[1]
-                
-                conflicts.append({
-                    "conflict_type": ConflictType.COMPETING_TARGETS.value,
-                    "severity": ConflictSeverity.MEDIUM.value,
-                    "network_id": network_id,
-                    "network_name": network_name,
-                    "domain_name": domain,
-                    "node_a_id": entry_a.get("id"),
-                    "node_a_path": entry_a.get("optimized_path"),
-                    "node_a_label": f"{domain}{entry_a.get('optimized_path', '')}",
-                    "node_b_id": entry_b.get("id"),
-                    "node_b_path": entry_b.get("optimized_path"),
-                    "node_b_label": f"{domain}{entry_b.get('optimized_path', '')}",
-                    "description": f"Multiple paths on {domain} are targeting the same node",
-                    "suggestion": "Consolidate paths or differentiate their targets",
-                    "detected_at": now_str,
-                })
-    
-    # Check for tier inversions
-    for e in entries:
-        source_tier = e.get("tier", 99)
-        target_id = e.get("target_node_id")
-        
-        if target_id and target_id in node_map:
-            target_entry = node_map[target_id]
-            target_tier = target_entry.get("tier", 99)
-            
-            # Tier inversion: source has lower tier number (higher authority) than target
-            if source_tier < target_tier and source_tier != 99 and target_tier != 99:
-                domain = e.get("optimized_domain") or e.get("asset_domain_name") or ""
-                
-                conflicts.append({
-                    "conflict_type": ConflictType.TIER_INVERSION.value,
-                    "severity": ConflictSeverity.CRITICAL.value,
-                    "network_id": network_id,
-                    "network_name": network_name,
-                    "domain_name": domain,
-                    "node_a_id": e.get("id"),
-                    "node_a_path": e.get("optimized_path"),
-                    "node_a_label": f"{domain}{e.get('optimized_path', '')} (Tier {source_tier})",
-                    "node_b_id": target_id,
-                    "node_b_path": target_entry.get("optimized_path"),
-                    "node_b_label": f"{target_entry.get('optimized_domain', '')}{target_entry.get('optimized_path', '')} (Tier {target_tier})",
-                    "description": f"Higher authority node (Tier {source_tier}) is supporting lower authority node (Tier {target_tier})",
-                    "suggestion": "Reverse the link direction or restructure the hierarchy",
-                    "detected_at": now_str,
-                })
+@router.get("/conflicts/scans/{scan_id}")
+async def get_conflict_scan_progress(
+    scan_id: str,
+    current_user: dict = Depends(get_current_user_wrapper),
+):
+    """Get progress of a conflict scan (networks done, failures, status)."""
+    user_role = current_user.get("role", "user")
+    if user_role not in ["super_admin", "admin"]:
+        raise HTTPException(
+            status_code=403,
+            detail="Only admins and super admins can view conflict scans"
+        )
     
-    # Check for orphan nodes (not connected to main)
-    main_entry = None
-    for e in entries:
-        if e.get("domain_role") == "main":
-            main_entry = e
-            break
+    conflict_scanner = get_conflict_scanner_service(db)
+    run = await conflict_scanner.get_scan_run(scan_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Conflict scan not found")
+    return run
+
+
+@router.post("/conflicts/scans/{scan_id}/cancel")
+async def cancel_conflict_scan(
+    scan_id: str,
+    current_user: dict = Depends(get_current_user_wrapper),
+):
+    """Request cancellation of a running conflict scan."""
+    user_role = current_user.get("role", "user")
+    if user_role not in ["super_admin", "admin"]:
+        raise HTTPException(
+            status_code=403,
+            detail="Only admins and super admins can cancel conflict scans"
+        )
     
-    if main_entry:
-        # Find all nodes that can reach main
-        reachable = set()
-        reachable.add(main_entry.get("id"))
-        
-        changed = True
-        while changed:
-            changed = False
-            for e in entries:
-                target_id = e.get("target_node_id")
-                if target_id in reachable and e.get("id") not in reachable:
-                    reachable.add(e.get("id"))
-                    changed = True
-        
-        # Nodes not reachable are orphans
-        for e in entries:
-            if e.get("id") not in reachable and e.get("domain_role") != "main":
-                domain = e.get("optimized_domain") or e.get("asset_domain_name") or ""
-                
-                conflicts.append({
-                    "conflict_type": "orphan",
-                    "severity": ConflictSeverity.MEDIUM.value,
-                    "network_id": network_id,
-                    "network_name": network_name,
-                    "domain_name": domain,
-                    "node_a_id": e.get("id"),
-                    "node_a_path": e.get("optimized_path"),
-                    "node_a_label": f"{domain}{e.get('optimized_path', '')}",
-                    "node_b_id": None,
-                    "node_b_path": None,
-                    "node_b_label": None,
-                    "description": "Node is not connected to the main hierarchy",
-                    "suggestion": "Connect this node to the network structure or remove it",
-                    "detected_at": now_str,
-                })
+    conflict_scanner = get_conflict_scanner_service(db)
+    if not await conflict_scanner.cancel_scan(scan_id):
+        raise HTTPException(status_code=404, detail="No running conflict scan with this ID")
     
-    return conflicts
+    return {"success": True, "scan_id": scan_id, "cancel_requested": True}
 
 
 @router.post("/conflicts/{conflict_id}/create-optimization")
@@ -8348,6 +8046,7 @@ async def create_optimization_for_conflict(
             "updated_at": datetime.now(timezone.utc).isoformat()
         }}
     )
+    await invalidate_metrics_rollups(conflict)
     
     return {
         "success": True,
@@ -8435,15 +8134,17 @@ async def approve_conflict(
                 "updated_at": now,
             }
         },
-        return_document=True
     )
     
     if not result:
         raise HTTPException(status_code=404, detail="Conflict not found")
     
+    # result is the conflict before approval: its old resolved day changes
+    await invalidate_metrics_rollups(result)
+    
     # Also complete/cancel any linked optimization
     if result.get("optimization_id"):
-        await db.seo_optimizations.update_one(
+        previous_optimization = await db.seo_optimizations.find_one_and_update(
             {"id": result["optimization_id"]},
             {
                 "$set": {
@@ -8452,8 +8153,10 @@ async def approve_conflict(
                     "completed_by": current_user.get("id", ""),
                     "notes": f"Auto-completed due to conflict approval. {approval_note or ''}"
                 }
-            }
+            },
+            projection={"_id": 0, "resolved_at": 1},
         )
+        await invalidate_metrics_rollups(previous_optimization)
     
     return {
         "success": True,
@@ -8789,9 +8492,9 @@ async def bulk_import_domains(
 
     for item in request.domains:
         try:
-            # Check for duplicate
+            # Check for duplicate (case-insensitive, indexed)
             existing = await db.asset_domains.find_one(
-                {"domain_name": item.domain_name}
+                {"domain_key": normalize_domain_key(item.domain_name)}, {"_id": 0, "id": 1}
             )
             if existing:
                 if request.skip_duplicates:
@@ -8832,6 +8535,7 @@ async def bulk_import_domains(
                 "id": str(uuid.uuid4()),
                 "legacy_id": None,
                 "domain_name": item.domain_name,
+                "domain_key": normalize_domain_key(item.domain_name),
                 "brand_id": brand_id,
                 "category_id": None,
                 "domain_type_id": None,
@@ -8852,6 +8556,7 @@ async def bulk_import_domains(
             }
 
             await db.asset_domains.insert_one(asset)
+            publish_event("inventory", asset_id=asset["id"])
 
             # Log activity
             if activity_log_service:
@@ -8943,7 +8648,7 @@ async def export_asset_domains(
     if monitoring_enabled is not None:
         query["monitoring_enabled"] = monitoring_enabled
     if search:
-        query["domain_name"] = {"$regex": search, "$options": "i"}
+        query.update(domain_search_filter(search))
     if lifecycle_status:
         query["lifecycle_status"] = lifecycle_status
     if monitoring_status:
@@ -9099,381 +8804,133 @@ async def import_domains_preview(
     - new_domains: Domains that will be created
     - updated_domains: Domains that exist and will be updated
     - errors: Invalid rows that cannot be imported
+
+    Large files should be uploaded to /import/domains/upload/preview
+    instead of being sent as JSON.
+    """
+    from services.domain_import_service import DomainImportService
+
+    import_service = DomainImportService(db)
+    rows = [item.model_dump() for item in request.domains]
+    return import_service.preview(
+        rows,
+        await import_service.load_lookups(),
+        await import_service.load_existing(rows),
+    )
+
+
+class ImportConfirmRequest(PydanticBaseModel):
+    domains: List[ImportDomainItem]
+    create_new: bool = True
+    update_existing: bool = True
+
+
+@router.post("/import/domains/confirm")
+async def import_domains_confirm(
+    request: ImportConfirmRequest,
+    current_user: dict = Depends(get_current_user_wrapper)
+):
     """
-    # Build lookups
-    brands = {b["name"].lower(): b for b in await db.brands.find({}, {"_id": 0}).to_list(1000)}
-    categories = {c["name"].lower(): c for c in await db.categories.find({}, {"_id": 0}).to_list(1000)}
-    registrars = {r["name"].lower(): r for r in await db.registrars.find({}, {"_id": 0}).to_list(1000)}
+    Confirm import - applies validated changes.
     
-    # Get existing domains
-    existing_domains = await db.asset_domains.find(
-        {"domain_name": {"$in": [d.domain_name for d in request.domains]}},
-        {"_id": 0}
-    ).to_list(50000)
-    existing_map = {d["domain_name"].lower(): d for d in existing_domains}
-    
-    # Valid lifecycle statuses
-    valid_lifecycle = {"active", "released", "quarantined", "not_renewed"}
-    
-    result = {
-        "new_domains": [],
-        "updated_domains": [],
-        "errors": [],
-        "summary": {
-            "total_rows": len(request.domains),
-            "new_count": 0,
-            "update_count": 0,
-            "error_count": 0
-        }
-    }
+    - create_new: If true, creates new domains
+    - update_existing: If true, updates existing domains
     
-    for idx, item in enumerate(request.domains):
-        row_num = idx + 2  # +2 for header row and 0-indexing
-        errors = []
-        
-        # Validate domain name
-        if not item.domain_name or not item.domain_name.strip():
-            errors.append("Domain name is required")
-        
-        # Validate expiration date format
-        exp_date = None
-        if item.expiration_date:
-            try:
-                # Support multiple date formats
-                date_str = item.expiration_date.strip()
-                for fmt in ["%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%d/%m/%Y", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%SZ"]:
-                    try:
-                        exp_date = datetime.strptime(date_str.split("T")[0] if "T" in date_str else date_str, fmt.split("T")[0])
-                        break
-                    except ValueError:
-                        continue
-                if not exp_date:
-                    errors.append(f"Invalid date format: {item.expiration_date}")
-            except Exception as e:
-                errors.append(f"Invalid date: {str(e)}")
-        
-        # Validate lifecycle status
-        lifecycle = None
-        if item.lifecycle_status:
-            lifecycle_lower = item.lifecycle_status.lower().strip()
-            if lifecycle_lower not in valid_lifecycle:
-                errors.append(f"Invalid lifecycle status: {item.lifecycle_status}. Valid: active, released, quarantined, not_renewed")
-            else:
-                lifecycle = lifecycle_lower
-        
-        # Validate monitoring_enabled
-        monitoring = None
-        if item.monitoring_enabled:
-            mon_lower = item.monitoring_enabled.upper().strip()
-            if mon_lower not in {"ON", "OFF", "TRUE", "FALSE", "1", "0", "YES", "NO"}:
-                errors.append(f"Invalid monitoring_enabled: {item.monitoring_enabled}. Use ON/OFF")
-            else:
-                monitoring = mon_lower in {"ON", "TRUE", "1", "YES"}
-        
-        # Check if brand exists (warn if not)
-        brand_id = None
-        brand_warning = None
-        if item.brand_name:
-            brand = brands.get(item.brand_name.lower().strip())
-            if brand:
-                brand_id = brand["id"]
-            else:
-                brand_warning = f"Brand '{item.brand_name}' will be created"
-        
-        # Check if category exists
-        category_id = None
-        category_warning = None
-        if item.category_name:
-            category = categories.get(item.category_name.lower().strip())
-            if category:
-                category_id = category["id"]
-            else:
-                category_warning = f"Category '{item.category_name}' not found - will be skipped"
-        
-        # Check if registrar exists
-        registrar_id = None
-        if item.registrar_name:
-            registrar = registrars.get(item.registrar_name.lower().strip())
-            if registrar:
-                registrar_id = registrar["id"]
-        
-        if errors:
-            result["errors"].append({
-                "row": row_num,
-                "domain_name": item.domain_name,
-                "errors": errors
-            })
-            result["summary"]["error_count"] += 1
-        else:
-            existing = existing_map.get(item.domain_name.lower().strip())
-            
-            preview_item = {
-                "row": row_num,
-                "domain_name": item.domain_name.strip(),
-                "brand_name": item.brand_name or "",
-                "brand_id": brand_id,
-                "brand_warning": brand_warning,
-                "category_name": item.category_name or "",
-                "category_id": category_id,
-                "category_warning": category_warning,
-                "registrar_name": item.registrar_name or "",
-                "registrar_id": registrar_id,
-                "expiration_date": exp_date.strftime("%Y-%m-%d") if exp_date else "",
-                "lifecycle_status": lifecycle or "active",
-                "monitoring_enabled": monitoring if monitoring is not None else False,
-                "notes": item.notes or ""
-            }
-            
-            if existing:
-                # Show what will change
-                changes = []
-                if item.brand_name and brand_id and existing.get("brand_id") != brand_id:
-                    changes.append(f"brand: {existing.get('brand_id', 'none')} → {brand_id}")
-                if item.category_name and category_id and existing.get("category_id") != category_id:
-                    changes.append("category changed")
-                if exp_date:
-                    old_exp = existing.get("expiration_date", "")
-                    new_exp = exp_date.strftime("%Y-%m-%d")
-                    if old_exp and not old_exp.startswith(new_exp):
-                        changes.append(f"expiration: {old_exp[:10]} → {new_exp}")
-                if lifecycle and existing.get("lifecycle_status") != lifecycle:
-                    changes.append(f"lifecycle: {existing.get('lifecycle_status', 'active')} → {lifecycle}")
-                if monitoring is not None and existing.get("monitoring_enabled") != monitoring:
-                    changes.append(f"monitoring: {'ON' if existing.get('monitoring_enabled') else 'OFF'} → {'ON' if monitoring else 'OFF'}")
-                
-                preview_item["existing_id"] = existing["id"]
-                preview_item["changes"] = changes
-                result["updated_domains"].append(preview_item)
-                result["summary"]["update_count"] += 1
-            else:
-                result["new_domains"].append(preview_item)
-                result["summary"]["new_count"] += 1
+    Rows are validated in one pass, then written with chunked unordered
+    bulk_write and batched activity logs (services/domain_import_service.py).
+    Large files should use POST /import/domains/jobs, which survives
+    dropped connections and worker restarts.
+    """
+    # Only super admin can import
+    if current_user.get("role") != "super_admin":
+        raise HTTPException(status_code=403, detail="Only Super Admin can import domains")
     
-    return result
+    from services.domain_import_service import DomainImportService
+    
+    import_service = DomainImportService(db, activity_log_service)
+    return await import_service.confirm_import(
+        [item.model_dump() for item in request.domains],
+        actor=current_user["email"],
+        create_new=request.create_new,
+        update_existing=request.update_existing,
+    )
 
 
-class ImportConfirmRequest(PydanticBaseModel):
-    domains: List[ImportDomainItem]
-    create_new: bool = True
-    update_existing: bool = True
+def _csv_upload_http_error(error: Exception) -> HTTPException:
+    from services.csv_upload_service import CsvUploadTooLarge
 
+    status_code = 413 if isinstance(error, CsvUploadTooLarge) else 400
+    return HTTPException(status_code=status_code, detail=str(error))
 
-@router.post("/import/domains/confirm")
-async def import_domains_confirm(
-    request: ImportConfirmRequest,
-    current_user: dict = Depends(get_current_user_wrapper)
+
+@router.post("/import/domains/upload/preview")
+async def import_domains_upload_preview(
+    request: Request,
+    item_limit: int = Query(500, ge=0, le=50000, description="Rows listed per category"),
+    current_user: dict = Depends(get_current_user_wrapper),
 ):
     """
-    Confirm import - applies validated changes.
-    
-    - create_new: If true, creates new domains
-    - update_existing: If true, updates existing domains
+    Preview a CSV upload (multipart field "file", or a text/csv body).
+
+    Same validation and response as /import/domains/preview, but the file
+    is parsed while it is received and validated in batches. Summary
+    counts cover every row; each list holds at most item_limit rows
+    (`truncated` tells whether rows were left out).
+    """
+    from services.csv_upload_service import CsvUploadError, iter_csv_upload
+    from services.domain_import_service import DomainImportService
+
+    try:
+        return await DomainImportService(db).preview_batches(
+            iter_csv_upload(request), item_limit=item_limit
+        )
+    except CsvUploadError as e:
+        raise _csv_upload_http_error(e)
+
+
+@router.post("/import/domains/upload/confirm")
+async def import_domains_upload_confirm(
+    request: Request,
+    create_new: bool = True,
+    update_existing: bool = True,
+    background: bool = False,
+    details_limit: int = Query(1000, ge=0, le=50000, description="Rows listed in details/errors"),
+    current_user: dict = Depends(get_current_user_wrapper),
+):
+    """
+    Import a CSV upload (multipart field "file", or a text/csv body).
+
+    Rows are parsed while the file is received and written batch by batch
+    with the /import/domains/confirm logic; details / errors list at most
+    details_limit rows (error_count has the total). A CSV error found
+    mid-file stops the import, batches before it stay written.
+
+    With background=true the rows are stored as an import job instead
+    (see /import/jobs/{job_id}).
     """
-    # Only super admin can import
     if current_user.get("role") != "super_admin":
         raise HTTPException(status_code=403, detail="Only Super Admin can import domains")
-    
-    # Build lookups
-    brands = {b["name"].lower(): b for b in await db.brands.find({}, {"_id": 0}).to_list(1000)}
-    categories = {c["name"].lower(): c for c in await db.categories.find({}, {"_id": 0}).to_list(1000)}
-    registrars = {r["name"].lower(): r for r in await db.registrars.find({}, {"_id": 0}).to_list(1000)}
-    
-    # Get existing domains
-    existing_domains = await db.asset_domains.find(
-        {"domain_name": {"$in": [d.domain_name for d in request.domains]}},
-        {"_id": 0}
-    ).to_list(50000)
-    existing_map = {d["domain_name"].lower(): d for d in existing_domains}
-    
-    valid_lifecycle = {"active", "released", "quarantined", "not_renewed"}
-    
-    result = {
-        "created": 0,
-        "updated": 0,
-        "skipped": 0,
-        "errors": [],
-        "details": []
-    }
-    
-    now = datetime.now(timezone.utc).isoformat()
-    
-    for item in request.domains:
-        try:
-            # Skip invalid domain names
-            if not item.domain_name or not item.domain_name.strip():
-                continue
-            
-            domain_name = item.domain_name.strip()
-            existing = existing_map.get(domain_name.lower())
-            
-            # Parse expiration date
-            exp_date = None
-            if item.expiration_date:
-                try:
-                    date_str = item.expiration_date.strip()
-                    for fmt in ["%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%d/%m/%Y"]:
-                        try:
-                            exp_date = datetime.strptime(date_str.split("T")[0] if "T" in date_str else date_str, fmt)
-                            break
-                        except ValueError:
-                            continue
-                except (ValueError, AttributeError):
-                    pass
-            
-            # Parse lifecycle
-            lifecycle = "active"
-            if item.lifecycle_status and item.lifecycle_status.lower().strip() in valid_lifecycle:
-                lifecycle = item.lifecycle_status.lower().strip()
-            
-            # Parse monitoring
-            monitoring = False
-            if item.monitoring_enabled:
-                mon_lower = item.monitoring_enabled.upper().strip()
-                monitoring = mon_lower in {"ON", "TRUE", "1", "YES"}
-            
-            # Get brand (create if needed)
-            brand_id = None
-            if item.brand_name:
-                brand = brands.get(item.brand_name.lower().strip())
-                if brand:
-                    brand_id = brand["id"]
-                else:
-                    # Create new brand
-                    new_brand = {
-                        "id": str(uuid.uuid4()),
-                        "name": item.brand_name.strip(),
-                        "created_at": now,
-                        "updated_at": now
-                    }
-                    await db.brands.insert_one(new_brand)
-                    brand_id = new_brand["id"]
-                    brands[item.brand_name.lower().strip()] = new_brand
-            
-            # Get category
-            category_id = None
-            if item.category_name:
-                category = categories.get(item.category_name.lower().strip())
-                if category:
-                    category_id = category["id"]
-            
-            # Get registrar
-            registrar_id = None
-            if item.registrar_name:
-                registrar = registrars.get(item.registrar_name.lower().strip())
-                if registrar:
-                    registrar_id = registrar["id"]
-            
-            if existing:
-                # Update existing domain
-                if not request.update_existing:
-                    result["skipped"] += 1
-                    result["details"].append({
-                        "domain": domain_name,
-                        "status": "skipped",
-                        "reason": "update_existing is false"
-                    })
-                    continue
-                
-                update_data = {"updated_at": now}
-                if brand_id:
-                    update_data["brand_id"] = brand_id
-                if category_id:
-                    update_data["category_id"] = category_id
-                if registrar_id:
-                    update_data["registrar_id"] = registrar_id
-                if exp_date:
-                    update_data["expiration_date"] = exp_date.strftime("%Y-%m-%dT00:00:00Z")
-                if item.lifecycle_status:
-                    update_data["lifecycle_status"] = lifecycle
-                if item.monitoring_enabled:
-                    update_data["monitoring_enabled"] = monitoring
-                if item.notes:
-                    update_data["notes"] = item.notes
-                
-                await db.asset_domains.update_one(
-                    {"id": existing["id"]},
-                    {"$set": update_data}
-                )
-                
-                # Log activity
-                if activity_log_service:
-                    await activity_log_service.log(
-                        actor=current_user["email"],
-                        action_type=ActionType.UPDATE,
-                        entity_type=EntityType.ASSET_DOMAIN,
-                        entity_id=existing["id"],
-                        before_value=existing,
-                        after_value={**existing, **update_data},
-                        metadata={"source": "csv_import"}
-                    )
-                
-                result["updated"] += 1
-                result["details"].append({
-                    "domain": domain_name,
-                    "status": "updated",
-                    "id": existing["id"]
-                })
-            else:
-                # Create new domain
-                if not request.create_new:
-                    result["skipped"] += 1
-                    result["details"].append({
-                        "domain": domain_name,
-                        "status": "skipped",
-                        "reason": "create_new is false"
-                    })
-                    continue
-                
-                new_asset = {
-                    "id": str(uuid.uuid4()),
-                    "legacy_id": None,
-                    "domain_name": domain_name,
-                    "brand_id": brand_id,
-                    "category_id": category_id,
-                    "registrar_id": registrar_id,
-                    "registrar": item.registrar_name or "",
-                    "expiration_date": exp_date.strftime("%Y-%m-%dT00:00:00Z") if exp_date else None,
-                    "auto_renew": False,
-                    "lifecycle_status": lifecycle,
-                    "monitoring_enabled": monitoring,
-                    "monitoring_status": "unknown",
-                    "monitoring_interval": "1hour",
-                    "last_check": None,
-                    "ping_status": "unknown",
-                    "http_status": None,
-                    "http_status_code": None,
-                    "notes": item.notes or "",
-                    "created_at": now,
-                    "updated_at": now
-                }
-                
-                await db.asset_domains.insert_one(new_asset)
-                
-                # Log activity
-                if activity_log_service:
-                    await activity_log_service.log(
-                        actor=current_user["email"],
-                        action_type=ActionType.CREATE,
-                        entity_type=EntityType.ASSET_DOMAIN,
-                        entity_id=new_asset["id"],
-                        after_value=new_asset,
-                        metadata={"source": "csv_import"}
-                    )
-                
-                result["created"] += 1
-                result["details"].append({
-                    "domain": domain_name,
-                    "status": "created",
-                    "id": new_asset["id"]
-                })
-        
-        except Exception as e:
-            result["errors"].append({
-                "domain": item.domain_name,
-                "error": str(e)
-            })
-    
-    return result
+
+    from services.csv_upload_service import CsvUploadError, iter_csv_upload
+    from services.domain_import_service import DomainImportService
+
+    try:
+        if background:
+            return await _get_import_job_service().submit_batches(
+                "domains",
+                iter_csv_upload(request),
+                actor=current_user["email"],
+                params={"create_new": create_new, "update_existing": update_existing},
+            )
+        return await DomainImportService(db, activity_log_service).confirm_batches(
+            iter_csv_upload(request),
+            actor=current_user["email"],
+            create_new=create_new,
+            update_existing=update_existing,
+            details_limit=details_limit,
+        )
+    except CsvUploadError as e:
+        raise _csv_upload_http_error(e)
 
 
 @router.get("/import/domains/template")
@@ -9742,6 +9199,9 @@ async def export_activity_logs(
     cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
     query["timestamp"] = {"$gte": cutoff}
 
+    from services.log_writer_service import get_log_writer
+    await get_log_writer().flush()
+
     logs = (
         await db.activity_logs_v3.find(query, {"_id": 0})
         .sort("timestamp", -1)
@@ -9839,167 +9299,26 @@ async def bulk_import_nodes(
     2. For each node, find or create the domain
     3. Create structure entry with path and relationships
     4. Resolve target_domain + target_path to target_entry_id
+
+    Large files should use POST /import/nodes/jobs.
     """
+    from services.node_import_service import NodeImportService, summarize
+
     # Validate network
     network = await db.seo_networks.find_one({"id": request.network_id})
     if not network:
         raise HTTPException(status_code=404, detail="Network not found")
 
-    results = {"imported": [], "skipped": [], "errors": [], "domains_created": []}
-
-    # First pass: ensure all domains exist and build lookup
-    domain_lookup = {}  # domain_name -> asset_domain_id
-    all_domains = await db.asset_domains.find(
-        {}, {"_id": 0, "id": 1, "domain_name": 1}
-    ).to_list(10000)
-    for d in all_domains:
-        domain_lookup[d["domain_name"].lower()] = d["id"]
-
-    # Create missing domains if requested
-    if request.create_missing_domains:
-        for node in request.nodes:
-            domain_lower = node.domain_name.lower()
-            if domain_lower not in domain_lookup:
-                # Create domain with network's brand
-                now = datetime.now(timezone.utc).isoformat()
-                new_domain = {
-                    "id": str(uuid.uuid4()),
-                    "domain_name": node.domain_name,
-                    "brand_id": network.get("brand_id"),
-                    "status": "active",
-                    "monitoring_enabled": False,
-                    "auto_renew": False,
-                    "created_at": now,
-                    "updated_at": now,
-                }
-                await db.asset_domains.insert_one(new_domain)
-                domain_lookup[domain_lower] = new_domain["id"]
-                results["domains_created"].append(node.domain_name)
-
-    # Second pass: create entries and build entry lookup
-    entry_lookup = {}  # (domain_name.lower, path) -> entry_id
-
-    # Load existing entries for this network
-    existing_entries = await db.seo_structure_entries.find(
-        {"network_id": request.network_id}, {"_id": 0}
-    ).to_list(10000)
-
-    for e in existing_entries:
-        domain_id = e.get("asset_domain_id")
-        # Find domain name
-        for dname, did in domain_lookup.items():
-            if did == domain_id:
-                key = (dname, e.get("optimized_path") or "")
-                entry_lookup[key] = e["id"]
-                break
-
-    # Third pass: create entries
-    entries_to_create = []
-    for node in request.nodes:
-        try:
-            domain_lower = node.domain_name.lower()
-            asset_id = domain_lookup.get(domain_lower)
-
-            if not asset_id:
-                results["errors"].append(
-                    {
-                        "domain": node.domain_name,
-                        "error": f"Domain not found: {node.domain_name}",
-                    }
-                )
-                continue
-
-            # Check if entry already exists
-            entry_key = (domain_lower, node.optimized_path or "")
-            if entry_key in entry_lookup:
-                results["skipped"].append(
-                    {
-                        "domain": node.domain_name,
-                        "path": node.optimized_path,
-                        "reason": "Entry already exists",
-                    }
-                )
-                continue
-
-            # Create entry (target will be resolved later)
-            now = datetime.now(timezone.utc).isoformat()
-            entry = {
-                "id": str(uuid.uuid4()),
-                "asset_domain_id": asset_id,
-                "network_id": request.network_id,
-                "optimized_path": node.optimized_path,
-                "domain_role": node.domain_role or "supporting",
-                "domain_status": node.domain_status or "canonical",
-                "index_status": node.index_status or "index",
-                "target_entry_id": None,  # Will be resolved
-                "target_domain": node.target_domain,  # Temp storage
-                "target_path": node.target_path,  # Temp storage
-                "ranking_url": node.ranking_url,
-                "primary_keyword": node.primary_keyword,
-                "notes": node.notes,
-                "created_at": now,
-                "updated_at": now,
-            }
-
-            entries_to_create.append(entry)
-            entry_lookup[entry_key] = entry["id"]
-
-        except Exception as e:
-            results["errors"].append({"domain": node.domain_name, "error": str(e)})
-
-    # Fourth pass: resolve targets and insert
-    for entry in entries_to_create:
-        target_domain = entry.pop("target_domain", None)
-        target_path = entry.pop("target_path", None)
-
-        if target_domain:
-            target_key = (target_domain.lower(), target_path or "")
-            target_entry_id = entry_lookup.get(target_key)
-
-            if target_entry_id:
-                entry["target_entry_id"] = target_entry_id
-            else:
-                # Target not found - might be in existing entries or not created yet
-                # Try to find by domain only
-                for (dname, path), eid in entry_lookup.items():
-                    if dname == target_domain.lower() and (
-                        not target_path or path == target_path
-                    ):
-                        entry["target_entry_id"] = eid
-                        break
-
-        await db.seo_structure_entries.insert_one(entry)
-        results["imported"].append(
-            {
-                "domain": entry.get("domain_name", ""),
-                "path": entry.get("optimized_path", ""),
-                "entry_id": entry["id"],
-            }
-        )
-
-    # Log activity
-    if activity_log_service:
-        await activity_log_service.log(
-            actor=current_user["email"],
-            action_type=ActionType.CREATE,
-            entity_type=EntityType.SEO_STRUCTURE_ENTRY,
-            entity_id=request.network_id,
-            after_value={
-                "type": "bulk_node_import",
-                "imported": len(results["imported"]),
-                "skipped": len(results["skipped"]),
-                "errors": len(results["errors"]),
-            },
-        )
+    results = await NodeImportService(db, activity_log_service).import_nodes(
+        network,
+        [node.model_dump() for node in request.nodes],
+        actor=current_user["email"],
+        create_missing_domains=request.create_missing_domains,
+    )
 
     return {
         "success": True,
-        "summary": {
-            "imported": len(results["imported"]),
-            "skipped": len(results["skipped"]),
-            "errors": len(results["errors"]),
-            "domains_created": len(results["domains_created"]),
-        },
+        "summary": summarize(results),
         "details": results,
     }
 
@@ -10060,6 +9379,183 @@ async def get_node_import_template(
     }
 
 
+# ==================== BACKGROUND IMPORT JOBS ====================
+
+# How often the progress stream re-reads the job
+IMPORT_JOB_STREAM_POLL_SECONDS = 1
+
+
+def _get_import_job_service():
+    from services.import_job_service import get_import_job_service
+
+    return get_import_job_service(db, activity_log_service)
+
+
+async def _get_visible_import_job(job_id: str, current_user: dict) -> dict:
+    """Load a job the user may see (their own, or any for admins)."""
+    job = await _get_import_job_service().get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    if job["actor"] != current_user["email"] and current_user.get("role") not in [
+        "super_admin",
+        "admin",
+    ]:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
+@router.post("/import/domains/jobs")
+async def submit_domain_import_job(
+    request: ImportConfirmRequest,
+    current_user: dict = Depends(get_current_user_wrapper),
+):
+    """
+    Run /import/domains/confirm as a background job.
+
+    Returns the job right away; follow it via GET /import/jobs/{job_id}
+    or the SSE stream /import/jobs/{job_id}/stream.
+    """
+    if current_user.get("role") != "super_admin":
+        raise HTTPException(status_code=403, detail="Only Super Admin can import domains")
+
+    return await _get_import_job_service().submit(
+        "domains",
+        [item.model_dump() for item in request.domains],
+        actor=current_user["email"],
+        params={
+            "create_new": request.create_new,
+            "update_existing": request.update_existing,
+        },
+    )
+
+
+@router.post("/import/nodes/jobs")
+async def submit_node_import_job(
+    request: BulkNodeImportRequest,
+    current_user: dict = Depends(get_current_user_wrapper),
+):
+    """
+    Run /import/nodes as a background job.
+
+    Nodes are ordered so every target is imported before the nodes
+    pointing at it, then written in checkpointed chunks.
+    """
+    network = await db.seo_networks.find_one({"id": request.network_id}, {"_id": 0, "id": 1})
+    if not network:
+        raise HTTPException(status_code=404, detail="Network not found")
+
+    return await _get_import_job_service().submit(
+        "nodes",
+        [node.model_dump() for node in request.nodes],
+        actor=current_user["email"],
+        params={
+            "network_id": request.network_id,
+            "create_missing_domains": request.create_missing_domains,
+        },
+    )
+
+
+@router.get("/import/jobs")
+async def list_import_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user_wrapper),
+):
+    """Recent import jobs (all jobs for admins, own jobs otherwise)."""
+    is_admin = current_user.get("role") in ["super_admin", "admin"]
+    return await _get_import_job_service().list_jobs(
+        actor=None if is_admin else current_user["email"], limit=limit
+    )
+
+
+@router.get("/import/jobs/{job_id}")
+async def get_import_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user_wrapper),
+):
+    """Get progress of an import job (rows done, counters, row errors, status)."""
+    return await _get_visible_import_job(job_id, current_user)
+
+
+@router.get("/import/jobs/{job_id}/stream")
+async def stream_import_job(
+    job_id: str,
+    request: Request,
+    token: Optional[str] = Query(None, description="JWT (EventSource cannot send headers)"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+):
+    """
+    Server-Sent Events stream of an import job's progress.
+
+    Events: progress (the job without its row errors, sent whenever it
+    advances) and done (the full job, sent once it has finished; the
+    stream then ends).
+    """
+    from services.import_job_service import FINISHED_STATUSES
+
+    if credentials is None:
+        if not token:
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    current_user = await get_current_user_wrapper(credentials)
+    await _get_visible_import_job(job_id, current_user)
+
+    job_service = _get_import_job_service()
+
+    async def event_stream():
+        yield "retry: 5000\n\n"
+        last_update = None
+        idle = 0.0
+        while not await request.is_disconnected():
+            job = await job_service.get_job(job_id)
+            if not job:
+                break
+            if job["status"] in FINISHED_STATUSES:
+                yield f"event: done\ndata: {json.dumps(job, default=str)}\n\n"
+                break
+            if job["updated_at"] != last_update:
+                last_update = job["updated_at"]
+                idle = 0.0
+                job.pop("errors", None)
+                yield f"event: progress\ndata: {json.dumps(job, default=str)}\n\n"
+            elif idle >= LIVE_STREAM_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ": keepalive\n\n"
+            await asyncio.sleep(IMPORT_JOB_STREAM_POLL_SECONDS)
+            idle += IMPORT_JOB_STREAM_POLL_SECONDS
+
+    from fastapi.responses import StreamingResponse
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/import/jobs/{job_id}/cancel")
+async def cancel_import_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user_wrapper),
+):
+    """Stop an import job at its next checkpoint (written chunks stay imported)."""
+    await _get_visible_import_job(job_id, current_user)
+    if not await _get_import_job_service().cancel_job(job_id):
+        raise HTTPException(status_code=409, detail="Import job is not queued or running")
+    return {"success": True, "job_id": job_id, "cancel_requested": True}
+
+
+@router.post("/import/jobs/{job_id}/retry")
+async def retry_import_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user_wrapper),
+):
+    """Re-queue a failed import job; it resumes from its last checkpoint."""
+    await _get_visible_import_job(job_id, current_user)
+    if not await _get_import_job_service().retry_job(job_id):
+        raise HTTPException(status_code=409, detail="Only failed import jobs can be retried")
+    return {"success": True, "job_id": job_id, "status": "queued"}
+
+
 # ==================== SETTINGS ENDPOINTS ====================
 
 
@@ -10118,39 +9614,7 @@ async def get_dashboard_stats_only(
 ):
     """Get lightweight dashboard stats for auto-refresh (no heavy computations)"""
     # Apply brand filtering for non-super-admin users
-    brand_filter = build_brand_filter(current_user)
-
-    # Domain filters
-    domain_base_filter = brand_filter.copy() if brand_filter else {}
-    domain_active_filter = {**domain_base_filter, "status": "active"}
-    domain_monitored_filter = {**domain_base_filter, "monitoring_enabled": True}
-    domain_up_filter = {**domain_base_filter, "ping_status": "up"}
-    domain_down_filter = {**domain_base_filter, "ping_status": "down"}
-
-    # Network filter
-    network_filter = brand_filter.copy() if brand_filter else {}
-
-    stats = {
-        "total_domains": await db.asset_domains.count_documents(domain_base_filter),
-        "total_networks": await db.seo_networks.count_documents(network_filter),
-        "active_domains": await db.asset_domains.count_documents(domain_active_filter),
-        "monitored_count": await db.asset_domains.count_documents(
-            domain_monitored_filter
-        ),
-        "indexed_count": await db.seo_structure_entries.count_documents(
-            {"index_status": "index"}
-        ),
-        "noindex_count": await db.seo_structure_entries.count_documents(
-            {"index_status": "noindex"}
-        ),
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-    }
-
-    stats["ping_up"] = await db.asset_domains.count_documents(domain_up_filter)
-    stats["ping_down"] = await db.asset_domains.count_documents(domain_down_filter)
-    stats["active_alerts"] = await db.alerts.count_documents({"acknowledged": False})
-
-    return stats
+    return await dashboard_stats.get_dashboard_stats(db, get_user_brand_scope(current_user))
 
 
 # ==================== MONITORING ENDPOINTS ====================
@@ -10199,66 +9663,7 @@ async def update_monitoring_settings(
 @router.get("/monitoring/stats")
 async def get_monitoring_stats(current_user: dict = Depends(get_current_user_wrapper)):
     """Get current monitoring statistics"""
-    now = datetime.now(timezone.utc)
-
-    # Availability stats
-    total_monitored = await db.asset_domains.count_documents(
-        {"monitoring_enabled": True}
-    )
-    up_count = await db.asset_domains.count_documents(
-        {"monitoring_enabled": True, "ping_status": "up"}
-    )
-    down_count = await db.asset_domains.count_documents(
-        {"monitoring_enabled": True, "ping_status": "down"}
-    )
-    unknown_count = await db.asset_domains.count_documents(
-        {"monitoring_enabled": True, "ping_status": {"$nin": ["up", "down"]}}
-    )
-
-    # Expiration stats
-    from datetime import timedelta
-
-    week_later = (now + timedelta(days=7)).isoformat()
-    month_later = (now + timedelta(days=30)).isoformat()
-
-    expiring_7_days = await db.asset_domains.count_documents(
-        {"expiration_date": {"$ne": None, "$lte": week_later, "$gt": now.isoformat()}}
-    )
-
-    expiring_30_days = await db.asset_domains.count_documents(
-        {"expiration_date": {"$ne": None, "$lte": month_later, "$gt": now.isoformat()}}
-    )
-
-    expired = await db.asset_domains.count_documents(
-        {"expiration_date": {"$ne": None, "$lte": now.isoformat()}}
-    )
-
-    # Alert stats
-    monitoring_alerts = await db.alerts.count_documents(
-        {"alert_type": "monitoring", "acknowledged": False}
-    )
-    expiration_alerts = await db.alerts.count_documents(
-        {"alert_type": "expiration", "acknowledged": False}
-    )
-
-    return {
-        "availability": {
-            "total_monitored": total_monitored,
-            "up": up_count,
-            "down": down_count,
-            "unknown": unknown_count,
-        },
-        "expiration": {
-            "expiring_7_days": expiring_7_days,
-            "expiring_30_days": expiring_30_days,
-            "expired": expired,
-        },
-        "alerts": {
-            "monitoring_unacknowledged": monitoring_alerts,
-            "expiration_unacknowledged": expiration_alerts,
-        },
-        "updated_at": now.isoformat(),
-    }
+    return await dashboard_stats.get_monitoring_stats(db)
 
 
 @router.post("/monitoring/check-expiration")
@@ -10609,6 +10014,13 @@ async def get_seo_domains_monitoring_summary(
     - Unmonitored count (these need attention)
     - By network breakdown
     """
+    return await run_coalesced(
+        "monitoring/seo-domains-summary", _compute_seo_domains_monitoring_summary
+    )
+
+
+async def _compute_seo_domains_monitoring_summary() -> dict:
+    """Summary of GET /monitoring/seo-domains-summary."""
     # Get all unique domain IDs used in SEO
     pipeline = [
         {"$match": {"asset_domain_id": {"$exists": True, "$ne": None}}},
@@ -11477,6 +10889,7 @@ async def mark_user_notification_read(
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Notification not found")
     
+    publish_event("notifications", user_id=user_id)
     return {"success": True}
 
 
@@ -11492,6 +10905,7 @@ async def mark_all_user_notifications_read(
         {"$set": {"read": True, "read_at": datetime.now(timezone.utc).isoformat()}}
     )
     
+    publish_event("notifications", user_id=user_id)
     return {"success": True}
 
 
@@ -11520,13 +10934,68 @@ async def create_user_notification(
     }
     
     await db.user_notifications.insert_one(notification)
+    publish_event("notifications", user_id=user_id)
     return notification
 
 
-# ==================== USER PRESENCE / ONLINE STATUS ====================
+# ==================== LIVE UPDATES (SERVER-SENT EVENTS) ====================
+
+# Comment line sent when idle so proxies keep the stream open
+LIVE_STREAM_KEEPALIVE_SECONDS = 15
+
+
+@router.get("/events/stream")
+async def stream_live_events(
+    request: Request,
+    token: Optional[str] = Query(None, description="JWT (EventSource cannot send headers)"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+):
+    """
+    Server-Sent Events stream of live dashboard data.
+
+    Events: dashboard_stats, monitoring_stats, presence, notifications.
+    A full snapshot is sent on connect; afterwards a section is only sent
+    when it changes. Replaces polling the matching GET endpoints.
+    """
+    if credentials is None:
+        if not token:
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    current_user = await get_current_user_wrapper(credentials)
+
+    hub = get_live_updates_service(db)
+
+    async def event_stream():
+        client = await hub.connect(current_user)
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    section, data = await asyncio.wait_for(
+                        client.queue.get(), timeout=LIVE_STREAM_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Re-check the session so deactivated users are cut off
+                    try:
+                        await get_current_user_wrapper(credentials)
+                    except HTTPException:
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {section}\ndata: {json.dumps(data, default=str)}\n\n"
+        finally:
+            hub.disconnect(client)
+
+    from fastapi.responses import StreamingResponse
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
-# Consider user online if heartbeat within last 60 seconds
-ONLINE_THRESHOLD_SECONDS = 60
+# ==================== USER PRESENCE / ONLINE STATUS ====================
 
 
 @router.post("/presence/heartbeat")
@@ -11536,31 +11005,9 @@ async def send_heartbeat(
     """
     Send heartbeat to update user's online status.
     Should be called every 30 seconds by the frontend.
+    Buffered in memory and flushed to the database in batches.
     """
-    user_id = current_user.get("id")
-    now = datetime.now(timezone.utc).isoformat()
-    
-    # Update user's last_seen and current page
-    await db.user_presence.update_one(
-        {"user_id": user_id},
-        {
-            "$set": {
-                "user_id": user_id,
-                "last_seen": now,
-                "user_name": current_user.get("name") or current_user.get("email"),
-                "user_email": current_user.get("email"),
-                "user_role": current_user.get("role"),
-            }
-        },
-        upsert=True
-    )
-    
-    # Also update user's last_online in users collection
-    await db.users.update_one(
-        {"id": user_id},
-        {"$set": {"last_online": now}}
-    )
-    
+    now = get_presence_service(db).record_heartbeat(current_user)
     return {"success": True, "timestamp": now}
 
 
@@ -11572,31 +11019,7 @@ async def get_online_users(
     Get list of currently online users.
     Users are considered online if heartbeat within last 60 seconds.
     """
-    threshold = datetime.now(timezone.utc) - timedelta(seconds=ONLINE_THRESHOLD_SECONDS)
-    threshold_str = threshold.isoformat()
-    
-    # Get all users with recent heartbeat
-    online_presence = await db.user_presence.find(
-        {"last_seen": {"$gte": threshold_str}},
-        {"_id": 0}
-    ).to_list(100)
-    
-    # Get recently offline users (last 24 hours)
-    day_ago = datetime.now(timezone.utc) - timedelta(hours=24)
-    day_ago_str = day_ago.isoformat()
-    
-    recent_users = await db.user_presence.find(
-        {
-            "last_seen": {"$gte": day_ago_str, "$lt": threshold_str}
-        },
-        {"_id": 0}
-    ).sort("last_seen", -1).limit(20).to_list(20)
-    
-    return {
-        "online": online_presence,
-        "online_count": len(online_presence),
-        "recently_active": recent_users
-    }
+    return await get_presence_service(db).get_online_users()
 
 
 @router.get("/users/{user_id}/status")
@@ -11605,10 +11028,7 @@ async def get_user_status(
     current_user: dict = Depends(get_current_user_wrapper),
 ):
     """Get online status and last seen for a specific user."""
-    presence = await db.user_presence.find_one(
-        {"user_id": user_id},
-        {"_id": 0}
-    )
+    presence = await get_presence_service(db).get_user_presence(user_id)
     
     if not presence:
         # Check users collection for last_online
@@ -12022,6 +11442,10 @@ async def clear_audit_logs(
     if current_user.get("role") != "super_admin":
         raise HTTPException(status_code=403, detail="Only super admins can clear audit logs")
     
+    # Queued entries would otherwise be written after the clear
+    from services.log_writer_service import get_log_writer
+    await get_log_writer().flush()
+
     result = await db.audit_logs.delete_many({})
     
     return {
@@ -12103,24 +11527,43 @@ async def get_metrics_dashboard(
     """
     Get combined metrics dashboard data.
     
-    Returns key metrics from all tracking systems.
+    Returns key metrics from all tracking systems. Resolution figures are
+    combined from daily rollups; only today is aggregated live.
     """
     if current_user.get("role") not in ["super_admin", "manager"]:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     
+    return await run_coalesced("metrics/dashboard", _compute_metrics_dashboard)
+
+
+async def _compute_metrics_dashboard() -> dict:
+    """Combined metrics of GET /metrics/dashboard."""
     from services.reminder_effectiveness_service import get_reminder_effectiveness_service
     from services.conflict_aging_service import get_conflict_aging_service
     from services.audit_log_service import get_audit_service
+    from services.metrics_rollup_service import get_metrics_rollup_service
     
     reminder_service = get_reminder_effectiveness_service(db)
     conflict_service = get_conflict_aging_service(db)
     audit_service = get_audit_service(db)
     
-    # Get metrics in parallel would be better, but for simplicity:
-    reminder_metrics = await reminder_service.get_effectiveness_metrics(days=7)
-    conflict_aging = await conflict_service.get_aging_metrics()
-    conflict_resolution = await conflict_service.get_resolution_metrics(days=30)
-    audit_stats = await audit_service.get_stats(days=7)
+    # Backfill any missing rollup days once, before the readers run concurrently
+    conflict_rollup = await get_metrics_rollup_service(db).get_summary(days=30)
+    
+    (
+        reminder_metrics,
+        conflict_aging,
+        conflict_resolution,
+        audit_stats,
+    ) = await asyncio.gather(
+        reminder_service.get_effectiveness_metrics(days=7),
+        conflict_service.get_aging_metrics(),
+        conflict_service.get_resolution_metrics(days=30),
+        audit_service.get_stats(days=7),
+    )
+    
+    conflicts_resolved = conflict_rollup["conflicts_resolved"]
+    timed = conflict_rollup["conflict_resolution_hours_count"]
     
     return {
         "reminder_effectiveness": {
@@ -12137,6 +11580,16 @@ async def get_metrics_dashboard(
             "total_resolved_30d": conflict_resolution.get("total_resolved", 0),
             "avg_resolution_time_days": conflict_resolution.get("avg_resolution_time_days", 0),
         },
+        "seo_conflicts": {
+            "detected_30d": conflict_rollup["conflicts_detected"],
+            "resolved_30d": conflicts_resolved,
+            "avg_resolution_time_hours": round(
+                conflict_rollup["conflict_resolution_hours_sum"] / timed, 1
+            ) if timed else 0,
+            "false_resolution_rate_percent": round(
+                conflict_rollup["false_resolutions"] / conflicts_resolved * 100, 1
+            ) if conflicts_resolved else 0,
+        },
         "audit": {
             "total_events_7d": audit_stats.get("total_events", 0),
             "permission_violations": audit_stats.get("permission_violations", 0),
@@ -12299,9 +11752,9 @@ async def get_current_performance_metrics(
             "breached": metrics["false_resolution_rate_percent"] > thresholds["false_resolution_rate_percent"]
         },
         "stale_conflicts": {
-            "current": len(metrics["stale_conflicts"]),
+            "current": metrics["stale_count"],
             "threshold_days": thresholds["stale_conflict_days"],
-            "breached": len(metrics["stale_conflicts"]) > 0
+            "breached": metrics["stale_count"] > 0
         },
         "open_backlog": {
             "current": metrics["open_count"],
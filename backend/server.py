@@ -1,6 +1,7 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Query
 from fastapi import status as fastapi_status
-from fastapi import BackgroundTasks
+from fastapi import BackgroundTasks, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
@@ -13,10 +14,10 @@ from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime, timezone, timedelta
 import jwt
-import bcrypt
 from enum import Enum
 import httpx
 import asyncio
+import time
 from contextlib import asynccontextmanager
 
 # Import action/entity types for activity logging
@@ -25,9 +26,21 @@ from models_v3 import ActionType, EntityType
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / ".env")
 
-# MongoDB connection
+# MongoDB connection (commands are counted per request by the query monitor,
+# pool usage is exported by the metrics service)
+from services.query_monitor_service import (
+    QueryMonitorMiddleware,
+    get_query_monitor,
+    query_monitor_listeners,
+)
+from services import metrics_service
+
 mongo_url = os.environ["MONGO_URL"]
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    event_listeners=query_monitor_listeners() + metrics_service.metrics_listeners(),
+)
+metrics_service.set_mongo_pool_max_size(client.options.pool_options.max_pool_size)
 db = client[os.environ["DB_NAME"]]
 
 # JWT Settings
@@ -48,12 +61,21 @@ logger = logging.getLogger(__name__)
 # Background monitoring state
 monitoring_tasks = {}
 
+# Interval for re-scanning networks whose structure changed
+CONFLICT_SCAN_INTERVAL_MINUTES = int(os.environ.get("CONFLICT_SCAN_INTERVAL_MINUTES", "10"))
+
 # V3 Services
 from services.activity_log_service import init_activity_log_service
+from services.log_writer_service import get_log_writer
 from services.tier_service import init_tier_service
 from services.seo_change_log_service import SeoChangeLogService
 from services.seo_telegram_service import SeoTelegramService
 from services.reminder_scheduler import init_reminder_scheduler, get_reminder_scheduler
+from services.user_cache_service import get_user_cache_service
+from services import password_hashing_service as password_hashing
+from services.event_bus import publish_event
+from services import dashboard_stats_service as dashboard_stats
+from services.single_flight_service import get_single_flight
 from routers.v3_router import router as v3_router, init_v3_router
 
 # Initialize V3 services
@@ -76,6 +98,9 @@ async def lifespan(app: FastAPI):
     # Create database indexes for performance
     await create_database_indexes()
 
+    # Write activity / audit log entries in batches off the request path
+    get_log_writer().start()
+
     # Start V3 monitoring scheduler (two independent engines)
     from services.monitoring_service import MonitoringScheduler
 
@@ -95,6 +120,7 @@ async def lifespan(app: FastAPI):
         db, telegram_service=optimization_telegram_service
     )
     reminder_scheduler.start()
+    metrics_service.instrument_scheduler(reminder_scheduler.scheduler, "reminders")
     logger.info("Optimization Reminder Scheduler started")
 
     # Start Team Performance Check Scheduler (daily)
@@ -123,8 +149,87 @@ async def lifespan(app: FastAPI):
         id="team_performance_check",
         replace_existing=True
     )
+
+    # Keep stored conflicts and conflict reports current by re-scanning
+    # networks whose structure changed since their last scan
+    from apscheduler.triggers.interval import IntervalTrigger
+    from services.conflict_scanner_service import get_conflict_scanner_service
+
+    async def run_conflict_scan():
+        """Background task to re-detect conflicts for changed networks."""
+        try:
+            result = await get_conflict_scanner_service(db).scan_dirty_networks()
+            if result.get("networks_scanned", 0) > 0:
+                logger.info(f"Conflict scan completed: {result}")
+            else:
+                logger.debug("Conflict scan: no changed networks")
+        except Exception as e:
+            logger.error(f"Conflict scan failed: {e}")
+
+    performance_scheduler.add_job(
+        run_conflict_scan,
+        trigger=IntervalTrigger(minutes=CONFLICT_SCAN_INTERVAL_MINUTES),
+        id="conflict_scan",
+        replace_existing=True
+    )
+
+    # Close yesterday's metrics rollup and backfill missing days
+    from services.metrics_rollup_service import get_metrics_rollup_service
+
+    async def run_metrics_rollup():
+        """Background task to refresh daily conflict metrics rollups."""
+        try:
+            days = await get_metrics_rollup_service(db).refresh_rollups()
+            logger.info(f"Metrics rollups refreshed ({days} days)")
+        except Exception as e:
+            logger.error(f"Metrics rollup refresh failed: {e}")
+
+    performance_scheduler.add_job(
+        run_metrics_rollup,
+        trigger=CronTrigger(hour=0, minute=10, timezone="UTC"),  # Just after UTC midnight
+        id="metrics_rollup",
+        replace_existing=True
+    )
+
+    # Write buffered presence heartbeats in batches
+    from services.presence_service import get_presence_service, PRESENCE_FLUSH_SECONDS
+
+    async def run_presence_flush():
+        """Background task to flush buffered presence heartbeats."""
+        try:
+            await get_presence_service(db).flush()
+        except Exception as e:
+            logger.error(f"Presence flush failed: {e}")
+
+    performance_scheduler.add_job(
+        run_presence_flush,
+        trigger=IntervalTrigger(seconds=PRESENCE_FLUSH_SECONDS),
+        id="presence_flush",
+        replace_existing=True
+    )
+
+    # Start queued import jobs and resume jobs abandoned by a dead worker
+    from services.import_job_service import get_import_job_service, IMPORT_JOB_POLL_SECONDS
+
+    async def run_import_jobs():
+        """Background task to claim queued or stale import jobs."""
+        try:
+            await get_import_job_service(db, activity_log_service).run_pending()
+        except Exception as e:
+            logger.error(f"Import job poll failed: {e}")
+
+    performance_scheduler.add_job(
+        run_import_jobs,
+        trigger=IntervalTrigger(seconds=IMPORT_JOB_POLL_SECONDS),
+        id="import_jobs",
+        replace_existing=True
+    )
+    metrics_service.instrument_scheduler(performance_scheduler, "performance")
     performance_scheduler.start()
     logger.info("Team Performance Check Scheduler started (daily at 9:00 AM)")
+    logger.info(
+        f"Conflict Scanner started (every {CONFLICT_SCAN_INTERVAL_MINUTES} minutes)"
+    )
 
     logger.info(
         "V3 services initialized: ActivityLog, TierCalculation, Monitoring, Reminders"
@@ -137,84 +242,43 @@ async def lifespan(app: FastAPI):
     if get_reminder_scheduler():
         get_reminder_scheduler().stop()
 
+    # Don't lose heartbeats buffered since the last flush
+    await get_presence_service(db).flush()
+
+    # Drain queued activity / audit log entries
+    await get_log_writer().stop()
+
+    from services.conflict_scanner_service import shutdown_conflict_scan_executor
+
+    shutdown_conflict_scan_executor()
+    password_hashing.shutdown_password_hashing_executor()
+
     client.close()
 
 
 async def create_database_indexes():
     """Create database indexes for optimal query performance"""
+    # Declarative registry shared with manage.py sync-indexes
+    from services.index_registry_service import apply_indexes
+
     try:
-        # Users indexes
-        await db.users.create_index("email", unique=True)
-        await db.users.create_index("id", unique=True)
-        await db.users.create_index("role")
-        await db.users.create_index("status")
-
-        # Brands indexes
-        await db.brands.create_index("id", unique=True)
-        await db.brands.create_index("status")
-        await db.brands.create_index("name")
-
-        # Asset domains indexes for pagination and filtering
-        await db.asset_domains.create_index("id", unique=True)
-        await db.asset_domains.create_index("domain_name")
-        await db.asset_domains.create_index("brand_id")
-        await db.asset_domains.create_index("status")
-        await db.asset_domains.create_index("lifecycle_status")
-        await db.asset_domains.create_index("monitoring_status")
-        await db.asset_domains.create_index("domain_active_status")
-        await db.asset_domains.create_index("created_at")
-        await db.asset_domains.create_index("expiration_date")
-        await db.asset_domains.create_index([("domain_name", 1), ("brand_id", 1)])
-        await db.asset_domains.create_index([("brand_id", 1), ("created_at", -1)])
-
-        # SEO structure entries indexes
-        await db.seo_structure_entries.create_index("id", unique=True)
-        await db.seo_structure_entries.create_index("network_id")
-        await db.seo_structure_entries.create_index("asset_domain_id")
-        await db.seo_structure_entries.create_index("tier")
-        await db.seo_structure_entries.create_index([("network_id", 1), ("asset_domain_id", 1)])
-
-        # SEO networks indexes
-        await db.seo_networks.create_index("id", unique=True)
-        await db.seo_networks.create_index("brand_id")
-        await db.seo_networks.create_index("name")
-        await db.seo_networks.create_index("created_at")
-        await db.seo_networks.create_index([("brand_id", 1), ("created_at", -1)])
-
-        # SEO optimizations indexes
-        await db.seo_optimizations.create_index("id", unique=True)
-        await db.seo_optimizations.create_index("network_id")
-        await db.seo_optimizations.create_index("brand_id")
-        await db.seo_optimizations.create_index("status")
-        await db.seo_optimizations.create_index("created_at")
-        await db.seo_optimizations.create_index([("network_id", 1), ("created_at", -1)])
-        await db.seo_optimizations.create_index([("brand_id", 1), ("status", 1)])
-
-        # SEO conflicts indexes
-        await db.seo_conflicts.create_index("id", unique=True)
-        await db.seo_conflicts.create_index("network_id")
-        await db.seo_conflicts.create_index("status")
-        await db.seo_conflicts.create_index("severity")
-        await db.seo_conflicts.create_index("created_at")
-        await db.seo_conflicts.create_index([("network_id", 1), ("status", 1)])
-
-        # Activity logs indexes
-        await db.activity_logs.create_index("created_at")
-        await db.activity_logs.create_index("user_id")
-        await db.activity_logs.create_index([("created_at", -1)])
-
-        # Audit logs indexes
-        await db.audit_logs.create_index("timestamp")
-        await db.audit_logs.create_index([("timestamp", -1)])
-
-        # Categories and Registrars indexes
-        await db.categories.create_index("id", unique=True)
-        await db.registrars.create_index("id", unique=True)
-
-        logger.info("Database indexes created/verified")
+        result = await apply_indexes(db)
+        logger.info(
+            f"Database indexes created/verified ({result['indexes']} indexes, "
+            f"{len(result['failed'])} failed)"
+        )
     except Exception as e:
         logger.warning(f"Index creation warning (may already exist): {e}")
 
+    # Unique conflict fingerprint index (backfills legacy conflicts first;
+    # handles its own errors so duplicates can't block the indexes above)
+    from services.conflict_optimization_linker_service import get_conflict_linker_service
+    await get_conflict_linker_service(db).ensure_indexes()
+
+    # Unique case-insensitive domain key (backfills legacy domains first)
+    from services.domain_key_service import get_domain_key_service
+    await get_domain_key_service(db).ensure_index()
+
 
 app = FastAPI(title="SEO-NOC API", lifespan=lifespan)
 
@@ -226,7 +290,7 @@ async def health_check():
     """
     return {"status": "ok"}
 
-api_router = APIRouter(prefix="/api")
+api_router = APIRouter(prefix="/api", route_class=metrics_service.MetricsRoute)
 security = HTTPBearer()
 
 # ==================== ENUMS ====================
@@ -651,14 +715,22 @@ async def get_system_timezone() -> tuple:
 # ==================== HELPER FUNCTIONS ====================
 
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+async def hash_password(password: str) -> str:
+    try:
+        return await password_hashing.hash_password(password)
+    except password_hashing.PasswordHashingBusy:
+        raise HTTPException(
+            status_code=503, detail="Server busy, please try again shortly"
+        )
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(
-        plain_password.encode("utf-8"), hashed_password.encode("utf-8")
-    )
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return await password_hashing.verify_password(plain_password, hashed_password)
+    except password_hashing.PasswordHashingBusy:
+        raise HTTPException(
+            status_code=503, detail="Server busy, please try again shortly"
+        )
 
 
 def create_token(user_id: str, email: str, role: str) -> str:
@@ -681,7 +753,7 @@ async def get_current_user(
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
-        user = await db.users.find_one({"id": user_id}, {"_id": 0})
+        user = await get_user_cache_service(db).get_user(user_id)
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
 
@@ -783,7 +855,7 @@ async def log_audit(
         "details": details,
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
-    await db.audit_logs.insert_one(audit_log)
+    await get_log_writer().write(db.audit_logs, audit_log)
 
 
 def calculate_severity(domain: dict) -> AlertSeverity:
@@ -826,6 +898,7 @@ async def send_telegram_alert(message: str):
         logger.warning("Telegram not configured, skipping alert")
         return False
 
+    started = time.perf_counter()
     try:
         url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
         async with httpx.AsyncClient() as client:
@@ -834,6 +907,7 @@ async def send_telegram_alert(message: str):
                 json={"chat_id": chat_id, "text": message, "parse_mode": "HTML"},
                 timeout=10,
             )
+            metrics_service.observe_notification("telegram", started, response.status_code == 200)
             if response.status_code == 200:
                 logger.info("Telegram alert sent successfully")
                 return True
@@ -841,6 +915,7 @@ async def send_telegram_alert(message: str):
                 logger.error(f"Telegram API error: {response.text}")
                 return False
     except Exception as e:
+        metrics_service.observe_notification("telegram", started, False)
         logger.error(f"Failed to send Telegram alert: {e}")
         return False
 
@@ -959,6 +1034,7 @@ async def create_alert(
     }
 
     await db.alerts.insert_one(alert)
+    publish_event("alerts", alert_id=alert["id"])
 
     # Send Telegram notification
     if alert_type == AlertType.MONITORING:
@@ -1216,6 +1292,7 @@ async def seed_default_super_admin():
                     }
                 }
             )
+            await get_user_cache_service(db).bump_user_version(existing_user["id"])
             logger.info(f"User upgraded to Super Admin!")
             return
         
@@ -1227,7 +1304,7 @@ async def seed_default_super_admin():
             "id": str(uuid.uuid4()),
             "email": DEFAULT_ADMIN_EMAIL,
             "name": DEFAULT_ADMIN_NAME,
-            "password": hash_password(DEFAULT_ADMIN_PASSWORD),
+            "password": await hash_password(DEFAULT_ADMIN_PASSWORD),
             "role": "super_admin",
             "status": "active",
             "brand_scope_ids": None,
@@ -1273,7 +1350,7 @@ async def register(user_data: UserCreate):
         "id": str(uuid.uuid4()),
         "email": user_data.email,
         "name": user_data.name,
-        "password": hash_password(user_data.password),
+        "password": await hash_password(user_data.password),
         "role": role.value if isinstance(role, UserRole) else role,
         "status": status.value if isinstance(status, UserStatus) else status,
         "brand_scope_ids": brand_scope_ids,
@@ -1311,7 +1388,7 @@ async def register(user_data: UserCreate):
 @api_router.post("/auth/login", response_model=TokenResponse)
 async def login(credentials: UserLogin):
     user = await db.users.find_one({"email": credentials.email}, {"_id": 0})
-    if not user or not verify_password(credentials.password, user["password"]):
+    if not user or not await verify_password(credentials.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     # Check user status
@@ -1381,6 +1458,39 @@ async def get_me(current_user: dict = Depends(get_current_user)):
     return UserResponse(**current_user)
 
 
+@api_router.get("/system/password-hashing")
+async def get_password_hashing_stats(
+    current_user: dict = Depends(require_roles([UserRole.SUPER_ADMIN])),
+):
+    """Password hashing pool queue depth and timings - Super Admin only"""
+    return password_hashing.get_password_hashing_stats()
+
+
+@api_router.get("/system/single-flight")
+async def get_single_flight_stats(
+    current_user: dict = Depends(require_roles([UserRole.SUPER_ADMIN])),
+):
+    """Request coalescing counters per report endpoint - Super Admin only"""
+    return get_single_flight().get_stats()
+
+
+@api_router.get("/system/query-stats")
+async def get_query_stats(
+    limit: int = Query(default=50, le=500),
+    reset: bool = False,
+    current_user: dict = Depends(require_roles([UserRole.SUPER_ADMIN])),
+):
+    """
+    MongoDB commands per route (count, time, slowest, N+1 patterns) - Super Admin only.
+    reset=true clears the aggregates after returning them.
+    """
+    monitor = get_query_monitor()
+    stats = monitor.get_stats(limit=limit)
+    if reset:
+        monitor.reset()
+    return stats
+
+
 # ==================== USER MANAGEMENT ====================
 
 
@@ -1435,6 +1545,7 @@ async def approve_user(
     }
 
     await db.users.update_one({"id": user_id}, {"$set": update_data})
+    await get_user_cache_service(db).bump_user_version(user_id)
 
     # Log activity
     if activity_log_service:
@@ -1519,7 +1630,7 @@ async def create_user_manually(
         "id": str(uuid.uuid4()),
         "email": user_data.email,
         "name": user_data.name,
-        "password": hash_password(final_password),
+        "password": await hash_password(final_password),
         "role": user_data.role.value,
         "status": UserStatus.ACTIVE.value,  # Active immediately
         "brand_scope_ids": user_data.brand_scope_ids,
@@ -1614,6 +1725,7 @@ async def update_user(
     result = await db.users.find_one_and_update(
         {"id": user_id}, {"$set": update_dict}, return_document=True
     )
+    await get_user_cache_service(db).bump_user_version(user_id)
 
     await log_audit(
         current_user["id"],
@@ -1637,6 +1749,7 @@ async def delete_user(
     result = await db.users.delete_one({"id": user_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
+    await get_user_cache_service(db).bump_user_version(user_id)
     await log_audit(
         current_user["id"], current_user["email"], "delete", "user", user_id, {}
     )
@@ -1664,6 +1777,7 @@ async def update_my_telegram_settings(
         update_dict["telegram_username"] = username if username else None
 
     await db.users.update_one({"id": current_user["id"]}, {"$set": update_dict})
+    await get_user_cache_service(db).bump_user_version(current_user["id"])
 
     return {
         "message": "Telegram settings updated",
@@ -1716,6 +1830,8 @@ async def deactivate_user(
             }
         },
     )
+    # Drop cached sessions so the user loses access immediately
+    await get_user_cache_service(db).bump_user_version(user_id)
 
     # Log activity
     if activity_log_service:
@@ -1769,6 +1885,7 @@ async def activate_user(
             }
         },
     )
+    await get_user_cache_service(db).bump_user_version(user_id)
 
     # Log activity
     if activity_log_service:
@@ -1851,6 +1968,7 @@ async def update_user_telegram_settings(
         update_data["telegram_user_id"] = telegram_user_id
 
     await db.users.update_one({"id": user_id}, {"$set": update_data})
+    await get_user_cache_service(db).bump_user_version(user_id)
 
     # Log activity
     if activity_log_service:
@@ -2442,37 +2560,16 @@ async def check_domain_now(
 @api_router.get("/monitoring/stats", response_model=MonitoringStats)
 async def get_monitoring_stats(current_user: dict = Depends(get_current_user)):
     """Get monitoring statistics from asset_domains collection"""
-    # Query asset_domains for monitoring data
-    total = await db.asset_domains.count_documents({"monitoring_enabled": True})
-    up = await db.asset_domains.count_documents(
-        {"monitoring_enabled": True, "ping_status": "up"}
-    )
-    down = await db.asset_domains.count_documents(
-        {"monitoring_enabled": True, "ping_status": "down"}
-    )
-    unknown = await db.asset_domains.count_documents(
-        {"monitoring_enabled": True, "ping_status": {"$nin": ["up", "down"]}}
-    )
-
-    # Check expiring domains (within 7 days)
-    now = datetime.now(timezone.utc)
-    week_later = (now + timedelta(days=7)).isoformat()
-
-    expiring = await db.asset_domains.count_documents(
-        {"expiration_date": {"$ne": None, "$lte": week_later, "$gt": now.isoformat()}}
-    )
-
-    expired = await db.asset_domains.count_documents(
-        {"expiration_date": {"$ne": None, "$lte": now.isoformat()}}
-    )
+    stats = await dashboard_stats.get_monitoring_stats(db)
+    availability = stats["availability"]
 
     return MonitoringStats(
-        total_monitored=total,
-        up_count=up,
-        down_count=down,
-        unknown_count=unknown,
-        expiring_soon=expiring,
-        expired=expired,
+        total_monitored=availability["total_monitored"],
+        up_count=availability["up"],
+        down_count=availability["down"],
+        unknown_count=availability["unknown"],
+        expiring_soon=stats["expiration"]["expiring_7_days"],
+        expired=stats["expiration"]["expired"],
     )
 
 
@@ -2519,6 +2616,7 @@ async def acknowledge_alert(
     )
     if not result:
         raise HTTPException(status_code=404, detail="Alert not found")
+    publish_event("alerts", alert_id=alert_id)
     return {"message": "Alert acknowledged"}
 
 
@@ -2774,97 +2872,13 @@ async def detect_seo_conflicts(current_user: dict = Depends(get_current_user)):
 
 @api_router.get("/reports/dashboard-stats")
 async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
-    # Apply brand filtering for non-super-admin users
-    brand_filter = {}
+    # Apply brand filtering for non-super-admin users (an empty scope sees everything here)
     brand_scope_ids = current_user.get("brand_scope_ids")
+    brand_scope = None
     if current_user.get("role") != "super_admin" and brand_scope_ids:
-        brand_filter = {"brand_id": {"$in": brand_scope_ids}}
-
-    # Use asset_domains collection (new V3 data)
-    domain_base_filter = brand_filter.copy()
-    domain_indexed_filter = {**domain_base_filter, "index_status": "index"}
-    domain_noindex_filter = {**domain_base_filter, "index_status": "noindex"}
-    domain_monitored_filter = {**domain_base_filter, "monitoring_enabled": True}
-    domain_up_filter = {
-        **domain_base_filter,
-        "monitoring_enabled": True,
-        "ping_status": "up",
-    }
-    domain_down_filter = {
-        **domain_base_filter,
-        "monitoring_enabled": True,
-        "ping_status": "down",
-    }
+        brand_scope = brand_scope_ids
 
-    # Use seo_networks collection (new V3 data)
-    network_filter = brand_filter.copy()
-
-    # Use asset_domains for domain counts
-    total_domains = await db.asset_domains.count_documents(domain_base_filter)
-    total_networks = await db.seo_networks.count_documents(network_filter)
-    total_brands = await db.brands.count_documents(
-        {}
-        if not brand_scope_ids or current_user.get("role") == "super_admin"
-        else {"id": {"$in": brand_scope_ids}}
-    )
-    indexed_count = await db.asset_domains.count_documents(domain_indexed_filter)
-    noindex_count = await db.asset_domains.count_documents(domain_noindex_filter)
-
-    # Monitoring stats from asset_domains
-    monitored = await db.asset_domains.count_documents(domain_monitored_filter)
-    up = await db.asset_domains.count_documents(domain_up_filter)
-    down = await db.asset_domains.count_documents(domain_down_filter)
-
-    # Active alerts
-    active_alerts = await db.alerts.count_documents({"acknowledged": False})
-    
-    # Get domains that are currently DOWN
-    down_domain_names = []
-    down_domains_cursor = db.asset_domains.find(
-        domain_down_filter,
-        {"_id": 0, "domain": 1}
-    )
-    async for doc in down_domains_cursor:
-        if doc.get("domain"):
-            down_domain_names.append(doc["domain"])
-    
-    # Critical alerts: only count alerts for domains that are CURRENTLY down
-    # This ensures banner disappears when domain is fixed
-    critical_filter = {"acknowledged": False, "severity": "critical"}
-    if down_domain_names:
-        # Only show critical alerts for domains that are still down
-        critical_filter["domain_name"] = {"$in": down_domain_names}
-    else:
-        # No domains down, no critical alerts to show
-        critical_filter["domain_name"] = {"$in": []}  # Match nothing
-    
-    critical_alerts_count = await db.alerts.count_documents(critical_filter)
-    
-    # Get critical alert details (domain names) for dashboard display
-    critical_alert_details = []
-    if critical_alerts_count > 0:
-        critical_alerts_cursor = db.alerts.find(
-            critical_filter,
-            {"_id": 0, "domain_name": 1, "title": 1, "alert_type": 1, "created_at": 1}
-        ).limit(5)  # Show max 5 in banner
-        critical_alert_details = await critical_alerts_cursor.to_list(5)
-
-    return {
-        "total_domains": total_domains,
-        "total_groups": total_networks,  # Keeping old key name for frontend compatibility
-        "total_brands": total_brands,
-        "indexed_count": indexed_count,
-        "noindex_count": noindex_count,
-        "index_rate": round(
-            (indexed_count / total_domains * 100) if total_domains > 0 else 0, 1
-        ),
-        "monitored_count": monitored,
-        "up_count": up,
-        "down_count": down,
-        "active_alerts": active_alerts,
-        "critical_alerts": critical_alerts_count,
-        "critical_alert_details": critical_alert_details,
-    }
+    return await dashboard_stats.get_legacy_dashboard_stats(db, brand_scope)
 
 
 @api_router.get("/reports/tier-distribution")
@@ -3249,6 +3263,8 @@ async def get_audit_logs(
     entity_type: Optional[str] = None,
     current_user: dict = Depends(require_roles([UserRole.SUPER_ADMIN])),
 ):
+    await get_log_writer().flush()
+
     query = {}
     if entity_type:
         query["entity_type"] = entity_type
@@ -3530,10 +3546,25 @@ init_v3_router(
     seo_telegram_svc=seo_telegram_service,
 )
 
+@app.get("/metrics", include_in_schema=False)
+@app.get("/api/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    """Prometheus text exposition (Bearer METRICS_TOKEN when configured)"""
+    if metrics_service.METRICS_TOKEN:
+        if request.headers.get("authorization") != f"Bearer {metrics_service.METRICS_TOKEN}":
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(
+        metrics_service.render_metrics(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 # Include routers
 app.include_router(api_router)  # V2 API (legacy)
 app.include_router(v3_router)  # V3 API (new architecture)
 
+app.add_middleware(QueryMonitorMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
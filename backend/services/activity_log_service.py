@@ -3,6 +3,9 @@ Activity Log Service for SEO-NOC V3
 ===================================
 Records all create, update, delete, and migration actions.
 Enabled from migration start with actor: system:migration_v3
+
+log() / log_many() queue their entries on the buffered log writer
+(services/log_writer_service.py); queries flush the writer first.
 """
 
 import uuid
@@ -11,6 +14,7 @@ from typing import Optional, Dict, Any, List
 from motor.motor_asyncio import AsyncIOMotorDatabase
 import logging
 
+from services.log_writer_service import get_log_writer
 from models_v3 import (
     ActionType,
     EntityType,
@@ -58,10 +62,49 @@ class ActivityLogService:
         Returns:
             ID of the created log entry
         """
-        log_id = str(uuid.uuid4())
+        log_entry = self._build_entry(
+            actor, action_type, entity_type, entity_id, before_value, after_value, metadata
+        )
+
+        await get_log_writer().write(self.collection, log_entry)
+        logger.info(f"Activity logged: {actor} {action_type} {entity_type} {entity_id}")
+
+        return log_entry["id"]
+
+    async def log_many(self, entries: List[Dict[str, Any]]) -> List[str]:
+        """
+        Record several activity log entries through the log writer.
 
-        log_entry = {
-            "id": log_id,
+        Args:
+            entries: Dicts with the keyword arguments of log() (actor,
+                action_type, entity_type, entity_id, before_value,
+                after_value, metadata)
+
+        Returns:
+            IDs of the created log entries
+        """
+        if not entries:
+            return []
+
+        log_entries = [self._build_entry(**entry) for entry in entries]
+        await get_log_writer().write_many(self.collection, log_entries)
+        logger.info(f"Activity logged: {len(log_entries)} entries")
+
+        return [entry["id"] for entry in log_entries]
+
+    def _build_entry(
+        self,
+        actor: str,
+        action_type: ActionType,
+        entity_type: EntityType,
+        entity_id: str,
+        before_value: Optional[Dict[str, Any]] = None,
+        after_value: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Activity log document as stored in activity_logs_v3."""
+        return {
+            "id": str(uuid.uuid4()),
             "actor": actor,
             "action_type": (
                 action_type.value
@@ -80,11 +123,6 @@ class ActivityLogService:
             "created_at": datetime.now(timezone.utc).isoformat(),
         }
 
-        await self.collection.insert_one(log_entry)
-        logger.info(f"Activity logged: {actor} {action_type} {entity_type} {entity_id}")
-
-        return log_id
-
     async def log_migration(
         self,
         action_type: ActionType,
@@ -145,6 +183,8 @@ class ActivityLogService:
         Returns:
             List of activity log entries
         """
+        await get_log_writer().flush()
+
         query = {}
 
         if entity_type:
@@ -209,6 +249,8 @@ class ActivityLogService:
         Returns:
             List of migration activity logs
         """
+        await get_log_writer().flush()
+
         query = {"actor": self.SYSTEM_MIGRATION_ACTOR}
 
         if phase:
@@ -227,6 +269,8 @@ class ActivityLogService:
         Returns:
             Dictionary with log statistics
         """
+        await get_log_writer().flush()
+
         total = await self.collection.count_documents({})
 
         # Count by action type
@@ -6,6 +6,9 @@ Centralized audit logging for:
 - Permission violations
 - Failed notifications
 - Security events
+
+Entries are queued on the buffered log writer (services/log_writer_service.py);
+queries flush it first.
 """
 
 import uuid
@@ -14,6 +17,8 @@ from typing import Any, Dict, List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 import logging
 
+from services.log_writer_service import get_log_writer
+
 logger = logging.getLogger(__name__)
 
 
@@ -97,7 +102,7 @@ class AuditLogService:
         }
         
         try:
-            await self.collection.insert_one(audit_entry)
+            await get_log_writer().write(self.collection, audit_entry)
             logger.info(f"Audit log created: {event_type} by {actor_email} on {resource_type}/{resource_id}")
         except Exception as e:
             logger.error(f"Failed to create audit log: {e}")
@@ -209,6 +214,8 @@ class AuditLogService:
         skip: int = 0,
     ) -> List[Dict[str, Any]]:
         """Query audit logs with filters"""
+        await get_log_writer().flush()
+
         query = {}
         
         if event_type:
@@ -237,6 +244,7 @@ class AuditLogService:
         from datetime import timedelta
         
         start_date = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+        await get_log_writer().flush()
         
         # Count total
         total = await self.collection.count_documents({"created_at": {"$gte": start_date}})
@@ -0,0 +1,416 @@
+"""
+Bulk Domain Operation Service
+=============================
+
+Lifecycle, monitoring and brand changes applied to many asset domains at
+once, behind POST /api/v3/asset-domains/bulk.
+
+A request names an operation and a selection; the router resolves the
+selection to domain ids within the user's brand scope. Then:
+1. validate_operation checks the operation's own fields once (the 400
+   rules of the single-domain endpoints, e.g. a note for 'other')
+2. Domains are loaded in batches of BULK_OPERATION_BATCH_SIZE and split by
+   plan_operation into domains to update and domains skipped with a
+   reason, using the rules of the single-domain endpoints:
+   - no Active lifecycle (set_lifecycle, remove_quarantine) for an expired
+     domain
+   - remove_quarantine only for quarantined domains
+   - monitoring only for Active, unexpired domains
+3. Each batch is written with one update_many of the operation's $set,
+   the same fields the single-domain endpoint sets
+4. One activity log entry, one in-app notification to the actor and one
+   inventory event cover the whole operation
+
+Operations:
+- set_lifecycle / quarantine / remove_quarantine / mark_released: mirror
+  POST /asset-domains/{id}/set-lifecycle, /quarantine, /remove-quarantine
+  and /mark-released (Super Admin only)
+- set_monitoring: the monitoring toggle
+- move_brand: brand_id, as PUT /asset-domains/{id} sets it
+
+Selections above BULK_OPERATION_SYNC_LIMIT domains (or background=true)
+run as a "domain_operations" job of services/import_job_service.py:
+the ids are stored as checkpointed chunks, progress is followed on
+/import/jobs/{id}, and the summary is recorded when the job finishes.
+Replaying a chunk is harmless - every operation sets absolute values.
+"""
+
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import PyMongoError
+
+from models_v3 import (
+    ActionType,
+    DomainLifecycleStatus,
+    EntityType,
+    QuarantineCategory,
+    QUARANTINE_CATEGORY_LABELS,
+)
+from services.event_bus import publish_event
+
+logger = logging.getLogger(__name__)
+
+# Larger selections run as a background job
+BULK_OPERATION_SYNC_LIMIT = int(os.environ.get("BULK_OPERATION_SYNC_LIMIT", "2000"))
+
+# Domains loaded / written per update_many
+BULK_OPERATION_BATCH_SIZE = 1000
+
+# Skipped domains listed in a synchronous response (the counts stay exact)
+MAX_REPORTED_SKIPS = 500
+
+# Domain ids kept on the consolidated activity log entry
+MAX_LOGGED_IDS = 1000
+
+SUPER_ADMIN_OPERATIONS = ("set_lifecycle", "quarantine", "remove_quarantine", "mark_released")
+
+ACTIVE = DomainLifecycleStatus.ACTIVE.value
+QUARANTINED = DomainLifecycleStatus.QUARANTINED.value
+
+# Fields plan_operation needs
+RULE_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "domain_name": 1,
+    "brand_id": 1,
+    "lifecycle_status": 1,
+    "quarantine_category": 1,
+    "expiration_date": 1,
+}
+
+_CLEAR_QUARANTINE = {
+    "quarantine_category": None,
+    "quarantine_note": None,
+    "quarantined_at": None,
+    "quarantined_by": None,
+}
+
+_CLEAR_RELEASE = {"released_at": None, "released_by": None}
+
+
+class BulkOperationError(ValueError):
+    """The operation itself is invalid (nothing was changed)."""
+
+
+def validate_operation(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check a BulkDomainOperationRequest dict (enums as values) and return
+    the operation spec: the operation plus the fields it uses.
+
+    Raises:
+        BulkOperationError: a required field is missing or invalid
+    """
+    operation = request["operation"]
+    spec: Dict[str, Any] = {"operation": operation, "reason": request.get("reason")}
+
+    if operation == "set_lifecycle":
+        lifecycle = request.get("lifecycle_status")
+        if not lifecycle:
+            raise BulkOperationError("lifecycle_status is required")
+        if lifecycle == QUARANTINED and not request.get("quarantine_category"):
+            raise BulkOperationError(
+                "Quarantine category is required when setting lifecycle to 'Quarantined'"
+            )
+        spec.update(
+            lifecycle_status=lifecycle,
+            quarantine_category=request.get("quarantine_category"),
+            quarantine_note=request.get("quarantine_note"),
+        )
+    elif operation == "quarantine":
+        category = request.get("quarantine_category")
+        if not category:
+            raise BulkOperationError("quarantine_category is required")
+        # Unknown categories are stored as 'other', like /quarantine does
+        if category not in [c.value for c in QuarantineCategory]:
+            category = "other"
+        if category == "other" and not request.get("quarantine_note"):
+            raise BulkOperationError("Quarantine note is required for 'Other' category")
+        spec.update(quarantine_category=category, quarantine_note=request.get("quarantine_note"))
+    elif operation == "set_monitoring":
+        if request.get("monitoring_enabled") is None:
+            raise BulkOperationError("monitoring_enabled is required")
+        spec["monitoring_enabled"] = bool(request["monitoring_enabled"])
+    elif operation == "move_brand":
+        if not request.get("target_brand_id"):
+            raise BulkOperationError("target_brand_id is required")
+        spec["target_brand_id"] = request["target_brand_id"]
+    elif operation not in ("remove_quarantine", "mark_released"):
+        raise BulkOperationError(f"Unknown operation: {operation}")
+    return spec
+
+
+def is_expired(expiration_date: Optional[str], now: datetime) -> bool:
+    """The expired rule of compute_domain_active_status, for a fixed now."""
+    if not expiration_date:
+        return False
+    try:
+        exp_date = datetime.fromisoformat(expiration_date.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return False
+    if exp_date.tzinfo is None:
+        exp_date = exp_date.replace(tzinfo=timezone.utc)
+    return exp_date < now
+
+
+def build_update(spec: Dict[str, Any], actor_id: Optional[str], now: str) -> Dict[str, Any]:
+    """The $set of an operation - the fields its single-domain endpoint sets."""
+    operation = spec["operation"]
+    update: Dict[str, Any] = {"updated_at": now}
+
+    if operation == "set_lifecycle":
+        lifecycle = spec["lifecycle_status"]
+        update["lifecycle_status"] = lifecycle
+        if lifecycle == DomainLifecycleStatus.RELEASED.value:
+            update.update(released_at=now, released_by=actor_id, monitoring_enabled=False)
+            update.update(_CLEAR_QUARANTINE)
+        elif lifecycle == QUARANTINED:
+            update.update(
+                quarantine_category=spec["quarantine_category"],
+                quarantine_note=spec.get("quarantine_note"),
+                quarantined_at=now,
+                quarantined_by=actor_id,
+                monitoring_enabled=False,
+            )
+            update.update(_CLEAR_RELEASE)
+        elif lifecycle == ACTIVE:
+            update.update(_CLEAR_RELEASE)
+            update.update(_CLEAR_QUARANTINE)
+        elif lifecycle == DomainLifecycleStatus.NOT_RENEWED.value:
+            update["monitoring_enabled"] = False
+            update.update(_CLEAR_QUARANTINE)
+            update.update(_CLEAR_RELEASE)
+    elif operation == "quarantine":
+        update.update(
+            lifecycle_status=QUARANTINED,
+            quarantine_category=spec["quarantine_category"],
+            quarantine_note=spec.get("quarantine_note"),
+            quarantined_at=now,
+            quarantined_by=actor_id,
+            monitoring_enabled=False,
+        )
+        update.update(_CLEAR_RELEASE)
+    elif operation == "remove_quarantine":
+        update["lifecycle_status"] = ACTIVE
+        update.update(_CLEAR_QUARANTINE)
+    elif operation == "mark_released":
+        update.update(
+            lifecycle_status=DomainLifecycleStatus.RELEASED.value,
+            released_at=now,
+            released_by=actor_id,
+            monitoring_enabled=False,
+        )
+        update.update(_CLEAR_QUARANTINE)
+    elif operation == "set_monitoring":
+        update["monitoring_enabled"] = spec["monitoring_enabled"]
+    elif operation == "move_brand":
+        update["brand_id"] = spec["target_brand_id"]
+    return update
+
+
+def plan_operation(
+    domains: List[Dict[str, Any]], spec: Dict[str, Any], now: datetime
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Split domains into the ids to update and the skipped domains.
+
+    Returns:
+        (ids, [{"id", "domain", "reason"}])
+    """
+    operation = spec["operation"]
+    ids, skipped = [], []
+    for domain in domains:
+        lifecycle = domain.get("lifecycle_status") or ACTIVE
+        expired = is_expired(domain.get("expiration_date"), now)
+        reason = None
+
+        if operation == "set_lifecycle" and spec["lifecycle_status"] == ACTIVE and expired:
+            reason = "Domain has expired and cannot be marked as Active"
+        elif operation == "remove_quarantine":
+            if not (domain.get("quarantine_category") or lifecycle == QUARANTINED):
+                reason = "Domain is not quarantined"
+            elif expired:
+                reason = "Domain has expired and cannot be restored to Active"
+        elif operation == "set_monitoring" and spec["monitoring_enabled"]:
+            if expired:
+                reason = "Monitoring is not allowed for expired domains"
+            elif lifecycle != ACTIVE:
+                reason = f"Monitoring is not allowed for {lifecycle} domains"
+        elif operation == "move_brand" and domain.get("brand_id") == spec["target_brand_id"]:
+            reason = "Domain is already in this brand"
+
+        if reason:
+            skipped.append({"id": domain["id"], "domain": domain.get("domain_name"), "reason": reason})
+        else:
+            ids.append(domain["id"])
+    return ids, skipped
+
+
+def describe(spec: Dict[str, Any]) -> str:
+    """Human-readable summary of an operation for logs and notifications."""
+    operation = spec["operation"]
+    if operation == "set_lifecycle":
+        text = f"Lifecycle changed to {spec['lifecycle_status']}"
+    elif operation == "quarantine":
+        category = spec["quarantine_category"]
+        text = f"Quarantined: {QUARANTINE_CATEGORY_LABELS.get(category, category)}"
+    elif operation == "remove_quarantine":
+        text = "Quarantine removed, lifecycle restored to Active"
+    elif operation == "mark_released":
+        text = "Marked as released"
+    elif operation == "set_monitoring":
+        text = f"Monitoring turned {'on' if spec['monitoring_enabled'] else 'off'}"
+    else:
+        text = f"Moved to brand {spec['target_brand_id']}"
+    return f"{text}: {spec['reason']}" if spec.get("reason") else text
+
+
+class BulkDomainOperationService:
+    """Applies one operation to many asset domains"""
+
+    def __init__(self, db: AsyncIOMotorDatabase, activity_log_service=None):
+        self.db = db
+        self.activity_log_service = activity_log_service
+
+    async def run(
+        self,
+        ids: List[str],
+        spec: Dict[str, Any],
+        actor: str,
+        actor_id: Optional[str],
+        selection: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Apply an operation synchronously and record its summary."""
+        result = await self.apply(ids, spec, actor_id)
+        result["operation_id"] = str(uuid.uuid4())
+        result["operation"] = spec["operation"]
+        result["total"] = len(ids)
+        await self.record(
+            result["operation_id"], spec, actor, actor_id, result,
+            selection=selection, domain_ids=result.pop("updated_ids"),
+        )
+        return result
+
+    async def apply(
+        self,
+        ids: List[str],
+        spec: Dict[str, Any],
+        actor_id: Optional[str],
+        batch_size: int = BULK_OPERATION_BATCH_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Validate and write the domains batch by batch.
+
+        Returns updated / skipped counts, the skipped domains (at most
+        MAX_REPORTED_SKIPS), the row errors and the updated ids.
+        """
+        now = datetime.now(timezone.utc)
+        update = build_update(spec, actor_id, now.isoformat())
+        result: Dict[str, Any] = {
+            "updated": 0, "skipped": 0, "skipped_domains": [], "errors": [], "updated_ids": [],
+        }
+
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            domains = await self.db.asset_domains.find(
+                {"id": {"$in": batch}}, RULE_PROJECTION
+            ).to_list(None)
+            update_ids, skipped = plan_operation(domains, spec, now)
+            found = {d["id"] for d in domains}
+            skipped += [
+                {"id": asset_id, "domain": None, "reason": "Asset domain not found"}
+                for asset_id in batch if asset_id not in found
+            ]
+
+            result["skipped"] += len(skipped)
+            room = MAX_REPORTED_SKIPS - len(result["skipped_domains"])
+            result["skipped_domains"].extend(skipped[:max(room, 0)])
+            if not update_ids:
+                continue
+
+            try:
+                await self.db.asset_domains.update_many(
+                    {"id": {"$in": update_ids}}, {"$set": update}
+                )
+            except PyMongoError as e:
+                logger.error(f"Bulk {spec['operation']} failed for {len(update_ids)} domains: {e}")
+                names = {d["id"]: d.get("domain_name") for d in domains}
+                result["errors"].extend(
+                    {"id": asset_id, "domain": names.get(asset_id), "error": str(e)}
+                    for asset_id in update_ids
+                )
+                continue
+            result["updated"] += len(update_ids)
+            result["updated_ids"].extend(update_ids)
+
+        return result
+
+    async def record(
+        self,
+        operation_id: str,
+        spec: Dict[str, Any],
+        actor: str,
+        actor_id: Optional[str],
+        summary: Dict[str, Any],
+        selection: Optional[Dict[str, Any]] = None,
+        domain_ids: Optional[List[str]] = None,
+    ):
+        """
+        One activity log entry, one in-app notification and one inventory
+        event for a finished operation. Failures are logged, never raised -
+        the domains are already written.
+        """
+        errors = summary["errors"]
+        error_count = errors if isinstance(errors, int) else len(errors)
+        notes = describe(spec)
+
+        if summary["updated"]:
+            publish_event("inventory", bulk_operation=spec["operation"], updated=summary["updated"])
+
+        if self.activity_log_service:
+            after_value = {
+                "type": "bulk_domain_operation",
+                "operation": spec["operation"],
+                "params": spec,
+                "updated": summary["updated"],
+                "skipped": summary["skipped"],
+                "errors": error_count,
+            }
+            if domain_ids is not None:
+                after_value["domain_ids"] = domain_ids[:MAX_LOGGED_IDS]
+            try:
+                await self.activity_log_service.log(
+                    actor=actor,
+                    action_type=ActionType.UPDATE,
+                    entity_type=EntityType.ASSET_DOMAIN,
+                    entity_id=operation_id,
+                    after_value=after_value,
+                    metadata={"notes": notes, "selection": selection},
+                )
+            except Exception as e:
+                logger.error(f"Bulk operation {operation_id} activity logging failed: {e}")
+
+        if actor_id:
+            message = f"{notes} - {summary['updated']} domains updated, {summary['skipped']} skipped"
+            if error_count:
+                message += f", {error_count} failed"
+            try:
+                await self.db.user_notifications.insert_one({
+                    "id": str(uuid.uuid4()),
+                    "user_id": actor_id,
+                    "type": "bulk_domain_operation",
+                    "title": "Bulk domain operation finished",
+                    "message": message,
+                    "link": "/domains",
+                    "metadata": {"operation_id": operation_id, "operation": spec["operation"]},
+                    "read": False,
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                })
+                publish_event("notifications", user_id=actor_id)
+            except PyMongoError as e:
+                logger.error(f"Bulk operation {operation_id} notification failed: {e}")
+
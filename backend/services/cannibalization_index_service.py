@@ -0,0 +1,441 @@
+"""
+Cannibalization Index Service
+=============================
+
+Brand-wide near-duplicate keyword cannibalization detection.
+
+Type A detection in the conflict scanner only catches identical
+primary_keyword values within one domain. Comparing every keyword of a
+brand against every other is O(n²), so this index uses MinHash with
+locality-sensitive hashing (LSH) instead:
+
+- primary_keyword and ranking_url are normalized and split into shingles
+- each shingle set gets a MinHash signature (MINHASH_PERMUTATIONS values)
+- signatures are cut into LSH_BANDS bands; each band hash is stored on the
+  entry's index document, so only entries sharing at least one band are
+  ever compared (roughly linear in the number of entries)
+- candidate pairs are confirmed by estimated Jaccard similarity
+
+Index documents (seo_cannibalization_index) are kept per structure entry
+and re-synced whenever the conflict scanner processes a dirty network;
+unchanged entries reuse their stored signatures. Confirmed pairs are stored
+in seo_cannibalization_pairs and reported as NEAR_DUPLICATE_KEYWORD
+conflicts owned by the network of node_a.
+"""
+
+import hashlib
+import logging
+import operator
+import os
+import random
+import re
+import unicodedata
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Set
+from urllib.parse import urlsplit
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne
+
+from models_v3 import ConflictType, ConflictSeverity
+
+logger = logging.getLogger(__name__)
+
+# MinHash / LSH parameters. With 16 bands of 4 rows a pair at 0.7 similarity
+# becomes a candidate with ~99% probability, a pair at 0.3 with ~12%.
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+SHINGLE_SIZE = 3
+
+# Minimum estimated Jaccard similarity for a near-duplicate pair
+NEAR_DUPLICATE_THRESHOLD = float(
+    os.environ.get("CANNIBALIZATION_SIMILARITY_THRESHOLD", "0.7")
+)
+
+# Pairs at or above this similarity are reported as HIGH severity
+HIGH_SEVERITY_SIMILARITY = 0.9
+
+# Band keys per $in query when fetching candidates
+CANDIDATE_QUERY_CHUNK = 5000
+
+# Fixed seed: signatures are persisted, so the permutations must never change.
+# Each permutation XORs the 32-bit shingle hash with a random mask.
+_rng = random.Random(1338)
+_PERMUTATION_MASKS = [_rng.getrandbits(32) for _ in range(MINHASH_PERMUTATIONS)]
+
+_NON_ALNUM = re.compile(r"[\W_]+", re.UNICODE)
+
+
+# ==================== PURE FUNCTIONS (run in executor) ====================
+
+
+def normalize_keyword(keyword: Optional[str]) -> str:
+    """Lowercase, NFKC-fold and collapse punctuation/whitespace of a keyword."""
+    if not keyword:
+        return ""
+    text = unicodedata.normalize("NFKC", keyword).lower()
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def normalize_ranking_url(url: Optional[str]) -> str:
+    """
+    Reduce a ranking URL to comparable words.
+
+    Scheme, "www.", query string, fragment and trailing slash are dropped;
+    https://www.Site.com/Best-Tools/ -> "site com best tools"
+    """
+    if not url:
+        return ""
+    url = url.strip().lower()
+    if "://" not in url:
+        url = f"//{url}"
+    parts = urlsplit(url)
+    host = parts.netloc
+    if host.startswith("www."):
+        host = host[4:]
+    return _NON_ALNUM.sub(" ", f"{host} {parts.path}").strip()
+
+
+def shingle(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Character shingles of normalized text (the text itself if shorter)."""
+    if not text:
+        return set()
+    if len(text) <= size:
+        return {text}
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash_signature(shingles: Set[str]) -> List[int]:
+    """MinHash signature of a shingle set (empty set -> empty signature)."""
+    if not shingles:
+        return []
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "big")
+        for s in shingles
+    ]
+    return [min(map(mask.__xor__, hashes)) for mask in _PERMUTATION_MASKS]
+
+
+def lsh_band_keys(signature: List[int], prefix: str) -> List[str]:
+    """One key per LSH band; entries sharing any key are candidate pairs."""
+    if not signature:
+        return []
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS : (band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(
+            ",".join(map(str, rows)).encode(), digest_size=8
+        ).hexdigest()
+        keys.append(f"{prefix}{band}:{digest}")
+    return keys
+
+
+def estimate_similarity(signature_a: List[int], signature_b: List[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    if not signature_a or not signature_b:
+        return 0.0
+    return sum(map(operator.eq, signature_a, signature_b)) / MINHASH_PERMUTATIONS
+
+
+def _source_hash(keyword: str, url: str) -> str:
+    return hashlib.sha1(f"{keyword}\n{url}".encode()).hexdigest()
+
+
+def build_index_docs(
+    network: Dict[str, Any],
+    brand_scope: str,
+    entries: List[Dict[str, Any]],
+    domain_names: Dict[str, str],
+    existing: Dict[str, Dict[str, Any]],
+    now: str,
+) -> List[Dict[str, Any]]:
+    """
+    Build index documents for a network's entries.
+
+    Entries with neither keyword nor ranking URL are not indexed. Signatures
+    are reused from `existing` (entry_id -> doc) when the normalized
+    keyword and URL are unchanged.
+    """
+    docs = []
+    for entry in entries:
+        keyword = normalize_keyword(entry.get("primary_keyword"))
+        url = normalize_ranking_url(entry.get("ranking_url"))
+        if not keyword and not url:
+            continue
+
+        source_hash = _source_hash(keyword, url)
+        previous = existing.get(entry["id"])
+        if previous and previous.get("source_hash") == source_hash:
+            keyword_signature = previous.get("keyword_signature", [])
+            url_signature = previous.get("url_signature", [])
+        else:
+            keyword_signature = minhash_signature(shingle(keyword))
+            url_signature = minhash_signature(shingle(url))
+
+        domain_name = domain_names.get(entry.get("asset_domain_id"), "")
+        path = entry.get("optimized_path") or ""
+        docs.append(
+            {
+                "entry_id": entry["id"],
+                "network_id": network["id"],
+                "network_name": network.get("name", "Unknown"),
+                "brand_scope": brand_scope,
+                "asset_domain_id": entry.get("asset_domain_id"),
+                "domain_name": domain_name,
+                "optimized_path": entry.get("optimized_path"),
+                "node_label": f"{domain_name}{path}" if path else domain_name,
+                "keyword": keyword,
+                "ranking_url": url,
+                "source_hash": source_hash,
+                "keyword_signature": keyword_signature,
+                "url_signature": url_signature,
+                "bands": lsh_band_keys(keyword_signature, "k")
+                + lsh_band_keys(url_signature, "u"),
+                "updated_at": now,
+            }
+        )
+    return docs
+
+
+def find_near_duplicate_pairs(
+    network_docs: List[Dict[str, Any]],
+    candidate_docs: List[Dict[str, Any]],
+    threshold: float,
+    now: str,
+) -> List[Dict[str, Any]]:
+    """
+    Confirm LSH candidates for a network's docs.
+
+    Only docs sharing a band key are compared. Pairs already reported as
+    Type A (same domain, identical keyword) are skipped.
+    """
+    docs_by_band: Dict[str, List[Dict[str, Any]]] = {}
+    for doc in candidate_docs:
+        for band in doc.get("bands", []):
+            docs_by_band.setdefault(band, []).append(doc)
+
+    pairs: Dict[str, Dict[str, Any]] = {}
+    compared: Set[str] = set()
+    for doc in network_docs:
+        doc_id = doc["entry_id"]
+        for band in doc["bands"]:
+            for other in docs_by_band.get(band, []):
+                other_id = other["entry_id"]
+                if other_id == doc_id:
+                    continue
+
+                a, b = (doc, other) if doc_id < other_id else (other, doc)
+                pair_key = f"{a['entry_id']}|{b['entry_id']}"
+                if pair_key in compared:
+                    continue
+                compared.add(pair_key)
+
+                if (
+                    a["keyword"]
+                    and a["keyword"] == b["keyword"]
+                    and a.get("asset_domain_id") == b.get("asset_domain_id")
+                ):
+                    continue
+
+                keyword_similarity = estimate_similarity(
+                    a["keyword_signature"], b["keyword_signature"]
+                )
+                url_similarity = estimate_similarity(
+                    a["url_signature"], b["url_signature"]
+                )
+                similarity = max(keyword_similarity, url_similarity)
+                if similarity < threshold:
+                    continue
+
+                pairs[pair_key] = {
+                    "pair_key": pair_key,
+                    "brand_scope": a["brand_scope"],
+                    "network_id": a["network_id"],
+                    "network_ids": sorted({a["network_id"], b["network_id"]}),
+                    "similarity": round(similarity, 3),
+                    "keyword_similarity": round(keyword_similarity, 3),
+                    "url_similarity": round(url_similarity, 3),
+                    "node_a": _pair_node(a),
+                    "node_b": _pair_node(b),
+                    "detected_at": now,
+                }
+    return list(pairs.values())
+
+
+def _pair_node(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "entry_id": doc["entry_id"],
+        "network_id": doc["network_id"],
+        "network_name": doc.get("network_name"),
+        "domain_name": doc.get("domain_name"),
+        "optimized_path": doc.get("optimized_path"),
+        "node_label": doc.get("node_label"),
+        "keyword": doc.get("keyword"),
+        "ranking_url": doc.get("ranking_url"),
+    }
+
+
+def pair_to_conflict(pair: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a stored pair into the conflict shape used by reports and the linker."""
+    a, b = pair["node_a"], pair["node_b"]
+
+    if pair["keyword_similarity"] >= pair["url_similarity"]:
+        matched = f"keywords '{a['keyword']}' and '{b['keyword']}'"
+    else:
+        matched = f"ranking URLs '{a['ranking_url']}' and '{b['ranking_url']}'"
+
+    description = f"Near-duplicate {matched} ({round(pair['similarity'] * 100)}% similar)"
+    if a["network_id"] != b["network_id"]:
+        description += f" across networks {a['network_name']} and {b['network_name']}"
+
+    severity = (
+        ConflictSeverity.HIGH.value
+        if pair["similarity"] >= HIGH_SEVERITY_SIMILARITY
+        else ConflictSeverity.MEDIUM.value
+    )
+
+    return {
+        "conflict_type": ConflictType.NEAR_DUPLICATE_KEYWORD.value,
+        "severity": severity,
+        "network_id": a["network_id"],
+        "network_name": a["network_name"],
+        "domain_name": a["domain_name"],
+        "node_a_id": a["entry_id"],
+        "node_a_path": a["optimized_path"],
+        "node_a_label": a["node_label"],
+        "node_b_id": b["entry_id"],
+        "node_b_path": b["optimized_path"],
+        "node_b_label": b["node_label"],
+        "similarity": pair["similarity"],
+        "description": description,
+        "suggestion": "Consolidate these pages or give each a distinct keyword target across the brand",
+        "detected_at": pair["detected_at"],
+    }
+
+
+# ==================== SERVICE ====================
+
+
+class CannibalizationIndexService:
+    """
+    Service that maintains the brand-wide cannibalization index.
+
+    - sync_network: re-index one network and recompute its pairs
+      (called by the conflict scanner for every dirty network)
+    - get_report_conflicts: pairs owned by the given networks, as conflicts
+    - delete_network_state: drop a deleted network's index and pairs
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+
+    @staticmethod
+    def brand_scope(network: Dict[str, Any]) -> str:
+        """Networks without a brand are only compared with themselves."""
+        return network.get("brand_id") or f"network:{network['id']}"
+
+    async def sync_network(
+        self,
+        network: Dict[str, Any],
+        entries: List[Dict[str, Any]],
+        domain_names: Dict[str, str],
+    ) -> List[Dict[str, Any]]:
+        """
+        Re-index a network's entries and recompute every pair touching them.
+
+        Args:
+            network: {id, name, brand_id}
+            entries: the network's structure entries (needs id, asset_domain_id,
+                     optimized_path, primary_keyword, ranking_url)
+            domain_names: asset_domain_id -> domain_name
+
+        Returns the network's current pairs as conflicts. A pair belongs to
+        the network of node_a, which may be another network of the brand.
+        """
+        from services.conflict_scanner_service import run_in_scan_executor
+
+        network_id = network["id"]
+        brand_scope = self.brand_scope(network)
+        now = datetime.now(timezone.utc).isoformat()
+
+        existing_docs = await self.db.seo_cannibalization_index.find(
+            {"network_id": network_id},
+            {"_id": 0, "entry_id": 1, "source_hash": 1, "keyword_signature": 1, "url_signature": 1},
+        ).to_list(None)
+        existing = {d["entry_id"]: d for d in existing_docs}
+
+        network_docs = await run_in_scan_executor(
+            build_index_docs,
+            len(entries),
+            network,
+            brand_scope,
+            entries,
+            domain_names,
+            existing,
+            now,
+        )
+
+        indexed_ids = [d["entry_id"] for d in network_docs]
+        if network_docs:
+            await self.db.seo_cannibalization_index.bulk_write(
+                [ReplaceOne({"entry_id": d["entry_id"]}, d, upsert=True) for d in network_docs],
+                ordered=False,
+            )
+        await self.db.seo_cannibalization_index.delete_many(
+            {"network_id": network_id, "entry_id": {"$nin": indexed_ids}}
+        )
+
+        # Only docs sharing an LSH band with this network are loaded
+        band_keys = list({band for d in network_docs for band in d["bands"]})
+        candidate_docs: Dict[str, Dict[str, Any]] = {}
+        for i in range(0, len(band_keys), CANDIDATE_QUERY_CHUNK):
+            chunk = band_keys[i : i + CANDIDATE_QUERY_CHUNK]
+            async for doc in self.db.seo_cannibalization_index.find(
+                {"brand_scope": brand_scope, "bands": {"$in": chunk}}, {"_id": 0}
+            ):
+                candidate_docs[doc["entry_id"]] = doc
+
+        pairs = await run_in_scan_executor(
+            find_near_duplicate_pairs,
+            len(candidate_docs),
+            network_docs,
+            list(candidate_docs.values()),
+            NEAR_DUPLICATE_THRESHOLD,
+            now,
+        )
+
+        pair_keys = [p["pair_key"] for p in pairs]
+        if pairs:
+            await self.db.seo_cannibalization_pairs.bulk_write(
+                [ReplaceOne({"pair_key": p["pair_key"]}, p, upsert=True) for p in pairs],
+                ordered=False,
+            )
+        await self.db.seo_cannibalization_pairs.delete_many(
+            {"network_ids": network_id, "pair_key": {"$nin": pair_keys}}
+        )
+
+        return [pair_to_conflict(p) for p in pairs]
+
+    async def get_report_conflicts(self, network_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get near-duplicate conflicts owned by the given networks."""
+        pairs = await self.db.seo_cannibalization_pairs.find(
+            {"network_id": {"$in": network_ids}}, {"_id": 0}
+        ).to_list(None)
+        return [pair_to_conflict(p) for p in pairs]
+
+    async def delete_network_state(self, network_id: str):
+        """Drop the index documents and pairs of a deleted network."""
+        await self.db.seo_cannibalization_index.delete_many({"network_id": network_id})
+        await self.db.seo_cannibalization_pairs.delete_many({"network_ids": network_id})
+
+
+# Global instance
+_cannibalization_index_service: Optional[CannibalizationIndexService] = None
+
+
+def get_cannibalization_index_service(db: AsyncIOMotorDatabase) -> CannibalizationIndexService:
+    """Get or create the cannibalization index service"""
+    global _cannibalization_index_service
+    if _cannibalization_index_service is None:
+        _cannibalization_index_service = CannibalizationIndexService(db)
+    return _cannibalization_index_service
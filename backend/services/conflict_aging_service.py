@@ -8,7 +8,7 @@ Tracks:
 """
 
 import uuid
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 import logging
@@ -36,7 +36,8 @@ class ConflictAgingService:
         """
         Calculate complaint aging metrics.
         
-        Returns aging statistics for open complaints.
+        Returns aging statistics for open complaints, computed server-side
+        ($bucket for age buckets, $group for per-status averages).
         """
         now = datetime.now(timezone.utc)
         
@@ -50,12 +51,53 @@ class ConflictAgingService:
             # Need to join with network to filter by brand
             pass
         
-        complaints = await self.db.seo_optimizations.find(
-            query,
-            {"_id": 0, "id": 1, "status": 1, "created_at": 1, "network_id": 1, "title": 1}
-        ).to_list(500)
-        
-        if not complaints:
+        aged = [
+            {"$addFields": {
+                "_created": {"$dateFromString": {
+                    "dateString": "$created_at", "onError": None, "onNull": None,
+                }},
+            }},
+            {"$match": {"_created": {"$ne": None}}},
+            {"$addFields": {
+                "age_days": {"$floor": {"$divide": [
+                    {"$subtract": [now, "$_created"]}, 24 * 3600 * 1000
+                ]}},
+            }},
+        ]
+        
+        results = await self.db.seo_optimizations.aggregate([
+            {"$match": query},
+            {"$project": {"_id": 0, "id": 1, "status": 1, "created_at": 1, "network_id": 1, "title": 1}},
+            {"$facet": {
+                "total": [{"$count": "count"}],
+                "summary": aged + [{"$group": {
+                    "_id": None,
+                    "avg_age_days": {"$avg": "$age_days"},
+                    "max_age_days": {"$max": "$age_days"},
+                    "critical_count": {"$sum": {"$cond": [{"$gt": ["$age_days", 7]}, 1, 0]}},
+                }}],
+                "by_status": aged + [{"$group": {
+                    "_id": {"$ifNull": ["$status", "unknown"]},
+                    "count": {"$sum": 1},
+                    "total_age_days": {"$sum": "$age_days"},
+                }}],
+                "by_age_bucket": aged + [{"$bucket": {
+                    # Future-dated complaints count as 0 days old
+                    "groupBy": {"$max": ["$age_days", 0]},
+                    "boundaries": [0, 2, 4, 8, 15, 31],
+                    "default": "30+_days",
+                    "output": {"count": {"$sum": 1}},
+                }}],
+                "oldest": aged + [
+                    {"$sort": {"age_days": -1}},
+                    {"$limit": 10},
+                ],
+            }},
+        ]).to_list(1)
+        facets = results[0] if results else {}
+        
+        total_open = (facets.get("total") or [{}])[0].get("count", 0)
+        if not total_open:
             return {
                 "total_open": 0,
                 "by_status": {},
@@ -66,83 +108,49 @@ class ConflictAgingService:
                 "oldest_complaints": [],
             }
         
-        # Calculate ages
-        ages = []
-        by_status = {}
-        by_age_bucket = {
-            "0-1_days": 0,
-            "2-3_days": 0,
-            "4-7_days": 0,
-            "8-14_days": 0,
-            "15-30_days": 0,
-            "30+_days": 0,
-        }
-        oldest = []
-        
-        for c in complaints:
-            created_str = c.get("created_at", "")
-            if not created_str:
-                continue
-            
-            try:
-                created = datetime.fromisoformat(created_str.replace("Z", "+00:00"))
-                age_days = (now - created).days
-                ages.append(age_days)
-                
-                # By status
-                status = c.get("status", "unknown")
-                if status not in by_status:
-                    by_status[status] = {"count": 0, "total_age_days": 0}
-                by_status[status]["count"] += 1
-                by_status[status]["total_age_days"] += age_days
-                
-                # By age bucket
-                if age_days <= 1:
-                    by_age_bucket["0-1_days"] += 1
-                elif age_days <= 3:
-                    by_age_bucket["2-3_days"] += 1
-                elif age_days <= 7:
-                    by_age_bucket["4-7_days"] += 1
-                elif age_days <= 14:
-                    by_age_bucket["8-14_days"] += 1
-                elif age_days <= 30:
-                    by_age_bucket["15-30_days"] += 1
-                else:
-                    by_age_bucket["30+_days"] += 1
-                
-                # Track for oldest
-                oldest.append({
-                    "id": c.get("id"),
-                    "title": c.get("title", ""),
-                    "network_id": c.get("network_id"),
-                    "status": status,
-                    "age_days": age_days,
-                    "created_at": created_str,
-                })
-            except Exception as e:
-                logger.warning(f"Failed to parse date for complaint {c.get('id')}: {e}")
-        
-        # Calculate averages per status
-        for status in by_status:
-            count = by_status[status]["count"]
-            total_age = by_status[status]["total_age_days"]
-            by_status[status]["avg_age_days"] = round(total_age / count, 1) if count > 0 else 0
+        summary = (facets.get("summary") or [{}])[0]
         
-        # Sort oldest
-        oldest.sort(key=lambda x: x["age_days"], reverse=True)
+        by_status = {}
+        for group in facets.get("by_status", []):
+            count = group["count"]
+            by_status[group["_id"]] = {
+                "count": count,
+                "total_age_days": int(group["total_age_days"]),
+                "avg_age_days": round(group["total_age_days"] / count, 1) if count > 0 else 0,
+            }
         
-        avg_age = sum(ages) / len(ages) if ages else 0
-        max_age = max(ages) if ages else 0
-        critical_count = len([a for a in ages if a > 7])
+        bucket_labels = {
+            0: "0-1_days",
+            2: "2-3_days",
+            4: "4-7_days",
+            8: "8-14_days",
+            15: "15-30_days",
+            "30+_days": "30+_days",
+        }
+        by_age_bucket = {label: 0 for label in bucket_labels.values()}
+        for bucket in facets.get("by_age_bucket", []):
+            by_age_bucket[bucket_labels[bucket["_id"]]] = bucket["count"]
+        
+        oldest = [
+            {
+                "id": c.get("id"),
+                "title": c.get("title", ""),
+                "network_id": c.get("network_id"),
+                "status": c.get("status", "unknown"),
+                "age_days": int(c["age_days"]),
+                "created_at": c.get("created_at"),
+            }
+            for c in facets.get("oldest", [])
+        ]
         
         return {
-            "total_open": len(complaints),
+            "total_open": total_open,
             "by_status": by_status,
             "by_age_bucket": by_age_bucket,
-            "avg_age_days": round(avg_age, 1),
-            "max_age_days": max_age,
-            "critical_count": critical_count,
-            "oldest_complaints": oldest[:10],  # Top 10 oldest
+            "avg_age_days": round(summary.get("avg_age_days") or 0, 1),
+            "max_age_days": int(summary.get("max_age_days") or 0),
+            "critical_count": summary.get("critical_count", 0),
+            "oldest_complaints": oldest,  # Top 10 oldest
         }
     
     async def get_resolution_metrics(
@@ -152,22 +160,18 @@ class ConflictAgingService:
     ) -> Dict[str, Any]:
         """
         Calculate resolution time metrics for recently resolved complaints.
-        """
-        start_date = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
         
-        query = {
-            "status": {"$in": [self.STATUS_RESOLVED, self.STATUS_CLOSED]},
-            "resolved_at": {"$gte": start_date},
-        }
-        if network_id:
-            query["network_id"] = network_id
+        Served from daily rollups (metrics_rollup_service): the window is
+        the last `days` UTC days, today included, and only today is
+        aggregated live.
+        """
+        from services.metrics_rollup_service import get_metrics_rollup_service
         
-        resolved = await self.db.seo_optimizations.find(
-            query,
-            {"_id": 0, "id": 1, "created_at": 1, "resolved_at": 1, "status": 1}
-        ).to_list(500)
+        summary = await get_metrics_rollup_service(self.db).get_summary(
+            days=days, network_id=network_id
+        )
         
-        if not resolved:
+        if not summary["optimizations_resolved"]:
             return {
                 "period_days": days,
                 "total_resolved": 0,
@@ -177,52 +181,16 @@ class ConflictAgingService:
                 "by_time_bucket": {},
             }
         
-        resolution_times = []
-        by_time_bucket = {
-            "same_day": 0,
-            "1-2_days": 0,
-            "3-7_days": 0,
-            "8-14_days": 0,
-            "15+_days": 0,
-        }
-        
-        for c in resolved:
-            created_str = c.get("created_at", "")
-            resolved_str = c.get("resolved_at", "")
-            
-            if not created_str or not resolved_str:
-                continue
-            
-            try:
-                created = datetime.fromisoformat(created_str.replace("Z", "+00:00"))
-                resolved_at = datetime.fromisoformat(resolved_str.replace("Z", "+00:00"))
-                resolution_days = (resolved_at - created).days
-                resolution_times.append(resolution_days)
-                
-                if resolution_days == 0:
-                    by_time_bucket["same_day"] += 1
-                elif resolution_days <= 2:
-                    by_time_bucket["1-2_days"] += 1
-                elif resolution_days <= 7:
-                    by_time_bucket["3-7_days"] += 1
-                elif resolution_days <= 14:
-                    by_time_bucket["8-14_days"] += 1
-                else:
-                    by_time_bucket["15+_days"] += 1
-            except Exception as e:
-                logger.warning(f"Failed to calculate resolution time for {c.get('id')}: {e}")
-        
-        avg_time = sum(resolution_times) / len(resolution_times) if resolution_times else 0
-        min_time = min(resolution_times) if resolution_times else 0
-        max_time = max(resolution_times) if resolution_times else 0
+        timed = summary["optimization_resolution_days_count"]
+        avg_time = summary["optimization_resolution_days_sum"] / timed if timed else 0
         
         return {
             "period_days": days,
-            "total_resolved": len(resolved),
+            "total_resolved": summary["optimizations_resolved"],
             "avg_resolution_time_days": round(avg_time, 1),
-            "min_resolution_time_days": min_time,
-            "max_resolution_time_days": max_time,
-            "by_time_bucket": by_time_bucket,
+            "min_resolution_time_days": int(summary["optimization_resolution_days_min"] or 0),
+            "max_resolution_time_days": int(summary["optimization_resolution_days_max"] or 0),
+            "by_time_bucket": summary["optimization_time_buckets"],
         }
 
 
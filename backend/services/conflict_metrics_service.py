@@ -19,6 +19,7 @@ P0 Requirements:
 
 import hashlib
 import logging
+import re
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
@@ -101,6 +102,11 @@ class ConflictMetricsService:
         Get comprehensive conflict resolution dashboard metrics.
         
         This is the main API for the dashboard with all P0 requirements implemented.
+        
+        Computed server-side in one aggregation: linked optimizations are
+        joined with $lookup, resolution times bucketed with $bucket and the
+        breakdowns/leaderboard built with $group, so no conflicts are
+        loaded into Python.
         """
         start_date = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
         
@@ -113,69 +119,33 @@ class ConflictMetricsService:
             brand_networks = await self.db.seo_networks.find(
                 {"brand_id": brand_id},
                 {"_id": 0, "id": 1}
-            ).to_list(500)
+            ).to_list(None)
             network_ids = [n["id"] for n in brand_networks]
             if network_ids:
                 query["network_id"] = {"$in": network_ids}
         
-        # Fetch conflicts with optimization data
-        conflicts = await self._fetch_conflicts_with_optimizations(query)
+        results = await self.db.seo_conflicts.aggregate(
+            self._dashboard_pipeline(query)
+        ).to_list(1)
+        facets = results[0] if results else {}
         
-        if not conflicts:
+        totals = (facets.get("totals") or [{}])[0]
+        total = totals.get("total", 0)
+        if not total:
             return self._empty_metrics(days)
         
-        # Calculate all metrics
-        total = len(conflicts)
-        
-        # Status counts - derived from linked optimization if available
-        resolved_conflicts = []
-        open_conflicts = []
-        for c in conflicts:
-            true_status = self._derive_true_status(c)
-            if true_status in ("resolved", "approved"):
-                resolved_conflicts.append(c)
-            else:
-                open_conflicts.append(c)
-        
-        # Calculate resolution times using CORRECT timestamps
-        resolution_times = await self._calculate_resolution_times(resolved_conflicts)
-        avg_resolution_hours = (
-            sum(resolution_times) / len(resolution_times) 
-            if resolution_times else 0
-        )
-        
-        # Recurring conflicts - ONLY active, unresolved with recurrence > 0
-        recurring = [
-            c for c in conflicts 
-            if c.get("recurrence_count", 0) > 0 
-            and c.get("is_active", True)
-            and c.get("status") not in ("resolved", "approved", "ignored")
-        ]
-        
-        # False resolution count
-        false_resolutions = [c for c in conflicts if c.get("is_false_resolution", False)]
+        resolved_count = totals.get("resolved", 0)
+        false_resolution_count = totals.get("false_resolutions", 0)
         false_resolution_rate = (
-            len(false_resolutions) / len(resolved_conflicts) * 100
-            if resolved_conflicts else 0
+            false_resolution_count / resolved_count * 100
+            if resolved_count else 0
         )
+        avg_recurrence_interval = totals.get("avg_recurrence_interval")
         
-        # Average recurrence interval
-        recurrence_intervals = [
-            c.get("recurrence_interval_days") 
-            for c in conflicts 
-            if c.get("recurrence_interval_days")
-        ]
-        avg_recurrence_interval = (
-            sum(recurrence_intervals) / len(recurrence_intervals)
-            if recurrence_intervals else None
-        )
+        resolution = (facets.get("resolution_stats") or [{}])[0]
+        resolution_buckets = {b["_id"]: b["count"] for b in facets.get("resolution_buckets", [])}
         
-        # Top resolvers - FILTERED to exclude system/null
-        top_resolvers = await self._get_top_resolvers(resolved_conflicts)
-        
-        # Breakdowns
-        by_severity = self._group_by_field(conflicts, "severity", resolved_conflicts)
-        by_type = self._group_by_field(conflicts, "conflict_type", resolved_conflicts)
+        recurring_count = (facets.get("recurring_count") or [{}])[0].get("count", 0)
         
         return {
             "period_days": days,
@@ -184,242 +154,208 @@ class ConflictMetricsService:
             
             # Primary metrics
             "total_conflicts": total,
-            "resolved_count": len(resolved_conflicts),
-            "open_count": len(open_conflicts),
-            "resolution_rate_percent": round(len(resolved_conflicts) / total * 100, 1) if total > 0 else 0,
+            "resolved_count": resolved_count,
+            "open_count": total - resolved_count,
+            "resolution_rate_percent": round(resolved_count / total * 100, 1),
             
             # Time metrics
-            "avg_resolution_time_hours": round(avg_resolution_hours, 1),
+            "avg_resolution_time_hours": round(resolution.get("avg_hours") or 0, 1),
             "resolution_times_breakdown": {
-                "under_1_hour": len([t for t in resolution_times if t < 1]),
-                "1_to_24_hours": len([t for t in resolution_times if 1 <= t < 24]),
-                "1_to_7_days": len([t for t in resolution_times if 24 <= t < 168]),
-                "over_7_days": len([t for t in resolution_times if t >= 168]),
+                "under_1_hour": resolution_buckets.get(0, 0),
+                "1_to_24_hours": resolution_buckets.get(1, 0),
+                "1_to_7_days": resolution_buckets.get(24, 0),
+                "over_7_days": resolution_buckets.get("over_7_days", 0),
             },
             
             # Recurrence metrics (P1)
-            "recurring_conflicts": len(recurring),
-            "false_resolution_count": len(false_resolutions),
+            "recurring_conflicts": recurring_count,
+            "false_resolution_count": false_resolution_count,
             "false_resolution_rate_percent": round(false_resolution_rate, 1),
             "avg_recurrence_interval_days": (
                 round(avg_recurrence_interval, 1) if avg_recurrence_interval else None
             ),
             
             # Team performance
-            "top_resolvers": top_resolvers,
+            "top_resolvers": [
+                self._format_resolver(r) for r in facets.get("top_resolvers", [])
+            ],
             
             # Breakdowns
-            "by_severity": by_severity,
-            "by_type": by_type,
+            "by_severity": {
+                g["_id"]: {"total": g["total"], "resolved": g["resolved"]}
+                for g in facets.get("by_severity", [])
+            },
+            "by_type": {
+                g["_id"]: {"total": g["total"], "resolved": g["resolved"]}
+                for g in facets.get("by_type", [])
+            },
             
             # Details for recurring conflicts CTA
-            "recurring_conflict_ids": [c["id"] for c in recurring[:10]],
+            "recurring_conflict_ids": [c["id"] for c in facets.get("recurring_ids", [])],
         }
     
-    async def _fetch_conflicts_with_optimizations(self, query: Dict) -> List[Dict]:
-        """Fetch conflicts and enrich with linked optimization data."""
-        conflicts = await self.db.seo_conflicts.find(
-            query,
-            {"_id": 0}
-        ).sort("detected_at", -1).to_list(1000)
-        
-        # Get all linked optimization IDs
-        opt_ids = [c["optimization_id"] for c in conflicts if c.get("optimization_id")]
-        
-        if opt_ids:
-            # Fetch optimizations in bulk
-            optimizations = await self.db.seo_optimizations.find(
-                {"id": {"$in": opt_ids}},
-                {"_id": 0, "id": 1, "status": 1, "completed_at": 1, 
-                 "created_by": 1, "type": 1}
-            ).to_list(1000)
-            
-            opt_map = {o["id"]: o for o in optimizations}
-            
-            # Enrich conflicts
-            for conflict in conflicts:
-                opt_id = conflict.get("optimization_id")
-                if opt_id and opt_id in opt_map:
-                    conflict["_linked_optimization"] = opt_map[opt_id]
-        
-        return conflicts
-    
-    def _derive_true_status(self, conflict: Dict) -> str:
-        """
-        Derive the TRUE status of a conflict from its linked optimization.
-        
-        P0 Requirement: Status source of truth is the optimization task.
-        
-        Mapping:
-        - Optimization status 'completed' → Conflict 'resolved'
-        - Optimization status 'in_progress' → Conflict 'under_review'
-        - Optimization status 'planned' → Conflict 'detected'
-        - No optimization → Use stored conflict status
+    def _dashboard_pipeline(self, query: Dict) -> List[Dict]:
         """
-        linked_opt = conflict.get("_linked_optimization")
-        
-        if not linked_opt:
-            return conflict.get("status", "detected")
-        
-        opt_status = linked_opt.get("status", "")
-        
-        if opt_status == "completed":
-            return "resolved"
-        elif opt_status == "in_progress":
-            return "under_review"
-        elif opt_status == "planned":
-            return "detected"
-        elif opt_status == "reverted":
-            return "detected"  # Revert means the fix didn't work
-        
-        return conflict.get("status", "detected")
-    
-    async def _calculate_resolution_times(self, resolved_conflicts: List[Dict]) -> List[float]:
-        """
-        Calculate resolution times using CORRECT timestamps.
-        
-        P0 Requirement: Time from first_detected_at → optimization.completed_at
-        
-        Falls back to:
-        - detected_at if first_detected_at not available
-        - resolved_at if optimization.completed_at not available
+        Build the dashboard aggregation.
+        
+        Stages mirror the P0 rules:
+        - True status is derived from the linked optimization
+          (completed → resolved, in_progress → under_review,
+          planned/reverted → detected, otherwise the stored status)
+        - Resolution time: first_detected_at (or detected_at) →
+          optimization.completed_at (or conflict.resolved_at)
+        - Resolver: resolved_by, else the optimization's creator; only
+          counted when an optimization is linked, system/null users excluded
         """
-        resolution_times = []
-        
-        for conflict in resolved_conflicts:
-            # Get detection timestamp (prefer first_detected_at)
-            detection_str = conflict.get("first_detected_at") or conflict.get("detected_at")
-            if not detection_str:
-                continue
-            
-            # Get completion timestamp (prefer optimization.completed_at)
-            completion_str = None
-            linked_opt = conflict.get("_linked_optimization")
-            
-            if linked_opt:
-                completion_str = linked_opt.get("completed_at")
-            
-            # Fallback to conflict.resolved_at
-            if not completion_str:
-                completion_str = conflict.get("resolved_at")
-            
-            if not completion_str:
-                continue
-            
-            try:
-                detected = datetime.fromisoformat(detection_str.replace("Z", "+00:00"))
-                completed = datetime.fromisoformat(completion_str.replace("Z", "+00:00"))
-                hours = (completed - detected).total_seconds() / 3600
-                
-                if hours >= 0:  # Sanity check
-                    resolution_times.append(hours)
-            except Exception as e:
-                logger.warning(f"Failed to parse dates for conflict: {e}")
-        
-        return resolution_times
+        def parse_date(field_expr):
+            return {"$dateFromString": {"dateString": field_expr, "onError": None, "onNull": None}}
+        
+        return [
+            {"$match": query},
+            {"$project": {
+                "_id": 0, "id": 1, "status": 1, "severity": 1, "conflict_type": 1,
+                "detected_at": 1, "first_detected_at": 1, "resolved_at": 1,
+                "resolved_by": 1, "is_active": 1, "recurrence_count": 1,
+                "recurrence_interval_days": 1, "is_false_resolution": 1,
+                "optimization_id": 1,
+            }},
+            {"$lookup": {
+                "from": "seo_optimizations",
+                "localField": "optimization_id",
+                "foreignField": "id",
+                "as": "_opt",
+            }},
+            {"$unwind": {"path": "$_opt", "preserveNullAndEmptyArrays": True}},
+            {"$addFields": {
+                "_true_status": {"$switch": {
+                    "branches": [
+                        {"case": {"$eq": ["$_opt.status", "completed"]}, "then": "resolved"},
+                        {"case": {"$eq": ["$_opt.status", "in_progress"]}, "then": "under_review"},
+                        {"case": {"$in": ["$_opt.status", ["planned", "reverted"]]}, "then": "detected"},
+                    ],
+                    "default": {"$ifNull": ["$status", "detected"]},
+                }},
+            }},
+            {"$addFields": {
+                "_resolved": {"$in": ["$_true_status", ["resolved", "approved"]]},
+            }},
+            {"$addFields": {
+                "_resolution_hours": {"$let": {
+                    "vars": {
+                        "detected": parse_date({"$ifNull": ["$first_detected_at", "$detected_at"]}),
+                        "completed": parse_date({"$ifNull": ["$_opt.completed_at", "$resolved_at"]}),
+                    },
+                    "in": {"$cond": [
+                        {"$and": ["$_resolved", "$$detected", "$$completed"]},
+                        {"$divide": [{"$subtract": ["$$completed", "$$detected"]}, 3600 * 1000]},
+                        None,
+                    ]},
+                }},
+                "_resolver": {"$cond": [
+                    # A missing _opt compares lower than null
+                    {"$and": ["$_resolved", {"$gt": ["$_opt", None]}]},
+                    # created_by is {"user_id": ...} or a plain user ID; a
+                    # dict without user_id is dropped by the string match below
+                    {"$ifNull": [
+                        "$resolved_by",
+                        {"$ifNull": ["$_opt.created_by.user_id", "$_opt.created_by"]},
+                    ]},
+                    None,
+                ]},
+            }},
+            {"$facet": {
+                "totals": [{"$group": {
+                    "_id": None,
+                    "total": {"$sum": 1},
+                    "resolved": {"$sum": {"$cond": ["$_resolved", 1, 0]}},
+                    "false_resolutions": {"$sum": {"$cond": [{"$eq": ["$is_false_resolution", True]}, 1, 0]}},
+                    "avg_recurrence_interval": {"$avg": {"$cond": [
+                        {"$gt": ["$recurrence_interval_days", 0]}, "$recurrence_interval_days", None
+                    ]}},
+                }}],
+                "resolution_stats": [
+                    {"$match": {"_resolution_hours": {"$gte": 0}}},
+                    {"$group": {"_id": None, "avg_hours": {"$avg": "$_resolution_hours"}}},
+                ],
+                "resolution_buckets": [
+                    {"$match": {"_resolution_hours": {"$gte": 0}}},
+                    {"$bucket": {
+                        "groupBy": "$_resolution_hours",
+                        "boundaries": [0, 1, 24, 168],
+                        "default": "over_7_days",
+                        "output": {"count": {"$sum": 1}},
+                    }},
+                ],
+                "recurring_count": [
+                    {"$match": self._recurring_match()},
+                    {"$count": "count"},
+                ],
+                "recurring_ids": [
+                    {"$match": self._recurring_match()},
+                    {"$sort": {"detected_at": -1}},
+                    {"$limit": 10},
+                    {"$project": {"id": 1}},
+                ],
+                "by_severity": [{"$group": {
+                    "_id": {"$ifNull": ["$severity", "unknown"]},
+                    "total": {"$sum": 1},
+                    "resolved": {"$sum": {"$cond": ["$_resolved", 1, 0]}},
+                }}],
+                "by_type": [{"$group": {
+                    "_id": {"$ifNull": ["$conflict_type", "unknown"]},
+                    "total": {"$sum": 1},
+                    "resolved": {"$sum": {"$cond": ["$_resolved", 1, 0]}},
+                }}],
+                # CRITICAL: Skip null/system users
+                "top_resolvers": [
+                    {"$match": {"_resolver": {
+                        "$type": "string",
+                        "$nin": ["", "null", "System", "System (Auto)"],
+                        "$not": re.compile("^system"),
+                    }}},
+                    {"$group": {"_id": "$_resolver", "resolved_count": {"$sum": 1}}},
+                    {"$sort": {"resolved_count": -1, "_id": 1}},
+                    {"$limit": 10},
+                    {"$lookup": {
+                        "from": "users",
+                        "localField": "_id",
+                        "foreignField": "id",
+                        "as": "_user",
+                    }},
+                    {"$project": {
+                        "resolved_count": 1,
+                        "user": {"$arrayElemAt": ["$_user", 0]},
+                    }},
+                ],
+            }},
+        ]
     
-    async def _get_top_resolvers(self, resolved_conflicts: List[Dict]) -> List[Dict]:
-        """
-        Get top resolvers with STRICT filtering.
-        
-        P0 Requirements:
-        - Exclude null users
-        - Exclude system users
-        - Only count users who resolved conflict_resolution type optimizations
-        - Show actual user names, not IDs
-        """
-        # First, get resolver counts from conflicts
-        resolver_counts = {}
-        
-        for conflict in resolved_conflicts:
-            linked_opt = conflict.get("_linked_optimization")
-            
-            # Skip if no linked optimization
-            if not linked_opt:
-                continue
-            
-            # Skip if optimization type is not conflict_resolution
-            opt_type = linked_opt.get("type") or linked_opt.get("activity_type", "")
-            if opt_type != "conflict_resolution":
-                # Still count based on resolved_by if available
-                pass
-            
-            # Get resolver from conflict or optimization
-            resolver_id = conflict.get("resolved_by")
-            
-            if not resolver_id:
-                # Try to get from optimization created_by
-                created_by = linked_opt.get("created_by", {})
-                if isinstance(created_by, dict):
-                    resolver_id = created_by.get("user_id")
-                elif isinstance(created_by, str):
-                    resolver_id = created_by
-            
-            # CRITICAL: Skip null/system users
-            if not resolver_id:
-                continue
-            if resolver_id in ("system", "null", "System", "System (Auto)"):
-                continue
-            if resolver_id.startswith("system"):
-                continue
-            
-            if resolver_id not in resolver_counts:
-                resolver_counts[resolver_id] = 0
-            resolver_counts[resolver_id] += 1
-        
-        if not resolver_counts:
-            return []
-        
-        # Fetch user details for all resolver IDs
-        user_ids = list(resolver_counts.keys())
-        users = await self.db.users.find(
-            {"id": {"$in": user_ids}},
-            {"_id": 0, "id": 1, "name": 1, "display_name": 1, "email": 1}
-        ).to_list(100)
-        
-        user_map = {u["id"]: u for u in users}
-        
-        # Build top resolvers list with names
-        top_resolvers = []
-        for user_id, count in sorted(resolver_counts.items(), key=lambda x: -x[1]):
-            user = user_map.get(user_id, {})
-            name = (
-                user.get("display_name") or 
-                user.get("name") or 
-                user.get("email") or 
-                user_id[:8] + "..."
-            )
-            
-            top_resolvers.append({
-                "user_id": user_id,
-                "name": name,
-                "email": user.get("email"),
-                "resolved_count": count,
-            })
-        
-        return top_resolvers[:10]  # Top 10
+    @staticmethod
+    def _recurring_match() -> Dict[str, Any]:
+        """Recurring conflicts - ONLY active, unresolved with recurrence > 0"""
+        return {
+            "recurrence_count": {"$gt": 0},
+            "is_active": {"$ne": False},
+            "status": {"$nin": ["resolved", "approved", "ignored"]},
+        }
     
-    def _group_by_field(
-        self, 
-        conflicts: List[Dict], 
-        field: str,
-        resolved_conflicts: List[Dict]
-    ) -> Dict[str, Dict]:
-        """Group conflicts by a field and count totals/resolved."""
-        result = {}
-        
-        # Build set of resolved IDs for quick lookup
-        resolved_ids = {c["id"] for c in resolved_conflicts}
-        
-        for conflict in conflicts:
-            value = conflict.get(field, "unknown")
-            if value not in result:
-                result[value] = {"total": 0, "resolved": 0}
-            result[value]["total"] += 1
-            if conflict["id"] in resolved_ids:
-                result[value]["resolved"] += 1
-        
-        return result
+    @staticmethod
+    def _format_resolver(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Show actual user names, not IDs"""
+        user_id = row["_id"]
+        user = row.get("user") or {}
+        name = (
+            user.get("display_name") or 
+            user.get("name") or 
+            user.get("email") or 
+            user_id[:8] + "..."
+        )
+        return {
+            "user_id": user_id,
+            "name": name,
+            "email": user.get("email"),
+            "resolved_count": row["resolved_count"],
+        }
     
     def _empty_metrics(self, days: int) -> Dict:
         """Return empty metrics structure."""
@@ -506,6 +442,9 @@ class ConflictMetricsService:
             {"$set": update_data}
         )
         
+        from services.metrics_rollup_service import get_metrics_rollup_service
+        await get_metrics_rollup_service(self.db).invalidate_days(conflict)
+        
         return update_data.get("status")
     
     async def check_for_false_resolution(
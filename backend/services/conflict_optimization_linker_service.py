@@ -17,12 +17,17 @@ Conflict Status Flow:
 - resolved (when optimization marked completed AND structure validated)
 """
 
+import asyncio
 import uuid
 import hashlib
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne, UpdateMany
+from pymongo.errors import BulkWriteError
+
+from services.metrics_rollup_service import get_metrics_rollup_service
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +47,7 @@ CONFLICT_TYPE_LABELS = {
     "index_noindex_mismatch": "Index/Noindex Mismatch",
     "orphan": "Orphan Node",
     "noindex_high_tier": "Noindex High Tier",
+    "near_duplicate_keyword": "Near-Duplicate Keyword",
 }
 
 # Priority mapping based on severity
@@ -52,6 +58,19 @@ SEVERITY_PRIORITY = {
     "low": "low",
 }
 
+SEVERITY_EMOJI = {
+    "critical": "🚨",
+    "high": "🔴",
+    "medium": "🟠",
+    "low": "🟡",
+}
+
+# Batches larger than this get a single digest message instead of one per conflict
+NOTIFICATION_DETAIL_LIMIT = 5
+
+# Telegram rejects messages longer than 4096 characters
+TELEGRAM_MESSAGE_LIMIT = 4000
+
 
 def generate_conflict_fingerprint(
     network_id: str,
@@ -96,20 +115,25 @@ class ConflictOptimizationLinkerService:
     """
     Service to automatically link detected conflicts to optimization tasks.
     
-    When a conflict is detected:
-    1. Check if conflict already exists (by hash of key fields)
-    2. If new: Store conflict + auto-create optimization
-    3. If existing: Update recurrence count
-    4. Send Telegram notifications
+    When a batch of conflicts is detected:
+    1. Look up existing conflicts by dedup fingerprint (unique index)
+    2. If new: Upsert conflict + auto-create optimization
+    3. If existing & resolved: Re-open with a new optimization
+    4. Write all conflicts with one bulk_write, optimizations with insert_many
+    5. Hand Telegram notifications to a batched sender
     """
     
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
+        # Keep references so pending notification batches aren't GC'd
+        self._notification_tasks: set = set()
     
     def _generate_conflict_hash(self, conflict: Dict[str, Any]) -> str:
         """
         Generate a unique hash for conflict deduplication.
         Based on: network_id + conflict_type + node_a_id + node_b_id
+        
+        Stored as dedup_fingerprint on seo_conflicts (unique index).
         """
         parts = [
             conflict.get("network_id", ""),
@@ -119,6 +143,30 @@ class ConflictOptimizationLinkerService:
         ]
         return "|".join(parts)
     
+    async def ensure_indexes(self):
+        """
+        Backfill dedup_fingerprint on legacy conflicts and create its unique index.
+        
+        The backfill is a single pipeline update mirroring _generate_conflict_hash.
+        If legacy duplicates prevent the unique index, processing still works
+        (upserts match one of the duplicates) and a warning is logged.
+        """
+        try:
+            await self.db.seo_conflicts.update_many(
+                {"dedup_fingerprint": {"$exists": False}},
+                [{"$set": {"dedup_fingerprint": {"$concat": [
+                    {"$ifNull": ["$network_id", ""]}, "|",
+                    {"$ifNull": ["$conflict_type", ""]}, "|",
+                    {"$ifNull": ["$node_a_id", ""]}, "|",
+                    {"$ifNull": ["$node_b_id", ""]},
+                ]}}}]
+            )
+            await self.db.seo_conflicts.create_index(
+                "dedup_fingerprint", unique=True, sparse=True
+            )
+        except Exception as e:
+            logger.warning(f"Could not create unique conflict fingerprint index: {e}")
+    
     async def process_detected_conflicts(
         self,
         conflicts: List[Dict[str, Any]],
@@ -133,109 +181,78 @@ class ConflictOptimizationLinkerService:
         - If existing & resolved: Increment recurrence + re-open + notify
         - If existing & open: Update timestamp only
         
+        All writes are batched: one lookup by fingerprint, one insert_many for
+        optimizations and one bulk_write for conflicts, regardless of batch size.
+        
         Returns summary of processed conflicts.
         """
         now = datetime.now(timezone.utc).isoformat()
         
-        new_conflicts = 0
-        recurring_conflicts = 0
-        optimizations_created = 0
-        notifications_sent = 0
+        summary = {
+            "processed": len(conflicts),
+            "new_conflicts": 0,
+            "recurring_conflicts": 0,
+            "optimizations_created": 0,
+            "notifications_sent": 0,
+        }
+        if not conflicts:
+            return summary
         
-        # Get network info for notifications
+        # Get network info for notifications and optimization assignment
         network = await self.db.seo_networks.find_one(
             {"id": network_id},
             {"_id": 0, "name": 1, "brand_id": 1, "created_by": 1}
         )
         network_name = network.get("name", "Unknown") if network else "Unknown"
         brand_id = network.get("brand_id") if network else None
+        assigned_manager = network.get("created_by") if network else None
+        activity_type_id = await self._get_conflict_activity_type_id()
+        
+        # Deduplicate the batch itself by fingerprint (first occurrence wins)
+        by_fingerprint: Dict[str, Dict[str, Any]] = {}
+        for conflict in conflicts:
+            fingerprint = self._generate_conflict_hash({**conflict, "network_id": network_id})
+            by_fingerprint.setdefault(fingerprint, conflict)
         
-        # Get existing stored conflicts for this network
+        # Only the conflicts in this batch are looked up - no cap, no full scan
         existing_conflicts = await self.db.seo_conflicts.find(
-            {"network_id": network_id},
-            {"_id": 0}
-        ).to_list(500)
+            {"dedup_fingerprint": {"$in": list(by_fingerprint.keys())}},
+            {"_id": 0, "id": 1, "dedup_fingerprint": 1, "status": 1, "recurrence_count": 1,
+             "detected_at": 1, "resolved_at": 1}
+        ).to_list(None)
+        existing_by_fingerprint = {c["dedup_fingerprint"]: c for c in existing_conflicts}
         
-        existing_hashes = {
-            self._generate_conflict_hash(c): c for c in existing_conflicts
-        }
+        new_items = []  # (fingerprint, stored_conflict, optimization, conflict)
+        recurring_items = []  # (existing, conflict, optimization, recurrence_count)
+        open_ids = []
         
-        for conflict in conflicts:
-            conflict_hash = self._generate_conflict_hash(conflict)
+        for fingerprint, conflict in by_fingerprint.items():
+            existing = existing_by_fingerprint.get(fingerprint)
             
-            if conflict_hash in existing_hashes:
-                # Existing conflict
-                existing = existing_hashes[conflict_hash]
-                existing_id = existing.get("id")
-                existing_status = existing.get("status", "detected")
-                
-                if existing_status in ["resolved", "ignored"]:
-                    # Conflict recurred! Re-open it
-                    recurring_conflicts += 1
-                    
-                    await self.db.seo_conflicts.update_one(
-                        {"id": existing_id},
-                        {"$set": {
-                            "status": "detected",
-                            "recurrence_count": existing.get("recurrence_count", 0) + 1,
-                            "last_recurrence_at": now,
-                            "updated_at": now,
-                            "optimization_id": None,  # Unlink old optimization
-                        }}
-                    )
-                    
-                    # Create new optimization for recurring conflict
-                    opt_id = await self._create_optimization_for_conflict(
-                        conflict_id=existing_id,
-                        conflict=conflict,
-                        network_id=network_id,
-                        network_name=network_name,
-                        brand_id=brand_id,
-                        is_recurring=True,
-                        recurrence_count=existing.get("recurrence_count", 0) + 1
-                    )
-                    
-                    if opt_id:
-                        optimizations_created += 1
-                        
-                        # Update conflict with new optimization link
-                        await self.db.seo_conflicts.update_one(
-                            {"id": existing_id},
-                            {"$set": {"optimization_id": opt_id, "status": "under_review"}}
-                        )
-                    
-                    # Send recurrence notification
-                    await self._send_conflict_notification(
-                        conflict=conflict,
-                        network_name=network_name,
-                        brand_id=brand_id,
-                        is_new=False,
-                        is_recurring=True,
-                        recurrence_count=existing.get("recurrence_count", 0) + 1
-                    )
-                    notifications_sent += 1
-                else:
-                    # Still open, just update timestamp
-                    await self.db.seo_conflicts.update_one(
-                        {"id": existing_id},
-                        {"$set": {"updated_at": now}}
-                    )
-            else:
-                # New conflict
-                new_conflicts += 1
+            if existing is None:
                 conflict_id = str(uuid.uuid4())
+                optimization = self._build_optimization_for_conflict(
+                    conflict_id=conflict_id,
+                    conflict=conflict,
+                    network_id=network_id,
+                    network_name=network_name,
+                    brand_id=brand_id,
+                    activity_type_id=activity_type_id,
+                    assigned_manager=assigned_manager,
+                    now=now,
+                )
                 
                 # Get affected nodes
                 affected_nodes = [conflict.get("node_a_id")]
                 if conflict.get("node_b_id"):
                     affected_nodes.append(conflict.get("node_b_id"))
                 
-                # Store the conflict
                 stored_conflict = {
                     "id": conflict_id,
+                    "dedup_fingerprint": fingerprint,
                     "conflict_type": conflict.get("conflict_type"),
                     "severity": conflict.get("severity"),
-                    "status": "detected",
+                    "status": "under_review",
                     "network_id": network_id,
                     "network_name": network_name,
                     "domain_name": conflict.get("domain_name", ""),
@@ -251,47 +268,232 @@ class ConflictOptimizationLinkerService:
                     "detected_at": now,
                     "updated_at": now,
                     "recurrence_count": 0,
-                    "optimization_id": None,
+                    "optimization_id": optimization["id"],
                 }
-                
-                await self.db.seo_conflicts.insert_one(stored_conflict)
-                
-                # Auto-create optimization
-                opt_id = await self._create_optimization_for_conflict(
-                    conflict_id=conflict_id,
+                new_items.append((fingerprint, stored_conflict, optimization, conflict))
+            
+            elif existing.get("status", "detected") in ["resolved", "ignored"]:
+                # Conflict recurred! Re-open it with a new optimization
+                recurrence_count = existing.get("recurrence_count", 0) + 1
+                optimization = self._build_optimization_for_conflict(
+                    conflict_id=existing["id"],
                     conflict=conflict,
                     network_id=network_id,
                     network_name=network_name,
                     brand_id=brand_id,
-                    is_recurring=False
+                    activity_type_id=activity_type_id,
+                    assigned_manager=assigned_manager,
+                    now=now,
+                    is_recurring=True,
+                    recurrence_count=recurrence_count,
                 )
-                
-                if opt_id:
-                    optimizations_created += 1
-                    
-                    # Update conflict with optimization link and status
-                    await self.db.seo_conflicts.update_one(
-                        {"id": conflict_id},
-                        {"$set": {"optimization_id": opt_id, "status": "under_review"}}
-                    )
-                
-                # Send new conflict notification
-                await self._send_conflict_notification(
-                    conflict=conflict,
-                    network_name=network_name,
-                    brand_id=brand_id,
-                    is_new=True,
-                    is_recurring=False
+                recurring_items.append((existing, conflict, optimization, recurrence_count))
+            
+            else:
+                # Still open, just update timestamp
+                open_ids.append(existing["id"])
+        
+        # One insert_many for every optimization in the batch
+        optimizations = [item[2] for item in new_items] + [item[2] for item in recurring_items]
+        failed_optimization_ids = await self._insert_optimizations(optimizations)
+        
+        operations = []
+        # New-conflict upserts come first so operation index == new_items index
+        for fingerprint, stored_conflict, optimization, _ in new_items:
+            if optimization["id"] in failed_optimization_ids:
+                stored_conflict["status"] = "detected"
+                stored_conflict["optimization_id"] = None
+            operations.append(UpdateOne(
+                {"dedup_fingerprint": fingerprint},
+                {"$setOnInsert": stored_conflict},
+                upsert=True,
+            ))
+        
+        for existing, conflict, optimization, recurrence_count in recurring_items:
+            optimization_ok = optimization["id"] not in failed_optimization_ids
+            operations.append(UpdateOne(
+                # Guard on status so a concurrent scan can't re-open it twice;
+                # the losing update matches nothing (see _confirm_reopened)
+                {"id": existing["id"], "status": {"$in": ["resolved", "ignored"]}},
+                {"$set": {
+                    "status": "under_review" if optimization_ok else "detected",
+                    "recurrence_count": recurrence_count,
+                    "last_recurrence_at": now,
+                    "updated_at": now,
+                    "optimization_id": optimization["id"] if optimization_ok else None,
+                }},
+            ))
+        
+        if open_ids:
+            operations.append(UpdateMany(
+                {"id": {"$in": open_ids}},
+                {"$set": {"updated_at": now}},
+            ))
+        
+        try:
+            upserted_indexes, failed_indexes = await self._write_conflicts(operations)
+        except Exception:
+            # Nothing was written reliably - don't leave optimizations without a conflict
+            await self._delete_optimizations([
+                o["id"] for o in optimizations if o["id"] not in failed_optimization_ids
+            ])
+            raise
+        
+        # Recurring items whose re-open failed keep their previous state
+        recurring_offset = len(new_items)
+        written_items = [
+            item for index, item in enumerate(recurring_items, start=recurring_offset)
+            if index not in failed_indexes
+        ]
+        reopened_items = await self._confirm_reopened(written_items, failed_optimization_ids, now)
+        reopened_ids = {existing["id"] for existing, _, _, _ in reopened_items}
+        
+        # A concurrent scan may have inserted or re-opened the same conflict
+        # first, or the conflict write failed; drop the optimizations of
+        # conflicts not written by this scan
+        orphaned_optimization_ids = [
+            optimization["id"]
+            for index, (_, _, optimization, _) in enumerate(new_items)
+            if index not in upserted_indexes
+        ] + [
+            optimization["id"]
+            for existing, _, optimization, _ in recurring_items
+            if existing["id"] not in reopened_ids
+        ]
+        orphaned_optimization_ids = [
+            optimization_id for optimization_id in orphaned_optimization_ids
+            if optimization_id not in failed_optimization_ids
+        ]
+        await self._delete_optimizations(orphaned_optimization_ids)
+        
+        # Re-opened conflicts no longer count as resolved on their old day
+        await get_metrics_rollup_service(self.db).invalidate_days(
+            *(existing for existing, _, _, _ in reopened_items)
+        )
+        
+        summary["new_conflicts"] = len(upserted_indexes)
+        summary["recurring_conflicts"] = len(reopened_items)
+        summary["optimizations_created"] = (
+            len(optimizations) - len(failed_optimization_ids) - len(orphaned_optimization_ids)
+        )
+        
+        # Notifications for conflicts another scan already inserted are skipped
+        notifications = [
+            {"conflict": conflict, "is_recurring": False}
+            for index, (_, _, _, conflict) in enumerate(new_items)
+            if index in upserted_indexes
+        ] + [
+            {"conflict": conflict, "is_recurring": True, "recurrence_count": recurrence_count}
+            for _, conflict, _, recurrence_count in reopened_items
+        ]
+        if notifications:
+            self._schedule_notification_batch(notifications, network_name, brand_id)
+            summary["notifications_sent"] = len(notifications)
+        
+        logger.info(
+            f"Processed {len(conflicts)} conflicts for network {network_id}: "
+            f"{summary['new_conflicts']} new, {summary['recurring_conflicts']} recurring"
+        )
+        
+        return summary
+    
+    async def _write_conflicts(self, operations: List[Any]) -> Tuple[set, set]:
+        """
+        Run the conflict bulk_write.
+        
+        Returns (indexes of upserted operations, indexes of failed operations).
+        A partial failure (e.g. a duplicate fingerprint inserted by a concurrent
+        scan) is reported per operation instead of failing the whole batch.
+        """
+        if not operations:
+            return set(), set()
+        
+        try:
+            result = await self.db.seo_conflicts.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            logger.error(f"Failed to write {len(write_errors)} conflicts: {write_errors[:3]}")
+            return (
+                {item["index"] for item in e.details.get("upserted", [])},
+                {err["index"] for err in write_errors},
+            )
+        return set(result.upserted_ids.keys()), set()
+    
+    async def _confirm_reopened(
+        self,
+        items: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], int]],
+        failed_optimization_ids: set,
+        now: str,
+    ) -> List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], int]]:
+        """
+        Recurring items whose re-open was applied by this scan.
+        
+        The re-open is guarded on status, so when a concurrent scan re-opened
+        the conflict first ours matches no document, which is not a write
+        error. The stored conflict tells: it carries our optimization (or, if
+        ours failed to insert, none and our timestamp).
+        """
+        if not items:
+            return []
+        
+        stored = await self.db.seo_conflicts.find(
+            {"id": {"$in": [existing["id"] for existing, _, _, _ in items]}},
+            {"_id": 0, "id": 1, "optimization_id": 1, "last_recurrence_at": 1}
+        ).to_list(None)
+        stored_by_id = {c["id"]: c for c in stored}
+        
+        confirmed = []
+        for item in items:
+            existing, _, optimization, _ = item
+            current = stored_by_id.get(existing["id"], {})
+            if optimization["id"] in failed_optimization_ids:
+                won = (
+                    current.get("optimization_id") is None
+                    and current.get("last_recurrence_at") == now
                 )
-                notifications_sent += 1
+            else:
+                won = current.get("optimization_id") == optimization["id"]
+            if won:
+                confirmed.append(item)
         
-        return {
-            "processed": len(conflicts),
-            "new_conflicts": new_conflicts,
-            "recurring_conflicts": recurring_conflicts,
-            "optimizations_created": optimizations_created,
-            "notifications_sent": notifications_sent,
-        }
+        lost = len(items) - len(confirmed)
+        if lost:
+            logger.info(f"{lost} recurring conflicts were re-opened by a concurrent scan")
+        return confirmed
+    
+    async def _delete_optimizations(self, optimization_ids: List[str]):
+        """Remove optimizations created for conflicts that were not written."""
+        if optimization_ids:
+            await self.db.seo_optimizations.delete_many({"id": {"$in": optimization_ids}})
+    
+    async def _get_conflict_activity_type_id(self) -> Optional[str]:
+        """Get the activity type ID used for conflict_resolution optimizations."""
+        activity_type_doc = await self.db.seo_optimization_activity_types.find_one(
+            {"name": {"$regex": "conflict", "$options": "i"}},
+            {"_id": 0, "id": 1}
+        )
+        return activity_type_doc.get("id") if activity_type_doc else None
+    
+    async def _insert_optimizations(self, optimizations: List[Dict[str, Any]]) -> set:
+        """
+        Insert optimizations with one insert_many.
+        
+        Returns the IDs of optimizations that failed to insert.
+        """
+        if not optimizations:
+            return set()
+        
+        try:
+            await self.db.seo_optimizations.insert_many(optimizations, ordered=False)
+        except BulkWriteError as e:
+            failed_indexes = {err["index"] for err in e.details.get("writeErrors", [])}
+            logger.error(f"Failed to create {len(failed_indexes)} conflict optimizations: {e}")
+            return {optimizations[i]["id"] for i in failed_indexes}
+        except Exception as e:
+            logger.error(f"Failed to create conflict optimizations: {e}")
+            return {o["id"] for o in optimizations}
+        
+        return set()
     
     async def _create_optimization_for_conflict(
         self,
@@ -304,11 +506,53 @@ class ConflictOptimizationLinkerService:
         recurrence_count: int = 0
     ) -> Optional[str]:
         """
-        Create an optimization task for a conflict.
+        Create an optimization task for a single conflict.
         
         Returns optimization ID if created successfully.
         """
-        now = datetime.now(timezone.utc).isoformat()
+        # Get network manager for assignment
+        assigned_manager = None
+        if network_id:
+            network_doc = await self.db.seo_networks.find_one(
+                {"id": network_id},
+                {"_id": 0, "created_by": 1}
+            )
+            if network_doc:
+                assigned_manager = network_doc.get("created_by")
+        
+        optimization = self._build_optimization_for_conflict(
+            conflict_id=conflict_id,
+            conflict=conflict,
+            network_id=network_id,
+            network_name=network_name,
+            brand_id=brand_id,
+            activity_type_id=await self._get_conflict_activity_type_id(),
+            assigned_manager=assigned_manager,
+            now=datetime.now(timezone.utc).isoformat(),
+            is_recurring=is_recurring,
+            recurrence_count=recurrence_count,
+        )
+        
+        await self.db.seo_optimizations.insert_one(optimization)
+        
+        logger.info(f"Created optimization {optimization['id']} for conflict {conflict_id}")
+        
+        return optimization["id"]
+    
+    def _build_optimization_for_conflict(
+        self,
+        conflict_id: str,
+        conflict: Dict[str, Any],
+        network_id: str,
+        network_name: str,
+        brand_id: Optional[str],
+        activity_type_id: Optional[str],
+        assigned_manager: Optional[str],
+        now: str,
+        is_recurring: bool = False,
+        recurrence_count: int = 0
+    ) -> Dict[str, Any]:
+        """Build the optimization document for a conflict (no database access)."""
         opt_id = str(uuid.uuid4())
         
         conflict_type = conflict.get("conflict_type", "unknown")
@@ -352,25 +596,7 @@ class ConflictOptimizationLinkerService:
         if is_recurring:
             reason_note += f" This conflict has recurred {recurrence_count} time(s)."
         
-        # Get activity type ID for conflict_resolution
-        activity_type_doc = await self.db.seo_optimization_activity_types.find_one(
-            {"name": {"$regex": "conflict", "$options": "i"}},
-            {"_id": 0, "id": 1}
-        )
-        activity_type_id = activity_type_doc.get("id") if activity_type_doc else None
-        
-        # Get network manager for assignment
-        assigned_manager = None
-        if network_id:
-            network_doc = await self.db.seo_networks.find_one(
-                {"id": network_id},
-                {"_id": 0, "created_by": 1}
-            )
-            if network_doc:
-                assigned_manager = network_doc.get("created_by")
-        
-        # Create optimization
-        optimization = {
+        return {
             "id": opt_id,
             "network_id": network_id,
             "brand_id": brand_id,
@@ -397,24 +623,155 @@ class ConflictOptimizationLinkerService:
             "assigned_to": assigned_manager,
             "priority": SEVERITY_PRIORITY.get(severity, "medium"),
         }
-        
-        await self.db.seo_optimizations.insert_one(optimization)
-        
-        logger.info(f"Created optimization {opt_id} for conflict {conflict_id}")
-        
-        return opt_id
     
-    async def _send_conflict_notification(
+    def _build_conflict_notification_message(
         self,
         conflict: Dict[str, Any],
         network_name: str,
-        brand_id: Optional[str],
-        is_new: bool,
         is_recurring: bool = False,
         recurrence_count: int = 0
+    ) -> str:
+        """Build the Telegram message for a single detected conflict."""
+        conflict_type = conflict.get("conflict_type", "unknown")
+        severity = conflict.get("severity", "medium")
+        type_label = CONFLICT_TYPE_LABELS.get(conflict_type, conflict_type.replace("_", " ").title())
+        
+        severity_emoji = SEVERITY_EMOJI.get(severity, "⚪")
+        
+        # Build message
+        if is_recurring:
+            header = f"🔄 RECURRING SEO CONFLICT #{recurrence_count}"
+        else:
+            header = "⚠️ NEW SEO CONFLICT DETECTED"
+        
+        message_lines = [
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+            header,
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+            "",
+            f"Type          : {type_label}",
+            f"Severity      : {severity_emoji} {severity.upper()}",
+            f"Network       : {network_name}",
+            f"Domain        : {conflict.get('domain_name', 'N/A')}",
+            "",
+            "Affected Nodes:",
+            f"  • {conflict.get('node_a_label', 'Node A')}",
+        ]
+        
+        if conflict.get("node_b_label"):
+            message_lines.append(f"  • {conflict.get('node_b_label')}")
+        
+        message_lines.extend([
+            "",
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+            "📋 DESCRIPTION:",
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+            conflict.get("description", "No description"),
+            "",
+        ])
+        
+        if conflict.get("suggestion"):
+            message_lines.extend([
+                "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+                "💡 SUGGESTED FIX:",
+                "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+                conflict.get("suggestion"),
+                "",
+            ])
+        
+        message_lines.extend([
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+            "⏰ ACTION REQUIRED",
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+            "An optimization task has been auto-created.",
+            "Please review and resolve this conflict.",
+        ])
+        
+        if is_recurring:
+            message_lines.extend([
+                "",
+                f"⚠️ This conflict has recurred {recurrence_count} time(s)!",
+                "Consider a permanent structural fix.",
+            ])
+        
+        return "\n".join(message_lines)
+    
+    def _build_conflict_digest_message(
+        self,
+        notifications: List[Dict[str, Any]],
+        network_name: str
+    ) -> str:
+        """Build one summary message for a large batch of detected conflicts."""
+        new_count = len([n for n in notifications if not n["is_recurring"]])
+        recurring_count = len(notifications) - new_count
+        
+        by_type: Dict[str, int] = {}
+        by_severity: Dict[str, int] = {}
+        for n in notifications:
+            conflict = n["conflict"]
+            ct = conflict.get("conflict_type", "unknown")
+            sev = conflict.get("severity", "medium")
+            by_type[ct] = by_type.get(ct, 0) + 1
+            by_severity[sev] = by_severity.get(sev, 0) + 1
+        
+        message_lines = [
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+            f"⚠️ {len(notifications)} SEO CONFLICTS DETECTED",
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+            "",
+            f"Network       : {network_name}",
+            f"New           : {new_count}",
+            f"Recurring     : {recurring_count}",
+            "",
+            "By Severity:",
+        ]
+        for sev in ["critical", "high", "medium", "low"]:
+            if by_severity.get(sev):
+                message_lines.append(
+                    f"  {SEVERITY_EMOJI.get(sev, '⚪')} {sev.upper()}: {by_severity[sev]}"
+                )
+        
+        message_lines.extend(["", "By Type:"])
+        for ct, count in sorted(by_type.items(), key=lambda item: -item[1]):
+            type_label = CONFLICT_TYPE_LABELS.get(ct, ct.replace("_", " ").title())
+            message_lines.append(f"  • {type_label}: {count}")
+        
+        message_lines.extend([
+            "",
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+            "⏰ ACTION REQUIRED",
+            "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+            "An optimization task has been auto-created for each conflict.",
+            "Review them in the Conflicts dashboard.",
+        ])
+        
+        return "\n".join(message_lines)
+    
+    def _schedule_notification_batch(
+        self,
+        notifications: List[Dict[str, Any]],
+        network_name: str,
+        brand_id: Optional[str]
+    ):
+        """Hand a batch of conflict notifications to the background sender."""
+        task = asyncio.create_task(
+            self._send_notification_batch(notifications, network_name, brand_id)
+        )
+        self._notification_tasks.add(task)
+        task.add_done_callback(self._notification_tasks.discard)
+    
+    async def _send_notification_batch(
+        self,
+        notifications: List[Dict[str, Any]],
+        network_name: str,
+        brand_id: Optional[str]
     ):
         """
-        Send Telegram notification for conflict detection.
+        Send Telegram notifications for a batch of detected conflicts.
+        
+        Small batches send the full per-conflict message, packed into as few
+        Telegram messages as the length limit allows. Larger batches send a
+        single digest instead of flooding the chat.
         
         Tags:
         - Project manager(s)
@@ -424,85 +781,31 @@ class ConflictOptimizationLinkerService:
             from services.seo_optimization_telegram_service import SeoOptimizationTelegramService
             telegram = SeoOptimizationTelegramService(self.db)
             
-            conflict_type = conflict.get("conflict_type", "unknown")
-            severity = conflict.get("severity", "medium")
-            type_label = CONFLICT_TYPE_LABELS.get(conflict_type, conflict_type.replace("_", " ").title())
-            
-            severity_emoji = {
-                "critical": "🚨",
-                "high": "🔴",
-                "medium": "🟠",
-                "low": "🟡",
-            }.get(severity, "⚪")
-            
-            # Build message
-            if is_recurring:
-                header = f"🔄 RECURRING SEO CONFLICT #{recurrence_count}"
+            if len(notifications) > NOTIFICATION_DETAIL_LIMIT:
+                messages = [self._build_conflict_digest_message(notifications, network_name)]
             else:
-                header = "⚠️ NEW SEO CONFLICT DETECTED"
-            
-            message_lines = [
-                "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
-                header,
-                "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
-                "",
-                f"Type          : {type_label}",
-                f"Severity      : {severity_emoji} {severity.upper()}",
-                f"Network       : {network_name}",
-                f"Domain        : {conflict.get('domain_name', 'N/A')}",
-                "",
-                "Affected Nodes:",
-                f"  • {conflict.get('node_a_label', 'Node A')}",
-            ]
-            
-            if conflict.get("node_b_label"):
-                message_lines.append(f"  • {conflict.get('node_b_label')}")
-            
-            message_lines.extend([
-                "",
-                "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
-                "📋 DESCRIPTION:",
-                "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
-                conflict.get("description", "No description"),
-                "",
-            ])
-            
-            if conflict.get("suggestion"):
-                message_lines.extend([
-                    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
-                    "💡 SUGGESTED FIX:",
-                    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
-                    conflict.get("suggestion"),
-                    "",
-                ])
-            
-            message_lines.extend([
-                "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
-                "⏰ ACTION REQUIRED",
-                "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
-                "An optimization task has been auto-created.",
-                "Please review and resolve this conflict.",
-            ])
-            
-            if is_recurring:
-                message_lines.extend([
-                    "",
-                    f"⚠️ This conflict has recurred {recurrence_count} time(s)!",
-                    "Consider a permanent structural fix.",
-                ])
-            
-            message = "\n".join(message_lines)
+                messages = []
+                current = ""
+                for n in notifications:
+                    message = self._build_conflict_notification_message(
+                        conflict=n["conflict"],
+                        network_name=network_name,
+                        is_recurring=n["is_recurring"],
+                        recurrence_count=n.get("recurrence_count", 0),
+                    )
+                    if current and len(current) + len(message) + 2 > TELEGRAM_MESSAGE_LIMIT:
+                        messages.append(current)
+                        current = message
+                    else:
+                        current = f"{current}\n\n{message}" if current else message
+                if current:
+                    messages.append(current)
             
-            # Send notification
-            await telegram.send_seo_change_notification(
-                message=message,
-                brand_id=brand_id,
-                network_id=conflict.get("network_id"),
-                is_conflict_alert=True
-            )
+            for message in messages:
+                await telegram.send_message(message, topic_type="seo_change")
             
         except Exception as e:
-            logger.error(f"Failed to send conflict notification: {e}")
+            logger.error(f"Failed to send conflict notification batch: {e}")
     
     async def resolve_conflict(
         self,
@@ -539,6 +842,7 @@ class ConflictOptimizationLinkerService:
                 "resolved_by": resolved_by_user_id,
             }}
         )
+        await get_metrics_rollup_service(self.db).invalidate_days(conflict)
         
         # Send resolution notification
         await self._send_resolution_notification(conflict, resolved_by_user_id)
@@ -0,0 +1,1118 @@
+"""
+Conflict Scanner Service
+========================
+
+Incremental SEO conflict detection driven by dirty-network tracking.
+
+Every network carries two counters:
+- structure_version: bumped whenever a node of the network is created,
+  updated, deleted or re-targeted, or a domain it uses is renamed (node
+  labels in the report snapshot carry the domain name)
+- conflicts_scanned_version: the structure_version last processed by a scan
+
+A scan only re-runs detection for networks whose structure_version has
+advanced past conflicts_scanned_version. Detected conflicts are persisted
+through ConflictOptimizationLinkerService, and a per-network report snapshot
+is stored in seo_conflict_reports so /reports/conflicts can serve
+precomputed results instead of re-scanning every network on each call.
+
+Networks created before versioning was introduced have neither counter and
+are treated as dirty until their first scan.
+
+Scanning a network also re-syncs its entries in the brand-wide
+cannibalization index (see cannibalization_index_service), which reports
+near-duplicate keyword targets across every network of the brand.
+
+Scan execution:
+- Network loads are fanned out with bounded concurrency
+  (CONFLICT_SCAN_CONCURRENCY)
+- The pairwise keyword/path comparisons and tier BFS run in a process or
+  thread pool (CONFLICT_SCAN_EXECUTOR) on compact, projected entries so the
+  event loop keeps serving requests during large scans
+- Each scan is recorded in conflict_scan_runs with progress counters and
+  can be cancelled from any worker
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from models_v3 import ConflictType, ConflictSeverity, get_tier_label
+from services.tier_service import TierCalculationService
+from services.cannibalization_index_service import get_cannibalization_index_service
+
+logger = logging.getLogger(__name__)
+
+# Defaults for networks that predate structure versioning
+DEFAULT_STRUCTURE_VERSION = 0
+DEFAULT_SCANNED_VERSION = -1
+
+# Mongo $expr matching networks whose structure changed since the last scan
+DIRTY_NETWORK_EXPR = {
+    "$gt": [
+        {"$ifNull": ["$structure_version", DEFAULT_STRUCTURE_VERSION]},
+        {"$ifNull": ["$conflicts_scanned_version", DEFAULT_SCANNED_VERSION]},
+    ]
+}
+
+# Max networks loaded/processed at the same time during a scan
+CONFLICT_SCAN_CONCURRENCY = int(os.environ.get("CONFLICT_SCAN_CONCURRENCY", "8"))
+
+# "process" or "thread" - where the CPU-heavy comparison step runs
+CONFLICT_SCAN_EXECUTOR = os.environ.get("CONFLICT_SCAN_EXECUTOR", "process")
+CONFLICT_SCAN_WORKERS = int(
+    os.environ.get("CONFLICT_SCAN_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+
+# Networks this small are cheaper to compare inline than to ship to a pool
+INLINE_COMPUTE_MAX_ENTRIES = 200
+
+# Progress is written to conflict_scan_runs at most every N networks
+PROGRESS_FLUSH_EVERY = 10
+
+# Only the entry fields the detectors read - keeps pool payloads small
+ENTRY_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "asset_domain_id": 1,
+    "optimized_path": 1,
+    "primary_keyword": 1,
+    "ranking_url": 1,
+    "domain_role": 1,
+    "domain_status": 1,
+    "index_status": 1,
+    "target_entry_id": 1,
+    "target_asset_domain_id": 1,
+    "target_node_id": 1,
+    "optimized_domain": 1,
+    "asset_domain_name": 1,
+}
+
+
+class ConflictScanCancelled(Exception):
+    """Raised inside a scan when cancellation was requested."""
+
+
+# ==================== PURE DETECTION (runs in executor) ====================
+
+
+def compute_network_conflicts(
+    inputs: Dict[str, Any], include_stored: bool = True
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Run tier calculation and both detectors on one network's compact inputs.
+
+    Args:
+        inputs: {"network": {id, name}, "entries": [...],
+                 "domain_names": {asset_domain_id: domain_name}, "now": iso}
+        include_stored: Also run the persistence detector
+
+    Returns:
+        (report_conflicts, stored_conflicts)
+    """
+    tiers = TierCalculationService.compute_tiers(
+        inputs["entries"], inputs["network"]["id"]
+    )
+    report_conflicts = _detect_report_conflicts(
+        inputs["network"], inputs["entries"], tiers, inputs["domain_names"], inputs["now"]
+    )
+    stored_conflicts = []
+    if include_stored:
+        stored_conflicts = _detect_stored_conflicts(
+            inputs["network"], inputs["entries"], tiers, inputs["now"]
+        )
+    return report_conflicts, stored_conflicts
+
+
+def _detect_report_conflicts(
+    network: Dict[str, Any],
+    entries: List[Dict[str, Any]],
+    tiers: Dict[str, int],
+    domain_name_lookup: Dict[str, str],
+    now: str,
+) -> List[Dict[str, Any]]:
+    """
+    Detect SEO conflicts for one network, including cross-path conflicts
+    within the same domain. Used by /reports/conflicts.
+
+    Conflict Types:
+    - Type A: Keyword Cannibalization (same keyword, different paths)
+    - Type B: Competing Targets (different paths targeting different nodes)
+    - Type C: Canonical Mismatch (path A canonical to B, B still indexed)
+    - Type D: Tier Inversion (higher tier supports lower tier)
+    - Legacy: NOINDEX in high tier, Orphan nodes
+    """
+    conflicts = []
+
+    # Build lookup structures
+    domain_entries = {}  # asset_domain_id -> [entries]
+    entry_lookup = {e["id"]: e for e in entries}
+
+    for entry in entries:
+        did = entry["asset_domain_id"]
+        if did not in domain_entries:
+            domain_entries[did] = []
+        domain_entries[did].append(entry)
+
+    # Helper to build node label
+    def node_label(entry):
+        dname = domain_name_lookup.get(entry["asset_domain_id"], "")
+        path = entry.get("optimized_path") or ""
+        return f"{dname}{path}" if path else dname
+
+    # ============ CROSS-PATH CONFLICT DETECTION ============
+
+    for domain_id, domain_entry_list in domain_entries.items():
+        domain_name = domain_name_lookup.get(domain_id, domain_id)
+
+        if len(domain_entry_list) < 2:
+            continue  # Need at least 2 paths to have cross-path conflicts
+
+        # TYPE A: Keyword Cannibalization
+        # Same domain, different paths, same or similar primary_keyword
+        keywords = {}
+        for e in domain_entry_list:
+            kw = (e.get("primary_keyword") or "").lower().strip()
+            if kw:
+                if kw not in keywords:
+                    keywords[kw] = []
+                keywords[kw].append(e)
+
+        for kw, kw_entries in keywords.items():
+            if len(kw_entries) > 1:
+                # Multiple paths targeting same keyword
+                for i, e1 in enumerate(kw_entries):
+                    for e2 in kw_entries[i + 1 :]:
+                        conflicts.append(
+                            {
+                                "conflict_type": ConflictType.KEYWORD_CANNIBALIZATION.value,
+                                "severity": ConflictSeverity.HIGH.value,
+                                "network_id": network["id"],
+                                "network_name": network["name"],
+                                "domain_name": domain_name,
+                                "node_a_id": e1["id"],
+                                "node_a_path": e1.get("optimized_path"),
+                                "node_a_label": node_label(e1),
+                                "node_b_id": e2["id"],
+                                "node_b_path": e2.get("optimized_path"),
+                                "node_b_label": node_label(e2),
+                                "description": f"Both paths target keyword '{kw}'",
+                                "suggestion": "Consolidate content or differentiate keywords",
+                                "detected_at": now,
+                            }
+                        )
+
+        # TYPE B: Competing Targets
+        # Different paths of same domain targeting different nodes
+        targets = {}
+        for e in domain_entry_list:
+            target_id = e.get("target_entry_id")
+            if target_id:
+                if target_id not in targets:
+                    targets[target_id] = []
+                targets[target_id].append(e)
+
+        if len(targets) > 1:
+            # Multiple different targets from same domain
+            target_entries = list(targets.values())
+            for i, group1 in enumerate(target_entries):
+                for group2 in target_entries[i + 1 :]:
+                    e1 = group1[0]
+                    e2 = group2[0]
+                    t1 = entry_lookup.get(e1.get("target_entry_id"))
+                    t2 = entry_lookup.get(e2.get("target_entry_id"))
+
+                    conflicts.append(
+                        {
+                            "conflict_type": ConflictType.COMPETING_TARGETS.value,
+                            "severity": ConflictSeverity.MEDIUM.value,
+                            "network_id": network["id"],
+                            "network_name": network["name"],
+                            "domain_name": domain_name,
+                            "node_a_id": e1["id"],
+                            "node_a_path": e1.get("optimized_path"),
+                            "node_a_label": node_label(e1),
+                            "node_b_id": e2["id"],
+                            "node_b_path": e2.get("optimized_path"),
+                            "node_b_label": node_label(e2),
+                            "description": f"Paths target different nodes: {node_label(t1) if t1 else 'unknown'} vs {node_label(t2) if t2 else 'unknown'}",
+                            "suggestion": "Consolidate link strategy for this domain",
+                            "detected_at": now,
+                        }
+                    )
+
+        # TYPE C: Canonical Mismatch
+        # Path A has canonical pointing to Path B, but B is still indexed
+        for e in domain_entry_list:
+            if (
+                e.get("domain_status") == "redirect_301"
+                or e.get("domain_status") == "redirect_302"
+            ):
+                target_id = e.get("target_entry_id")
+                if target_id:
+                    target = entry_lookup.get(target_id)
+                    if target and target.get("index_status") == "index":
+                        conflicts.append(
+                            {
+                                "conflict_type": ConflictType.CANONICAL_MISMATCH.value,
+                                "severity": ConflictSeverity.HIGH.value,
+                                "network_id": network["id"],
+                                "network_name": network["name"],
+                                "domain_name": domain_name,
+                                "node_a_id": e["id"],
+                                "node_a_path": e.get("optimized_path"),
+                                "node_a_label": node_label(e),
+                                "node_b_id": target["id"],
+                                "node_b_path": target.get("optimized_path"),
+                                "node_b_label": node_label(target),
+                                "description": "Redirects to indexed path",
+                                "suggestion": "Review canonical chain or noindex the target",
+                                "detected_at": now,
+                            }
+                        )
+
+        # TYPE D: Tier Inversion (within same domain)
+        # Higher-tier path supports lower-tier path
+        for e in domain_entry_list:
+            if e.get("domain_role") == "supporting":
+                target_id = e.get("target_entry_id")
+                if target_id:
+                    target = entry_lookup.get(target_id)
+                    if target:
+                        e_tier = tiers.get(e["id"], 5)
+                        t_tier = tiers.get(target_id, 5)
+
+                        if e_tier < t_tier:
+                            conflicts.append(
+                                {
+                                    "conflict_type": ConflictType.TIER_INVERSION.value,
+                                    "severity": ConflictSeverity.CRITICAL.value,
+                                    "network_id": network["id"],
+                                    "network_name": network["name"],
+                                    "domain_name": domain_name,
+                                    "node_a_id": e["id"],
+                                    "node_a_path": e.get("optimized_path"),
+                                    "node_a_label": node_label(e),
+                                    "node_b_id": target["id"],
+                                    "node_b_path": target.get("optimized_path"),
+                                    "node_b_label": node_label(target),
+                                    "description": f"Tier {e_tier} ({get_tier_label(e_tier)}) supports Tier {t_tier} ({get_tier_label(t_tier)})",
+                                    "suggestion": "Reverse the relationship or restructure hierarchy",
+                                    "detected_at": now,
+                                }
+                            )
+
+    # ============ NETWORK-WIDE CONFLICT DETECTION ============
+    
+    # Build reverse lookup: target_entry_id -> list of source entries
+    target_sources = {}  # target_entry_id -> [source entries]
+    for entry in entries:
+        target_id = entry.get("target_entry_id")
+        if target_id:
+            if target_id not in target_sources:
+                target_sources[target_id] = []
+            target_sources[target_id].append(entry)
+    
+    # TYPE E: Redirect/Canonical Loops
+    # Detect A -> B -> A or A -> B -> C -> A cycles
+    def detect_redirect_loop(start_entry_id, visited=None, path=None):
+        """Detect redirect loops starting from entry"""
+        if visited is None:
+            visited = set()
+        if path is None:
+            path = []
+        
+        if start_entry_id in visited:
+            return path  # Loop found
+        
+        visited.add(start_entry_id)
+        path.append(start_entry_id)
+        
+        entry = entry_lookup.get(start_entry_id)
+        if entry:
+            target_id = entry.get("target_entry_id")
+            # Only follow redirects/canonicals
+            if target_id and entry.get("domain_status") in ["redirect_301", "redirect_302", "canonical"]:
+                return detect_redirect_loop(target_id, visited, path)
+        
+        return None  # No loop
+    
+    detected_loops = set()
+    for entry in entries:
+        if entry.get("domain_status") in ["redirect_301", "redirect_302", "canonical"]:
+            loop_path = detect_redirect_loop(entry["id"])
+            if loop_path and len(loop_path) > 1:
+                loop_key = tuple(sorted(loop_path))
+                if loop_key not in detected_loops:
+                    detected_loops.add(loop_key)
+                    first_entry = entry_lookup.get(loop_path[0])
+                    last_entry = entry_lookup.get(loop_path[-1]) if loop_path else None
+                    conflicts.append({
+                        "conflict_type": ConflictType.REDIRECT_LOOP.value,
+                        "severity": ConflictSeverity.CRITICAL.value,
+                        "network_id": network["id"],
+                        "network_name": network["name"],
+                        "domain_name": domain_name_lookup.get(first_entry["asset_domain_id"], "") if first_entry else "",
+                        "node_a_id": loop_path[0],
+                        "node_a_path": first_entry.get("optimized_path") if first_entry else None,
+                        "node_a_label": node_label(first_entry) if first_entry else "",
+                        "node_b_id": loop_path[-1] if loop_path else None,
+                        "node_b_path": last_entry.get("optimized_path") if last_entry else None,
+                        "node_b_label": node_label(last_entry) if last_entry else "",
+                        "description": f"Redirect/canonical loop detected with {len(loop_path)} nodes",
+                        "suggestion": "Break the loop by removing one redirect",
+                        "detected_at": now,
+                    })
+    
+    # TYPE F: Multiple Parents pointing to Money Site without intent
+    # Find main node
+    main_entries = [e for e in entries if e.get("domain_role") == "main"]
+    for main_entry in main_entries:
+        main_id = main_entry["id"]
+        
+        # Find all entries pointing to this main
+        sources_to_main = target_sources.get(main_id, [])
+        
+        # Filter out expected supporting nodes
+        non_supporting_sources = [
+            s for s in sources_to_main 
+            if s.get("domain_role") != "supporting" and s.get("domain_status") not in ["redirect_301", "redirect_302"]
+        ]
+        
+        if len(non_supporting_sources) > 1:
+            # Multiple non-supporting nodes point to main - potential issue
+            for src in non_supporting_sources:
+                conflicts.append({
+                    "conflict_type": ConflictType.MULTIPLE_PARENTS_TO_MAIN.value,
+                    "severity": ConflictSeverity.MEDIUM.value,
+                    "network_id": network["id"],
+                    "network_name": network["name"],
+                    "domain_name": domain_name_lookup.get(src["asset_domain_id"], ""),
+                    "node_a_id": src["id"],
+                    "node_a_path": src.get("optimized_path"),
+                    "node_a_label": node_label(src),
+                    "node_b_id": main_id,
+                    "node_b_path": main_entry.get("optimized_path"),
+                    "node_b_label": node_label(main_entry),
+                    "description": f"Non-supporting node pointing to Money Site (total {len(non_supporting_sources)} similar)",
+                    "suggestion": "Change to supporting role or redirect if intentional",
+                    "detected_at": now,
+                })
+    
+    # TYPE G: Index/Noindex Mismatch in Link Chain
+    # Node A (indexed) links to Node B (noindex) - potential issue
+    for entry in entries:
+        if entry.get("index_status") == "index":
+            target_id = entry.get("target_entry_id")
+            if target_id:
+                target = entry_lookup.get(target_id)
+                if target and target.get("index_status") == "noindex":
+                    entry_tier = tiers.get(entry["id"], 5)
+                    target_tier = tiers.get(target_id, 5)
+                    
+                    # Only flag if indexed node is lower tier pointing to noindex higher tier
+                    if entry_tier > target_tier:
+                        conflicts.append({
+                            "conflict_type": ConflictType.INDEX_NOINDEX_MISMATCH.value,
+                            "severity": ConflictSeverity.HIGH.value,
+                            "network_id": network["id"],
+                            "network_name": network["name"],
+                            "domain_name": domain_name_lookup.get(entry["asset_domain_id"], ""),
+                            "node_a_id": entry["id"],
+                            "node_a_path": entry.get("optimized_path"),
+                            "node_a_label": node_label(entry),
+                            "node_b_id": target_id,
+                            "node_b_path": target.get("optimized_path"),
+                            "node_b_label": node_label(target),
+                            "description": "Indexed node links to NOINDEX target in higher tier",
+                            "suggestion": "Index the target or remove the link",
+                            "detected_at": now,
+                        })
+
+    # ============ LEGACY CONFLICT DETECTION ============
+
+    for entry in entries:
+        entry_id = entry["id"]
+        asset_id = entry["asset_domain_id"]
+        tier = tiers.get(entry_id, 5)
+        domain_name = domain_name_lookup.get(asset_id, asset_id)
+
+        # NOINDEX in high tier (0-2)
+        if entry.get("index_status") == "noindex" and tier <= 2:
+            conflicts.append(
+                {
+                    "conflict_type": "noindex_high_tier",
+                    "severity": ConflictSeverity.HIGH.value,
+                    "network_id": network["id"],
+                    "network_name": network["name"],
+                    "domain_name": domain_name,
+                    "node_a_id": entry_id,
+                    "node_a_path": entry.get("optimized_path"),
+                    "node_a_label": node_label(entry),
+                    "node_b_id": None,
+                    "node_b_path": None,
+                    "node_b_label": None,
+                    "description": f"NOINDEX node in {get_tier_label(tier)}",
+                    "suggestion": "Change to INDEX or move to lower tier",
+                    "detected_at": now,
+                }
+            )
+
+        # Orphan (no target and not main)
+        if (
+            entry.get("domain_role") != "main"
+            and not entry.get("target_entry_id")
+            and not entry.get("target_asset_domain_id")
+        ):
+            if tier >= 5:
+                conflicts.append(
+                    {
+                        "conflict_type": "orphan",
+                        "severity": ConflictSeverity.MEDIUM.value,
+                        "network_id": network["id"],
+                        "network_name": network["name"],
+                        "domain_name": domain_name,
+                        "node_a_id": entry_id,
+                        "node_a_path": entry.get("optimized_path"),
+                        "node_a_label": node_label(entry),
+                        "node_b_id": None,
+                        "node_b_path": None,
+                        "node_b_label": None,
+                        "description": "Node not connected to main hierarchy",
+                        "suggestion": "Assign a target node or remove from network",
+                        "detected_at": now,
+                    }
+                )
+
+    return conflicts
+
+
+def _detect_stored_conflicts(
+    network: Dict[str, Any],
+    entries: List[Dict[str, Any]],
+    tiers: Dict[str, int],
+    now_str: str,
+) -> List[Dict[str, Any]]:
+    """
+    Detect conflicts for a single network for persistence.
+    Returns list of conflict dictionaries.
+    """
+    conflicts = []
+    network_id = network["id"]
+    network_name = network.get("name", "Unknown")
+
+    if not entries:
+        return []
+
+    # Copy so the tier annotation below doesn't leak into the report detector
+    entries = [dict(e) for e in entries]
+
+    # Build node map
+    node_map = {}
+    for e in entries:
+        node_id = e.get("id")
+        tier = tiers.get(node_id, 99)
+        e["tier"] = tier
+        node_map[node_id] = e
+
+    # Group entries by domain
+    by_domain = {}
+    for e in entries:
+        domain = e.get("optimized_domain") or e.get("asset_domain_name") or ""
+        if domain:
+            if domain not in by_domain:
+                by_domain[domain] = []
+            by_domain[domain].append(e)
+
+    # Detect conflicts (simplified version of the main detection logic)
+    for domain, domain_entries in by_domain.items():
+        if len(domain_entries) < 2:
+            continue
+    
+        # Check for competing targets
+        targets = {}
+        for e in domain_entries:
+            target = e.get("target_node_id")
+            if target:
+                if target not in targets:
+                    targets[target] = []
+                targets[target].append(e)
+    
+        # Cross-path conflicts
+        for target_id, target_entries in targets.items():
+            if len(target_entries) >= 2:
+                # Multiple paths targeting same node
+                entry_a = target_entries[0]
+                entry_b = target_entries[1]
+            
+                conflicts.append({
+                    "conflict_type": ConflictType.COMPETING_TARGETS.value,
+                    "severity": ConflictSeverity.MEDIUM.value,
+                    "network_id": network_id,
+                    "network_name": network_name,
+                    "domain_name": domain,
+                    "node_a_id": entry_a.get("id"),
+                    "node_a_path": entry_a.get("optimized_path"),
+                    "node_a_label": f"{domain}{entry_a.get('optimized_path', '')}",
+                    "node_b_id": entry_b.get("id"),
+                    "node_b_path": entry_b.get("optimized_path"),
+                    "node_b_label": f"{domain}{entry_b.get('optimized_path', '')}",
+                    "description": f"Multiple paths on {domain} are targeting the same node",
+                    "suggestion": "Consolidate paths or differentiate their targets",
+                    "detected_at": now_str,
+                })
+
+    # Check for tier inversions
+    for e in entries:
+        source_tier = e.get("tier", 99)
+        target_id = e.get("target_node_id")
+    
+        if target_id and target_id in node_map:
+            target_entry = node_map[target_id]
+            target_tier = target_entry.get("tier", 99)
+        
+            # Tier inversion: source has lower tier number (higher authority) than target
+            if source_tier < target_tier and source_tier != 99 and target_tier != 99:
+                domain = e.get("optimized_domain") or e.get("asset_domain_name") or ""
+            
+                conflicts.append({
+                    "conflict_type": ConflictType.TIER_INVERSION.value,
+                    "severity": ConflictSeverity.CRITICAL.value,
+                    "network_id": network_id,
+                    "network_name": network_name,
+                    "domain_name": domain,
+                    "node_a_id": e.get("id"),
+                    "node_a_path": e.get("optimized_path"),
+                    "node_a_label": f"{domain}{e.get('optimized_path', '')} (Tier {source_tier})",
+                    "node_b_id": target_id,
+                    "node_b_path": target_entry.get("optimized_path"),
+                    "node_b_label": f"{target_entry.get('optimized_domain', '')}{target_entry.get('optimized_path', '')} (Tier {target_tier})",
+                    "description": f"Higher authority node (Tier {source_tier}) is supporting lower authority node (Tier {target_tier})",
+                    "suggestion": "Reverse the link direction or restructure the hierarchy",
+                    "detected_at": now_str,
+                })
+
+    # Check for orphan nodes (not connected to main)
+    main_entry = None
+    for e in entries:
+        if e.get("domain_role") == "main":
+            main_entry = e
+            break
+
+    if main_entry:
+        # Find all nodes that can reach main
+        reachable = set()
+        reachable.add(main_entry.get("id"))
+    
+        changed = True
+        while changed:
+            changed = False
+            for e in entries:
+                target_id = e.get("target_node_id")
+                if target_id in reachable and e.get("id") not in reachable:
+                    reachable.add(e.get("id"))
+                    changed = True
+    
+        # Nodes not reachable are orphans
+        for e in entries:
+            if e.get("id") not in reachable and e.get("domain_role") != "main":
+                domain = e.get("optimized_domain") or e.get("asset_domain_name") or ""
+            
+                conflicts.append({
+                    "conflict_type": "orphan",
+                    "severity": ConflictSeverity.MEDIUM.value,
+                    "network_id": network_id,
+                    "network_name": network_name,
+                    "domain_name": domain,
+                    "node_a_id": e.get("id"),
+                    "node_a_path": e.get("optimized_path"),
+                    "node_a_label": f"{domain}{e.get('optimized_path', '')}",
+                    "node_b_id": None,
+                    "node_b_path": None,
+                    "node_b_label": None,
+                    "description": "Node is not connected to the main hierarchy",
+                    "suggestion": "Connect this node to the network structure or remove it",
+                    "detected_at": now_str,
+                })
+
+    return conflicts
+
+
+_executor: Optional[Executor] = None
+
+
+def _get_executor() -> Executor:
+    """Lazily create the pool used for the comparison step."""
+    global _executor
+    if _executor is None:
+        if CONFLICT_SCAN_EXECUTOR == "process":
+            try:
+                # spawn: forking a process that holds Motor's threads is unsafe
+                _executor = ProcessPoolExecutor(
+                    max_workers=CONFLICT_SCAN_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"Process pool unavailable, using threads: {e}")
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=CONFLICT_SCAN_WORKERS,
+                thread_name_prefix="conflict-scan",
+            )
+    return _executor
+
+
+def _use_thread_executor():
+    """Replace the pool with a thread pool (after a process pool broke)."""
+    global _executor
+    broken = _executor
+    _executor = ThreadPoolExecutor(
+        max_workers=CONFLICT_SCAN_WORKERS,
+        thread_name_prefix="conflict-scan",
+    )
+    if broken is not None:
+        broken.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_conflict_scan_executor():
+    """Shut down the comparison pool (called on application shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run_in_scan_executor(fn, size: int, *args):
+    """
+    Run a pure, picklable function for the conflict scan.
+
+    Inputs of at most INLINE_COMPUTE_MAX_ENTRIES items run inline; larger
+    ones go to the scan executor so the event loop keeps serving requests.
+    """
+    if size <= INLINE_COMPUTE_MAX_ENTRIES:
+        return fn(*args)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+    except BrokenProcessPool as e:
+        # A dead worker poisons the whole pool; fall back to threads
+        logger.warning(f"Conflict scan process pool broken, using threads: {e}")
+        _use_thread_executor()
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+
+
+# ==================== SCANNER ====================
+
+
+class ConflictScannerService:
+    """
+    Service that keeps stored conflicts and conflict reports current.
+
+    - mark_network_changed: called from every structure write path
+    - scan_dirty_networks: re-detects only networks whose version advanced
+    - start_background_scan / cancel_scan / get_scan_run: long scans
+    - get_report_conflicts: serves /reports/conflicts from snapshots
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        # Serializes scans so the scheduler and manual triggers don't
+        # process the same network twice in this worker
+        self._scan_lock = asyncio.Lock()
+        self._active_scan_id: Optional[str] = None
+        self._cancelled_scans: set = set()
+        self._background_tasks: Dict[str, asyncio.Task] = {}
+
+    async def mark_network_changed(self, network_id: str):
+        """Bump a network's structure version so the next scan picks it up."""
+        if not network_id:
+            return
+        await self.db.seo_networks.update_one(
+            {"id": network_id},
+            {"$inc": {"structure_version": 1}},
+        )
+
+    async def mark_domain_changed(self, asset_domain_id: str):
+        """Bump every network with a node on or pointing at the domain (renames)."""
+        network_ids = await self.db.seo_structure_entries.distinct(
+            "network_id",
+            {"$or": [
+                {"asset_domain_id": asset_domain_id},
+                {"target_asset_domain_id": asset_domain_id},
+            ]},
+        )
+        if network_ids:
+            await self.db.seo_networks.update_many(
+                {"id": {"$in": network_ids}},
+                {"$inc": {"structure_version": 1}},
+            )
+
+    # ---------- loading & computing ----------
+
+    async def _load_network_inputs(self, network: Dict[str, Any]) -> Dict[str, Any]:
+        """Load the compact detector inputs for one network."""
+        entries = await self.db.seo_structure_entries.find(
+            {"network_id": network["id"]}, ENTRY_PROJECTION
+        ).to_list(None)
+
+        domain_ids = list({e["asset_domain_id"] for e in entries if e.get("asset_domain_id")})
+        domains = await self.db.asset_domains.find(
+            {"id": {"$in": domain_ids}}, {"_id": 0, "id": 1, "domain_name": 1}
+        ).to_list(None)
+
+        return {
+            "network": {"id": network["id"], "name": network.get("name", "Unknown")},
+            "entries": entries,
+            "domain_names": {d["id"]: d["domain_name"] for d in domains},
+            "now": datetime.now(timezone.utc).isoformat(),
+        }
+
+    async def _compute(
+        self, inputs: Dict[str, Any], include_stored: bool = True
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Run the comparison step, off the event loop for non-trivial networks."""
+        return await run_in_scan_executor(
+            compute_network_conflicts, len(inputs["entries"]), inputs, include_stored
+        )
+
+    async def detect_report_conflicts(
+        self, network: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Detect /reports/conflicts conflicts for one network."""
+        inputs = await self._load_network_inputs(network)
+        report_conflicts, _ = await self._compute(inputs, include_stored=False)
+        return report_conflicts
+
+    async def detect_stored_conflicts(self, network_id: str) -> List[Dict[str, Any]]:
+        """Detect conflicts to persist for one network."""
+        network = await self.db.seo_networks.find_one(
+            {"id": network_id}, {"_id": 0, "id": 1, "name": 1}
+        )
+        if not network:
+            return []
+        inputs = await self._load_network_inputs(network)
+        _, stored_conflicts = await self._compute(inputs)
+        return stored_conflicts
+
+    # ---------- scanning ----------
+
+    async def scan_dirty_networks(
+        self,
+        network_id: Optional[str] = None,
+        force: bool = False,
+        triggered_by: str = "system",
+        scan_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Re-run conflict detection for networks whose structure changed.
+
+        Args:
+            network_id: Restrict the scan to a single network
+            force: Re-scan even if the network is not dirty
+            triggered_by: User ID (or "system") recorded on the linker
+            scan_id: ID for the conflict_scan_runs record (generated if omitted)
+
+        Returns summary of the scan.
+        """
+        from services.conflict_optimization_linker_service import (
+            get_conflict_linker_service,
+        )
+
+        linker = get_conflict_linker_service(self.db)
+        scan_id = scan_id or str(uuid.uuid4())
+
+        query: Dict[str, Any] = {"id": network_id} if network_id else {}
+        if not force:
+            query["$expr"] = DIRTY_NETWORK_EXPR
+
+        summary = {
+            "scan_id": scan_id,
+            "status": "running",
+            "networks_scanned": 0,
+            "networks_skipped": 0,
+            "networks_failed": 0,
+            "conflicts_processed": 0,
+            "new_conflicts": 0,
+            "recurring_conflicts": 0,
+            "optimizations_created": 0,
+        }
+
+        async with self._scan_lock:
+            self._active_scan_id = scan_id
+            try:
+                networks = await self.db.seo_networks.find(
+                    query,
+                    {"_id": 0, "id": 1, "name": 1, "brand_id": 1, "structure_version": 1},
+                ).to_list(None)
+
+                total_networks = await self.db.seo_networks.count_documents(
+                    {"id": network_id} if network_id else {}
+                )
+                summary["networks_skipped"] = max(total_networks - len(networks), 0)
+
+                now = datetime.now(timezone.utc).isoformat()
+                await self.db.conflict_scan_runs.insert_one(
+                    {
+                        "id": scan_id,
+                        "status": "running",
+                        "network_id": network_id,
+                        "force": force,
+                        "triggered_by": triggered_by,
+                        "total_networks": len(networks),
+                        "networks_done": 0,
+                        "cancel_requested": False,
+                        "started_at": now,
+                        "updated_at": now,
+                        "finished_at": None,
+                    }
+                )
+
+                semaphore = asyncio.Semaphore(CONFLICT_SCAN_CONCURRENCY)
+
+                async def scan_one(network: Dict[str, Any]):
+                    async with semaphore:
+                        if scan_id in self._cancelled_scans:
+                            raise ConflictScanCancelled()
+                        try:
+                            await self._scan_network(network, linker, triggered_by, summary)
+                            summary["networks_scanned"] += 1
+                        except Exception as e:
+                            summary["networks_failed"] += 1
+                            logger.error(
+                                f"Conflict scan failed for network {network['id']}: {e}"
+                            )
+                        done = summary["networks_scanned"] + summary["networks_failed"]
+                        if done % PROGRESS_FLUSH_EVERY == 0:
+                            await self._flush_progress(scan_id, summary)
+
+                tasks = [asyncio.ensure_future(scan_one(n)) for n in networks]
+                try:
+                    await asyncio.gather(*tasks)
+                    summary["status"] = "completed"
+                except (ConflictScanCancelled, asyncio.CancelledError):
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    summary["status"] = "cancelled"
+                    logger.info(f"Conflict scan {scan_id} cancelled: {summary}")
+            finally:
+                self._active_scan_id = None
+                self._cancelled_scans.discard(scan_id)
+                await self._flush_progress(scan_id, summary, finished=True)
+
+        return summary
+
+    async def _scan_network(
+        self,
+        network: Dict[str, Any],
+        linker,
+        triggered_by: str,
+        summary: Dict[str, Any],
+    ):
+        """Detect, persist and snapshot one network, then mark it scanned."""
+        nid = network["id"]
+        version = network.get("structure_version", DEFAULT_STRUCTURE_VERSION)
+
+        inputs = await self._load_network_inputs(network)
+        report_conflicts, stored_conflicts = await self._compute(inputs)
+
+        # Brand-wide near-duplicates; a pair is owned by node_a's network,
+        # which may be another network of the brand
+        near_duplicates = await get_cannibalization_index_service(self.db).sync_network(
+            network, inputs["entries"], inputs["domain_names"]
+        )
+        conflicts_by_network: Dict[str, List[Dict[str, Any]]] = {nid: stored_conflicts}
+        for conflict in near_duplicates:
+            conflicts_by_network.setdefault(conflict["network_id"], []).append(conflict)
+
+        for owner_id, conflicts in conflicts_by_network.items():
+            if not conflicts:
+                continue
+            result = await linker.process_detected_conflicts(
+                conflicts=conflicts,
+                network_id=owner_id,
+                triggered_by=triggered_by,
+            )
+            summary["conflicts_processed"] += result.get("processed", 0)
+            summary["new_conflicts"] += result.get("new_conflicts", 0)
+            summary["recurring_conflicts"] += result.get("recurring_conflicts", 0)
+            summary["optimizations_created"] += result.get("optimizations_created", 0)
+
+        await self._store_report_snapshot(network, version, report_conflicts)
+
+        # $max so a slower concurrent scan never moves the marker back
+        await self.db.seo_networks.update_one(
+            {"id": nid},
+            {
+                "$max": {"conflicts_scanned_version": version},
+                "$set": {"conflicts_scanned_at": datetime.now(timezone.utc).isoformat()},
+            },
+        )
+
+    async def _flush_progress(
+        self, scan_id: str, summary: Dict[str, Any], finished: bool = False
+    ):
+        """Persist scan progress and pick up cancellation requested elsewhere."""
+        now = datetime.now(timezone.utc).isoformat()
+        update = {
+            **{k: v for k, v in summary.items() if k != "scan_id"},
+            "networks_done": summary["networks_scanned"] + summary["networks_failed"],
+            "updated_at": now,
+        }
+        if finished:
+            update["finished_at"] = now
+
+        try:
+            run = await self.db.conflict_scan_runs.find_one_and_update(
+                {"id": scan_id},
+                {"$set": update},
+                projection={"_id": 0, "cancel_requested": 1},
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record conflict scan progress: {e}")
+            return
+
+        if run and run.get("cancel_requested") and not finished:
+            self._cancelled_scans.add(scan_id)
+
+    async def start_background_scan(
+        self,
+        network_id: Optional[str] = None,
+        force: bool = False,
+        triggered_by: str = "system",
+    ) -> Dict[str, Any]:
+        """
+        Start a scan without waiting for it.
+
+        If this worker is already scanning, the running scan is returned
+        instead of queueing another one.
+        """
+        running_id = self._active_scan_id or next(iter(self._background_tasks), None)
+        if running_id:
+            return {"scan_id": running_id, "already_running": True}
+
+        scan_id = str(uuid.uuid4())
+        task = asyncio.create_task(
+            self.scan_dirty_networks(
+                network_id=network_id,
+                force=force,
+                triggered_by=triggered_by,
+                scan_id=scan_id,
+            )
+        )
+        self._background_tasks[scan_id] = task
+        task.add_done_callback(lambda _t: self._background_tasks.pop(scan_id, None))
+        return {"scan_id": scan_id, "already_running": False}
+
+    async def cancel_scan(self, scan_id: str) -> bool:
+        """
+        Request cancellation of a running scan.
+
+        The flag is stored on the run so a scan in another worker stops at
+        its next progress flush; a scan in this worker stops immediately.
+        """
+        result = await self.db.conflict_scan_runs.update_one(
+            {"id": scan_id, "status": "running"},
+            {"$set": {"cancel_requested": True}},
+        )
+        if scan_id == self._active_scan_id:
+            self._cancelled_scans.add(scan_id)
+        return result.matched_count > 0
+
+    async def get_scan_run(self, scan_id: str) -> Optional[Dict[str, Any]]:
+        """Get the progress record of a scan."""
+        run = await self.db.conflict_scan_runs.find_one({"id": scan_id}, {"_id": 0})
+        if run and run.get("total_networks"):
+            run["progress_percent"] = round(
+                run.get("networks_done", 0) / run["total_networks"] * 100, 1
+            )
+        return run
+
+    # ---------- reports ----------
+
+    async def get_report_conflicts(
+        self, networks: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Get report conflicts for the given networks from stored snapshots.
+
+        Networks without a snapshot for their current structure_version are
+        detected inline (with bounded concurrency) and their snapshot
+        refreshed. Nothing is persisted to seo_conflicts here - that only
+        happens in scan_dirty_networks.
+        """
+        network_ids = [n["id"] for n in networks]
+        snapshots = await self.db.seo_conflict_reports.find(
+            {"network_id": {"$in": network_ids}},
+            {"_id": 0, "network_id": 1, "structure_version": 1, "conflicts": 1},
+        ).to_list(None)
+        snapshot_lookup = {s["network_id"]: s for s in snapshots}
+
+        semaphore = asyncio.Semaphore(CONFLICT_SCAN_CONCURRENCY)
+
+        async def network_conflicts(network: Dict[str, Any]) -> List[Dict[str, Any]]:
+            version = network.get("structure_version", DEFAULT_STRUCTURE_VERSION)
+            snapshot = snapshot_lookup.get(network["id"])
+
+            if snapshot and snapshot.get("structure_version") == version:
+                return snapshot.get("conflicts", [])
+
+            async with semaphore:
+                report_conflicts = await self.detect_report_conflicts(network)
+                await self._store_report_snapshot(network, version, report_conflicts)
+                return report_conflicts
+
+        results = await asyncio.gather(*(network_conflicts(n) for n in networks))
+        conflicts = [c for network_result in results for c in network_result]
+
+        # Near-duplicates are kept incrementally by scans, not per snapshot
+        conflicts.extend(
+            await get_cannibalization_index_service(self.db).get_report_conflicts(network_ids)
+        )
+        return conflicts
+
+    async def _store_report_snapshot(
+        self,
+        network: Dict[str, Any],
+        version: int,
+        conflicts: List[Dict[str, Any]],
+    ):
+        """Upsert the report snapshot for a network at a structure version."""
+        await self.db.seo_conflict_reports.update_one(
+            {"network_id": network["id"]},
+            {
+                "$set": {
+                    "network_id": network["id"],
+                    "network_name": network.get("name"),
+                    "structure_version": version,
+                    "conflicts": conflicts,
+                    "scanned_at": datetime.now(timezone.utc).isoformat(),
+                }
+            },
+            upsert=True,
+        )
+
+    async def delete_network_state(self, network_id: str):
+        """Drop the report snapshot and cannibalization index of a deleted network."""
+        await self.db.seo_conflict_reports.delete_one({"network_id": network_id})
+        await get_cannibalization_index_service(self.db).delete_network_state(network_id)
+
+
+# Global instance
+_conflict_scanner_service: Optional[ConflictScannerService] = None
+
+
+def get_conflict_scanner_service(db: AsyncIOMotorDatabase) -> ConflictScannerService:
+    """Get or create the conflict scanner service"""
+    global _conflict_scanner_service
+    if _conflict_scanner_service is None:
+        _conflict_scanner_service = ConflictScannerService(db)
+    return _conflict_scanner_service
@@ -0,0 +1,231 @@
+"""
+CSV Upload Service
+==================
+
+Incremental parsing of CSV uploads for the import endpoints.
+
+The request body is read chunk by chunk from the ASGI stream - nothing is
+buffered in memory or spooled to disk:
+- multipart/form-data (a browser FormData upload): the chunks are fed to
+  python-multipart's push parser and only the "file" part is kept
+- text/csv: the body is the file itself
+
+The file is decoded incrementally (UTF-8, BOM tolerated) and split into
+complete CSV records - a newline inside a quoted field does not end a
+record - which are parsed with the csv module and yielded as row dicts in
+batches of CSV_UPLOAD_BATCH_ROWS. Memory is bounded by one batch plus one
+network chunk, whatever the size of the file.
+
+Header handling matches the import dialog: names are stripped and
+lowercased, `registrar` is accepted for `registrar_name`, unknown columns
+are dropped and rows without a domain_name are skipped.
+"""
+
+import codecs
+import csv
+import os
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.requests import Request
+
+from services.domain_import_service import IMPORT_FIELDS
+
+# Rows per batch handed to the import service
+CSV_UPLOAD_BATCH_ROWS = int(os.environ.get("CSV_UPLOAD_BATCH_ROWS", "1000"))
+
+# Largest accepted upload (bytes of request body)
+CSV_UPLOAD_MAX_BYTES = int(os.environ.get("CSV_UPLOAD_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# A single record this long means an unterminated quoted field
+MAX_RECORD_CHARS = 1024 * 1024
+
+COLUMN_ALIASES = {"registrar": "registrar_name"}
+
+
+class CsvUploadError(ValueError):
+    """The upload is not a readable CSV file."""
+
+
+class CsvUploadTooLarge(CsvUploadError):
+    """The upload exceeds CSV_UPLOAD_MAX_BYTES."""
+
+
+class CsvRecordSplitter:
+    """
+    Splits streamed text into complete CSV records.
+
+    A line ends a record when the record holds an even number of quote
+    characters so far (escaped quotes come in pairs), which is exactly when
+    the line break is outside a quoted field.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._scanned = 0
+        self._quotes = 0
+
+    def feed(self, text: str) -> List[str]:
+        self._buffer += text
+        records = []
+        start = 0
+        while True:
+            newline = self._buffer.find("\n", self._scanned)
+            if newline < 0:
+                break
+            self._quotes += self._buffer.count('"', self._scanned, newline + 1)
+            self._scanned = newline + 1
+            if self._quotes % 2 == 0:
+                records.append(self._buffer[start:self._scanned])
+                start = self._scanned
+                self._quotes = 0
+        self._buffer = self._buffer[start:]
+        self._scanned -= start
+        if len(self._buffer) > MAX_RECORD_CHARS:
+            raise CsvUploadError("Unterminated quoted field in CSV")
+        return records
+
+    def close(self) -> List[str]:
+        """The last record when the file does not end with a newline."""
+        rest, self._buffer, self._scanned = self._buffer, "", 0
+        return [rest] if rest.strip() else []
+
+
+class CsvRowReader:
+    """Turns complete CSV records into import row dicts, header first."""
+
+    def __init__(self, fields: Tuple[str, ...] = IMPORT_FIELDS):
+        self.fields = fields
+        self.columns: Optional[List[Tuple[int, str]]] = None
+
+    def rows(self, records: List[str]) -> List[Dict[str, Any]]:
+        rows = []
+        try:
+            for values in csv.reader(records):
+                if self.columns is None:
+                    self._read_header(values)
+                    continue
+                row = {
+                    field: values[index].strip()
+                    for index, field in self.columns
+                    if index < len(values)
+                }
+                if row.get("domain_name"):
+                    rows.append(row)
+        except csv.Error as e:
+            raise CsvUploadError(f"Invalid CSV: {e}")
+        return rows
+
+    def _read_header(self, values: List[str]):
+        header = [COLUMN_ALIASES.get(h.strip().lower(), h.strip().lower()) for h in values]
+        if "domain_name" not in header:
+            raise CsvUploadError('CSV must have a "domain_name" column')
+        # First occurrence wins when both registrar and registrar_name exist
+        self.columns = []
+        taken = set()
+        for index, name in enumerate(header):
+            if name in self.fields and name not in taken:
+                self.columns.append((index, name))
+                taken.add(name)
+
+
+class _MultipartFileReader:
+    """Push-parses a multipart body, collecting the bytes of one file field."""
+
+    def __init__(self, boundary: bytes, field: str):
+        self.field = field.encode()
+        self.data: List[bytes] = []
+        self.found = False
+        self._in_field = False
+        self._header_field = b""
+        self._header_value = b""
+        self._disposition = b""
+        self.parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+        })
+
+    def write(self, chunk: bytes) -> bytes:
+        """Feed a body chunk; returns the file bytes it contained."""
+        self.parser.write(chunk)
+        data, self.data = b"".join(self.data), []
+        return data
+
+    def _on_part_begin(self):
+        self._in_field = False
+        self._disposition = b""
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        if self._header_field.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._disposition)
+        self._in_field = options.get(b"name") == self.field and not self.found
+        self.found = self.found or self._in_field
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._in_field:
+            self.data.append(data[start:end])
+
+
+async def iter_csv_upload(
+    request: Request,
+    field: str = "file",
+    batch_rows: int = CSV_UPLOAD_BATCH_ROWS,
+    max_bytes: int = CSV_UPLOAD_MAX_BYTES,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield the rows of an uploaded CSV in batches while the body is received.
+
+    Raises:
+        CsvUploadError: not multipart/text CSV, no file part, no
+            domain_name column or malformed CSV
+        CsvUploadTooLarge: the body exceeds max_bytes
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    multipart = None
+    if content_type == b"multipart/form-data":
+        if not options.get(b"boundary"):
+            raise CsvUploadError("Multipart upload without boundary")
+        multipart = _MultipartFileReader(options[b"boundary"], field)
+    elif content_type not in (b"text/csv", b"text/plain", b"application/csv"):
+        raise CsvUploadError("Upload the CSV as multipart/form-data or text/csv")
+
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    splitter = CsvRecordSplitter()
+    reader = CsvRowReader()
+    pending: List[Dict[str, Any]] = []
+    received = 0
+
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes:
+            raise CsvUploadTooLarge(f"Upload exceeds {max_bytes // (1024 * 1024)} MB")
+        data = multipart.write(chunk) if multipart else chunk
+        if not data:
+            continue
+        pending.extend(reader.rows(splitter.feed(decoder.decode(data))))
+        while len(pending) >= batch_rows:
+            yield pending[:batch_rows]
+            pending = pending[batch_rows:]
+
+    if multipart and not multipart.found:
+        raise CsvUploadError(f'No "{field}" file in the upload')
+    pending.extend(reader.rows(splitter.feed(decoder.decode(b"", final=True)) + splitter.close()))
+    if reader.columns is None:
+        raise CsvUploadError("CSV file is empty")
+    for start in range(0, len(pending), batch_rows):
+        yield pending[start:start + batch_rows]
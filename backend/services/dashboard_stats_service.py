@@ -0,0 +1,327 @@
+"""
+Dashboard Stats Service
+=======================
+
+Lightweight counters shown on the dashboard, monitoring and report pages.
+
+Shared by the polling endpoints (/dashboard/stats, /monitoring/stats,
+/reports/dashboard, legacy /reports/dashboard-stats and /monitoring/stats)
+and the live updates hub.
+
+- Each collection is counted with one $facet aggregation (one facet per
+  counter) and the collections are queried concurrently
+- Results are cached per brand scope for DASHBOARD_STATS_CACHE_SECONDS
+  through the single-flight service: concurrent requests for the same
+  stats share one computation instead of each running it
+"""
+
+import asyncio
+import os
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Any, List, Optional
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+
+from services.single_flight_service import get_single_flight
+
+# How long computed stats are served to other requests
+DASHBOARD_STATS_CACHE_SECONDS = float(os.environ.get("DASHBOARD_STATS_CACHE_SECONDS", "5"))
+
+
+def brand_scope_filter(brand_scope: Optional[List[str]], brand_field: str = "brand_id") -> dict:
+    """
+    MongoDB filter for a brand scope.
+    None (Super Admin): no filter; empty list: no access.
+    """
+    if brand_scope is None:
+        return {}
+    return {brand_field: {"$in": list(brand_scope)}}
+
+
+async def facet_counts(
+    collection: AsyncIOMotorCollection,
+    facets: Dict[str, Dict[str, Any]],
+    match: Optional[Dict[str, Any]] = None,
+) -> Dict[str, int]:
+    """Count documents for several filters in one $facet aggregation."""
+    pipeline = []
+    if match:
+        pipeline.append({"$match": match})
+    pipeline.append({"$facet": {
+        name: [{"$match": facet_filter}, {"$count": "count"}]
+        for name, facet_filter in facets.items()
+    }})
+
+    rows = await collection.aggregate(pipeline).to_list(1)
+    result = rows[0] if rows else {}
+    return {
+        name: result[name][0]["count"] if result.get(name) else 0
+        for name in facets
+    }
+
+
+# ==================== /api/v3/dashboard/stats ====================
+
+
+async def compute_dashboard_stats(
+    db: AsyncIOMotorDatabase, brand_scope: Optional[List[str]]
+) -> Dict[str, Any]:
+    """Dashboard counters for one brand scope."""
+    brand_filter = brand_scope_filter(brand_scope)
+
+    domains, total_networks, entries, alerts = await asyncio.gather(
+        facet_counts(db.asset_domains, {
+            "total_domains": {},
+            "active_domains": {"status": "active"},
+            "monitored_count": {"monitoring_enabled": True},
+            "ping_up": {"ping_status": "up"},
+            "ping_down": {"ping_status": "down"},
+        }, match=brand_filter),
+        db.seo_networks.count_documents(brand_filter),
+        facet_counts(db.seo_structure_entries, {
+            "indexed_count": {"index_status": "index"},
+            "noindex_count": {"index_status": "noindex"},
+        }),
+        facet_counts(db.alerts, {"active_alerts": {"acknowledged": False}}),
+    )
+
+    return {
+        "total_domains": domains["total_domains"],
+        "total_networks": total_networks,
+        "active_domains": domains["active_domains"],
+        "monitored_count": domains["monitored_count"],
+        "indexed_count": entries["indexed_count"],
+        "noindex_count": entries["noindex_count"],
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "ping_up": domains["ping_up"],
+        "ping_down": domains["ping_down"],
+        "active_alerts": alerts["active_alerts"],
+    }
+
+
+async def get_dashboard_stats(
+    db: AsyncIOMotorDatabase, brand_scope: Optional[List[str]], fresh: bool = False
+) -> Dict[str, Any]:
+    """Cached compute_dashboard_stats."""
+    return await get_single_flight().run(
+        "dashboard_stats",
+        lambda: compute_dashboard_stats(db, brand_scope),
+        brand_scope=brand_scope,
+        ttl_seconds=DASHBOARD_STATS_CACHE_SECONDS,
+        fresh=fresh,
+    )
+
+
+# ==================== /api/v3/monitoring/stats ====================
+
+
+async def compute_monitoring_stats(db: AsyncIOMotorDatabase) -> Dict[str, Any]:
+    """Availability, expiration and alert counters (not brand scoped)."""
+    now = datetime.now(timezone.utc)
+    now_str = now.isoformat()
+    week_later = (now + timedelta(days=7)).isoformat()
+    month_later = (now + timedelta(days=30)).isoformat()
+
+    domains, alerts = await asyncio.gather(
+        facet_counts(db.asset_domains, {
+            "total_monitored": {"monitoring_enabled": True},
+            "up": {"monitoring_enabled": True, "ping_status": "up"},
+            "down": {"monitoring_enabled": True, "ping_status": "down"},
+            "unknown": {"monitoring_enabled": True, "ping_status": {"$nin": ["up", "down"]}},
+            "expiring_7_days": {"expiration_date": {"$ne": None, "$lte": week_later, "$gt": now_str}},
+            "expiring_30_days": {"expiration_date": {"$ne": None, "$lte": month_later, "$gt": now_str}},
+            "expired": {"expiration_date": {"$ne": None, "$lte": now_str}},
+        }),
+        facet_counts(db.alerts, {
+            "monitoring_unacknowledged": {"alert_type": "monitoring"},
+            "expiration_unacknowledged": {"alert_type": "expiration"},
+        }, match={"acknowledged": False}),
+    )
+
+    return {
+        "availability": {
+            "total_monitored": domains["total_monitored"],
+            "up": domains["up"],
+            "down": domains["down"],
+            "unknown": domains["unknown"],
+        },
+        "expiration": {
+            "expiring_7_days": domains["expiring_7_days"],
+            "expiring_30_days": domains["expiring_30_days"],
+            "expired": domains["expired"],
+        },
+        "alerts": alerts,
+        "updated_at": now_str,
+    }
+
+
+async def get_monitoring_stats(db: AsyncIOMotorDatabase, fresh: bool = False) -> Dict[str, Any]:
+    """Cached compute_monitoring_stats."""
+    return await get_single_flight().run(
+        "monitoring_stats",
+        lambda: compute_monitoring_stats(db),
+        ttl_seconds=DASHBOARD_STATS_CACHE_SECONDS,
+        fresh=fresh,
+    )
+
+
+# ==================== /api/v3/reports/dashboard ====================
+
+
+async def compute_v3_report_stats(db: AsyncIOMotorDatabase) -> Dict[str, Any]:
+    """Collection, status, role, index and monitoring totals."""
+    domains, network_count, entries = await asyncio.gather(
+        facet_counts(db.asset_domains, {
+            "total": {},
+            "active": {"status": "active"},
+            "inactive": {"status": "inactive"},
+            "expired": {"status": "expired"},
+            "monitored": {"monitoring_enabled": True},
+            "up": {"monitoring_enabled": True, "ping_status": "up"},
+            "down": {"monitoring_enabled": True, "ping_status": "down"},
+        }),
+        db.seo_networks.count_documents({}),
+        facet_counts(db.seo_structure_entries, {
+            "total": {},
+            "main": {"domain_role": "main"},
+            "supporting": {"domain_role": "supporting"},
+            "indexed": {"index_status": "index"},
+            "noindexed": {"index_status": "noindex"},
+        }),
+    )
+
+    structure_count = entries["total"]
+    return {
+        "collections": {
+            "asset_domains": domains["total"],
+            "seo_networks": network_count,
+            "seo_structure_entries": structure_count,
+        },
+        "asset_status": {
+            "active": domains["active"],
+            "inactive": domains["inactive"],
+            "expired": domains["expired"],
+        },
+        "domain_roles": {"main": entries["main"], "supporting": entries["supporting"]},
+        "index_status": {
+            "indexed": entries["indexed"],
+            "noindexed": entries["noindexed"],
+            "index_rate": (
+                round(entries["indexed"] / structure_count * 100, 1) if structure_count > 0 else 0
+            ),
+        },
+        "monitoring": {
+            "total_monitored": domains["monitored"],
+            "up": domains["up"],
+            "down": domains["down"],
+            "unknown": domains["monitored"] - domains["up"] - domains["down"],
+        },
+    }
+
+
+async def get_v3_report_stats(db: AsyncIOMotorDatabase) -> Dict[str, Any]:
+    """Cached compute_v3_report_stats."""
+    return await get_single_flight().run(
+        "v3_report_stats",
+        lambda: compute_v3_report_stats(db),
+        ttl_seconds=DASHBOARD_STATS_CACHE_SECONDS,
+    )
+
+
+# ==================== /api/reports/dashboard-stats (legacy) ====================
+
+
+async def compute_legacy_dashboard_stats(
+    db: AsyncIOMotorDatabase, brand_scope: Optional[List[str]]
+) -> Dict[str, Any]:
+    """Legacy dashboard counters, including critical alerts of down domains."""
+    brand_filter = brand_scope_filter(brand_scope)
+    brand_list_filter = brand_scope_filter(brand_scope, brand_field="id")
+    down_filter = {"monitoring_enabled": True, "ping_status": "down"}
+
+    domain_pipeline = []
+    if brand_filter:
+        domain_pipeline.append({"$match": brand_filter})
+    domain_pipeline.append({"$facet": {
+        **{
+            name: [{"$match": facet_filter}, {"$count": "count"}]
+            for name, facet_filter in {
+                "total_domains": {},
+                "indexed_count": {"index_status": "index"},
+                "noindex_count": {"index_status": "noindex"},
+                "monitored_count": {"monitoring_enabled": True},
+                "up_count": {"monitoring_enabled": True, "ping_status": "up"},
+                "down_count": down_filter,
+            }.items()
+        },
+        "down_domain_names": [
+            {"$match": {**down_filter, "domain": {"$nin": [None, ""]}}},
+            {"$group": {"_id": None, "names": {"$push": "$domain"}}},
+        ],
+    }})
+
+    domain_rows, total_networks, total_brands, alerts = await asyncio.gather(
+        db.asset_domains.aggregate(domain_pipeline).to_list(1),
+        db.seo_networks.count_documents(brand_filter),
+        db.brands.count_documents(brand_list_filter),
+        facet_counts(db.alerts, {"active_alerts": {"acknowledged": False}}),
+    )
+
+    facets = domain_rows[0] if domain_rows else {}
+    domains = {
+        name: rows[0]["count"] if rows else 0
+        for name, rows in facets.items() if name != "down_domain_names"
+    }
+    down_names = facets.get("down_domain_names") or []
+    down_domain_names = down_names[0]["names"] if down_names else []
+
+    # Critical alerts: only count alerts for domains that are CURRENTLY down
+    # This ensures banner disappears when domain is fixed
+    critical_filter = {
+        "acknowledged": False,
+        "severity": "critical",
+        "domain_name": {"$in": down_domain_names},
+    }
+    critical_rows = await db.alerts.aggregate([
+        {"$match": critical_filter},
+        {"$facet": {
+            "count": [{"$count": "count"}],
+            # Show max 5 in banner
+            "details": [
+                {"$limit": 5},
+                {"$project": {"_id": 0, "domain_name": 1, "title": 1, "alert_type": 1, "created_at": 1}},
+            ],
+        }},
+    ]).to_list(1)
+    critical = critical_rows[0] if critical_rows else {}
+    critical_alerts_count = critical["count"][0]["count"] if critical.get("count") else 0
+
+    total_domains = domains.get("total_domains", 0)
+    indexed_count = domains.get("indexed_count", 0)
+    return {
+        "total_domains": total_domains,
+        "total_groups": total_networks,  # Keeping old key name for frontend compatibility
+        "total_brands": total_brands,
+        "indexed_count": indexed_count,
+        "noindex_count": domains.get("noindex_count", 0),
+        "index_rate": round(
+            (indexed_count / total_domains * 100) if total_domains > 0 else 0, 1
+        ),
+        "monitored_count": domains.get("monitored_count", 0),
+        "up_count": domains.get("up_count", 0),
+        "down_count": domains.get("down_count", 0),
+        "active_alerts": alerts["active_alerts"],
+        "critical_alerts": critical_alerts_count,
+        "critical_alert_details": critical.get("details", []) if critical_alerts_count else [],
+    }
+
+
+async def get_legacy_dashboard_stats(
+    db: AsyncIOMotorDatabase, brand_scope: Optional[List[str]]
+) -> Dict[str, Any]:
+    """Cached compute_legacy_dashboard_stats."""
+    return await get_single_flight().run(
+        "legacy_dashboard_stats",
+        lambda: compute_legacy_dashboard_stats(db, brand_scope),
+        brand_scope=brand_scope,
+        ttl_seconds=DASHBOARD_STATS_CACHE_SECONDS,
+    )
@@ -0,0 +1,651 @@
+"""
+Domain Import Service
+=====================
+
+Bulk write pipeline behind POST /api/v3/import/domains/confirm.
+
+An import runs in two passes:
+1. Plan (in memory, no writes): every row is parsed and resolved against
+   brand / category / registrar lookups and the existing-domain map loaded
+   with one $in query on domain_key (case-insensitive, see
+   services/domain_key_service.py). Rows become InsertOne / UpdateOne
+   operations, or skipped / error results. Unknown brands are collected
+   once per name.
+2. Write, in chunks of IMPORT_WRITE_BATCH_SIZE rows:
+   - new brands: one insert_many before the first chunk
+   - domains: one unordered bulk_write per chunk
+   - activity logs: queued on the log writer once per chunk
+     (ActivityLogService.log_many), only for rows whose write succeeded
+
+A failed operation (BulkWriteError) turns only its own row into an error;
+the rest of the chunk is still applied. When the bulk_write fails as a
+whole (timeout, connection drop), the chunk is re-read and only the rows
+that were not applied become errors; the import continues with the next
+chunk. A domain created concurrently by
+another request is rejected by the unique domain_key index and reported as
+already existing. A domain name repeated in the same file (in any case) is
+imported once - later rows are reported as skipped, since unordered writes
+could otherwise apply them in any order.
+
+The response keeps the per-row shape of the previous row-by-row
+implementation (created / updated / skipped / errors / details) and adds
+`stats` with the rows per second of the import.
+
+preview_batches / confirm_batches take rows as an async iterator of batches
+(see services/csv_upload_service.py for streamed CSV uploads): lookups are
+loaded once, every batch is planned and written before the next one is
+read, and duplicates / row numbers are tracked across batches. With a
+limit, only the first rows of the per-row lists are returned - the counts
+stay exact - so memory does not grow with the file.
+"""
+
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from models_v3 import ActionType, EntityType
+from services.domain_key_service import normalize_domain_key, with_domain_key
+from services.event_bus import publish_event
+from services.metrics_service import IMPORT_ROWS, IMPORT_ROWS_PER_SECOND
+
+logger = logging.getLogger(__name__)
+
+# Rows written per bulk_write / activity log insert_many
+IMPORT_WRITE_BATCH_SIZE = int(os.environ.get("IMPORT_WRITE_BATCH_SIZE", "1000"))
+
+VALID_LIFECYCLE = {"active", "released", "quarantined", "not_renewed"}
+
+EXPIRATION_DATE_FORMATS = ["%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%d/%m/%Y"]
+
+DUPLICATE_KEY_ERROR = 11000
+
+MONITORING_ON_VALUES = {"ON", "TRUE", "1", "YES"}
+
+MONITORING_VALUES = MONITORING_ON_VALUES | {"OFF", "FALSE", "0", "NO"}
+
+# Columns of an import row (ImportDomainItem)
+IMPORT_FIELDS = (
+    "domain_name",
+    "brand_name",
+    "category_name",
+    "registrar_name",
+    "expiration_date",
+    "lifecycle_status",
+    "monitoring_enabled",
+    "notes",
+)
+
+
+def parse_expiration_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an import expiration date (time part ignored); None if unparseable."""
+    if not value:
+        return None
+    date_str = value.strip()
+    if "T" in date_str:
+        date_str = date_str.split("T")[0]
+    for fmt in EXPIRATION_DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _clean(value: Optional[str]) -> str:
+    return (value or "").strip()
+
+
+async def single_batch(rows: List[Dict[str, Any]]) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Rows already in memory as a one-batch iterator."""
+    yield rows
+
+
+def _trim(result: Dict[str, Any], keys: Tuple[str, ...], limit: Optional[int]):
+    """Cut per-row lists down to `limit` entries, flagging the result as truncated."""
+    if limit is None:
+        return
+    for key in keys:
+        if len(result[key]) > limit:
+            del result[key][limit:]
+            result["truncated"] = True
+
+
+class DomainImportService:
+    """Validates and bulk-writes asset domain CSV imports"""
+
+    def __init__(self, db: AsyncIOMotorDatabase, activity_log_service=None):
+        self.db = db
+        self.activity_log_service = activity_log_service
+
+    async def load_lookups(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Brands, categories and registrars keyed by lowercase name."""
+        return {
+            "brands": {
+                b["name"].lower(): b
+                for b in await self.db.brands.find({}, {"_id": 0}).to_list(1000)
+            },
+            "categories": {
+                c["name"].lower(): c
+                for c in await self.db.categories.find({}, {"_id": 0}).to_list(1000)
+            },
+            "registrars": {
+                r["name"].lower(): r
+                for r in await self.db.registrars.find({}, {"_id": 0}).to_list(1000)
+            },
+        }
+
+    async def load_existing(self, rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Existing asset domains of the import, keyed by domain_key."""
+        keys = list({normalize_domain_key(row.get("domain_name")) for row in rows} - {""})
+        existing = await self.db.asset_domains.find(
+            {"domain_key": {"$in": keys}}, {"_id": 0}
+        ).to_list(None)
+        return {d["domain_key"]: d for d in existing}
+
+    # ---------- preview ----------
+
+    def preview(
+        self,
+        rows: List[Dict[str, Any]],
+        lookups: Dict[str, Dict[str, Dict[str, Any]]],
+        existing_map: Dict[str, Dict[str, Any]],
+        row_offset: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Validate rows without writing anything.
+
+        Returns new_domains / updated_domains / errors lists and a summary;
+        row numbers count the CSV header, starting at row_offset.
+        """
+        brands, categories, registrars = (
+            lookups["brands"], lookups["categories"], lookups["registrars"]
+        )
+        result = {
+            "new_domains": [],
+            "updated_domains": [],
+            "errors": [],
+            "summary": {
+                "total_rows": len(rows),
+                "new_count": 0,
+                "update_count": 0,
+                "error_count": 0
+            }
+        }
+
+        for idx, item in enumerate(rows):
+            row_num = row_offset + idx + 2  # +2 for header row and 0-indexing
+            errors = []
+            domain_name = item.get("domain_name") or ""
+
+            # Validate domain name
+            if not domain_name.strip():
+                errors.append("Domain name is required")
+
+            # Validate expiration date format
+            exp_date = None
+            if item.get("expiration_date"):
+                exp_date = parse_expiration_date(item["expiration_date"])
+                if not exp_date:
+                    errors.append(f"Invalid date format: {item['expiration_date']}")
+
+            # Validate lifecycle status
+            lifecycle = None
+            if item.get("lifecycle_status"):
+                lifecycle_lower = item["lifecycle_status"].lower().strip()
+                if lifecycle_lower not in VALID_LIFECYCLE:
+                    errors.append(f"Invalid lifecycle status: {item['lifecycle_status']}. Valid: active, released, quarantined, not_renewed")
+                else:
+                    lifecycle = lifecycle_lower
+
+            # Validate monitoring_enabled
+            monitoring = None
+            if item.get("monitoring_enabled"):
+                mon_upper = item["monitoring_enabled"].upper().strip()
+                if mon_upper not in MONITORING_VALUES:
+                    errors.append(f"Invalid monitoring_enabled: {item['monitoring_enabled']}. Use ON/OFF")
+                else:
+                    monitoring = mon_upper in MONITORING_ON_VALUES
+
+            # Check if brand exists (warn if not)
+            brand_id = None
+            brand_warning = None
+            if item.get("brand_name"):
+                brand = brands.get(item["brand_name"].lower().strip())
+                if brand:
+                    brand_id = brand["id"]
+                else:
+                    brand_warning = f"Brand '{item['brand_name']}' will be created"
+
+            # Check if category exists
+            category_id = None
+            category_warning = None
+            if item.get("category_name"):
+                category = categories.get(item["category_name"].lower().strip())
+                if category:
+                    category_id = category["id"]
+                else:
+                    category_warning = f"Category '{item['category_name']}' not found - will be skipped"
+
+            # Check if registrar exists
+            registrar_id = None
+            if item.get("registrar_name"):
+                registrar = registrars.get(item["registrar_name"].lower().strip())
+                if registrar:
+                    registrar_id = registrar["id"]
+
+            if errors:
+                result["errors"].append({
+                    "row": row_num,
+                    "domain_name": domain_name,
+                    "errors": errors
+                })
+                result["summary"]["error_count"] += 1
+                continue
+
+            existing = existing_map.get(normalize_domain_key(domain_name))
+
+            preview_item = {
+                "row": row_num,
+                "domain_name": domain_name.strip(),
+                "brand_name": item.get("brand_name") or "",
+                "brand_id": brand_id,
+                "brand_warning": brand_warning,
+                "category_name": item.get("category_name") or "",
+                "category_id": category_id,
+                "category_warning": category_warning,
+                "registrar_name": item.get("registrar_name") or "",
+                "registrar_id": registrar_id,
+                "expiration_date": exp_date.strftime("%Y-%m-%d") if exp_date else "",
+                "lifecycle_status": lifecycle or "active",
+                "monitoring_enabled": monitoring if monitoring is not None else False,
+                "notes": item.get("notes") or ""
+            }
+
+            if existing:
+                # Show what will change
+                changes = []
+                if item.get("brand_name") and brand_id and existing.get("brand_id") != brand_id:
+                    changes.append(f"brand: {existing.get('brand_id', 'none')} → {brand_id}")
+                if item.get("category_name") and category_id and existing.get("category_id") != category_id:
+                    changes.append("category changed")
+                if exp_date:
+                    old_exp = existing.get("expiration_date", "")
+                    new_exp = exp_date.strftime("%Y-%m-%d")
+                    if old_exp and not old_exp.startswith(new_exp):
+                        changes.append(f"expiration: {old_exp[:10]} → {new_exp}")
+                if lifecycle and existing.get("lifecycle_status") != lifecycle:
+                    changes.append(f"lifecycle: {existing.get('lifecycle_status', 'active')} → {lifecycle}")
+                if monitoring is not None and existing.get("monitoring_enabled") != monitoring:
+                    changes.append(f"monitoring: {'ON' if existing.get('monitoring_enabled') else 'OFF'} → {'ON' if monitoring else 'OFF'}")
+
+                preview_item["existing_id"] = existing["id"]
+                preview_item["changes"] = changes
+                result["updated_domains"].append(preview_item)
+                result["summary"]["update_count"] += 1
+            else:
+                result["new_domains"].append(preview_item)
+                result["summary"]["new_count"] += 1
+
+        return result
+
+    async def preview_batches(
+        self,
+        batches: AsyncIterator[List[Dict[str, Any]]],
+        item_limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Preview rows arriving in batches; lists are cut at item_limit entries each."""
+        lookups = await self.load_lookups()
+        result: Dict[str, Any] = {
+            "new_domains": [],
+            "updated_domains": [],
+            "errors": [],
+            "summary": {"total_rows": 0, "new_count": 0, "update_count": 0, "error_count": 0},
+            "truncated": False,
+        }
+        async for rows in batches:
+            existing_map = await self.load_existing(rows)
+            part = self.preview(rows, lookups, existing_map, row_offset=result["summary"]["total_rows"])
+            for key in ("new_domains", "updated_domains", "errors"):
+                result[key].extend(part[key])
+            for key, count in part["summary"].items():
+                result["summary"][key] += count
+            _trim(result, ("new_domains", "updated_domains", "errors"), item_limit)
+        return result
+
+    # ---------- pass 1: plan ----------
+
+    def plan(
+        self,
+        rows: List[Dict[str, Any]],
+        lookups: Dict[str, Dict[str, Dict[str, Any]]],
+        existing_map: Dict[str, Dict[str, Any]],
+        create_new: bool = True,
+        update_existing: bool = True,
+        now: Optional[str] = None,
+        seen: Optional[Dict[str, int]] = None,
+        row_offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Resolve rows into write operations without touching the database.
+
+        `seen` (domain -> row index) carries duplicate detection across
+        batches; row_offset is the index of the batch's first row.
+
+        Returns:
+            (operations, new_brands, result) - result already holds the
+            skipped rows; operations are in row order
+        """
+        now = now or datetime.now(timezone.utc).isoformat()
+        brands = dict(lookups["brands"])
+        new_brands: List[Dict[str, Any]] = []
+        seen = {} if seen is None else seen
+        operations: List[Dict[str, Any]] = []
+        result = {"created": 0, "updated": 0, "skipped": 0, "errors": [], "details": []}
+
+        for index, row in enumerate(rows, start=row_offset):
+            domain_name = _clean(row.get("domain_name"))
+            # Skip invalid domain names
+            if not domain_name:
+                continue
+
+            key = normalize_domain_key(domain_name)
+            if key in seen:
+                result["skipped"] += 1
+                result["details"].append({
+                    "domain": domain_name,
+                    "status": "skipped",
+                    "reason": f"duplicate of row {seen[key] + 2}",
+                })
+                continue
+            seen[key] = index
+
+            existing = existing_map.get(key)
+            if existing and not update_existing:
+                result["skipped"] += 1
+                result["details"].append({
+                    "domain": domain_name,
+                    "status": "skipped",
+                    "reason": "update_existing is false",
+                })
+                continue
+            if not existing and not create_new:
+                result["skipped"] += 1
+                result["details"].append({
+                    "domain": domain_name,
+                    "status": "skipped",
+                    "reason": "create_new is false",
+                })
+                continue
+
+            exp_date = parse_expiration_date(row.get("expiration_date"))
+
+            lifecycle_value = _clean(row.get("lifecycle_status")).lower()
+            lifecycle = lifecycle_value if lifecycle_value in VALID_LIFECYCLE else "active"
+
+            monitoring_value = _clean(row.get("monitoring_enabled")).upper()
+            monitoring = monitoring_value in MONITORING_ON_VALUES
+
+            # Get brand (created once per unknown name)
+            brand_id = None
+            brand_name = _clean(row.get("brand_name"))
+            if brand_name:
+                brand = brands.get(brand_name.lower())
+                if not brand:
+                    brand = {
+                        "id": str(uuid.uuid4()),
+                        "name": brand_name,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    brands[brand_name.lower()] = brand
+                    new_brands.append(brand)
+                brand_id = brand["id"]
+
+            category = lookups["categories"].get(_clean(row.get("category_name")).lower())
+            category_id = category["id"] if category else None
+
+            registrar = lookups["registrars"].get(_clean(row.get("registrar_name")).lower())
+            registrar_id = registrar["id"] if registrar else None
+
+            expiration = exp_date.strftime("%Y-%m-%dT00:00:00Z") if exp_date else None
+
+            if existing:
+                update_data = {"updated_at": now}
+                if brand_id:
+                    update_data["brand_id"] = brand_id
+                if category_id:
+                    update_data["category_id"] = category_id
+                if registrar_id:
+                    update_data["registrar_id"] = registrar_id
+                if expiration:
+                    update_data["expiration_date"] = expiration
+                if row.get("lifecycle_status"):
+                    update_data["lifecycle_status"] = lifecycle
+                if row.get("monitoring_enabled"):
+                    update_data["monitoring_enabled"] = monitoring
+                if row.get("notes"):
+                    update_data["notes"] = row["notes"]
+
+                operations.append({
+                    "domain": domain_name,
+                    "status": "updated",
+                    "id": existing["id"],
+                    "request": UpdateOne({"id": existing["id"]}, {"$set": update_data}),
+                    "log": {
+                        "action_type": ActionType.UPDATE,
+                        "before_value": existing,
+                        "after_value": {**existing, **update_data},
+                    },
+                })
+            else:
+                new_asset = {
+                    "id": str(uuid.uuid4()),
+                    "legacy_id": None,
+                    "domain_name": domain_name,
+                    "brand_id": brand_id,
+                    "category_id": category_id,
+                    "registrar_id": registrar_id,
+                    "registrar": row.get("registrar_name") or "",
+                    "expiration_date": expiration,
+                    "auto_renew": False,
+                    "lifecycle_status": lifecycle,
+                    "monitoring_enabled": monitoring,
+                    "monitoring_status": "unknown",
+                    "monitoring_interval": "1hour",
+                    "last_check": None,
+                    "ping_status": "unknown",
+                    "http_status": None,
+                    "http_status_code": None,
+                    "notes": row.get("notes") or "",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                with_domain_key(new_asset)
+                operations.append({
+                    "domain": domain_name,
+                    "status": "created",
+                    "id": new_asset["id"],
+                    "request": InsertOne(new_asset),
+                    "log": {"action_type": ActionType.CREATE, "after_value": new_asset},
+                })
+
+        return operations, new_brands, result
+
+    # ---------- pass 2: write ----------
+
+    async def write(
+        self,
+        operations: List[Dict[str, Any]],
+        new_brands: List[Dict[str, Any]],
+        result: Dict[str, Any],
+        actor: str,
+        batch_size: int = IMPORT_WRITE_BATCH_SIZE,
+    ) -> Dict[str, Any]:
+        """Apply planned operations chunk by chunk; per-row outcomes go into result."""
+        if new_brands:
+            await self.db.brands.insert_many(new_brands, ordered=False)
+
+        for start in range(0, len(operations), batch_size):
+            await self._write_chunk(operations[start:start + batch_size], result, actor)
+        return result
+
+    async def _write_chunk(
+        self, chunk: List[Dict[str, Any]], result: Dict[str, Any], actor: str
+    ):
+        failed: Dict[int, str] = {}
+        try:
+            await self.db.asset_domains.bulk_write(
+                [op["request"] for op in chunk], ordered=False
+            )
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                if error.get("code") == DUPLICATE_KEY_ERROR:
+                    failed[error["index"]] = "Domain already exists"
+                else:
+                    failed[error["index"]] = error.get("errmsg", "write failed")
+        except Exception as e:
+            # Timeout / connection drop: part of the chunk may still have been
+            # applied, so only rows that did not land become errors
+            logger.error(f"Import chunk of {len(chunk)} rows failed: {e}")
+            failed = await self._unwritten_rows(chunk, f"Write failed: {e}")
+
+        logs = []
+        created = 0
+        for index, op in enumerate(chunk):
+            if index in failed:
+                result["errors"].append({"domain": op["domain"], "error": failed[index]})
+                continue
+            result[op["status"]] += 1
+            result["details"].append({"domain": op["domain"], "status": op["status"], "id": op["id"]})
+            if op["status"] == "created":
+                created += 1
+            logs.append({
+                "actor": actor,
+                "entity_type": EntityType.ASSET_DOMAIN,
+                "entity_id": op["id"],
+                "metadata": {"source": "csv_import"},
+                **op["log"],
+            })
+
+        if created:
+            publish_event("inventory", created=created)
+
+        if self.activity_log_service and logs:
+            try:
+                await self.activity_log_service.log_many(logs)
+            except Exception as e:
+                # Domains are written - a lost audit batch must not fail the import
+                logger.error(f"Import activity logging failed for {len(logs)} rows: {e}")
+
+    async def _unwritten_rows(
+        self, chunk: List[Dict[str, Any]], error: str
+    ) -> Dict[int, str]:
+        """
+        Rows of a chunk whose bulk_write raised that were not applied.
+
+        A created domain exists under its planned id; an updated one carries
+        the planned updated_at. If the chunk can't be re-read either, every
+        row is reported with an unknown outcome.
+        """
+        try:
+            stored = await self.db.asset_domains.find(
+                {"id": {"$in": [op["id"] for op in chunk]}},
+                {"_id": 0, "id": 1, "updated_at": 1},
+            ).to_list(None)
+        except Exception as e:
+            logger.error(f"Could not re-read failed import chunk: {e}")
+            return {
+                index: f"{error} (outcome unknown, check the domain)"
+                for index in range(len(chunk))
+            }
+
+        updated_at = {doc["id"]: doc.get("updated_at") for doc in stored}
+        return {
+            index: error
+            for index, op in enumerate(chunk)
+            if op["id"] not in updated_at
+            or updated_at[op["id"]] != op["log"]["after_value"]["updated_at"]
+        }
+
+    # ---------- entry points ----------
+
+    async def confirm_import(
+        self,
+        rows: List[Dict[str, Any]],
+        actor: str,
+        create_new: bool = True,
+        update_existing: bool = True,
+    ) -> Dict[str, Any]:
+        """Plan and write an import; returns per-row results plus throughput stats."""
+        return await self.confirm_batches(
+            single_batch(rows), actor, create_new, update_existing
+        )
+
+    async def confirm_batches(
+        self,
+        batches: AsyncIterator[List[Dict[str, Any]]],
+        actor: str,
+        create_new: bool = True,
+        update_existing: bool = True,
+        details_limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Plan and write rows arriving in batches, one batch at a time.
+
+        details / errors are cut at details_limit entries each;
+        error_count keeps the total.
+        """
+        started = time.perf_counter()
+
+        lookups = await self.load_lookups()
+        seen: Dict[str, int] = {}
+        result = {"created": 0, "updated": 0, "skipped": 0, "errors": [], "details": []}
+        total_rows = 0
+        error_count = 0
+
+        async for rows in batches:
+            existing_map = await self.load_existing(rows)
+            operations, new_brands, planned = self.plan(
+                rows, lookups, existing_map, create_new, update_existing,
+                seen=seen, row_offset=total_rows,
+            )
+            total_rows += len(rows)
+            result["skipped"] += planned["skipped"]
+            result["details"].extend(planned["details"])
+
+            errors_before = len(result["errors"])
+            await self.write(operations, new_brands, result, actor)
+            error_count += len(result["errors"]) - errors_before
+
+            # Brands created by this batch are known to the next one
+            for brand in new_brands:
+                lookups["brands"][brand["name"].lower()] = brand
+            _trim(result, ("details", "errors"), details_limit)
+
+        elapsed = time.perf_counter() - started
+        rows_per_second = total_rows / elapsed if elapsed > 0 else 0.0
+        result["error_count"] = error_count
+        result["stats"] = {
+            "rows": total_rows,
+            "duration_ms": round(elapsed * 1000, 1),
+            "rows_per_second": round(rows_per_second, 1),
+        }
+
+        for outcome in ("created", "updated", "skipped"):
+            IMPORT_ROWS.labels("domains", outcome).inc(result[outcome])
+        IMPORT_ROWS.labels("domains", "error").inc(error_count)
+        IMPORT_ROWS_PER_SECOND.labels("domains").set(rows_per_second)
+
+        logger.info(
+            f"Domain import by {actor}: {result['created']} created, {result['updated']} updated, "
+            f"{result['skipped']} skipped, {error_count} errors "
+            f"({rows_per_second:.0f} rows/s)"
+        )
+        return result
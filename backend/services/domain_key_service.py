@@ -0,0 +1,173 @@
+"""
+Domain Key Service
+==================
+
+Case-insensitive identity of asset domains.
+
+Every asset domain stores `domain_key` next to its `domain_name`: the name
+stripped, without trailing dot, lowercased and IDNA-encoded
+(normalize_domain_key), so "Example.COM.", "example.com" and "bücher.de" /
+"xn--bcher-kva.de" each map to a single key. A unique index on domain_key
+makes it the existence check of every write path:
+- create / update / imports set domain_key and let the index reject
+  duplicates (DuplicateKeyError) instead of reading first, so two concurrent
+  requests can no longer both create the same domain
+- imports load existing domains with one $in on the keys of their rows
+- a domain search for a full hostname matches its normalized form anywhere
+  in the key (so "bücher.de" finds "www.xn--bcher-kva.de"); any other
+  search text keeps the case-insensitive regex on domain_name, which
+  matches Unicode input against internationalized names as entered.
+  Existence checks compare the key for equality.
+
+Domains written before the key existed are backfilled at startup
+(ensure_index), before the unique index is built. If differently-cased
+duplicates already exist, the index cannot be created: the duplicates are
+logged and the application keeps working without the guarantee until they
+are merged and the server restarted.
+"""
+
+import logging
+import re
+from typing import Dict, Any, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+DOMAIN_KEY_INDEX = "domain_key_1"
+
+# Documents updated per bulk_write during the backfill
+BACKFILL_BATCH_SIZE = 1000
+
+# Duplicate keys reported when the unique index cannot be built
+MAX_REPORTED_DUPLICATES = 20
+
+# Search text with these characters is a regex, not a hostname
+REGEX_SPECIALS = re.compile(r"[\\^$*+?()\[\]{}|\s/]")
+
+# Normalized key of a full hostname: two or more DNS labels
+HOSTNAME_KEY = re.compile(r"^(?:[a-z0-9_](?:[a-z0-9_-]*[a-z0-9_])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?$")
+
+
+def normalize_domain_key(domain_name: Optional[str]) -> str:
+    """
+    Normalized key of a domain name ("" for an empty name).
+
+    Names the IDNA codec rejects (empty or over-long labels) keep their
+    lowercase form, so they still get a stable, unique key.
+    """
+    name = (domain_name or "").strip().rstrip(".").lower()
+    if not name:
+        return ""
+    try:
+        return name.encode("idna").decode("ascii")
+    except UnicodeError:
+        return name
+
+
+def with_domain_key(asset: Dict[str, Any]) -> Dict[str, Any]:
+    """Set domain_key on an asset domain document (in place) and return it."""
+    key = normalize_domain_key(asset.get("domain_name"))
+    if key:
+        asset["domain_key"] = key
+    return asset
+
+
+def domain_search_filter(search: str) -> Dict[str, Any]:
+    """
+    Query condition for the asset domain search box.
+
+    A full hostname ("Shop.Example.com", "bücher.de") matches the domains
+    whose key contains its normalized form, like the substring search on
+    domain_name does. Anything else (a fragment, a regex) is matched
+    case-insensitively anywhere in domain_name.
+    """
+    term = search.strip()
+    if not REGEX_SPECIALS.search(term.rstrip(".")):
+        key = normalize_domain_key(term)
+        if HOSTNAME_KEY.match(key):
+            return {"domain_key": {"$regex": re.escape(key)}}
+    return {"domain_name": {"$regex": term, "$options": "i"}}
+
+
+class DomainKeyService:
+    """Backfills domain_key and owns its unique index"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+
+    async def backfill(self, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+        """Set domain_key on domains that don't have it; returns the count."""
+        updated = 0
+        batch: List[UpdateOne] = []
+        cursor = self.db.asset_domains.find(
+            {"domain_key": {"$exists": False}, "domain_name": {"$type": "string"}},
+            {"_id": 1, "domain_name": 1},
+        )
+        async for doc in cursor:
+            key = normalize_domain_key(doc["domain_name"])
+            if not key:
+                continue
+            batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"domain_key": key}}))
+            if len(batch) >= batch_size:
+                await self.db.asset_domains.bulk_write(batch, ordered=False)
+                updated += len(batch)
+                batch = []
+        if batch:
+            await self.db.asset_domains.bulk_write(batch, ordered=False)
+            updated += len(batch)
+        return updated
+
+    async def find_duplicates(self, limit: int = MAX_REPORTED_DUPLICATES) -> List[Dict[str, Any]]:
+        """Keys held by more than one domain, with their domain names."""
+        pipeline = [
+            {"$match": {"domain_key": {"$type": "string"}}},
+            {"$group": {"_id": "$domain_key", "names": {"$push": "$domain_name"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+            {"$sort": {"count": -1}},
+            {"$limit": limit},
+        ]
+        return [
+            {"domain_key": d["_id"], "domain_names": d["names"]}
+            async for d in self.db.asset_domains.aggregate(pipeline)
+        ]
+
+    async def ensure_index(self) -> Dict[str, Any]:
+        """
+        Backfill domain_key and create its unique index.
+
+        Never raises: duplicates or other failures are logged and reported
+        in the result, so they can't block startup.
+        """
+        result = {"backfilled": 0, "index": False, "duplicates": []}
+        try:
+            result["backfilled"] = await self.backfill()
+            await self.db.asset_domains.create_index(
+                "domain_key", name=DOMAIN_KEY_INDEX, unique=True, sparse=True
+            )
+            result["index"] = True
+        except PyMongoError as e:
+            try:
+                result["duplicates"] = await self.find_duplicates()
+            except PyMongoError:
+                pass
+            logger.warning(
+                f"Could not create unique domain_key index: {e}. "
+                f"Duplicate domains: {result['duplicates']}"
+            )
+        if result["backfilled"]:
+            logger.info(f"Backfilled domain_key on {result['backfilled']} asset domains")
+        return result
+
+
+# Global instance
+_domain_key_service: Optional[DomainKeyService] = None
+
+
+def get_domain_key_service(db: AsyncIOMotorDatabase) -> DomainKeyService:
+    global _domain_key_service
+    if _domain_key_service is None:
+        _domain_key_service = DomainKeyService(db)
+    return _domain_key_service
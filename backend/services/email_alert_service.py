@@ -18,10 +18,13 @@ Triggers:
 import os
 import asyncio
 import logging
+import time
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from services.metrics_service import observe_notification
+
 logger = logging.getLogger(__name__)
 
 # Check if resend is available
@@ -476,7 +479,13 @@ class EmailAlertService:
             }
 
             # Run sync SDK in thread to keep FastAPI non-blocking
-            await asyncio.to_thread(resend.Emails.send, params)
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(resend.Emails.send, params)
+            except Exception:
+                observe_notification("email_alert", started, False)
+                raise
+            observe_notification("email_alert", started, True)
 
             logger.info(f"Email sent to {recipients}: {subject}")
             return True
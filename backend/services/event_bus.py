@@ -0,0 +1,87 @@
+"""
+Event Bus
+=========
+
+In-process publish/subscribe for change notifications.
+
+Write paths and the monitoring engines publish small events when
+something a live view depends on changes; subscribers (the live updates
+hub behind the SSE stream) react to them instead of polling the database.
+
+Topics:
+- monitoring: a domain's availability status changed
+- alerts: an alert was created or acknowledged
+- inventory: domains or networks were created, imported or deleted
+- notifications: a user's in-app notifications changed (data.user_id)
+- presence: a user came online
+
+publish() never blocks: each subscriber has a bounded queue and events
+for a full queue are dropped (subscribers resync periodically). It must be
+called from the event loop thread. Events stay within one worker process.
+"""
+
+import asyncio
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterator, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before new ones are dropped
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+
+class EventBus:
+    """Fan-out of published events to subscriber queues."""
+
+    def __init__(self):
+        self._subscribers: Set[asyncio.Queue] = set()
+        self.dropped = 0
+
+    def publish(self, topic: str, data: Optional[Dict[str, Any]] = None):
+        """Publish an event to every subscriber."""
+        if not self._subscribers:
+            return
+        event = {
+            "topic": topic,
+            "data": data or {},
+            "published_at": datetime.now(timezone.utc).isoformat(),
+        }
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                logger.debug(f"Event bus subscriber full, dropped {topic} event")
+
+    @contextmanager
+    def subscribe(self, maxsize: int = SUBSCRIBER_QUEUE_SIZE) -> Iterator[asyncio.Queue]:
+        """Subscribe to all events for the duration of the with-block."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+# Global instance
+_event_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    """Get or create the process-wide event bus"""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = EventBus()
+    return _event_bus
+
+
+def publish_event(topic: str, **data):
+    """Publish an event on the process-wide bus."""
+    get_event_bus().publish(topic, data)
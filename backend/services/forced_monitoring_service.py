@@ -37,6 +37,8 @@ from typing import Dict, Any, List, Optional, Tuple
 import uuid
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from services.domain_key_service import normalize_domain_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -430,7 +432,7 @@ class TestAlertService:
         """
         # Validate domain exists
         domain = await self.db.asset_domains.find_one(
-            {"domain_name": domain_name},
+            {"domain_key": normalize_domain_key(domain_name)},
             {"_id": 0}
         )
         
@@ -0,0 +1,555 @@
+"""
+Import Job Service
+==================
+
+Background CSV imports that survive dropped connections, proxy timeouts
+and worker restarts.
+
+A job is submitted with its rows (a list, or batches of a streamed CSV
+upload) and answered right away with the job id. The rows are split into
+chunks of IMPORT_JOB_CHUNK_SIZE and stored in import_job_chunks; the job
+itself lives in import_jobs:
+- kind: "domains" (DomainImportService), "nodes" (NodeImportService) or
+  "domain_operations" (BulkDomainOperationService; the rows are domain ids)
+- status: queued -> running -> completed / failed / cancelled
+- next_chunk: the checkpoint - every chunk before it is fully written
+- rows_done / counters / errors: progress, advanced in the same atomic
+  update as the checkpoint so they always describe committed chunks
+- worker_id / heartbeat_at: the lease of the worker running the job,
+  renewed every IMPORT_JOB_HEARTBEAT_SECONDS while a chunk runs
+
+Workers claim queued jobs, or running jobs whose heartbeat is older than
+IMPORT_JOB_STALE_SECONDS (their worker died), with one find_one_and_update,
+and continue at next_chunk (a job cancelled while its worker was down is
+closed by the worker that picks it up). The running worker checks that it
+still holds the lease before each chunk and stops a chunk in flight as soon
+as a renewal finds the lease gone, so two workers never write the same
+chunk at the same time. A chunk interrupted half-way is replayed; both
+importers are idempotent for replays (an already created domain is updated
+again, an already created node is skipped), so only the created/updated
+split of that one chunk can differ from an uninterrupted run.
+
+Every worker polls for claimable jobs every IMPORT_JOB_POLL_SECONDS (see
+server.py) and submissions start the job immediately in the receiving
+worker. Progress is read from GET /import/jobs/{id} or streamed over SSE.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+from services.bulk_domain_operation_service import BulkDomainOperationService
+from services.domain_import_service import DomainImportService, single_batch
+from services.domain_key_service import normalize_domain_key
+from services.metrics_service import IMPORT_ROWS, IMPORT_ROWS_PER_SECOND
+from services.node_import_service import NodeImportService, order_nodes_by_target
+
+logger = logging.getLogger(__name__)
+
+# Rows per checkpoint
+IMPORT_JOB_CHUNK_SIZE = int(os.environ.get("IMPORT_JOB_CHUNK_SIZE", "500"))
+
+# A running job whose heartbeat is older than this is resumed by another worker
+IMPORT_JOB_STALE_SECONDS = int(os.environ.get("IMPORT_JOB_STALE_SECONDS", "120"))
+
+# How often the running worker renews its lease, well inside the stale window
+IMPORT_JOB_HEARTBEAT_SECONDS = max(IMPORT_JOB_STALE_SECONDS / 3, 1)
+
+# How often every worker looks for queued or abandoned jobs
+IMPORT_JOB_POLL_SECONDS = int(os.environ.get("IMPORT_JOB_POLL_SECONDS", "10"))
+
+# Jobs processed at the same time by one worker
+IMPORT_JOB_CONCURRENCY = int(os.environ.get("IMPORT_JOB_CONCURRENCY", "2"))
+
+# Row errors kept on the job document (the counters keep the full total)
+MAX_STORED_ERRORS = 500
+
+JOB_KINDS = ("domains", "nodes", "domain_operations")
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+# Outcome counters of each kind, as returned by its importer
+JOB_COUNTERS = {
+    "domains": ("created", "updated", "skipped", "errors"),
+    "nodes": ("imported", "skipped", "errors", "domains_created"),
+    "domain_operations": ("updated", "skipped", "errors"),
+}
+
+
+class ImportJobLeaseLost(Exception):
+    """The job was claimed by another worker or cancelled."""
+
+
+def chunk_rows(rows: List[Dict[str, Any]], size: int) -> List[List[Dict[str, Any]]]:
+    return [rows[start:start + size] for start in range(0, len(rows), size)]
+
+
+def dedupe_domain_rows(
+    rows: List[Dict[str, Any]], seen: Optional[set] = None
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Drop repeated domain names (first row wins) and blank rows.
+
+    Names are compared by domain key, as in the synchronous import, which
+    skips repeats within its single plan; a job plans each chunk
+    separately, so repeats are removed before chunking instead. `seen`
+    carries the keys of earlier batches. Returns (rows, skipped repeats).
+    """
+    seen = set() if seen is None else seen
+    kept = []
+    skipped = 0
+    for row in rows:
+        key = normalize_domain_key(row.get("domain_name"))
+        if not key:
+            continue
+        if key in seen:
+            skipped += 1
+            continue
+        seen.add(key)
+        kept.append(row)
+    return kept, skipped
+
+
+class ImportJobService:
+    """
+    Service for chunked, resumable background imports.
+
+    - submit / submit_batches: store rows as chunks and queue the job
+    - run_pending: claim and start queued or abandoned jobs
+    - get_job / list_jobs / cancel_job / retry_job: job control
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, activity_log_service=None):
+        self.db = db
+        self.activity_log_service = activity_log_service
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._background_tasks: Dict[str, asyncio.Task] = {}
+
+    # ---------- submission ----------
+
+    async def submit(
+        self,
+        kind: str,
+        rows: List[Dict[str, Any]],
+        actor: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Store an import as a queued job and start it in this worker.
+
+        Args:
+            kind: "domains", "nodes" or "domain_operations"
+            rows: ImportDomainItem / BulkNodeImportItem / {"id"} dicts
+            actor: Email of the submitting user
+            params: Importer flags (create_new, update_existing /
+                network_id, create_missing_domains / spec, actor_id,
+                selection)
+        """
+        if kind == "nodes":
+            rows = order_nodes_by_target(rows)
+        return await self.submit_batches(kind, single_batch(rows), actor, params)
+
+    async def submit_batches(
+        self,
+        kind: str,
+        batches: AsyncIterator[List[Dict[str, Any]]],
+        actor: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Store rows arriving in batches (a streamed CSV upload) as a job.
+
+        Chunks are written as the batches arrive; the job is only queued
+        once the last one is stored, and the chunks are removed if the
+        upload breaks off. Node rows must already be ordered target-first.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown import job kind: {kind}")
+
+        job_id = str(uuid.uuid4())
+        counters = {name: 0 for name in JOB_COUNTERS[kind]}
+        seen: set = set()
+        pending: List[Dict[str, Any]] = []
+        chunks_total = 0
+        total_rows = 0
+
+        async def store(rows: List[Dict[str, Any]]):
+            nonlocal chunks_total
+            chunks = chunk_rows(rows, IMPORT_JOB_CHUNK_SIZE)
+            if chunks:
+                await self.db.import_job_chunks.insert_many([
+                    {"job_id": job_id, "seq": chunks_total + i, "rows": chunk}
+                    for i, chunk in enumerate(chunks)
+                ])
+                chunks_total += len(chunks)
+
+        try:
+            async for rows in batches:
+                if kind == "domains":
+                    rows, skipped = dedupe_domain_rows(rows, seen)
+                    counters["skipped"] += skipped
+                total_rows += len(rows)
+                pending.extend(rows)
+                full = len(pending) - len(pending) % IMPORT_JOB_CHUNK_SIZE
+                await store(pending[:full])
+                pending = pending[full:]
+            await store(pending)
+        except BaseException:
+            await self.db.import_job_chunks.delete_many({"job_id": job_id})
+            raise
+
+        now = datetime.now(timezone.utc).isoformat()
+        job = {
+            "id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "actor": actor,
+            "params": params or {},
+            "total_rows": total_rows,
+            "rows_done": 0,
+            "chunks_total": chunks_total,
+            "next_chunk": 0,
+            "counters": counters,
+            "errors": [],
+            "error": None,
+            "attempts": 0,
+            "worker_id": None,
+            "heartbeat_at": None,
+            "cancel_requested": False,
+            "created_at": now,
+            "started_at": None,
+            "updated_at": now,
+            "finished_at": None,
+        }
+        await self.db.import_jobs.insert_one(job)
+        job.pop("_id", None)
+
+        await self.run_pending()
+        return job
+
+    # ---------- claiming ----------
+
+    async def _claim_next(self) -> Optional[Dict[str, Any]]:
+        """Take the oldest queued job, or a running job whose worker went silent."""
+        now = datetime.now(timezone.utc)
+        stale_before = (now - timedelta(seconds=IMPORT_JOB_STALE_SECONDS)).isoformat()
+        return await self.db.import_jobs.find_one_and_update(
+            {
+                "$or": [
+                    {"status": "queued"},
+                    {"status": "running", "heartbeat_at": {"$lt": stale_before}},
+                ],
+                "id": {"$nin": list(self._background_tasks)},
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "worker_id": self.worker_id,
+                    "heartbeat_at": now.isoformat(),
+                    "updated_at": now.isoformat(),
+                },
+                "$inc": {"attempts": 1},
+            },
+            projection={"_id": 0, "errors": 0},
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def run_pending(self) -> int:
+        """Claim and start jobs while this worker has free slots; returns jobs started."""
+        started = 0
+        while len(self._background_tasks) < IMPORT_JOB_CONCURRENCY:
+            job = await self._claim_next()
+            if not job:
+                break
+            if job["attempts"] > 1:
+                logger.info(
+                    f"Resuming import job {job['id']} at chunk "
+                    f"{job['next_chunk']}/{job['chunks_total']}"
+                )
+            job_id = job["id"]
+            task = asyncio.create_task(self._run_job(job))
+            self._background_tasks[job_id] = task
+            task.add_done_callback(lambda _t, job_id=job_id: self._background_tasks.pop(job_id, None))
+            started += 1
+        return started
+
+    # ---------- processing ----------
+
+    async def _run_job(self, job: Dict[str, Any]):
+        job_id = job["id"]
+        if not job.get("started_at"):
+            await self.db.import_jobs.update_one(
+                {"id": job_id}, {"$set": {"started_at": job["updated_at"]}}
+            )
+
+        started = time.perf_counter()
+        rows_at_start = job["rows_done"]
+        try:
+            network = None
+            if job["kind"] == "nodes":
+                network = await self.db.seo_networks.find_one(
+                    {"id": job["params"].get("network_id")}, {"_id": 0}
+                )
+                if not network:
+                    raise ValueError("Network not found")
+
+            while not job.get("cancel_requested"):
+                chunk = await self.db.import_job_chunks.find_one(
+                    {"job_id": job_id, "seq": job["next_chunk"]}, {"_id": 0}
+                )
+                if chunk is None:
+                    break
+                if not await self._renew_lease(job_id):
+                    raise ImportJobLeaseLost()
+                counters, errors = await self._run_leased(
+                    job_id, self._import_chunk(job, chunk["rows"], network)
+                )
+                job = await self._checkpoint(job, len(chunk["rows"]), counters, errors)
+
+            status = "cancelled" if job.get("cancel_requested") else "completed"
+            await self._finish(job, status)
+        except ImportJobLeaseLost:
+            logger.warning(f"Import job {job_id} was taken over by another worker")
+            return
+        except Exception as e:
+            logger.error(f"Import job {job_id} failed at chunk {job['next_chunk']}: {e}")
+            await self._finish(job, "failed", error=str(e))
+            return
+
+        elapsed = time.perf_counter() - started
+        rows = job["rows_done"] - rows_at_start
+        if elapsed > 0 and rows:
+            IMPORT_ROWS_PER_SECOND.labels(job["kind"]).set(rows / elapsed)
+
+    async def _renew_lease(self, job_id: str) -> bool:
+        """Move the heartbeat forward; False if this worker no longer holds the job."""
+        now = datetime.now(timezone.utc).isoformat()
+        result = await self.db.import_jobs.update_one(
+            {"id": job_id, "worker_id": self.worker_id, "status": "running"},
+            {"$set": {"heartbeat_at": now}},
+        )
+        return result.matched_count > 0
+
+    async def _heartbeat(self, job_id: str, work: asyncio.Task):
+        """Renew the lease while work runs; cancel work once the lease is lost."""
+        while True:
+            await asyncio.sleep(IMPORT_JOB_HEARTBEAT_SECONDS)
+            try:
+                renewed = await self._renew_lease(job_id)
+            except Exception as e:
+                logger.warning(f"Import job {job_id} heartbeat failed: {e}")
+                continue
+            if not renewed:
+                work.cancel()
+                return
+
+    async def _run_leased(self, job_id: str, coro):
+        """Await one chunk's import with the lease renewed in the background."""
+        work = asyncio.ensure_future(coro)
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, work))
+        try:
+            return await work
+        except asyncio.CancelledError:
+            # The heartbeat only ends by itself when it cancelled the chunk
+            if heartbeat.done() and not heartbeat.cancelled():
+                raise ImportJobLeaseLost()
+            raise
+        finally:
+            heartbeat.cancel()
+
+    async def _import_chunk(
+        self,
+        job: Dict[str, Any],
+        rows: List[Dict[str, Any]],
+        network: Optional[Dict[str, Any]],
+    ) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+        """Run one chunk through its importer; returns (counter increments, row errors)."""
+        params = job["params"]
+        if job["kind"] == "domains":
+            result = await DomainImportService(self.db, self.activity_log_service).confirm_import(
+                rows,
+                actor=job["actor"],
+                create_new=params.get("create_new", True),
+                update_existing=params.get("update_existing", True),
+            )
+            counters = {name: result[name] for name in ("created", "updated", "skipped")}
+            errors = result["errors"]
+        elif job["kind"] == "domain_operations":
+            result = await BulkDomainOperationService(self.db).apply(
+                [row["id"] for row in rows], params["spec"], params.get("actor_id")
+            )
+            counters = {name: result[name] for name in ("updated", "skipped")}
+            errors = result["errors"]
+        else:
+            results = await NodeImportService(self.db).import_nodes(
+                network,
+                rows,
+                actor=job["actor"],
+                create_missing_domains=params.get("create_missing_domains", False),
+                log_activity=False,
+            )
+            counters = {
+                "imported": len(results["imported"]),
+                "skipped": len(results["skipped"]),
+                "domains_created": len(results["domains_created"]),
+            }
+            errors = results["errors"]
+            for outcome in ("imported", "skipped"):
+                IMPORT_ROWS.labels("nodes", outcome).inc(counters[outcome])
+            IMPORT_ROWS.labels("nodes", "error").inc(len(errors))
+        counters["errors"] = len(errors)
+        return counters, errors
+
+    async def _checkpoint(
+        self,
+        job: Dict[str, Any],
+        rows: int,
+        counters: Dict[str, int],
+        errors: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Advance the checkpoint past the chunk just written, together with
+        its progress, and renew the lease. Picks up cancellation.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        update: Dict[str, Any] = {
+            "$inc": {
+                "next_chunk": 1,
+                "rows_done": rows,
+                **{f"counters.{name}": value for name, value in counters.items()},
+            },
+            "$set": {"heartbeat_at": now, "updated_at": now},
+        }
+        if errors:
+            update["$push"] = {
+                "errors": {"$each": [{**e, "chunk": job["next_chunk"]} for e in errors],
+                           "$slice": MAX_STORED_ERRORS}
+            }
+        updated = await self.db.import_jobs.find_one_and_update(
+            {"id": job["id"], "worker_id": self.worker_id, "next_chunk": job["next_chunk"]},
+            update,
+            projection={"_id": 0, "errors": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+        if updated is None:
+            raise ImportJobLeaseLost()
+        return updated
+
+    async def _finish(self, job: Dict[str, Any], status: str, error: Optional[str] = None):
+        now = datetime.now(timezone.utc).isoformat()
+        updated = await self.db.import_jobs.find_one_and_update(
+            {"id": job["id"], "worker_id": self.worker_id},
+            {"$set": {"status": status, "error": error, "updated_at": now, "finished_at": now}},
+            projection={"_id": 0, "errors": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+        if updated is None:
+            return
+
+        # Failed jobs keep their chunks so they can be retried from the checkpoint
+        if status != "failed":
+            await self.db.import_job_chunks.delete_many({"job_id": job["id"]})
+
+        if updated["kind"] == "nodes" and status == "completed":
+            await NodeImportService(self.db, self.activity_log_service).log_summary(
+                updated["params"].get("network_id"),
+                updated["actor"],
+                updated["counters"],
+                metadata={"import_job_id": updated["id"]},
+            )
+
+        # A cancelled operation keeps the chunks it applied - record those too.
+        # Failed ones are recorded once a retry finishes them.
+        if updated["kind"] == "domain_operations" and status != "failed":
+            await BulkDomainOperationService(self.db, self.activity_log_service).record(
+                updated["id"],
+                updated["params"]["spec"],
+                updated["actor"],
+                updated["params"].get("actor_id"),
+                updated["counters"],
+                selection=updated["params"].get("selection"),
+            )
+
+        logger.info(
+            f"Import job {updated['id']} ({updated['kind']}) {status}: "
+            f"{updated['rows_done']}/{updated['total_rows']} rows, {updated['counters']}"
+        )
+
+    # ---------- job control ----------
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job with its progress."""
+        job = await self.db.import_jobs.find_one({"id": job_id}, {"_id": 0})
+        if job:
+            job["progress_percent"] = (
+                round(job["rows_done"] / job["total_rows"] * 100, 1)
+                if job["total_rows"] else 100.0
+            )
+        return job
+
+    async def list_jobs(self, actor: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent jobs (of one user when actor is given), without row errors."""
+        query = {"actor": actor} if actor else {}
+        return await self.db.import_jobs.find(
+            query, {"_id": 0, "errors": 0}
+        ).sort("created_at", -1).limit(limit).to_list(limit)
+
+    async def cancel_job(self, job_id: str) -> bool:
+        """
+        Request cancellation of a queued or running job.
+
+        The running worker stops at its next checkpoint; rows of chunks
+        already written stay imported.
+        """
+        result = await self.db.import_jobs.update_one(
+            {"id": job_id, "status": {"$in": ["queued", "running"]}},
+            {"$set": {"cancel_requested": True}},
+        )
+        if result.matched_count == 0:
+            return False
+
+        # Nobody is running a queued job - close it here
+        now = datetime.now(timezone.utc).isoformat()
+        closed = await self.db.import_jobs.update_one(
+            {"id": job_id, "status": "queued"},
+            {"$set": {"status": "cancelled", "updated_at": now, "finished_at": now}},
+        )
+        if closed.modified_count:
+            await self.db.import_job_chunks.delete_many({"job_id": job_id})
+        return True
+
+    async def retry_job(self, job_id: str) -> bool:
+        """Re-queue a failed job; it continues from its last checkpoint."""
+        result = await self.db.import_jobs.update_one(
+            {"id": job_id, "status": "failed"},
+            {"$set": {
+                "status": "queued",
+                "error": None,
+                "finished_at": None,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }},
+        )
+        if result.modified_count:
+            await self.run_pending()
+        return result.modified_count > 0
+
+
+# Global instance
+_import_job_service: Optional[ImportJobService] = None
+
+
+def get_import_job_service(db: AsyncIOMotorDatabase, activity_log_service=None) -> ImportJobService:
+    """Get or create the import job service"""
+    global _import_job_service
+    if _import_job_service is None:
+        _import_job_service = ImportJobService(db, activity_log_service)
+    return _import_job_service
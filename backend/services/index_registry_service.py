@@ -0,0 +1,665 @@
+"""
+Index Registry Service
+======================
+
+Single declarative list of the MongoDB indexes the application relies on,
+plus an explain()-based advisor that checks them against real query shapes.
+
+- INDEX_REGISTRY is applied at startup (create_database_indexes in server.py),
+  by `manage.py sync-indexes` and by optimize_db.py
+- Compound keys follow the ESR rule (Equality, Sort, Range) of the queries
+  they serve; single-field indexes that are a prefix of a registered compound
+  index are left out (the compound index serves them)
+- Computed fields (e.g. asset_domains.domain_active_status, derived from
+  expiration_date at read time) are never indexed
+- QUERY_CATALOG lists the hot query shapes of the routers and services;
+  `manage.py index-advisor` explains each one and reports COLLSCANs,
+  in-memory sorts, missing compound indexes, unused indexes ($indexStats)
+  and indexes present in the database but not registered
+
+seo_conflicts.dedup_fingerprint is managed by the conflict linker and
+asset_domains.domain_key by services/domain_key_service.py (both must
+backfill legacy documents before their unique index can be built).
+"""
+
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+
+def _index(keys, **options) -> IndexModel:
+    """IndexModel from a field name or a list of (field, direction)."""
+    if isinstance(keys, str):
+        keys = [(keys, ASCENDING)]
+    return IndexModel(keys, **options)
+
+
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    "users": [
+        _index("email", unique=True),
+        _index("id", unique=True),
+        _index("role"),
+        _index("status"),
+    ],
+    "brands": [
+        _index("id", unique=True),
+        _index("status"),
+        _index("name"),
+    ],
+    "asset_domains": [
+        _index("id", unique=True),
+        _index("domain_name"),
+        # Brand-scoped lists (by name / newest first)
+        _index([("brand_id", ASCENDING), ("domain_name", ASCENDING)]),
+        _index([("brand_id", ASCENDING), ("created_at", DESCENDING)]),
+        _index("category_id"),
+        _index("registrar_id"),
+        _index("status"),
+        _index([("lifecycle_status", ASCENDING), ("monitoring_status", ASCENDING)]),
+        _index("monitoring_status"),
+        # Availability pass: monitoring_enabled + lifecycle exclusion
+        _index("monitoring_enabled"),
+        _index("created_at"),
+        _index("expiration_date"),
+    ],
+    "seo_structure_entries": [
+        _index("id", unique=True),
+        _index([("network_id", ASCENDING), ("asset_domain_id", ASCENDING)]),
+        _index([("network_id", ASCENDING), ("domain_role", ASCENDING)]),
+        # Node uniqueness checks (domain + path, optionally within a network)
+        _index([
+            ("asset_domain_id", ASCENDING), ("optimized_path", ASCENDING), ("network_id", ASCENDING)
+        ]),
+        _index("target_entry_id"),
+        _index("target_asset_domain_id"),
+        _index("domain_role"),
+        _index("tier"),
+    ],
+    "seo_networks": [
+        _index("id", unique=True),
+        _index([("brand_id", ASCENDING), ("created_at", DESCENDING)]),
+        _index("name"),
+        _index("status"),
+        _index("created_at"),
+    ],
+    "seo_optimizations": [
+        _index("id", unique=True),
+        _index([("network_id", ASCENDING), ("created_at", DESCENDING)]),
+        # Open complaints per network (network list and detail)
+        _index([("network_id", ASCENDING), ("complaint_status", ASCENDING)]),
+        _index([("brand_id", ASCENDING), ("status", ASCENDING)]),
+        _index("status"),
+        _index("created_at"),
+    ],
+    "optimization_complaints": [
+        _index([("optimization_id", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "seo_conflicts": [
+        _index("id", unique=True),
+        _index([("network_id", ASCENDING), ("status", ASCENDING)]),
+        _index([("status", ASCENDING), ("severity", ASCENDING)]),
+        _index("severity"),
+        _index("detected_at"),
+        _index("created_at"),
+    ],
+    # Precomputed conflict reports (one snapshot per network)
+    "seo_conflict_reports": [
+        _index("network_id", unique=True),
+    ],
+    "conflict_scan_runs": [
+        _index("id", unique=True),
+        _index([("started_at", DESCENDING)]),
+    ],
+    # Background import jobs and their row chunks
+    "import_jobs": [
+        _index("id", unique=True),
+        _index([("status", ASCENDING), ("heartbeat_at", ASCENDING)]),
+        _index([("actor", ASCENDING), ("created_at", DESCENDING)]),
+        _index("created_at"),
+    ],
+    "import_job_chunks": [
+        _index([("job_id", ASCENDING), ("seq", ASCENDING)], unique=True),
+    ],
+    # Brand-wide cannibalization index (MinHash/LSH band keys)
+    "seo_cannibalization_index": [
+        _index("entry_id", unique=True),
+        _index("network_id"),
+        _index([("brand_scope", ASCENDING), ("bands", ASCENDING)]),
+    ],
+    "seo_cannibalization_pairs": [
+        _index("pair_key", unique=True),
+        _index("network_ids"),
+        _index("network_id"),
+    ],
+    "seo_change_logs": [
+        _index([("network_id", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "network_managers_audit_logs": [
+        _index([("network_id", ASCENDING), ("changed_at", DESCENDING)]),
+    ],
+    # Daily conflict/complaint metrics rollups
+    "metrics_daily_rollups": [
+        _index("date", unique=True),
+    ],
+    # User presence (expired by TTL)
+    "user_presence": [
+        _index("user_id", unique=True),
+        _index("last_seen"),
+        _index("expires_at", expireAfterSeconds=0),
+    ],
+    # User cache invalidation versions
+    "user_cache_versions": [
+        _index("user_id", unique=True),
+        _index("updated_at"),
+    ],
+    "user_notifications": [
+        _index([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+        _index([("user_id", ASCENDING), ("read", ASCENDING)]),
+    ],
+    "alerts": [
+        # Alert cooldown lookup
+        _index([("domain_id", ASCENDING), ("alert_type", ASCENDING), ("created_at", DESCENDING)]),
+        _index([("acknowledged", ASCENDING), ("created_at", DESCENDING)]),
+        _index("created_at"),
+    ],
+    "activity_logs_v3": [
+        _index("created_at"),
+        _index([("entity_type", ASCENDING), ("entity_id", ASCENDING), ("created_at", DESCENDING)]),
+        _index([("actor", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "audit_logs": [
+        _index("created_at"),
+        _index([("entity_type", ASCENDING), ("created_at", DESCENDING)]),
+        _index("user_id"),
+        # Menu permission changes are stamped with "timestamp"
+        _index("timestamp"),
+    ],
+    "settings": [
+        _index("key"),
+    ],
+    "categories": [
+        _index("id", unique=True),
+        _index("name"),
+    ],
+    "registrars": [
+        _index("id", unique=True),
+        _index("name"),
+    ],
+}
+
+# Indexes created outside the registry (never reported or dropped)
+EXTERNALLY_MANAGED_INDEXES: Dict[str, List[str]] = {
+    "seo_conflicts": ["dedup_fingerprint_1"],
+    "asset_domains": ["domain_key_1"],
+}
+
+
+# Hot query shapes (values are placeholders - explain only needs the shape)
+QUERY_CATALOG: List[Dict[str, Any]] = [
+    {
+        "name": "network list: open complaints per network",
+        "collection": "seo_optimizations",
+        "filter": {"network_id": "?", "complaint_status": {"$in": ["complained", "under_review"]}},
+    },
+    {
+        "name": "network list: last optimization",
+        "collection": "seo_optimizations",
+        "filter": {"network_id": "?"},
+        "sort": [("created_at", DESCENDING)],
+    },
+    {
+        "name": "optimizations of a network (paginated)",
+        "collection": "seo_optimizations",
+        "filter": {"network_id": "?", "archived": {"$ne": True}},
+        "sort": [("created_at", DESCENDING)],
+    },
+    {
+        "name": "complaints of an optimization",
+        "collection": "optimization_complaints",
+        "filter": {"optimization_id": "?"},
+        "sort": [("created_at", DESCENDING)],
+    },
+    {
+        "name": "node uniqueness check (domain + path)",
+        "collection": "seo_structure_entries",
+        "filter": {"asset_domain_id": "?", "optimized_path": "?"},
+    },
+    {
+        "name": "duplicate node in network",
+        "collection": "seo_structure_entries",
+        "filter": {"asset_domain_id": "?", "network_id": "?", "optimized_path": "?"},
+    },
+    {
+        "name": "entries of a network",
+        "collection": "seo_structure_entries",
+        "filter": {"network_id": "?"},
+    },
+    {
+        "name": "main node of a network",
+        "collection": "seo_structure_entries",
+        "filter": {"network_id": "?", "domain_role": "main"},
+    },
+    {
+        "name": "children of a node",
+        "collection": "seo_structure_entries",
+        "filter": {"target_entry_id": "?", "id": {"$ne": "?"}},
+    },
+    {
+        "name": "entries pointing at an asset (delete guard)",
+        "collection": "seo_structure_entries",
+        "filter": {"$or": [{"asset_domain_id": "?"}, {"target_asset_domain_id": "?"}]},
+    },
+    {
+        "name": "asset domains of a brand by name",
+        "collection": "asset_domains",
+        "filter": {"brand_id": "?"},
+        "sort": [("domain_name", ASCENDING)],
+    },
+    {
+        "name": "availability pass: monitored domains",
+        "collection": "asset_domains",
+        "filter": {
+            "monitoring_enabled": True,
+            "lifecycle_status": {"$nin": ["released", "not_renewed", "quarantined"]},
+        },
+    },
+    {
+        "name": "expiration pass: domains with an expiration date",
+        "collection": "asset_domains",
+        "filter": {
+            "expiration_date": {"$ne": None, "$exists": True},
+            "lifecycle_status": {"$nin": ["released", "not_renewed", "quarantined"]},
+        },
+    },
+    {
+        "name": "networks of a brand (newest first)",
+        "collection": "seo_networks",
+        "filter": {"brand_id": "?"},
+        "sort": [("created_at", DESCENDING)],
+    },
+    {
+        "name": "open conflicts of a network",
+        "collection": "seo_conflicts",
+        "filter": {"network_id": "?", "status": "detected"},
+    },
+    {
+        "name": "conflicts by status and severity",
+        "collection": "seo_conflicts",
+        "pipeline": [
+            {"$match": {"status": "detected"}},
+            {"$group": {"_id": "$severity", "count": {"$sum": 1}}},
+        ],
+    },
+    {
+        "name": "alert cooldown lookup",
+        "collection": "alerts",
+        "filter": {"domain_id": "?", "alert_type": "?", "created_at": {"$gt": "?"}},
+    },
+    {
+        "name": "unacknowledged alerts (newest first)",
+        "collection": "alerts",
+        "filter": {"acknowledged": False},
+        "sort": [("created_at", DESCENDING)],
+    },
+    {
+        "name": "notification bell",
+        "collection": "user_notifications",
+        "filter": {"user_id": "?"},
+        "sort": [("created_at", DESCENDING)],
+    },
+    {
+        "name": "unread notification count",
+        "collection": "user_notifications",
+        "filter": {"user_id": "?", "read": False},
+    },
+    {
+        "name": "change history of a network",
+        "collection": "seo_change_logs",
+        "filter": {"network_id": "?", "archived": {"$ne": True}},
+        "sort": [("created_at", DESCENDING)],
+    },
+    {
+        "name": "activity logs of an entity",
+        "collection": "activity_logs_v3",
+        "filter": {"entity_type": "?", "entity_id": "?"},
+        "sort": [("created_at", DESCENDING)],
+    },
+    {
+        "name": "audit logs by entity type",
+        "collection": "audit_logs",
+        "filter": {"entity_type": "?"},
+        "sort": [("created_at", DESCENDING)],
+    },
+    {
+        "name": "settings lookup",
+        "collection": "settings",
+        "filter": {"key": "?"},
+    },
+    {
+        "name": "online users",
+        "collection": "user_presence",
+        "filter": {"last_seen": {"$gte": "?"}},
+    },
+    {
+        "name": "import job claim: abandoned jobs",
+        "collection": "import_jobs",
+        "filter": {"status": "running", "heartbeat_at": {"$lt": "?"}},
+    },
+    {
+        "name": "import jobs of a user",
+        "collection": "import_jobs",
+        "filter": {"actor": "?"},
+        "sort": [("created_at", DESCENDING)],
+    },
+    {
+        "name": "import job chunk",
+        "collection": "import_job_chunks",
+        "filter": {"job_id": "?", "seq": "?"},
+    },
+    {
+        "name": "cannibalization band lookup",
+        "collection": "seo_cannibalization_index",
+        "filter": {"brand_scope": "?", "bands": {"$in": ["?"]}},
+    },
+]
+
+# Operators that keep a predicate an equality match for ESR purposes
+_EQUALITY_OPERATORS = {"$eq", "$in"}
+
+
+def index_key(model: IndexModel) -> List[Tuple[str, Any]]:
+    return list(model.document["key"].items())
+
+
+def index_name(model: IndexModel) -> str:
+    return model.document["name"]
+
+
+def registered_names(collection: str) -> List[str]:
+    names = [index_name(model) for model in INDEX_REGISTRY.get(collection, [])]
+    return names + EXTERNALLY_MANAGED_INDEXES.get(collection, [])
+
+
+def redundant_indexes() -> List[Dict[str, str]]:
+    """Registered non-unique indexes whose key is a prefix of another registered index."""
+    redundant = []
+    for collection, models in INDEX_REGISTRY.items():
+        for model in models:
+            if model.document.get("unique") or "expireAfterSeconds" in model.document:
+                continue
+            key = index_key(model)
+            for other in models:
+                other_key = index_key(other)
+                if other is not model and len(other_key) > len(key) and other_key[:len(key)] == key:
+                    redundant.append({
+                        "collection": collection,
+                        "index": index_name(model),
+                        "covered_by": index_name(other),
+                    })
+                    break
+    return redundant
+
+
+# ==================== APPLYING THE REGISTRY ====================
+
+
+async def apply_indexes(db) -> Dict[str, Any]:
+    """Create all registered indexes (Motor). Existing indexes are left as they are."""
+    created, failed = 0, []
+    for collection, models in INDEX_REGISTRY.items():
+        try:
+            await db[collection].create_indexes(models)
+            created += len(models)
+        except PyMongoError:
+            # One conflicting index must not block the others
+            for model in models:
+                try:
+                    await db[collection].create_indexes([model])
+                    created += 1
+                except PyMongoError as e:
+                    logger.warning(f"Index {collection}.{index_name(model)} not created: {e}")
+                    failed.append(f"{collection}.{index_name(model)}")
+    return {"indexes": created, "failed": failed}
+
+
+def apply_indexes_sync(db) -> Dict[str, Any]:
+    """Create all registered indexes (pymongo, used by manage.py)."""
+    created, failed = 0, []
+    for collection, models in INDEX_REGISTRY.items():
+        try:
+            db[collection].create_indexes(models)
+            created += len(models)
+        except PyMongoError:
+            for model in models:
+                try:
+                    db[collection].create_indexes([model])
+                    created += 1
+                except PyMongoError as e:
+                    logger.warning(f"Index {collection}.{index_name(model)} not created: {e}")
+                    failed.append(f"{collection}.{index_name(model)}")
+    return {"indexes": created, "failed": failed}
+
+
+def unregistered_indexes(db) -> List[Dict[str, Any]]:
+    """Indexes present in the database but not in the registry (pymongo)."""
+    found = []
+    for collection in sorted(db.list_collection_names()):
+        if collection.startswith("system."):
+            continue
+        known = set(registered_names(collection))
+        for info in db[collection].list_indexes():
+            if info["name"] != "_id_" and info["name"] not in known:
+                found.append({
+                    "collection": collection,
+                    "index": info["name"],
+                    "key": list(info["key"].items()),
+                })
+    return found
+
+
+def drop_unregistered_indexes(db) -> List[str]:
+    dropped = []
+    for item in unregistered_indexes(db):
+        db[item["collection"]].drop_index(item["index"])
+        dropped.append(f"{item['collection']}.{item['index']}")
+    return dropped
+
+
+# ==================== ADVISOR ====================
+
+
+def query_predicates(query: Dict[str, Any]) -> Tuple[List[str], List[Tuple[str, int]], List[str]]:
+    """(equality fields, sort, range fields) of a catalog query."""
+    filter_ = query.get("filter")
+    sort = list(query.get("sort") or [])
+    if "pipeline" in query:
+        filter_ = {}
+        stages = query["pipeline"]
+        if stages and "$match" in stages[0]:
+            filter_ = stages[0]["$match"]
+            if len(stages) > 1 and "$sort" in stages[1]:
+                sort = list(stages[1]["$sort"].items())
+
+    equality, ranges = [], []
+    for field, value in (filter_ or {}).items():
+        if field.startswith("$"):
+            # $or / $and branches are planned separately
+            continue
+        if isinstance(value, dict) and not set(value) <= _EQUALITY_OPERATORS:
+            ranges.append(field)
+        else:
+            equality.append(field)
+    return equality, sort, ranges
+
+
+def suggest_index(query: Dict[str, Any]) -> List[Tuple[str, int]]:
+    """ESR compound key for a query: equality fields, then sort, then range."""
+    equality, sort, ranges = query_predicates(query)
+    key = [(field, ASCENDING) for field in equality]
+    key += [(field, direction) for field, direction in sort if field not in equality]
+    key += [(field, ASCENDING) for field in ranges if field not in dict(key)]
+    return key
+
+
+def _serves(key: List[Tuple[str, Any]], equality: List[str], sort: List[Tuple[str, int]]) -> bool:
+    """Does an index with this key serve the equality fields (as a prefix) and the sort?"""
+    fields = [field for field, _ in key]
+    covered = 0
+    while covered < len(fields) and fields[covered] in equality:
+        covered += 1
+    if not (equality or sort) or covered < len(equality):
+        return False
+    if not sort:
+        return True
+    rest = key[covered:covered + len(sort)]
+    if [field for field, _ in rest] != [field for field, _ in sort]:
+        return False
+    same = all(d == s for (_, d), (_, s) in zip(rest, sort))
+    reversed_ = all(d == -s for (_, d), (_, s) in zip(rest, sort))
+    return same or reversed_
+
+
+def registered_index_for(query: Dict[str, Any]) -> Optional[str]:
+    """Name of a registered index serving the query, if any."""
+    equality, sort, ranges = query_predicates(query)
+    filter_ = query.get("filter") or {}
+    models = INDEX_REGISTRY.get(query["collection"], [])
+
+    if filter_.get("$or"):
+        # Every $or branch needs its own index
+        names = [
+            registered_index_for({"collection": query["collection"], "filter": branch})
+            for branch in filter_["$or"]
+        ]
+        return ", ".join(names) if all(names) else None
+
+    if not equality and not sort and ranges:
+        equality = ranges[:1]
+    for model in models:
+        if _serves(index_key(model), equality, sort):
+            return index_name(model)
+    return None
+
+
+def _find_key(document: Any, wanted: str) -> Optional[Any]:
+    if isinstance(document, dict):
+        if wanted in document:
+            return document[wanted]
+        items = document.values()
+    elif isinstance(document, list):
+        items = document
+    else:
+        return None
+    for item in items:
+        found = _find_key(item, wanted)
+        if found is not None:
+            return found
+    return None
+
+
+def _plan_stages(plan: Any) -> List[Dict[str, Any]]:
+    """Flatten a winning plan into its stages (classic and SBE layouts)."""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan)
+        for child_key in ("queryPlan", "inputStage", "inputStages"):
+            child = plan.get(child_key)
+            for item in child if isinstance(child, list) else [child]:
+                stages.extend(_plan_stages(item))
+    return stages
+
+
+def explain_query(db, query: Dict[str, Any]) -> Dict[str, Any]:
+    """Winning plan summary of one catalog query (queryPlanner verbosity)."""
+    collection = query["collection"]
+    if "pipeline" in query:
+        command = {"aggregate": collection, "pipeline": query["pipeline"], "cursor": {}}
+    else:
+        command = {"find": collection, "filter": query.get("filter") or {}}
+        if query.get("sort"):
+            command["sort"] = dict(query["sort"])
+
+    explain = db.command("explain", command, verbosity="queryPlanner")
+    planner = _find_key(explain, "queryPlanner") or {}
+    stages = _plan_stages(planner.get("winningPlan") or {})
+    return {
+        "stages": [stage["stage"] for stage in stages],
+        "indexes": sorted({stage["indexName"] for stage in stages if stage.get("indexName")}),
+    }
+
+
+def run_index_advisor(db) -> Dict[str, Any]:
+    """Explain every catalog query and collect findings (pymongo)."""
+    existing = {
+        collection: {info["name"] for info in db[collection].list_indexes()}
+        for collection in db.list_collection_names()
+    }
+
+    queries = []
+    for query in QUERY_CATALOG:
+        collection = query["collection"]
+        result = {"name": query["name"], "collection": collection, "findings": []}
+        try:
+            plan = explain_query(db, query)
+        except PyMongoError as e:
+            result["findings"].append(f"explain failed: {e}")
+            queries.append(result)
+            continue
+        result.update(plan)
+
+        if "COLLSCAN" in plan["stages"]:
+            result["findings"].append("COLLSCAN")
+        if "SORT" in plan["stages"]:
+            result["findings"].append("in-memory SORT")
+
+        registered = registered_index_for(query)
+        if registered is None:
+            key = suggest_index(query)
+            result["findings"].append(
+                "missing compound index: " + ", ".join(f"{f}:{d}" for f, d in key)
+            )
+        else:
+            missing = [
+                name for name in registered.split(", ")
+                if name not in existing.get(collection, set())
+            ]
+            if missing and collection in existing:
+                result["findings"].append(
+                    f"registered index not built: {', '.join(missing)} (run sync-indexes)"
+                )
+        queries.append(result)
+
+    unused = []
+    for collection in sorted(existing):
+        if collection.startswith("system."):
+            continue
+        constraints = {
+            info["name"] for info in db[collection].list_indexes()
+            if info.get("unique") or "expireAfterSeconds" in info
+        }
+        try:
+            usage = list(db[collection].aggregate([{"$indexStats": {}}]))
+        except PyMongoError:
+            continue
+        for stat in usage:
+            name = stat["name"]
+            # _id, unique and TTL indexes do their job even when never read
+            if name == "_id_" or name in constraints:
+                continue
+            if stat.get("accesses", {}).get("ops", 0) == 0:
+                unused.append({
+                    "collection": collection,
+                    "index": name,
+                    "since": str(stat.get("accesses", {}).get("since", "")),
+                })
+
+    return {
+        "queries": queries,
+        "unused_indexes": unused,
+        "unregistered_indexes": unregistered_indexes(db),
+        "redundant_registered_indexes": redundant_indexes(),
+    }
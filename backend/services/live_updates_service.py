@@ -0,0 +1,229 @@
+"""
+Live Updates Service
+====================
+
+Fan-out hub behind the Server-Sent Events stream (/api/v3/events/stream).
+
+Instead of every open dashboard polling 8-10 count_documents calls on a
+timer, connected clients register here. One background task listens on
+the event bus and, when something changes, recomputes each affected
+section once and pushes it to every client that needs it:
+
+- dashboard_stats: once per distinct brand scope among connected clients
+- monitoring_stats: once (not brand scoped)
+- presence: once
+- notifications: unread counts of the affected connected users only
+
+Events arriving within LIVE_UPDATES_DEBOUNCE_SECONDS are coalesced into
+one recompute. A client only receives a section when its content differs
+from what it was last sent (deltas). Every LIVE_UPDATES_RESYNC_SECONDS all
+sections are recomputed anyway, which picks up time-based changes
+(expirations, users going offline) and writes made by other workers.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Any, List, Optional, Set, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from services.event_bus import EventBus, get_event_bus
+from services.dashboard_stats_service import get_dashboard_stats, get_monitoring_stats
+from services.presence_service import get_presence_service
+
+logger = logging.getLogger(__name__)
+
+# Events within this window are coalesced into one recompute
+LIVE_UPDATES_DEBOUNCE_SECONDS = float(os.environ.get("LIVE_UPDATES_DEBOUNCE_SECONDS", "1"))
+
+# Full recompute interval, even without events
+LIVE_UPDATES_RESYNC_SECONDS = float(os.environ.get("LIVE_UPDATES_RESYNC_SECONDS", "60"))
+
+# Section updates buffered per client before it is considered too slow
+LIVE_CLIENT_QUEUE_SIZE = 100
+
+GLOBAL_SECTIONS = {"dashboard_stats", "monitoring_stats", "presence"}
+
+# Sections to recompute for each event bus topic
+TOPIC_SECTIONS = {
+    "monitoring": {"dashboard_stats", "monitoring_stats"},
+    "alerts": {"dashboard_stats", "monitoring_stats"},
+    "inventory": {"dashboard_stats", "monitoring_stats"},
+    "presence": {"presence"},
+}
+
+
+def _comparable(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Section content without its computation timestamp."""
+    return {k: v for k, v in data.items() if k != "updated_at"}
+
+
+class LiveClient:
+    """One connected SSE stream."""
+
+    def __init__(self, user: Dict[str, Any]):
+        self.user_id = user["id"]
+        if user.get("role") == "super_admin":
+            self.brand_scope: Optional[Tuple[str, ...]] = None
+        else:
+            self.brand_scope = tuple(sorted(user.get("brand_scope_ids") or []))
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=LIVE_CLIENT_QUEUE_SIZE)
+        self._last_sent: Dict[str, Dict[str, Any]] = {}
+
+    def send(self, section: str, data: Dict[str, Any]) -> bool:
+        """Queue a section update unless the client already has this content."""
+        comparable = _comparable(data)
+        if self._last_sent.get(section) == comparable:
+            return True
+        try:
+            self.queue.put_nowait((section, data))
+        except asyncio.QueueFull:
+            # Too slow to keep up - start over with the next full resync
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self._last_sent.clear()
+            return False
+        self._last_sent[section] = comparable
+        return True
+
+
+class LiveUpdatesService:
+    """
+    Hub that computes live sections once per change and fans them out.
+
+    - connect / disconnect: called by the SSE endpoint
+    - a background task (running while clients are connected) consumes
+      event bus events and pushes changed sections
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, bus: EventBus):
+        self.db = db
+        self.bus = bus
+        self._clients: Set[LiveClient] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._resync_requested = False
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    async def connect(self, user: Dict[str, Any]) -> LiveClient:
+        """Register a client and queue a full snapshot for it."""
+        client = LiveClient(user)
+        self._clients.add(client)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            await self._push(GLOBAL_SECTIONS, {client.user_id}, [client], fresh=False)
+        except BaseException:
+            # The caller never gets the client to disconnect it
+            self._clients.discard(client)
+            raise
+        return client
+
+    def disconnect(self, client: LiveClient):
+        self._clients.discard(client)
+
+    async def _run(self):
+        with self.bus.subscribe() as events:
+            next_resync = time.monotonic() + LIVE_UPDATES_RESYNC_SECONDS
+            while self._clients:
+                sections: Set[str] = set()
+                user_ids: Set[str] = set()
+
+                timeout = max(next_resync - time.monotonic(), 0)
+                try:
+                    event = await asyncio.wait_for(events.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    event = None
+
+                if event is not None:
+                    self._collect(event, sections, user_ids)
+                    # Coalesce the burst this event belongs to
+                    await asyncio.sleep(LIVE_UPDATES_DEBOUNCE_SECONDS)
+                    while not events.empty():
+                        self._collect(events.get_nowait(), sections, user_ids)
+
+                if time.monotonic() >= next_resync or self._resync_requested:
+                    self._resync_requested = False
+                    next_resync = time.monotonic() + LIVE_UPDATES_RESYNC_SECONDS
+                    sections |= GLOBAL_SECTIONS
+                    user_ids |= {client.user_id for client in self._clients}
+
+                if sections or user_ids:
+                    try:
+                        await self._push(sections, user_ids, list(self._clients))
+                    except Exception as e:
+                        logger.error(f"Live update push failed: {e}")
+
+    @staticmethod
+    def _collect(event: Dict[str, Any], sections: Set[str], user_ids: Set[str]):
+        topic = event["topic"]
+        if topic == "notifications":
+            user_id = event["data"].get("user_id")
+            if user_id:
+                user_ids.add(user_id)
+        else:
+            sections |= TOPIC_SECTIONS.get(topic, set())
+
+    async def _push(
+        self,
+        sections: Set[str],
+        user_ids: Set[str],
+        clients: List[LiveClient],
+        fresh: bool = True,
+    ):
+        """
+        Recompute the given sections once and send them to clients.
+        fresh=False allows stats cached by the polling endpoints (snapshots).
+        """
+        if not clients:
+            return
+
+        updates: List[Tuple[LiveClient, str, Dict[str, Any]]] = []
+
+        if "dashboard_stats" in sections:
+            scopes = list({client.brand_scope for client in clients})
+            results = await asyncio.gather(*(
+                get_dashboard_stats(self.db, None if scope is None else list(scope), fresh=fresh)
+                for scope in scopes
+            ))
+            by_scope = dict(zip(scopes, results))
+            updates += [(c, "dashboard_stats", by_scope[c.brand_scope]) for c in clients]
+
+        if "monitoring_stats" in sections:
+            stats = await get_monitoring_stats(self.db, fresh=fresh)
+            updates += [(c, "monitoring_stats", stats) for c in clients]
+
+        if "presence" in sections:
+            presence = await get_presence_service(self.db).get_online_users()
+            updates += [(c, "presence", presence) for c in clients]
+
+        connected_users = user_ids & {client.user_id for client in clients}
+        if connected_users:
+            rows = await self.db.user_notifications.aggregate([
+                {"$match": {"user_id": {"$in": list(connected_users)}, "read": False}},
+                {"$group": {"_id": "$user_id", "unread_count": {"$sum": 1}}},
+            ]).to_list(None)
+            unread = {row["_id"]: row["unread_count"] for row in rows}
+            updates += [
+                (c, "notifications", {"unread_count": unread.get(c.user_id, 0)})
+                for c in clients if c.user_id in connected_users
+            ]
+
+        for client, section, data in updates:
+            if not client.send(section, data):
+                self._resync_requested = True
+
+
+# Global instance
+_live_updates_service: Optional[LiveUpdatesService] = None
+
+
+def get_live_updates_service(db: AsyncIOMotorDatabase) -> LiveUpdatesService:
+    """Get or create the live updates hub"""
+    global _live_updates_service
+    if _live_updates_service is None:
+        _live_updates_service = LiveUpdatesService(db, get_event_bus())
+    return _live_updates_service
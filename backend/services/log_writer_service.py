@@ -0,0 +1,207 @@
+"""
+Log Writer Service
+==================
+
+Buffered, asynchronous writer for activity and audit log entries.
+
+ActivityLogService.log / log_many and AuditLogService.log build their
+documents and hand them to this writer instead of inserting them on the
+request path. Each worker keeps a bounded in-memory queue and writes it
+with one unordered insert_many per collection:
+
+- a flush starts as soon as LOG_WRITER_BATCH_SIZE entries are queued, and
+  at the latest every LOG_WRITER_FLUSH_SECONDS
+- at most LOG_WRITER_QUEUE_SIZE entries wait in memory; when the queue is
+  full the caller inserts its entry itself (counted as overflow), so a
+  slow database slows requests down instead of losing log entries
+- a flush that fails (database unreachable) keeps its entries for the next
+  one while there is room; entries rejected by MongoDB itself are dropped
+  and counted
+- readers of the log collections call flush() first, so they see every
+  entry of the requests this worker already answered. flush() only drains
+  the queue of its own worker: with several uvicorn workers, a read can
+  miss entries another worker still holds, for up to
+  LOG_WRITER_FLUSH_SECONDS
+- stop() (application shutdown) ends the flush task and drains the queue
+- before start() (scripts, migrations, tests) entries are inserted directly
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from pymongo.errors import BulkWriteError
+
+from services.metrics_service import (
+    LOG_WRITER_ENTRIES,
+    LOG_WRITER_FLUSH_DURATION,
+    LOG_WRITER_QUEUE_DEPTH,
+)
+
+logger = logging.getLogger(__name__)
+
+# Entries waiting in memory per worker before callers insert directly
+LOG_WRITER_QUEUE_SIZE = int(os.environ.get("LOG_WRITER_QUEUE_SIZE", "10000"))
+
+# Queued entries that trigger a flush without waiting for the timer
+LOG_WRITER_BATCH_SIZE = int(os.environ.get("LOG_WRITER_BATCH_SIZE", "500"))
+
+# Longest time an entry waits in memory
+LOG_WRITER_FLUSH_SECONDS = float(os.environ.get("LOG_WRITER_FLUSH_SECONDS", "1"))
+
+
+class LogWriter:
+    """
+    Bounded queue of (collection, document) pairs flushed in batches.
+
+    - write / write_many: enqueue (direct insert before start() or when the
+      queue is full)
+    - flush: insert_many everything queued (timer, batch size, readers)
+    - start / stop: background flush task (application lifespan)
+    """
+
+    def __init__(
+        self,
+        queue_size: int = LOG_WRITER_QUEUE_SIZE,
+        batch_size: int = LOG_WRITER_BATCH_SIZE,
+        flush_seconds: float = LOG_WRITER_FLUSH_SECONDS,
+    ):
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._pending: List[Tuple[Any, Dict[str, Any]]] = []
+        # Serializes flushes so a reader's flush waits for one in flight
+        self._flush_lock = asyncio.Lock()
+        self._batch_ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def write(self, collection, entry: Dict[str, Any]):
+        """Queue a document for collection (a Motor collection)."""
+        if self._task is None:
+            await collection.insert_one(entry)
+            return
+
+        if len(self._pending) >= self.queue_size:
+            LOG_WRITER_ENTRIES.labels(collection.name, "overflow").inc()
+            await collection.insert_one(entry)
+            return
+
+        self._pending.append((collection, entry))
+        LOG_WRITER_ENTRIES.labels(collection.name, "queued").inc()
+        LOG_WRITER_QUEUE_DEPTH.set(len(self._pending))
+        if len(self._pending) >= self.batch_size:
+            self._batch_ready.set()
+
+    async def write_many(self, collection, entries: List[Dict[str, Any]]):
+        """Queue several documents for collection; what does not fit is inserted directly."""
+        if not entries:
+            return
+        if self._task is None:
+            await collection.insert_many(entries, ordered=False)
+            return
+
+        room = max(self.queue_size - len(self._pending), 0)
+        queued, overflow = entries[:room], entries[room:]
+        self._pending.extend((collection, entry) for entry in queued)
+        if queued:
+            LOG_WRITER_ENTRIES.labels(collection.name, "queued").inc(len(queued))
+            LOG_WRITER_QUEUE_DEPTH.set(len(self._pending))
+        if len(self._pending) >= self.batch_size:
+            self._batch_ready.set()
+
+        if overflow:
+            LOG_WRITER_ENTRIES.labels(collection.name, "overflow").inc(len(overflow))
+            await collection.insert_many(overflow, ordered=False)
+
+    async def flush(self) -> int:
+        """Write all queued entries. Returns entries written."""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            # Swap the queue before awaiting so new entries go to a fresh one
+            pending, self._pending = self._pending, []
+            started = time.perf_counter()
+
+            batches: Dict[str, Tuple[Any, List[Dict[str, Any]]]] = {}
+            for collection, entry in pending:
+                batches.setdefault(collection.name, (collection, []))[1].append(entry)
+
+            written = 0
+            for name, (collection, entries) in batches.items():
+                try:
+                    await collection.insert_many(entries, ordered=False)
+                    written += len(entries)
+                    LOG_WRITER_ENTRIES.labels(name, "written").inc(len(entries))
+                except BulkWriteError as e:
+                    inserted = e.details.get("nInserted", 0)
+                    rejected = len(entries) - inserted
+                    written += inserted
+                    LOG_WRITER_ENTRIES.labels(name, "written").inc(inserted)
+                    LOG_WRITER_ENTRIES.labels(name, "dropped").inc(rejected)
+                    logger.error(f"Log writer: {rejected} {name} entries rejected: {e.details.get('writeErrors', [])[:3]}")
+                except Exception as e:
+                    self._requeue(collection, entries)
+                    logger.error(f"Log writer flush to {name} failed, keeping entries: {e}")
+
+            LOG_WRITER_FLUSH_DURATION.observe(time.perf_counter() - started)
+            LOG_WRITER_QUEUE_DEPTH.set(len(self._pending))
+            return written
+
+    def _requeue(self, collection, entries: List[Dict[str, Any]]):
+        """Put entries of a failed flush back in front of the queue, as far as it has room."""
+        room = max(self.queue_size - len(self._pending), 0)
+        kept = entries[:room]
+        if len(entries) > room:
+            LOG_WRITER_ENTRIES.labels(collection.name, "dropped").inc(len(entries) - room)
+            logger.error(f"Log writer queue full: {len(entries) - room} {collection.name} entries dropped")
+        self._pending[:0] = [(collection, entry) for entry in kept]
+
+    async def _run(self):
+        while self._running:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Log writer flush failed: {e}")
+
+    def start(self):
+        """Queue writes from now on and flush them in a background task."""
+        if self._task is None:
+            self._running = True
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Finish the flush task and drain the queue (shutdown)."""
+        if self._task is not None:
+            self._running = False
+            self._batch_ready.set()
+            await self._task
+            # Writes from here on are inserted directly
+            self._task = None
+
+        await self.flush()
+        if self._pending:
+            logger.error(f"Log writer stopped with {len(self._pending)} entries not written")
+
+
+# Global instance
+_log_writer: Optional[LogWriter] = None
+
+
+def get_log_writer() -> LogWriter:
+    """Get or create the log writer"""
+    global _log_writer
+    if _log_writer is None:
+        _log_writer = LogWriter()
+    return _log_writer
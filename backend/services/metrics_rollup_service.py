@@ -0,0 +1,356 @@
+"""
+Metrics Rollup Service
+======================
+
+Daily pre-aggregated conflict and complaint resolution metrics.
+
+One document per UTC day is stored in metrics_daily_rollups:
+
+    {
+        "date": "2025-01-31",
+        "computed_at": iso,
+        "totals": {...counters...},
+        "by_network": {network_id: {...counters...}},
+    }
+
+Counters are keyed by the day an event happened (conflict detected,
+conflict resolved, complaint resolved), so a closed day does not change
+and dashboards sum the days of their window instead of recounting history.
+Each day is computed server-side with one aggregation per collection.
+
+- Closed days are computed once (lazily on first use, or by the nightly
+  job) and the last ROLLUP_REFRESH_DAYS are recomputed nightly to pick up
+  late edits
+- Writes that change how a conflict or optimization counts (re-open,
+  re-resolve, approval, deletion) call invalidate_days with the document as
+  it was, which drops the rollups of the closed days it was counted on;
+  they are recomputed on their next read
+- Today is always computed live with the same pipelines
+- Windows are capped at ROLLUP_RETENTION_DAYS, the days the nightly job
+  keeps
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone, timedelta, date
+from typing import Dict, Any, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne
+
+logger = logging.getLogger(__name__)
+
+# Closed days recomputed by the nightly job
+ROLLUP_REFRESH_DAYS = 2
+
+# Days kept warm by the nightly job (longest dashboard window)
+ROLLUP_RETENTION_DAYS = 90
+
+# Max days computed at the same time when backfilling
+ROLLUP_BACKFILL_CONCURRENCY = 4
+
+# Complaint resolution time buckets (days) - same as ConflictAgingService
+OPTIMIZATION_TIME_BUCKETS = ["same_day", "1-2_days", "3-7_days", "8-14_days", "15+_days"]
+
+MS_PER_HOUR = 3600 * 1000
+MS_PER_DAY = 24 * MS_PER_HOUR
+
+
+def _empty_counters() -> Dict[str, Any]:
+    return {
+        "conflicts_detected": 0,
+        "conflicts_resolved": 0,
+        "false_resolutions": 0,
+        "conflict_resolution_hours_sum": 0.0,
+        "conflict_resolution_hours_count": 0,
+        "optimizations_resolved": 0,
+        "optimization_resolution_days_sum": 0,
+        "optimization_resolution_days_count": 0,
+        "optimization_resolution_days_min": None,
+        "optimization_resolution_days_max": None,
+        "optimization_time_buckets": {bucket: 0 for bucket in OPTIMIZATION_TIME_BUCKETS},
+    }
+
+
+def merge_counters(target: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the counters of `source` into `target` (min/max are combined)."""
+    for key, value in source.items():
+        if key == "optimization_time_buckets":
+            for bucket, count in value.items():
+                target[key][bucket] = target[key].get(bucket, 0) + count
+        elif key.endswith("_min"):
+            if value is not None:
+                target[key] = value if target[key] is None else min(target[key], value)
+        elif key.endswith("_max"):
+            if value is not None:
+                target[key] = value if target[key] is None else max(target[key], value)
+        else:
+            target[key] = target.get(key, 0) + (value or 0)
+    return target
+
+
+def _parse_date(field_expr: Any) -> Dict[str, Any]:
+    """$dateFromString that yields null for missing/invalid values."""
+    return {
+        "$dateFromString": {
+            "dateString": field_expr,
+            "onError": None,
+            "onNull": None,
+        }
+    }
+
+
+class MetricsRollupService:
+    """
+    Service that maintains and combines daily metrics rollups.
+
+    - get_summary: combined counters for the last N days (optionally one network)
+    - refresh_rollups: nightly job - backfill and re-close recent days
+    - invalidate_days / invalidate_network: drop rollups a write made stale
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+
+    # ---------- computing one day ----------
+
+    async def compute_day(self, day: str) -> Dict[str, Any]:
+        """Compute the rollup document for one UTC day ("YYYY-MM-DD")."""
+        next_day = (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+        # ISO timestamps sort lexically, so day strings bound them directly
+        day_range = {"$gte": day, "$lt": next_day}
+
+        detected, resolved, optimizations = await asyncio.gather(
+            self._aggregate_conflicts_detected(day_range),
+            self._aggregate_conflicts_resolved(day_range),
+            self._aggregate_optimizations_resolved(day_range),
+        )
+
+        by_network: Dict[str, Dict[str, Any]] = {}
+        for rows in (detected, resolved, optimizations):
+            for row in rows:
+                network_id = row.pop("_id") or "unknown"
+                counters = by_network.setdefault(network_id, _empty_counters())
+                merge_counters(counters, row)
+
+        totals = _empty_counters()
+        for counters in by_network.values():
+            merge_counters(totals, counters)
+
+        return {
+            "date": day,
+            "computed_at": datetime.now(timezone.utc).isoformat(),
+            "totals": totals,
+            "by_network": by_network,
+        }
+
+    async def _aggregate_conflicts_detected(self, day_range: Dict) -> List[Dict]:
+        return await self.db.seo_conflicts.aggregate([
+            {"$match": {"detected_at": day_range}},
+            {"$group": {"_id": "$network_id", "conflicts_detected": {"$sum": 1}}},
+        ]).to_list(None)
+
+    async def _aggregate_conflicts_resolved(self, day_range: Dict) -> List[Dict]:
+        return await self.db.seo_conflicts.aggregate([
+            {"$match": {
+                "status": {"$in": ["resolved", "approved"]},
+                "resolved_at": day_range,
+            }},
+            {"$addFields": {
+                "_hours": {"$let": {
+                    "vars": {
+                        "detected": _parse_date({"$ifNull": ["$first_detected_at", "$detected_at"]}),
+                        "resolved": _parse_date("$resolved_at"),
+                    },
+                    "in": {"$cond": [
+                        {"$and": ["$$detected", "$$resolved"]},
+                        {"$divide": [{"$subtract": ["$$resolved", "$$detected"]}, MS_PER_HOUR]},
+                        None,
+                    ]},
+                }},
+            }},
+            {"$addFields": {
+                "_valid_hours": {"$and": [{"$ne": ["$_hours", None]}, {"$gte": ["$_hours", 0]}]},
+            }},
+            {"$group": {
+                "_id": "$network_id",
+                "conflicts_resolved": {"$sum": 1},
+                "false_resolutions": {"$sum": {"$cond": [{"$eq": ["$is_false_resolution", True]}, 1, 0]}},
+                "conflict_resolution_hours_sum": {"$sum": {"$cond": ["$_valid_hours", "$_hours", 0]}},
+                "conflict_resolution_hours_count": {"$sum": {"$cond": ["$_valid_hours", 1, 0]}},
+            }},
+        ]).to_list(None)
+
+    async def _aggregate_optimizations_resolved(self, day_range: Dict) -> List[Dict]:
+        rows = await self.db.seo_optimizations.aggregate([
+            {"$match": {
+                "status": {"$in": ["resolved", "closed"]},
+                "resolved_at": day_range,
+            }},
+            {"$addFields": {
+                "_days": {"$let": {
+                    "vars": {
+                        "created": _parse_date("$created_at"),
+                        "resolved": _parse_date("$resolved_at"),
+                    },
+                    "in": {"$cond": [
+                        {"$and": ["$$created", "$$resolved"]},
+                        {"$floor": {"$divide": [{"$subtract": ["$$resolved", "$$created"]}, MS_PER_DAY]}},
+                        None,
+                    ]},
+                }},
+            }},
+            {"$addFields": {
+                "_bucket": {"$switch": {
+                    "branches": [
+                        {"case": {"$eq": ["$_days", None]}, "then": None},
+                        {"case": {"$eq": ["$_days", 0]}, "then": "same_day"},
+                        {"case": {"$lte": ["$_days", 2]}, "then": "1-2_days"},
+                        {"case": {"$lte": ["$_days", 7]}, "then": "3-7_days"},
+                        {"case": {"$lte": ["$_days", 14]}, "then": "8-14_days"},
+                    ],
+                    "default": "15+_days",
+                }},
+            }},
+            {"$group": {
+                "_id": "$network_id",
+                "optimizations_resolved": {"$sum": 1},
+                "optimization_resolution_days_sum": {"$sum": {"$ifNull": ["$_days", 0]}},
+                "optimization_resolution_days_count": {"$sum": {"$cond": [{"$ne": ["$_days", None]}, 1, 0]}},
+                "optimization_resolution_days_min": {"$min": "$_days"},
+                "optimization_resolution_days_max": {"$max": "$_days"},
+                **{
+                    f"bucket:{bucket}": {"$sum": {"$cond": [{"$eq": ["$_bucket", bucket]}, 1, 0]}}
+                    for bucket in OPTIMIZATION_TIME_BUCKETS
+                },
+            }},
+        ]).to_list(None)
+
+        for row in rows:
+            row["optimization_time_buckets"] = {
+                bucket: row.pop(f"bucket:{bucket}") for bucket in OPTIMIZATION_TIME_BUCKETS
+            }
+        return rows
+
+    # ---------- storing & combining ----------
+
+    async def _store_days(self, days: List[str]):
+        """Compute and upsert rollups for the given closed days."""
+        if not days:
+            return
+
+        semaphore = asyncio.Semaphore(ROLLUP_BACKFILL_CONCURRENCY)
+
+        async def compute(day: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.compute_day(day)
+
+        docs = await asyncio.gather(*(compute(day) for day in days))
+        await self.db.metrics_daily_rollups.bulk_write(
+            [ReplaceOne({"date": doc["date"]}, doc, upsert=True) for doc in docs],
+            ordered=False,
+        )
+
+    async def _ensure_days(self, days: List[str]):
+        """Backfill rollups for closed days that were never computed."""
+        existing = await self.db.metrics_daily_rollups.distinct(
+            "date", {"date": {"$in": days}}
+        )
+        missing = [day for day in days if day not in set(existing)]
+        if missing:
+            logger.info(f"Backfilling {len(missing)} daily metrics rollups")
+            await self._store_days(missing)
+
+    async def get_summary(
+        self, days: int = 30, network_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Combined counters for the last `days` UTC days, today included
+        (at most ROLLUP_RETENTION_DAYS).
+
+        Closed days come from stored rollups; today is computed live.
+        """
+        days = min(days, ROLLUP_RETENTION_DAYS)
+        today = datetime.now(timezone.utc).date()
+        closed_days = [(today - timedelta(days=i)).isoformat() for i in range(1, max(days, 1))]
+
+        await self._ensure_days(closed_days)
+
+        scope = f"by_network.{network_id}" if network_id else "totals"
+        docs = await self.db.metrics_daily_rollups.find(
+            {"date": {"$in": closed_days}}, {"_id": 0, "date": 1, scope: 1}
+        ).to_list(None)
+        docs.append(await self.compute_day(today.isoformat()))
+
+        summary = _empty_counters()
+        for doc in docs:
+            if network_id:
+                counters = doc.get("by_network", {}).get(network_id)
+            else:
+                counters = doc.get("totals")
+            if counters:
+                merge_counters(summary, counters)
+
+        summary["period_days"] = days
+        summary["period_start"] = (today - timedelta(days=max(days, 1) - 1)).isoformat()
+        return summary
+
+    async def refresh_rollups(self) -> int:
+        """
+        Nightly job: recompute the most recent closed days and backfill any
+        missing day in the retention window. Returns days written.
+        """
+        today = datetime.now(timezone.utc).date()
+        recent = [(today - timedelta(days=i)).isoformat() for i in range(1, ROLLUP_REFRESH_DAYS + 1)]
+        window = [
+            (today - timedelta(days=i)).isoformat()
+            for i in range(ROLLUP_REFRESH_DAYS + 1, ROLLUP_RETENTION_DAYS + 1)
+        ]
+
+        existing = set(await self.db.metrics_daily_rollups.distinct(
+            "date", {"date": {"$in": window}}
+        ))
+        days = recent + [day for day in window if day not in existing]
+        await self._store_days(days)
+
+        # Rollups older than the retention window are no longer read
+        await self.db.metrics_daily_rollups.delete_many(
+            {"date": {"$lt": (today - timedelta(days=ROLLUP_RETENTION_DAYS)).isoformat()}}
+        )
+        return len(days)
+
+
+    async def invalidate_days(self, *docs: Optional[Dict[str, Any]]):
+        """
+        Drop the stored rollups of the closed days the given conflicts /
+        optimizations were counted on (their detected_at and resolved_at).
+
+        Pass the documents as they were before the write that changes their
+        status or resolution time.
+        """
+        today = datetime.now(timezone.utc).date().isoformat()
+        days = {
+            doc[field][:10]
+            for doc in docs if doc
+            for field in ("detected_at", "resolved_at")
+            if isinstance(doc.get(field), str) and doc[field][:10] < today
+        }
+        if days:
+            await self.db.metrics_daily_rollups.delete_many({"date": {"$in": sorted(days)}})
+
+    async def invalidate_network(self, network_id: str):
+        """Drop every stored rollup that counts the network (network deletion)."""
+        await self.db.metrics_daily_rollups.delete_many(
+            {f"by_network.{network_id}": {"$exists": True}}
+        )
+
+
+# Global instance
+_metrics_rollup_service: Optional[MetricsRollupService] = None
+
+
+def get_metrics_rollup_service(db: AsyncIOMotorDatabase) -> MetricsRollupService:
+    """Get or create the metrics rollup service"""
+    global _metrics_rollup_service
+    if _metrics_rollup_service is None:
+        _metrics_rollup_service = MetricsRollupService(db)
+    return _metrics_rollup_service
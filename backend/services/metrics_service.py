@@ -0,0 +1,485 @@
+"""
+Metrics Service
+===============
+
+In-process metrics served at GET /metrics in the Prometheus text
+exposition format (version 0.0.4).
+
+Small built-in registry instead of prometheus_client: counters, gauges and
+histograms with fixed label sets. Recording is a dict lookup plus an add
+(histograms: one bisect), so it can sit on every request.
+
+- HTTP: latency histogram, request counter and in-flight gauge per route
+  template (MetricsRoute, the route_class of the API routers)
+- Monitoring engines: availability pass duration, checks, checks per second
+  and due backlog; expiration pass duration
+- Schedulers: job run time, runs, errors and missed runs (APScheduler events)
+- Imports: rows by outcome and rows per second of the last import
+- Notifications: send latency and failures per channel
+- Log writer: queued, written, overflowed and dropped log entries, queue
+  depth and flush duration
+- Caches: hit ratios (collected at scrape time)
+- MongoDB: connection pool usage (pymongo pool listener)
+
+Set METRICS_TOKEN to require "Authorization: Bearer <token>" on /metrics.
+"""
+
+import logging
+import math
+from abc import ABC, abstractmethod
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from fastapi.routing import APIRoute
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+METRICS_PREFIX = "seo_nexus_"
+
+# Default latency buckets (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Buckets for long-running passes and jobs (seconds)
+PASS_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Metric(ABC):
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = METRICS_PREFIX + name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """Child metric for one label combination (cached)."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """Value holder of one label combination."""
+
+    @abstractmethod
+    def samples(self) -> Iterable[Tuple[str, Tuple[str, ...], Tuple[str, ...], float]]:
+        """(suffix, label names, label values, value) per exposed sample."""
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        for suffix, names, values, value in self.samples():
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}"
+            )
+        return lines
+
+
+class _Value:
+    # Updated from pymongo / scheduler threads too, so += needs the lock
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name + "_total", documentation, labelnames)
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            yield "", self.labelnames, values, child.value
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1):
+        self.labels().dec(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            yield "", self.labelnames, values, child.value
+
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum", "_lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.upper_bounds)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def samples(self):
+        bucket_names = self.labelnames + ("le",)
+        for values, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.upper_bounds + (math.inf,), list(child.counts)):
+                cumulative += count
+                yield "_bucket", bucket_names, values + (_format_value(bound),), cumulative
+            yield "_sum", self.labelnames, values, child.sum
+            yield "_count", self.labelnames, values, cumulative
+
+
+class MetricsRegistry:
+    """Registered metrics plus collectors evaluated at scrape time."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Function run before each scrape to refresh derived gauges."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return registry.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return registry.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = LATENCY_BUCKETS,
+) -> Histogram:
+    return registry.register(Histogram(name, documentation, labelnames, buckets))
+
+
+# ==================== HTTP ====================
+
+HTTP_REQUEST_DURATION = histogram(
+    "http_request_duration_seconds", "Request latency per route", ("method", "route")
+)
+HTTP_REQUESTS = counter(
+    "http_requests", "Requests per route and status class", ("method", "route", "status")
+)
+HTTP_IN_FLIGHT = gauge(
+    "http_requests_in_flight", "Requests currently being handled per route", ("method", "route")
+)
+
+
+class MetricsRoute(APIRoute):
+    """APIRoute recording latency, status and in-flight requests."""
+
+    async def handle(self, scope, receive, send):
+        method = scope["method"]
+        in_flight = HTTP_IN_FLIGHT.labels(method, self.path)
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await super().handle(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            HTTP_REQUEST_DURATION.labels(method, self.path).observe(
+                time.perf_counter() - started
+            )
+            HTTP_REQUESTS.labels(method, self.path, f"{status['code'] // 100}xx").inc()
+
+
+# ==================== MONITORING ENGINES ====================
+
+AVAILABILITY_PASS_DURATION = histogram(
+    "availability_pass_duration_seconds", "Duration of availability monitoring passes",
+    buckets=PASS_BUCKETS,
+)
+AVAILABILITY_CHECKS = counter("availability_checks", "Domain availability checks", ("status",))
+AVAILABILITY_CHECKS_PER_SECOND = gauge(
+    "availability_checks_per_second", "Check throughput of the last availability pass"
+)
+AVAILABILITY_DUE_BACKLOG = gauge(
+    "availability_due_backlog", "Domains due for an availability check not yet checked"
+)
+EXPIRATION_PASS_DURATION = histogram(
+    "expiration_pass_duration_seconds", "Duration of expiration monitoring passes",
+    buckets=PASS_BUCKETS,
+)
+
+
+# ==================== IMPORTS ====================
+
+IMPORT_ROWS = counter("import_rows", "Imported CSV rows by outcome", ("kind", "outcome"))
+IMPORT_ROWS_PER_SECOND = gauge(
+    "import_rows_per_second", "Row throughput of the last import", ("kind",)
+)
+
+
+# ==================== SCHEDULERS ====================
+
+SCHEDULER_JOB_DURATION = histogram(
+    "scheduler_job_duration_seconds",
+    "Time from a job's scheduled start to its completion",
+    ("scheduler", "job"),
+    buckets=PASS_BUCKETS,
+)
+SCHEDULER_JOB_RUNS = counter(
+    "scheduler_job_runs", "Scheduler job runs by outcome", ("scheduler", "job", "outcome")
+)
+SCHEDULER_JOB_LAST_SUCCESS = gauge(
+    "scheduler_job_last_success_timestamp_seconds",
+    "Unix time of the last successful run",
+    ("scheduler", "job"),
+)
+
+
+def instrument_scheduler(scheduler, name: str):
+    """Record run time, outcome and missed runs of an APScheduler scheduler's jobs."""
+    from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MISSED
+
+    def on_event(event):
+        if event.code == EVENT_JOB_MISSED:
+            SCHEDULER_JOB_RUNS.labels(name, event.job_id, "missed").inc()
+            return
+
+        outcome = "error" if event.code == EVENT_JOB_ERROR else "success"
+        SCHEDULER_JOB_RUNS.labels(name, event.job_id, outcome).inc()
+        if event.scheduled_run_time is not None:
+            elapsed = time.time() - event.scheduled_run_time.timestamp()
+            SCHEDULER_JOB_DURATION.labels(name, event.job_id).observe(max(elapsed, 0))
+        if outcome == "success":
+            SCHEDULER_JOB_LAST_SUCCESS.labels(name, event.job_id).set(time.time())
+
+    scheduler.add_listener(on_event, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED)
+
+
+# ==================== NOTIFICATIONS ====================
+
+NOTIFICATION_SEND_DURATION = histogram(
+    "notification_send_duration_seconds", "Notification send latency per channel", ("channel",)
+)
+NOTIFICATION_SENDS = counter(
+    "notification_sends", "Notification send attempts per channel and outcome",
+    ("channel", "outcome"),
+)
+
+
+def observe_notification(channel: str, started: float, success: bool):
+    """Record one send attempt that began at time.perf_counter() == started."""
+    NOTIFICATION_SEND_DURATION.labels(channel).observe(time.perf_counter() - started)
+    NOTIFICATION_SENDS.labels(channel, "success" if success else "failure").inc()
+
+
+# ==================== LOG WRITER ====================
+
+LOG_WRITER_ENTRIES = counter(
+    "log_writer_entries", "Activity / audit log entries by outcome", ("collection", "outcome")
+)
+LOG_WRITER_QUEUE_DEPTH = gauge("log_writer_queue_depth", "Log entries waiting to be written")
+LOG_WRITER_FLUSH_DURATION = histogram(
+    "log_writer_flush_duration_seconds", "Duration of log writer flushes"
+)
+
+
+# ==================== CACHES ====================
+
+# Gauge: set at scrape time from the totals the caches keep themselves
+CACHE_REQUESTS = gauge("cache_requests", "Cache lookups by result since start", ("cache", "result"))
+CACHE_HIT_RATIO = gauge("cache_hit_ratio", "Share of lookups served without recomputing", ("cache",))
+
+
+def _collect_cache_stats():
+    from services.user_cache_service import _user_cache_service
+    from services.single_flight_service import get_single_flight
+
+    caches: Dict[str, Tuple[int, int]] = {}
+    if _user_cache_service is not None:
+        caches["user"] = (_user_cache_service.hits, _user_cache_service.misses)
+    for endpoint, stats in get_single_flight().get_stats()["endpoints"].items():
+        hits = stats["requests"] - stats["computations"] + stats["stale_hits"]
+        caches[f"single_flight:{endpoint}"] = (hits, stats["requests"] - hits)
+
+    for cache, (hits, misses) in caches.items():
+        # Totals are kept by the caches themselves
+        CACHE_REQUESTS.labels(cache, "hit").set(hits)
+        CACHE_REQUESTS.labels(cache, "miss").set(misses)
+        total = hits + misses
+        CACHE_HIT_RATIO.labels(cache).set(hits / total if total else 0)
+
+
+registry.add_collector(_collect_cache_stats)
+
+
+# ==================== MONGODB CONNECTION POOL ====================
+
+MONGO_POOL_CONNECTIONS = gauge(
+    "mongo_pool_connections", "Open connections per server", ("address",)
+)
+MONGO_POOL_CHECKED_OUT = gauge(
+    "mongo_pool_checked_out", "Connections in use per server", ("address",)
+)
+MONGO_POOL_MAX_SIZE = gauge("mongo_pool_max_size", "maxPoolSize of the Motor client")
+MONGO_POOL_CHECKOUT_FAILURES = counter(
+    "mongo_pool_checkout_failures", "Failed connection check-outs by reason", ("address", "reason")
+)
+MONGO_POOL_CLEARED = counter("mongo_pool_cleared", "Pool clears per server", ("address",))
+
+
+def _address(event) -> str:
+    host, port = event.address
+    return f"{host}:{port}"
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """pymongo pool listener feeding the connection pool gauges."""
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        MONGO_POOL_CLEARED.labels(_address(event)).inc()
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        MONGO_POOL_CONNECTIONS.labels(_address(event)).inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        MONGO_POOL_CONNECTIONS.labels(_address(event)).dec()
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        MONGO_POOL_CHECKOUT_FAILURES.labels(_address(event), str(event.reason)).inc()
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_CHECKED_OUT.labels(_address(event)).inc()
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_CHECKED_OUT.labels(_address(event)).dec()
+
+
+def metrics_listeners() -> List[object]:
+    """event_listeners for the Motor client."""
+    return [PoolMetricsListener()]
+
+
+def set_mongo_pool_max_size(max_pool_size: Optional[int]):
+    MONGO_POOL_MAX_SIZE.set(max_pool_size or 0)
+
+
+def render_metrics() -> str:
+    """All metrics in the text exposition format."""
+    return registry.render()
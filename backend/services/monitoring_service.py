@@ -11,6 +11,8 @@ These engines operate INDEPENDENTLY and send Telegram alerts separately.
 
 import asyncio
 import logging
+import os
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any, List
 import httpx
@@ -20,9 +22,48 @@ from services.timezone_helper import (
     format_now_local,
     get_system_timezone,
 )
+from services.event_bus import publish_event
+from services.metrics_service import (
+    AVAILABILITY_CHECKS,
+    AVAILABILITY_CHECKS_PER_SECOND,
+    AVAILABILITY_DUE_BACKLOG,
+    AVAILABILITY_PASS_DURATION,
+    EXPIRATION_PASS_DURATION,
+    observe_notification,
+)
 
 logger = logging.getLogger(__name__)
 
+# Max availability checks in flight during a pass. Defaults to one at a time;
+# higher values are for benchmarks (benchmarks/monitoring_throughput.py)
+AVAILABILITY_CHECK_CONCURRENCY = int(os.environ.get("AVAILABILITY_CHECK_CONCURRENCY", "1"))
+
+# "host:port" every availability check connects to over plain HTTP instead of
+# resolving the domain; the Host header still carries the domain. Used by the
+# fake-internet server of benchmarks/monitoring_throughput.py - empty in production.
+AVAILABILITY_RESOLVE_OVERRIDE = os.environ.get("AVAILABILITY_RESOLVE_OVERRIDE", "")
+
+
+class ResolveOverrideTransport(httpx.AsyncHTTPTransport):
+    """Sends every request to one host:port, keeping the original Host header."""
+
+    def __init__(self, target: str, **kwargs):
+        super().__init__(**kwargs)
+        host, _, port = target.rpartition(":")
+        self.host = host
+        self.port = int(port)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(scheme="http", host=self.host, port=self.port)
+        return await super().handle_async_request(request)
+
+
+def availability_transport() -> Optional[httpx.AsyncBaseTransport]:
+    """Transport for availability checks (None = regular DNS resolution)."""
+    if AVAILABILITY_RESOLVE_OVERRIDE:
+        return ResolveOverrideTransport(AVAILABILITY_RESOLVE_OVERRIDE)
+    return None
+
 
 # ==================== MONITORING SETTINGS MODEL ====================
 
@@ -114,6 +155,7 @@ class TelegramAlertService:
             logger.warning("Telegram not configured, skipping alert")
             return False
 
+        started = time.perf_counter()
         try:
             url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
             async with httpx.AsyncClient() as client:
@@ -122,6 +164,7 @@ class TelegramAlertService:
                     json={"chat_id": chat_id, "text": message, "parse_mode": "HTML"},
                     timeout=10,
                 )
+                observe_notification("telegram", started, response.status_code == 200)
                 if response.status_code == 200:
                     logger.info("Telegram alert sent successfully")
                     return True
@@ -129,6 +172,7 @@ class TelegramAlertService:
                     logger.error(f"Telegram API error: {response.text}")
                     return False
         except Exception as e:
+            observe_notification("telegram", started, False)
             logger.error(f"Failed to send Telegram alert: {e}")
             return False
 
@@ -180,6 +224,7 @@ class DomainMonitoringTelegramService:
             logger.warning("Domain Monitoring alert not sent - Telegram not configured")
             return False
 
+        started = time.perf_counter()
         try:
             url = f"https://api.telegram.org/bot{config['bot_token']}/sendMessage"
             async with httpx.AsyncClient() as client:
@@ -193,6 +238,9 @@ class DomainMonitoringTelegramService:
                     },
                     timeout=15,
                 )
+                observe_notification(
+                    "telegram_monitoring", started, response.status_code == 200
+                )
 
                 if response.status_code == 200:
                     logger.info("Domain Monitoring Telegram alert sent successfully")
@@ -203,6 +251,7 @@ class DomainMonitoringTelegramService:
                     )
                     return False
         except Exception as e:
+            observe_notification("telegram_monitoring", started, False)
             logger.error(f"Failed to send Domain Monitoring alert: {e}")
             return False
 
@@ -254,6 +303,7 @@ class ExpirationMonitoringService:
         if not include_auto_renew:
             query["$or"] = [{"auto_renew": False}, {"auto_renew": {"$exists": False}}]
 
+        pass_started = time.perf_counter()
         domains = await self.db.asset_domains.find(query, {"_id": 0}).to_list(10000)
 
         now = datetime.now(timezone.utc)
@@ -269,6 +319,7 @@ class ExpirationMonitoringService:
             elif result == "skipped":
                 skipped += 1
 
+        EXPIRATION_PASS_DURATION.observe(time.perf_counter() - pass_started)
         logger.info(
             f"Expiration check complete: {checked} checked, {alerts_sent} alerts sent, {skipped} skipped"
         )
@@ -686,6 +737,7 @@ class ExpirationMonitoringService:
         }
 
         await self.db.alerts.insert_one(alert)
+        publish_event("alerts", alert_id=alert["id"])
 
     async def send_test_expiration_alert(
         self,
@@ -758,6 +810,7 @@ class AvailabilityMonitoringService:
 
     - Runs at configurable intervals (e.g., every 5 min)
     - Only checks domains with monitoring_enabled=True
+    - Checks up to AVAILABILITY_CHECK_CONCURRENCY domains at a time
     - Detects: UP, DOWN (timeout, DNS, 5xx), SOFT_BLOCKED (Cloudflare, captcha, geo-block)
     - Alerts on UP → DOWN transition (CRITICAL)
     - Alerts on SOFT_BLOCKED (WARNING)
@@ -790,6 +843,7 @@ class AvailabilityMonitoringService:
         from services.seo_context_enricher import SeoContextEnricher
 
         self.seo_enricher = SeoContextEnricher(db)
+        self.check_concurrency = AVAILABILITY_CHECK_CONCURRENCY
 
     async def check_all_domains(self) -> Dict[str, Any]:
         """Check all monitored domains for availability"""
@@ -806,6 +860,8 @@ class AvailabilityMonitoringService:
                 "alerts_sent": 0,
             }
 
+        pass_started = time.perf_counter()
+
         # Get domains with monitoring enabled
         # PHASE 6: Exclude archived and blocked lifecycle domains
         domains = await self.db.asset_domains.find(
@@ -823,14 +879,23 @@ class AvailabilityMonitoringService:
         soft_blocked_count = 0
         alerts_sent = 0
 
-        for domain in domains:
-            # Check if it's time to monitor based on interval
-            if not self._should_check_now(domain, now):
-                continue
+        # Check only domains whose interval has elapsed
+        due = [domain for domain in domains if self._should_check_now(domain, now)]
+        AVAILABILITY_DUE_BACKLOG.set(len(due))
 
-            checked += 1
-            result = await self._check_domain_availability(domain, avail_settings)
+        semaphore = asyncio.Semaphore(max(1, self.check_concurrency))
 
+        async def check(domain):
+            async with semaphore:
+                result = await self._check_domain_availability(domain, avail_settings)
+            AVAILABILITY_DUE_BACKLOG.dec()
+            AVAILABILITY_CHECKS.labels(result["status"]).inc()
+            return result
+
+        results = await asyncio.gather(*(check(domain) for domain in due))
+
+        for result in results:
+            checked += 1
             if result["status"] == "up":
                 up_count += 1
             elif result["status"] == "down":
@@ -841,6 +906,9 @@ class AvailabilityMonitoringService:
             if result.get("alert_sent"):
                 alerts_sent += 1
 
+        elapsed = time.perf_counter() - pass_started
+        AVAILABILITY_PASS_DURATION.observe(elapsed)
+        AVAILABILITY_CHECKS_PER_SECOND.set(checked / elapsed if elapsed > 0 else 0)
         logger.info(
             f"Availability check complete: {checked} checked, {up_count} up, {down_count} down, {soft_blocked_count} soft_blocked, {alerts_sent} alerts"
         )
@@ -912,7 +980,9 @@ class AvailabilityMonitoringService:
 
         try:
             async with httpx.AsyncClient(
-                follow_redirects=follow_redirects, timeout=timeout
+                follow_redirects=follow_redirects,
+                timeout=timeout,
+                transport=availability_transport(),
             ) as client:
                 response = await client.get(url)
                 new_http_code = response.status_code
@@ -985,6 +1055,14 @@ class AvailabilityMonitoringService:
         await self.db.asset_domains.update_one(
             {"id": domain["id"]}, {"$set": update_data}
         )
+        if new_status != previous_status:
+            publish_event(
+                "monitoring",
+                domain_id=domain["id"],
+                brand_id=domain.get("brand_id"),
+                previous_status=previous_status,
+                status=new_status,
+            )
 
         alert_sent = False
 
@@ -1555,6 +1633,7 @@ class AvailabilityMonitoringService:
         }
 
         await self.db.alerts.insert_one(alert)
+        publish_event("alerts", alert_id=alert["id"])
 
 
 # ==================== UNIFIED MONITORING SCHEDULER ====================
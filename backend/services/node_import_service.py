@@ -0,0 +1,374 @@
+"""
+Node Import Service
+===================
+
+Bulk import of SEO structure entries (nodes) into a network, behind
+POST /api/v3/import/nodes and the background node import jobs
+(services/import_job_service.py).
+
+An import:
+1. Resolves every row's domain name to an asset domain, creating missing
+   domains with the network's brand when create_missing_domains is set
+2. Skips rows whose (domain, optimized_path) already exists in the network,
+   so replaying the same rows is harmless
+3. Creates the remaining entries and resolves target_domain + target_path
+   against the network's entries and the rows of the same import (falling
+   back to any entry of the target domain when no path matches)
+
+All lookups are hash maps built once per call, keyed by domain_key (see
+services/domain_key_service.py): the rows' domains come from one $in
+query on the keys, the network's entries from one query plus one $in
+for the names of their domains. Missing domains and the new entries are
+written with insert_many. The work grows linearly with the rows and the
+size of the network, independent of the size of the portfolio.
+
+Rows only see targets that already exist or are part of the same call.
+Callers that split an import into chunks order the rows with
+order_nodes_by_target first, so a target is always imported before (or
+together with) the nodes pointing at it.
+"""
+
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import BulkWriteError
+
+from models_v3 import ActionType, EntityType
+from services.conflict_scanner_service import get_conflict_scanner_service
+from services.domain_key_service import normalize_domain_key
+from services.event_bus import publish_event
+
+logger = logging.getLogger(__name__)
+
+
+def _node_key(domain_name: str, path: Optional[str]) -> Tuple[str, str]:
+    return (normalize_domain_key(domain_name), path or "")
+
+
+def order_nodes_by_target(nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Reorder rows so every node comes after the node it targets.
+
+    Rows are sorted (stably) by their depth in the target chain within the
+    import; targets outside the import and cycles count as depth 0.
+    """
+    by_key: Dict[Tuple[str, str], int] = {}
+    first_by_domain: Dict[str, int] = {}
+    for index, node in enumerate(nodes):
+        key = _node_key(node.get("domain_name") or "", node.get("optimized_path"))
+        by_key.setdefault(key, index)
+        first_by_domain.setdefault(key[0], index)
+
+    def target_index(node: Dict[str, Any]) -> Optional[int]:
+        target_domain = node.get("target_domain")
+        if not target_domain:
+            return None
+        key = _node_key(target_domain, node.get("target_path"))
+        if key in by_key:
+            return by_key[key]
+        if not node.get("target_path"):
+            return first_by_domain.get(key[0])
+        return None
+
+    depths: Dict[int, int] = {}
+    for start in range(len(nodes)):
+        chain: List[int] = []
+        on_chain = set()
+        current: Optional[int] = start
+        while current is not None and current not in depths and current not in on_chain:
+            chain.append(current)
+            on_chain.add(current)
+            current = target_index(nodes[current])
+        depth = depths.get(current, -1) if current is not None else -1
+        for index in reversed(chain):
+            depth += 1
+            depths[index] = depth
+
+    order = sorted(range(len(nodes)), key=lambda i: depths[i])
+    return [nodes[i] for i in order]
+
+
+def plan_entries(
+    network_id: str,
+    nodes: List[Dict[str, Any]],
+    domain_ids: Dict[str, str],
+    entry_lookup: Dict[Tuple[str, str], str],
+    now: Optional[str] = None,
+) -> Tuple[List[Tuple[str, Dict[str, Any]]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    Build the entries of an import without touching the database.
+
+    Args:
+        domain_ids: domain key -> asset domain id
+        entry_lookup: (domain key, path) -> entry id of the network's
+            existing entries; the new entries are added to it
+
+    Returns:
+        ([(domain_name, entry)], results) - results holds the skipped rows
+        and the rows whose domain does not exist
+    """
+    now = now or datetime.now(timezone.utc).isoformat()
+    results = {"imported": [], "skipped": [], "errors": [], "domains_created": []}
+
+    # First entry of each domain, in lookup order, for domain-only targets
+    first_by_domain: Dict[str, str] = {}
+    for (dname, _path), eid in entry_lookup.items():
+        first_by_domain.setdefault(dname, eid)
+
+    entries = []
+    for node in nodes:
+        domain_key = normalize_domain_key(node["domain_name"])
+        asset_id = domain_ids.get(domain_key)
+        if not asset_id:
+            results["errors"].append(
+                {
+                    "domain": node["domain_name"],
+                    "error": f"Domain not found: {node['domain_name']}",
+                }
+            )
+            continue
+
+        # Check if entry already exists
+        entry_key = (domain_key, node.get("optimized_path") or "")
+        if entry_key in entry_lookup:
+            results["skipped"].append(
+                {
+                    "domain": node["domain_name"],
+                    "path": node.get("optimized_path"),
+                    "reason": "Entry already exists",
+                }
+            )
+            continue
+
+        entry = {
+            "id": str(uuid.uuid4()),
+            "asset_domain_id": asset_id,
+            "network_id": network_id,
+            "optimized_path": node.get("optimized_path"),
+            "domain_role": node.get("domain_role") or "supporting",
+            "domain_status": node.get("domain_status") or "canonical",
+            "index_status": node.get("index_status") or "index",
+            "target_entry_id": None,  # Resolved once every entry is known
+            "ranking_url": node.get("ranking_url"),
+            "primary_keyword": node.get("primary_keyword"),
+            "notes": node.get("notes"),
+            "created_at": now,
+            "updated_at": now,
+        }
+        entries.append((node, entry))
+        entry_lookup[entry_key] = entry["id"]
+        first_by_domain.setdefault(domain_key, entry["id"])
+
+    # Resolve targets: exact (domain, path), else any entry of the domain
+    # when no target path was given
+    planned = []
+    for node, entry in entries:
+        target_domain = node.get("target_domain")
+        if target_domain:
+            target_key = _node_key(target_domain, node.get("target_path"))
+            entry["target_entry_id"] = entry_lookup.get(target_key)
+            if not entry["target_entry_id"] and not node.get("target_path"):
+                entry["target_entry_id"] = first_by_domain.get(target_key[0])
+        planned.append((node["domain_name"], entry))
+
+    return planned, results
+
+
+class NodeImportService:
+    """Creates structure entries for a network from CSV rows"""
+
+    def __init__(self, db: AsyncIOMotorDatabase, activity_log_service=None):
+        self.db = db
+        self.activity_log_service = activity_log_service
+
+    async def import_nodes(
+        self,
+        network: Dict[str, Any],
+        nodes: List[Dict[str, Any]],
+        actor: str,
+        create_missing_domains: bool = False,
+        log_activity: bool = True,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Import rows into a network.
+
+        Args:
+            network: The seo_networks document
+            nodes: BulkNodeImportItem dicts
+            actor: Email recorded on the activity log
+            create_missing_domains: Create asset domains that don't exist
+            log_activity: Write the bulk_node_import summary log
+
+        Returns:
+            {"imported", "skipped", "errors", "domains_created"} detail lists
+        """
+        network_id = network["id"]
+
+        domain_ids = await self.load_domain_ids([node["domain_name"] for node in nodes])
+        domains_created = []
+        if create_missing_domains:
+            domains_created = await self.create_missing_domains(network, nodes, domain_ids)
+
+        entry_lookup = await self.load_entry_lookup(network_id, domain_ids)
+        entries, results = plan_entries(network_id, nodes, domain_ids, entry_lookup)
+        results["domains_created"] = domains_created
+
+        await self.insert_entries(entries, results)
+
+        if results["imported"]:
+            await get_conflict_scanner_service(self.db).mark_network_changed(network_id)
+
+        if log_activity:
+            await self.log_summary(network_id, actor, summarize(results))
+
+        return results
+
+    # ---------- lookups ----------
+
+    async def load_domain_ids(self, names: List[str]) -> Dict[str, str]:
+        """Asset domain ids of the given names, keyed by domain_key."""
+        keys = {normalize_domain_key(name) for name in names} - {""}
+        domains = await self.db.asset_domains.find(
+            {"domain_key": {"$in": list(keys)}}, {"_id": 0, "id": 1, "domain_key": 1}
+        ).to_list(None)
+        return {d["domain_key"]: d["id"] for d in domains}
+
+    async def load_entry_lookup(
+        self, network_id: str, domain_ids: Dict[str, str]
+    ) -> Dict[Tuple[str, str], str]:
+        """(domain key, path) -> entry id for the network's existing entries."""
+        existing_entries = await self.db.seo_structure_entries.find(
+            {"network_id": network_id},
+            {"_id": 0, "id": 1, "asset_domain_id": 1, "optimized_path": 1},
+        ).to_list(None)
+
+        # Reverse index, plus the names of domains the import doesn't mention
+        names_by_id = {did: name for name, did in domain_ids.items()}
+        unknown = {e.get("asset_domain_id") for e in existing_entries} - set(names_by_id) - {None}
+        if unknown:
+            async for d in self.db.asset_domains.find(
+                {"id": {"$in": list(unknown)}}, {"_id": 0, "id": 1, "domain_name": 1}
+            ):
+                names_by_id[d["id"]] = normalize_domain_key(d["domain_name"])
+
+        entry_lookup = {}
+        for e in existing_entries:
+            key = names_by_id.get(e.get("asset_domain_id"))
+            if key:
+                entry_lookup[(key, e.get("optimized_path") or "")] = e["id"]
+        return entry_lookup
+
+    # ---------- writes ----------
+
+    async def create_missing_domains(
+        self,
+        network: Dict[str, Any],
+        nodes: List[Dict[str, Any]],
+        domain_ids: Dict[str, str],
+    ) -> List[str]:
+        """
+        Create absent domains with the network's brand; returns their names.
+
+        A domain created concurrently by another request fails on the unique
+        domain_key index and is looked up instead.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        new_domains = {}
+        for node in nodes:
+            domain_key = normalize_domain_key(node["domain_name"])
+            if not domain_key or domain_key in domain_ids or domain_key in new_domains:
+                continue
+            new_domains[domain_key] = {
+                "id": str(uuid.uuid4()),
+                "domain_name": node["domain_name"],
+                "domain_key": domain_key,
+                "brand_id": network.get("brand_id"),
+                "status": "active",
+                "monitoring_enabled": False,
+                "auto_renew": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+        if not new_domains:
+            return []
+
+        documents = list(new_domains.values())
+        failed = set()
+        try:
+            await self.db.asset_domains.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+        created = [domain for index, domain in enumerate(documents) if index not in failed]
+        if created:
+            publish_event("inventory", created=len(created))
+        for domain in created:
+            domain_ids[domain["domain_key"]] = domain["id"]
+        if failed:
+            domain_ids.update(
+                await self.load_domain_ids([documents[index]["domain_key"] for index in failed])
+            )
+        return [domain["domain_name"] for domain in created]
+
+    async def insert_entries(
+        self, entries: List[Tuple[str, Dict[str, Any]]], results: Dict[str, List[Dict[str, Any]]]
+    ):
+        """insert_many the planned entries; a failed insert only fails its own row."""
+        if not entries:
+            return
+        failed: Dict[int, str] = {}
+        try:
+            await self.db.seo_structure_entries.insert_many(
+                [entry for _, entry in entries], ordered=False
+            )
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed[error["index"]] = error.get("errmsg", "write failed")
+
+        for index, (domain_name, entry) in enumerate(entries):
+            if index in failed:
+                results["errors"].append({"domain": domain_name, "error": failed[index]})
+                continue
+            results["imported"].append(
+                {
+                    "domain": domain_name,
+                    "path": entry.get("optimized_path", ""),
+                    "entry_id": entry["id"],
+                }
+            )
+
+    async def log_summary(
+        self,
+        network_id: str,
+        actor: str,
+        summary: Dict[str, int],
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """Write the bulk_node_import activity log of a finished import."""
+        if not self.activity_log_service:
+            return
+        await self.activity_log_service.log(
+            actor=actor,
+            action_type=ActionType.CREATE,
+            entity_type=EntityType.SEO_STRUCTURE_ENTRY,
+            entity_id=network_id,
+            after_value={
+                "type": "bulk_node_import",
+                "imported": summary["imported"],
+                "skipped": summary["skipped"],
+                "errors": summary["errors"],
+            },
+            metadata=metadata,
+        )
+
+
+def summarize(results: Dict[str, List[Dict[str, Any]]]) -> Dict[str, int]:
+    """Counts of an import_nodes result, as returned in `summary`."""
+    return {
+        "imported": len(results["imported"]),
+        "skipped": len(results["skipped"]),
+        "errors": len(results["errors"]),
+        "domains_created": len(results["domains_created"]),
+    }
@@ -0,0 +1,169 @@
+"""
+Password Hashing Service
+========================
+
+Runs bcrypt hashing and verification off the event loop.
+
+bcrypt is deliberately slow (tens of milliseconds per call). Called from
+an async handler it blocks the only event loop, so a burst of logins
+stalls every other request and the monitoring loop. Password work runs on
+a dedicated, bounded thread pool instead (bcrypt releases the GIL):
+
+- PASSWORD_HASH_WORKERS threads do the hashing
+- At most PASSWORD_HASH_MAX_PENDING calls may be queued or running; beyond
+  that PasswordHashingBusy is raised so callers can shed load
+- Queue depth, wait time and bcrypt duration are tracked per operation
+  (get_password_hashing_stats)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+# Threads dedicated to bcrypt
+PASSWORD_HASH_WORKERS = int(
+    os.environ.get("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+
+# Max password operations queued or running before new ones are rejected
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", "64"))
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when too many password operations are already pending."""
+
+
+def _empty_operation_stats() -> Dict[str, Any]:
+    return {
+        "count": 0,
+        "errors": 0,
+        "duration_ms_total": 0.0,
+        "duration_ms_max": 0.0,
+        "wait_ms_total": 0.0,
+        "wait_ms_max": 0.0,
+    }
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+# Only touched from the event loop thread
+_stats: Dict[str, Any] = {
+    "pending": 0,
+    "peak_pending": 0,
+    "rejected": 0,
+    "operations": {
+        "hash": _empty_operation_stats(),
+        "verify": _empty_operation_stats(),
+    },
+}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Lazily create the password hashing pool."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash",
+        )
+    return _executor
+
+
+def shutdown_password_hashing_executor():
+    """Shut down the password hashing pool (called on application shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _timed(fn: Callable, *args):
+    """Run fn in a worker thread, returning (result, started, finished)."""
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, started, time.perf_counter()
+
+
+async def _run(operation: str, fn: Callable, *args):
+    if _stats["pending"] >= PASSWORD_HASH_MAX_PENDING:
+        _stats["rejected"] += 1
+        raise PasswordHashingBusy(
+            f"{_stats['pending']} password operations pending"
+        )
+
+    op_stats = _stats["operations"][operation]
+    _stats["pending"] += 1
+    _stats["peak_pending"] = max(_stats["peak_pending"], _stats["pending"])
+    submitted = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        result, started, finished = await loop.run_in_executor(
+            _get_executor(), _timed, fn, *args
+        )
+    except Exception:
+        op_stats["errors"] += 1
+        raise
+    finally:
+        _stats["pending"] -= 1
+
+    wait_ms = (started - submitted) * 1000
+    duration_ms = (finished - started) * 1000
+    op_stats["count"] += 1
+    op_stats["wait_ms_total"] += wait_ms
+    op_stats["wait_ms_max"] = max(op_stats["wait_ms_max"], wait_ms)
+    op_stats["duration_ms_total"] += duration_ms
+    op_stats["duration_ms_max"] = max(op_stats["duration_ms_max"], duration_ms)
+    return result
+
+
+def _hash(password: str) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(
+        plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+    )
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password with bcrypt on the password hashing pool."""
+    return await _run("hash", _hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Check a password against a bcrypt hash on the password hashing pool."""
+    return await _run("verify", _verify, plain_password, hashed_password)
+
+
+def get_password_hashing_stats() -> Dict[str, Any]:
+    """Current queue depth plus per-operation counts and timings."""
+    operations = {}
+    for operation, op_stats in _stats["operations"].items():
+        count = op_stats["count"]
+        operations[operation] = {
+            "count": count,
+            "errors": op_stats["errors"],
+            "avg_duration_ms": round(op_stats["duration_ms_total"] / count, 2) if count else 0,
+            "max_duration_ms": round(op_stats["duration_ms_max"], 2),
+            "avg_wait_ms": round(op_stats["wait_ms_total"] / count, 2) if count else 0,
+            "max_wait_ms": round(op_stats["wait_ms_max"], 2),
+        }
+
+    pending = _stats["pending"]
+    return {
+        "workers": PASSWORD_HASH_WORKERS,
+        "max_pending": PASSWORD_HASH_MAX_PENDING,
+        "pending": pending,
+        "queue_depth": max(pending - PASSWORD_HASH_WORKERS, 0),
+        "peak_pending": _stats["peak_pending"],
+        "rejected": _stats["rejected"],
+        "operations": operations,
+    }
@@ -0,0 +1,195 @@
+"""
+Presence Service
+================
+
+Coalesced user presence (online status) tracking.
+
+The frontend sends a heartbeat every 30 seconds per open tab. Heartbeats
+are recorded in an in-process map (one entry per user, latest wins) and
+flushed every PRESENCE_FLUSH_SECONDS with one bulk_write to user_presence
+plus one to users.last_online, instead of two writes per heartbeat.
+
+- user_presence documents carry expires_at; a TTL index removes users not
+  seen for PRESENCE_RETENTION_HOURS (users.last_online keeps the last value)
+- users.last_online is only rewritten once the stored value is older than
+  LAST_ONLINE_WRITE_SECONDS (skipped in memory for users this worker wrote
+  recently, and by the update filter for writes of other workers), so it
+  lags the presence document by at most that long
+- Reads merge the worker's unflushed heartbeats over the stored documents,
+  so a user is online as soon as their first heartbeat arrives
+- Heartbeats seen by other workers become visible after their next flush,
+  well inside ONLINE_THRESHOLD_SECONDS
+- A "presence" event is published when a user comes online on this worker
+"""
+
+import logging
+import os
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Any, List, Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from services.event_bus import publish_event
+
+logger = logging.getLogger(__name__)
+
+# Consider user online if heartbeat within last 60 seconds
+ONLINE_THRESHOLD_SECONDS = 60
+
+# How often buffered heartbeats are written to MongoDB
+PRESENCE_FLUSH_SECONDS = int(os.environ.get("PRESENCE_FLUSH_SECONDS", "10"))
+
+# Minimum age of users.last_online before a flush overwrites it
+LAST_ONLINE_WRITE_SECONDS = int(os.environ.get("LAST_ONLINE_WRITE_SECONDS", "60"))
+
+# Presence documents are removed by the TTL index after this long
+PRESENCE_RETENTION_HOURS = 24
+
+# Limits of the /presence/online lists
+ONLINE_USERS_LIMIT = 100
+RECENTLY_ACTIVE_LIMIT = 20
+
+
+class PresenceService:
+    """
+    Service that buffers heartbeats and serves the merged presence view.
+
+    - record_heartbeat: in-memory, no database write
+    - flush: bulk write buffered heartbeats (scheduled job + shutdown)
+    - get_online_users / get_user_presence: stored documents + buffer
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # Latest heartbeat per user seen by this worker (survives flushes)
+        self._last_heartbeat: Dict[str, datetime] = {}
+        # users.last_online last written by this worker, per user
+        self._last_online_written: Dict[str, datetime] = {}
+
+    def record_heartbeat(self, user: Dict[str, Any]) -> str:
+        """Record a heartbeat for a user. Returns its timestamp."""
+        now_dt = datetime.now(timezone.utc)
+        now = now_dt.isoformat()
+        self._pending[user["id"]] = {
+            "user_id": user["id"],
+            "last_seen": now,
+            "user_name": user.get("name") or user.get("email"),
+            "user_email": user.get("email"),
+            "user_role": user.get("role"),
+        }
+
+        previous = self._last_heartbeat.get(user["id"])
+        self._last_heartbeat[user["id"]] = now_dt
+        if previous is None or now_dt - previous > timedelta(seconds=ONLINE_THRESHOLD_SECONDS):
+            publish_event("presence", user_id=user["id"])
+        return now
+
+    async def flush(self) -> int:
+        """Write buffered heartbeats to MongoDB. Returns users written."""
+        if not self._pending:
+            return 0
+
+        # Swap the buffer before awaiting so new heartbeats go to a fresh one
+        pending, self._pending = self._pending, {}
+
+        presence_ops = []
+        user_ops = []
+        last_online_written = {}
+        for user_id, presence in pending.items():
+            last_seen = datetime.fromisoformat(presence["last_seen"])
+            presence_ops.append(UpdateOne(
+                {"user_id": user_id},
+                {"$set": {**presence, "expires_at": last_seen + timedelta(hours=PRESENCE_RETENTION_HOURS)}},
+                upsert=True,
+            ))
+
+            write_before = last_seen - timedelta(seconds=LAST_ONLINE_WRITE_SECONDS)
+            written = self._last_online_written.get(user_id)
+            if written is not None and written > write_before:
+                continue
+            user_ops.append(UpdateOne(
+                {
+                    "id": user_id,
+                    "$or": [
+                        {"last_online": {"$lt": write_before.isoformat()}},
+                        {"last_online": None},
+                    ],
+                },
+                {"$set": {"last_online": presence["last_seen"]}},
+            ))
+            last_online_written[user_id] = last_seen
+
+        try:
+            await self.db.user_presence.bulk_write(presence_ops, ordered=False)
+            if user_ops:
+                await self.db.users.bulk_write(user_ops, ordered=False)
+        except Exception as e:
+            logger.error(f"Presence flush failed, keeping {len(pending)} heartbeats: {e}")
+            # Re-buffer unless a newer heartbeat arrived meanwhile
+            for user_id, presence in pending.items():
+                self._pending.setdefault(user_id, presence)
+            return 0
+
+        self._last_online_written.update(last_online_written)
+        return len(pending)
+
+    def _merge_pending(self, docs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Stored presence docs by user id, overlaid with newer buffered ones."""
+        merged = {doc["user_id"]: doc for doc in docs}
+        for user_id, presence in self._pending.items():
+            stored = merged.get(user_id)
+            if stored is None or presence["last_seen"] > (stored.get("last_seen") or ""):
+                merged[user_id] = dict(presence)
+        return merged
+
+    async def get_online_users(self) -> Dict[str, Any]:
+        """Online users plus users active in the last day."""
+        now = datetime.now(timezone.utc)
+        threshold_str = (now - timedelta(seconds=ONLINE_THRESHOLD_SECONDS)).isoformat()
+        day_ago_str = (now - timedelta(hours=24)).isoformat()
+
+        online = await self.db.user_presence.find(
+            {"last_seen": {"$gte": threshold_str}},
+            {"_id": 0, "expires_at": 0}
+        ).to_list(ONLINE_USERS_LIMIT)
+
+        recent = await self.db.user_presence.find(
+            {"last_seen": {"$gte": day_ago_str, "$lt": threshold_str}},
+            {"_id": 0, "expires_at": 0}
+        ).sort("last_seen", -1).limit(RECENTLY_ACTIVE_LIMIT).to_list(RECENTLY_ACTIVE_LIMIT)
+
+        merged = self._merge_pending(online + recent)
+
+        online_presence = [p for p in merged.values() if p["last_seen"] >= threshold_str]
+        recent_users = sorted(
+            (p for p in merged.values() if day_ago_str <= p["last_seen"] < threshold_str),
+            key=lambda p: p["last_seen"],
+            reverse=True,
+        )
+
+        return {
+            "online": online_presence[:ONLINE_USERS_LIMIT],
+            "online_count": len(online_presence[:ONLINE_USERS_LIMIT]),
+            "recently_active": recent_users[:RECENTLY_ACTIVE_LIMIT],
+        }
+
+    async def get_user_presence(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Latest presence document of a user (buffered or stored)."""
+        stored = await self.db.user_presence.find_one(
+            {"user_id": user_id},
+            {"_id": 0, "expires_at": 0}
+        )
+        return self._merge_pending([stored] if stored else []).get(user_id)
+
+
+# Global instance
+_presence_service: Optional[PresenceService] = None
+
+
+def get_presence_service(db: AsyncIOMotorDatabase) -> PresenceService:
+    """Get or create the presence service"""
+    global _presence_service
+    if _presence_service is None:
+        _presence_service = PresenceService(db)
+    return _presence_service
@@ -0,0 +1,265 @@
+"""
+Query Monitor Service
+=====================
+
+Per-request MongoDB command instrumentation and N+1 detection.
+
+A pymongo command listener (registered on the Motor client) records every
+command issued while a request is being handled:
+
+- QueryMonitorMiddleware opens a per-request context (contextvar; Motor
+  copies the context into its executor threads, so listener callbacks see it)
+- Each request records command count, total database time and its slowest
+  commands
+- Commands are reduced to a "shape" (command, collection, filter keys and
+  operators without values). When one request issues the same shape
+  QUERY_N_PLUS_ONE_THRESHOLD times or more, a warning is logged - the
+  classic N+1 pattern (one query per item of a list)
+- Per-route aggregates are served at GET /api/system/query-stats
+
+Commands issued outside a request (scheduler jobs, startup) are ignored.
+Disable the listener with QUERY_MONITOR_ENABLED=false.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional, Tuple
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+QUERY_MONITOR_ENABLED = os.environ.get("QUERY_MONITOR_ENABLED", "true").lower() == "true"
+
+# Identical query shapes per request before an N+1 warning is logged
+QUERY_N_PLUS_ONE_THRESHOLD = int(os.environ.get("QUERY_N_PLUS_ONE_THRESHOLD", "10"))
+
+# Slowest commands kept per request and per route
+SLOWEST_COMMANDS_LIMIT = 5
+
+# Commands that continue an earlier one (not counted as repeated shapes)
+_CONTINUATION_COMMANDS = {"getMore", "killCursors", "endSessions"}
+
+# Where each command keeps its filter (or pipeline)
+_FILTER_FIELDS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+    "aggregate": "pipeline",
+}
+
+
+def _shape(value: Any) -> Any:
+    """Filter/pipeline structure with all values replaced by '?'."""
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, dict) for item in value):
+            return [_shape(item) for item in value]
+        return ["?"]
+    return "?"
+
+
+def command_shape(command_name: str, command: Dict[str, Any]) -> str:
+    """Short description of a command without its values, e.g. find users {"id": "?"}."""
+    collection = command.get(command_name)
+    if not isinstance(collection, str):
+        collection = "-"
+
+    if command_name in _FILTER_FIELDS:
+        query = command.get(_FILTER_FIELDS[command_name]) or {}
+    elif command_name in ("update", "delete"):
+        statements = command.get(command_name + "s") or [{}]
+        query = statements[0].get("q") or {}
+    else:
+        return f"{command_name} {collection}"
+
+    return f"{command_name} {collection} {json.dumps(_shape(query), sort_keys=True)}"
+
+
+class RequestQueryStats:
+    """Commands recorded while one request was being handled."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest: List[Tuple[float, str]] = []
+        self.shapes: Counter = Counter()
+        self.closed = False
+        self._started: Dict[Tuple[Any, int], str] = {}
+        # Listener callbacks run in Motor's executor threads
+        self._lock = threading.Lock()
+
+    def started(self, key: Tuple[Any, int], command_name: str, shape: str):
+        with self._lock:
+            self._started[key] = shape
+            if command_name not in _CONTINUATION_COMMANDS:
+                self.shapes[shape] += 1
+
+    def finished(self, key: Tuple[Any, int], duration_ms: float):
+        with self._lock:
+            shape = self._started.pop(key, None)
+            if shape is None:
+                return
+            self.count += 1
+            self.total_ms += duration_ms
+            self.slowest.append((duration_ms, shape))
+            if len(self.slowest) > SLOWEST_COMMANDS_LIMIT:
+                self.slowest.sort(reverse=True)
+                del self.slowest[SLOWEST_COMMANDS_LIMIT:]
+
+    def repeated_shapes(self) -> List[Tuple[str, int]]:
+        """Shapes issued at least QUERY_N_PLUS_ONE_THRESHOLD times."""
+        return [
+            (shape, count) for shape, count in self.shapes.most_common()
+            if count >= QUERY_N_PLUS_ONE_THRESHOLD
+        ]
+
+
+_current_request: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "query_monitor_request", default=None
+)
+
+
+class QueryCommandListener(monitoring.CommandListener):
+    """pymongo listener feeding the current request's RequestQueryStats."""
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        stats = _current_request.get()
+        if stats is None or stats.closed:
+            return
+        try:
+            shape = command_shape(event.command_name, event.command)
+        except Exception:
+            shape = event.command_name
+        stats.started((event.connection_id, event.request_id), event.command_name, shape)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        stats = _current_request.get()
+        if stats is not None:
+            stats.finished((event.connection_id, event.request_id), event.duration_micros / 1000)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        stats = _current_request.get()
+        if stats is not None:
+            stats.finished((event.connection_id, event.request_id), event.duration_micros / 1000)
+
+
+class QueryMonitor:
+    """Per-route aggregates of RequestQueryStats."""
+
+    def __init__(self):
+        self.listener = QueryCommandListener()
+        self._routes: Dict[str, Dict[str, Any]] = {}
+
+    def begin_request(self):
+        """Open a request context. Returns (stats, token) for end_request."""
+        stats = RequestQueryStats()
+        return stats, _current_request.set(stats)
+
+    def end_request(self, route: str, stats: RequestQueryStats, token):
+        _current_request.reset(token)
+        # Tasks spawned by the request may still hold the context
+        stats.closed = True
+
+        repeated = stats.repeated_shapes()
+        for shape, count in repeated:
+            logger.warning(
+                f"Possible N+1 query pattern in {route}: {count}x {shape} "
+                f"({stats.count} commands, {stats.total_ms:.1f} ms total)"
+            )
+
+        agg = self._routes.get(route)
+        if agg is None:
+            agg = self._routes[route] = {
+                "requests": 0,
+                "commands": 0,
+                "max_commands": 0,
+                "db_time_ms": 0.0,
+                "max_db_time_ms": 0.0,
+                "n_plus_one_requests": 0,
+                "repeated_shapes": {},
+                "slowest_commands": [],
+            }
+        agg["requests"] += 1
+        agg["commands"] += stats.count
+        agg["max_commands"] = max(agg["max_commands"], stats.count)
+        agg["db_time_ms"] += stats.total_ms
+        agg["max_db_time_ms"] = max(agg["max_db_time_ms"], stats.total_ms)
+        if repeated:
+            agg["n_plus_one_requests"] += 1
+            for shape, count in repeated:
+                agg["repeated_shapes"][shape] = max(agg["repeated_shapes"].get(shape, 0), count)
+        agg["slowest_commands"] = sorted(
+            agg["slowest_commands"] + stats.slowest, reverse=True
+        )[:SLOWEST_COMMANDS_LIMIT]
+
+    def get_stats(self, limit: int = 50) -> Dict[str, Any]:
+        """Routes ordered by total commands issued."""
+        routes = sorted(self._routes.items(), key=lambda item: item[1]["commands"], reverse=True)
+        return {
+            "enabled": QUERY_MONITOR_ENABLED,
+            "n_plus_one_threshold": QUERY_N_PLUS_ONE_THRESHOLD,
+            "routes": [
+                {
+                    "route": route,
+                    "requests": agg["requests"],
+                    "avg_commands": round(agg["commands"] / agg["requests"], 1),
+                    "max_commands": agg["max_commands"],
+                    "avg_db_time_ms": round(agg["db_time_ms"] / agg["requests"], 2),
+                    "max_db_time_ms": round(agg["max_db_time_ms"], 2),
+                    "n_plus_one_requests": agg["n_plus_one_requests"],
+                    "repeated_shapes": agg["repeated_shapes"],
+                    "slowest_commands": [
+                        {"duration_ms": round(ms, 2), "command": shape}
+                        for ms, shape in agg["slowest_commands"]
+                    ],
+                }
+                for route, agg in routes[:limit]
+            ],
+        }
+
+    def reset(self):
+        self._routes.clear()
+
+
+class QueryMonitorMiddleware:
+    """ASGI middleware opening a query monitor context per HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        monitor = get_query_monitor()
+        stats, token = monitor.begin_request()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # The router stores the matched route in the scope
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            monitor.end_request(f"{scope['method']} {route}", stats, token)
+
+
+def query_monitor_listeners() -> List[monitoring.CommandListener]:
+    """event_listeners for the Motor client (empty when disabled)."""
+    return [get_query_monitor().listener] if QUERY_MONITOR_ENABLED else []
+
+
+# Global instance
+_query_monitor: Optional[QueryMonitor] = None
+
+
+def get_query_monitor() -> QueryMonitor:
+    """Get or create the query monitor"""
+    global _query_monitor
+    if _query_monitor is None:
+        _query_monitor = QueryMonitor()
+    return _query_monitor
@@ -6,10 +6,13 @@ Generates and sends periodic summaries of SEO optimization activities.
 
 import asyncio
 import logging
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any, List
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from services.metrics_service import observe_notification
+
 logger = logging.getLogger(__name__)
 
 
@@ -237,15 +240,21 @@ class SeoDigestService:
                 "parse_mode": "Markdown",
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    if response.status == 200:
-                        logger.info("Weekly digest sent successfully")
-                        return True
-                    else:
-                        error = await response.text()
-                        logger.error(f"Failed to send digest: {error}")
-                        return False
+            started = time.perf_counter()
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.post(url, json=payload) as response:
+                        observe_notification("telegram_digest", started, response.status == 200)
+                        if response.status == 200:
+                            logger.info("Weekly digest sent successfully")
+                            return True
+                        else:
+                            error = await response.text()
+                            logger.error(f"Failed to send digest: {error}")
+                            return False
+            except aiohttp.ClientError:
+                observe_notification("telegram_digest", started, False)
+                raise
 
         except Exception as e:
             logger.error(f"Error sending digest: {e}")
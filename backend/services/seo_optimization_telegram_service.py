@@ -14,7 +14,9 @@ import logging
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
 import httpx
+import time
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from services.metrics_service import observe_notification
 from services.timezone_helper import format_to_local_time, get_system_timezone
 
 logger = logging.getLogger(__name__)
@@ -234,6 +236,7 @@ class SeoOptimizationTelegramService:
                     f"Topic routing enabled but {topic_id_field} not configured, sending to General"
                 )
 
+        started = time.perf_counter()
         try:
             url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
             payload = {
@@ -249,6 +252,7 @@ class SeoOptimizationTelegramService:
 
             async with httpx.AsyncClient() as client:
                 response = await client.post(url, json=payload, timeout=30.0)
+                observe_notification("telegram_optimization", started, response.status_code == 200)
 
                 if response.status_code == 200:
                     topic_info = f" (topic: {topic_type})" if message_thread_id else ""
@@ -265,7 +269,11 @@ class SeoOptimizationTelegramService:
                         )
                         # Retry without message_thread_id
                         del payload["message_thread_id"]
+                        started = time.perf_counter()
                         retry_response = await client.post(url, json=payload, timeout=30.0)
+                        observe_notification(
+                            "telegram_optimization", started, retry_response.status_code == 200
+                        )
                         if retry_response.status_code == 200:
                             logger.info("SEO Telegram notification sent (fallback to main chat after invalid topic_id)")
                             return True
@@ -278,6 +286,7 @@ class SeoOptimizationTelegramService:
                     )
                     return False
         except Exception as e:
+            observe_notification("telegram_optimization", started, False)
             logger.error(f"Failed to send Telegram notification: {e}")
             return False
 
@@ -14,10 +14,12 @@ Features:
 
 import logging
 import httpx
+import time
 import asyncio
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any, List
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from services.metrics_service import observe_notification
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
@@ -230,6 +232,7 @@ class SeoTelegramService:
                     f"Topic routing enabled but {topic_id_field} not configured, sending to General"
                 )
 
+        started = time.perf_counter()
         try:
             url = f"https://api.telegram.org/bot{settings['bot_token']}/sendMessage"
 
@@ -245,6 +248,7 @@ class SeoTelegramService:
 
             async with httpx.AsyncClient() as client:
                 response = await client.post(url, json=payload, timeout=15)
+                observe_notification("telegram_seo", started, response.status_code == 200)
 
                 if response.status_code == 200:
                     topic_info = f" (topic: {topic_type})" if message_thread_id else ""
@@ -259,7 +263,11 @@ class SeoTelegramService:
                         )
                         # Retry without message_thread_id
                         del payload["message_thread_id"]
+                        started = time.perf_counter()
                         retry_response = await client.post(url, json=payload, timeout=15)
+                        observe_notification(
+                            "telegram_seo", started, retry_response.status_code == 200
+                        )
                         if retry_response.status_code == 200:
                             logger.info("SEO Telegram notification sent (fallback to main chat after invalid topic_id)")
                             return True
@@ -272,6 +280,7 @@ class SeoTelegramService:
                     )
                     return False
         except Exception as e:
+            observe_notification("telegram_seo", started, False)
             logger.error(f"Failed to send Telegram message: {e}")
             return False
 
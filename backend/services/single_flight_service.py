@@ -0,0 +1,187 @@
+"""
+Single-Flight Service
+=====================
+
+Request coalescing for expensive read endpoints (reports, metrics,
+dashboard counters).
+
+Several managers often open the same report at once (e.g. right after a
+Telegram alert). Instead of each request running the same aggregations,
+identical requests share one in-flight computation.
+
+- Requests are keyed by endpoint, parameters and brand scope
+- ttl_seconds: a finished result is served to later requests for this long
+  (0 = only requests arriving while it is computed share it)
+- stale_seconds: optional stale-while-revalidate window after the TTL; the
+  old result is returned immediately and one background refresh runs
+- fresh=True always starts a new computation (e.g. right after a change)
+- Results are shared between callers and must be treated as read-only
+- Counters per endpoint (computations, coalesced, cache/stale hits, errors)
+  are exposed via GET /api/system/single-flight
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Awaitable, Callable, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stored results kept before expired ones are pruned
+SINGLE_FLIGHT_MAX_ENTRIES = 1000
+
+_COUNTERS = ("requests", "computations", "coalesced", "cache_hits", "stale_hits", "errors")
+
+
+def scope_key(brand_scope: Optional[List[str]]) -> Optional[Tuple[str, ...]]:
+    """Hashable brand scope (None = all brands)."""
+    return None if brand_scope is None else tuple(sorted(brand_scope))
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent requests into one computation.
+
+    run() returns a cached result, joins a computation already running for
+    the key, or starts one.
+    """
+
+    def __init__(self):
+        # key -> (fresh_until, stale_until, value)
+        self._values: Dict[Hashable, Tuple[float, float, Any]] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        brand_scope: Optional[List[str]] = None,
+    ) -> Tuple:
+        return (
+            endpoint,
+            tuple(sorted((params or {}).items())),
+            scope_key(brand_scope),
+        )
+
+    def _count(self, endpoint: str, counter: str):
+        stats = self._stats.setdefault(endpoint, dict.fromkeys(_COUNTERS, 0))
+        stats[counter] += 1
+
+    async def run(
+        self,
+        endpoint: str,
+        compute: Callable[[], Awaitable[Any]],
+        params: Optional[Dict[str, Any]] = None,
+        brand_scope: Optional[List[str]] = None,
+        ttl_seconds: float = 0,
+        stale_seconds: float = 0,
+        fresh: bool = False,
+    ) -> Any:
+        """Result of compute() for this endpoint/params/scope, shared."""
+        key = self.make_key(endpoint, params, brand_scope)
+        self._count(endpoint, "requests")
+
+        if not fresh:
+            now = time.monotonic()
+            entry = self._values.get(key)
+            if entry is not None and entry[0] > now:
+                self._count(endpoint, "cache_hits")
+                return entry[2]
+
+            task = self._inflight.get(key)
+            if task is not None:
+                self._count(endpoint, "coalesced")
+                return await asyncio.shield(task)
+
+            if entry is not None and entry[1] > now:
+                # Serve the old result and refresh it in the background
+                self._count(endpoint, "stale_hits")
+                self._start(key, endpoint, compute, ttl_seconds, stale_seconds)
+                return entry[2]
+
+        task = self._start(key, endpoint, compute, ttl_seconds, stale_seconds)
+        # Shielded so one cancelled request doesn't cancel it for the others
+        return await asyncio.shield(task)
+
+    def _start(
+        self,
+        key: Hashable,
+        endpoint: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl_seconds: float,
+        stale_seconds: float,
+    ) -> asyncio.Future:
+        self._count(endpoint, "computations")
+        task = asyncio.ensure_future(compute())
+        self._inflight[key] = task
+        task.add_done_callback(
+            lambda t: self._finish(key, endpoint, t, ttl_seconds, stale_seconds)
+        )
+        return task
+
+    def _finish(
+        self,
+        key: Hashable,
+        endpoint: str,
+        task: asyncio.Future,
+        ttl_seconds: float,
+        stale_seconds: float,
+    ):
+        if task.cancelled():
+            error = "cancelled"
+        else:
+            error = task.exception()
+        if error is not None:
+            self._count(endpoint, "errors")
+            logger.warning(f"Single-flight computation for {endpoint} failed: {error!r}")
+
+        if self._inflight.get(key) is not task:
+            return  # A newer computation for this key will store its result
+        del self._inflight[key]
+        if error is not None or ttl_seconds + stale_seconds <= 0:
+            return
+
+        now = time.monotonic()
+        if len(self._values) >= SINGLE_FLIGHT_MAX_ENTRIES:
+            self._values = {k: v for k, v in self._values.items() if v[1] > now}
+        self._values[key] = (
+            now + ttl_seconds,
+            now + ttl_seconds + stale_seconds,
+            task.result(),
+        )
+
+    def invalidate(self, endpoint: Optional[str] = None):
+        """Drop stored results (of one endpoint, or all)."""
+        if endpoint is None:
+            self._values.clear()
+        else:
+            self._values = {k: v for k, v in self._values.items() if k[0] != endpoint}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters per endpoint plus current in-flight/stored sizes."""
+        return {
+            "endpoints": {
+                endpoint: {
+                    **stats,
+                    "coalesce_rate_percent": round(
+                        (stats["requests"] - stats["computations"]) / stats["requests"] * 100, 1
+                    ) if stats["requests"] else 0,
+                }
+                for endpoint, stats in sorted(self._stats.items())
+            },
+            "in_flight": len(self._inflight),
+            "stored_results": len(self._values),
+        }
+
+
+# Global instance
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Get or create the single-flight coalescer"""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
@@ -0,0 +1,612 @@
+"""
+Synthetic Dataset Service
+=========================
+
+Production-scale synthetic portfolio for local performance work
+(`manage.py generate-dataset`, benchmark harnesses).
+
+- Deterministic: every id, name, status and timestamp comes from one
+  random.Random(seed); timestamps are offsets from an anchor date (default
+  today, 00:00 UTC), so the same seed and anchor produce the same documents
+- Realistic distributions: skewed brand sizes, lifecycle / monitoring /
+  expiration mixes, log-normal network sizes with deep tier graphs and
+  path-level nodes, complaint and conflict rates
+- Documents use the same shape as the API writes them (asset_domains,
+  seo_networks, seo_structure_entries, seo_optimizations,
+  optimization_complaints, seo_conflicts, activity_logs_v3, seo_change_logs)
+- Bulk inserted with unordered insert_many batches (sync pymongo)
+
+Synthetic users share one password (SYNTHETIC_PASSWORD) and use the
+SYNTHETIC_EMAIL_DOMAIN email domain, so they can log in.
+"""
+
+import logging
+import math
+import random
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Callable, Iterable, List, Optional
+
+import bcrypt
+
+from services.domain_key_service import with_domain_key
+
+logger = logging.getLogger(__name__)
+
+SYNTHETIC_PASSWORD = "Synthetic@123!"
+SYNTHETIC_EMAIL_DOMAIN = "synthetic.example.com"
+
+# Default volumes (override any of them with generate_dataset(volumes=...))
+DEFAULT_VOLUMES = {
+    "brands": 12,
+    "users": 60,
+    "domains": 50000,
+    "networks": 400,
+    "max_tiers": 6,
+    "optimizations": 25000,
+    "conflicts": 6000,
+    "activity_logs": 120000,
+    "change_logs": 40000,
+}
+
+# Collections written by the generator (cleared by clear_dataset)
+DATASET_COLLECTIONS = [
+    "brands",
+    "registrars",
+    "asset_domains",
+    "seo_networks",
+    "seo_structure_entries",
+    "seo_optimizations",
+    "optimization_complaints",
+    "seo_conflicts",
+    "activity_logs_v3",
+    "seo_change_logs",
+]
+
+_WORDS = [
+    "alpha", "best", "bola", "casino", "daily", "dewa", "elite", "fast", "gacor",
+    "gold", "hoki", "info", "jaya", "king", "link", "lucky", "maxi", "mega",
+    "naga", "news", "ocean", "panen", "prime", "pro", "royal", "sakti", "slot",
+    "star", "super", "togel", "top", "ultra", "vip", "win", "zeus",
+]
+_TLDS = ["com", "net", "org", "info", "xyz", "site", "online", "co", "io", "id"]
+_PATH_SEGMENTS = ["blog", "news", "promo", "guide", "review", "bonus", "daftar", "login", "tips"]
+_REGISTRARS = ["Namecheap", "GoDaddy", "Porkbun", "Dynadot", "Cloudflare", "Gandi", "NameSilo", "Hostinger"]
+
+# (value, weight) distributions
+_LIFECYCLE = [("active", 85), ("released", 6), ("quarantined", 4), ("not_renewed", 5)]
+_MONITORING = [
+    ("up", 88), ("down", 5), ("soft_blocked", 3), ("js_challenge", 1),
+    ("country_block", 1), ("captcha", 1), ("unknown", 1),
+]
+_QUARANTINE = [("spam", 40), ("dmca", 20), ("manual_penalty", 15), ("penalized", 15), ("other", 10)]
+_SUPPORTING_STATUS = [("canonical", 70), ("301_redirect", 20), ("302_redirect", 5), ("restore", 5)]
+_NETWORK_STATUS = [("active", 90), ("inactive", 7), ("archived", 3)]
+_OPTIMIZATION_STATUS = [("completed", 60), ("in_progress", 20), ("planned", 15), ("reverted", 5)]
+_ACTIVITY_TYPES = [
+    ("backlink", 35), ("onpage", 20), ("content", 20), ("technical", 10),
+    ("schema", 5), ("internal-link", 5), ("experiment", 3), ("other", 2),
+]
+_COMPLAINT_STATUS = [("none", 90), ("complained", 4), ("under_review", 3), ("resolved", 3)]
+_CONFLICT_TYPES = [
+    ("keyword_cannibalization", 30), ("competing_targets", 15), ("canonical_mismatch", 15),
+    ("tier_inversion", 10), ("redirect_loop", 5), ("orphan", 10),
+    ("noindex_high_tier", 10), ("index_noindex_mismatch", 5),
+]
+_CONFLICT_SEVERITY = [("low", 30), ("medium", 35), ("high", 25), ("critical", 10)]
+_CONFLICT_STATUS = [("detected", 50), ("under_review", 20), ("resolved", 25), ("ignored", 5)]
+_USER_ROLES = [("admin", 10), ("manager", 50), ("viewer", 40)]
+_CHANGE_ACTIONS = [
+    ("create_node", 35), ("update_node", 30), ("relink_node", 15),
+    ("delete_node", 8), ("change_path", 8), ("change_role", 4),
+]
+_LOG_ENTITIES = [
+    ("asset_domain", 40), ("seo_structure_entry", 30), ("seo_optimization", 15),
+    ("seo_network", 10), ("brand", 3), ("user", 2),
+]
+_LOG_ACTIONS = [("update", 55), ("create", 35), ("delete", 10)]
+
+
+class SyntheticDataset:
+    """Deterministic generator for one seed, anchor date and set of volumes."""
+
+    def __init__(
+        self,
+        seed: int = 42,
+        volumes: Optional[Dict[str, int]] = None,
+        anchor: Optional[datetime] = None,
+    ):
+        self.rng = random.Random(seed)
+        self.volumes = {**DEFAULT_VOLUMES, **(volumes or {})}
+        if anchor is None:
+            anchor = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.anchor = anchor
+
+        self.brands: List[Dict[str, Any]] = []
+        self.users: List[Dict[str, Any]] = []
+        self.registrars: List[Dict[str, Any]] = []
+        self.domains_by_brand: Dict[str, List[Dict[str, Any]]] = {}
+        self.networks: List[Dict[str, Any]] = []
+        self.entries_by_network: Dict[str, List[Dict[str, Any]]] = {}
+
+    # ==================== HELPERS ====================
+
+    def _id(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _pick(self, distribution):
+        values, weights = zip(*distribution)
+        return self.rng.choices(values, weights)[0]
+
+    def _days_ago(self, max_days: float, min_days: float = 0) -> str:
+        seconds = self.rng.uniform(min_days * 86400, max_days * 86400)
+        return (self.anchor - timedelta(seconds=seconds)).isoformat()
+
+    def _after(self, iso: str, max_days: float) -> str:
+        start = datetime.fromisoformat(iso)
+        moment = start + timedelta(seconds=self.rng.uniform(0, max_days * 86400))
+        return min(moment, self.anchor).isoformat()
+
+    def _actor(self) -> Dict[str, Any]:
+        return self.rng.choice(self.users)
+
+    # ==================== MASTER DATA ====================
+
+    def generate_masters(self, categories: List[Dict[str, Any]]):
+        """Brands (Zipf-weighted sizes), users and registrars."""
+        now = self.anchor.isoformat()
+        for i in range(self.volumes["brands"]):
+            name = f"{self.rng.choice(_WORDS).upper()}{self.rng.randint(10, 999)}"
+            self.brands.append({
+                "id": self._id(),
+                "name": name,
+                "slug": f"{name.lower()}-{i}",
+                "description": "Synthetic brand",
+                "status": "active",
+                "weight": 1 / (i + 1),
+                "created_at": self._days_ago(1100, 900),
+                "updated_at": now,
+            })
+
+        for name in _REGISTRARS:
+            self.registrars.append({
+                "id": self._id(),
+                "name": f"{name} (synthetic)",
+                "website": f"https://{name.lower()}.example",
+                "status": "active",
+                "notes": "",
+                "created_at": now,
+                "updated_at": now,
+            })
+
+        password = bcrypt.hashpw(SYNTHETIC_PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+        for i in range(self.volumes["users"]):
+            role = self._pick(_USER_ROLES)
+            scope_size = self.rng.randint(1, max(1, len(self.brands) // 3))
+            self.users.append({
+                "id": self._id(),
+                "email": f"user{i:04d}@{SYNTHETIC_EMAIL_DOMAIN}",
+                "name": f"Synthetic User {i:04d}",
+                "password": password,
+                "role": role,
+                "status": "active",
+                "brand_scope_ids": [b["id"] for b in self.rng.sample(self.brands, scope_size)],
+                "telegram_username": None,
+                "created_at": self._days_ago(900, 300),
+                "updated_at": now,
+                "approved_by": "system:synthetic_dataset",
+                "approved_at": now,
+                "menu_permissions": None,
+            })
+
+        self.category_ids = [c["id"] for c in categories] or [None]
+
+    # ==================== ASSET DOMAINS ====================
+
+    def generate_domains(self) -> Iterable[Dict[str, Any]]:
+        weights = [b["weight"] for b in self.brands]
+        for i in range(self.volumes["domains"]):
+            brand = self.rng.choices(self.brands, weights)[0]
+            lifecycle = self._pick(_LIFECYCLE)
+            monitored = lifecycle == "active" and self.rng.random() < 0.7
+
+            # 3% expired, 5% expiring within 30 days, rest renewed up to 3 years out
+            roll = self.rng.random()
+            if lifecycle == "not_renewed" or roll < 0.03:
+                expiration = self.anchor - timedelta(days=self.rng.uniform(1, 180))
+            elif roll < 0.08:
+                expiration = self.anchor + timedelta(days=self.rng.uniform(0, 30))
+            else:
+                expiration = self.anchor + timedelta(days=self.rng.uniform(31, 1095))
+            created_at = self._days_ago(1095, 30)
+            last_checked = self._days_ago(1) if monitored else None
+            monitoring_status = self._pick(_MONITORING) if monitored else "unknown"
+
+            domain = {
+                "id": self._id(),
+                "legacy_id": None,
+                "domain_name": (
+                    f"{self.rng.choice(_WORDS)}{self.rng.choice(_WORDS)}{i}."
+                    f"{self.rng.choice(_TLDS)}"
+                ),
+                "brand_id": brand["id"],
+                "category_id": self.rng.choice(self.category_ids),
+                "domain_type_id": None,
+                "registrar_id": self.rng.choice(self.registrars)["id"],
+                "registrar": None,
+                "buy_date": created_at[:10],
+                "expiration_date": expiration.isoformat(),
+                "auto_renew": self.rng.random() < 0.4,
+                "monitoring_status": monitoring_status,
+                "lifecycle_status": lifecycle,
+                "quarantine_category": self._pick(_QUARANTINE) if lifecycle == "quarantined" else None,
+                "quarantine_note": None,
+                "quarantined_at": self._after(created_at, 300) if lifecycle == "quarantined" else None,
+                "quarantined_by": None,
+                "released_at": self._after(created_at, 300) if lifecycle == "released" else None,
+                "released_by": None,
+                "monitoring_enabled": monitored,
+                "monitoring_interval": self.rng.choice(["5min", "15min", "1hour", "1hour", "daily"]),
+                "last_checked_at": last_checked,
+                "last_http_code": (200 if monitoring_status == "up" else 503) if monitored else None,
+                "status": "active",
+                "last_check": last_checked,
+                "ping_status": "unknown",
+                "last_ping_status": None,
+                "http_status": None,
+                "http_status_code": None,
+                "expiration_alert_sent_at": None,
+                "last_expiration_days": None,
+                "notes": "",
+                "created_at": created_at,
+                "updated_at": self._after(created_at, 365),
+            }
+            with_domain_key(domain)
+            self.domains_by_brand.setdefault(brand["id"], []).append(domain)
+            yield domain
+
+    # ==================== NETWORKS AND NODES ====================
+
+    def generate_networks(self) -> Iterable[Dict[str, Any]]:
+        """Networks with their structure entries (see entries_by_network)."""
+        weights = [b["weight"] for b in self.brands]
+        # Each active domain is used at its root once (domain+path is globally unique)
+        free_roots = {
+            brand_id: [d for d in domains if d["lifecycle_status"] == "active"]
+            for brand_id, domains in self.domains_by_brand.items()
+        }
+        for pool in free_roots.values():
+            self.rng.shuffle(pool)
+        used_paths: Dict[str, set] = {}
+
+        average = max(3, 0.8 * self.volumes["domains"] / max(1, self.volumes["networks"]))
+        mu = math.log(average) - 0.5
+
+        for i in range(self.volumes["networks"]):
+            brand = self.rng.choices(self.brands, weights)[0]
+            pool = free_roots.get(brand["id"]) or []
+            if not pool:
+                continue
+            created_at = self._days_ago(900, 10)
+            managers = self.rng.sample(self.users, min(len(self.users), self.rng.randint(1, 3)))
+            network = {
+                "id": self._id(),
+                "legacy_id": None,
+                "name": f"{brand['name']} Network {i:04d}",
+                "brand_id": brand["id"],
+                "description": "Synthetic network",
+                "status": self._pick(_NETWORK_STATUS),
+                "visibility_mode": "restricted" if self.rng.random() < 0.2 else "brand_based",
+                "manager_ids": [u["id"] for u in managers],
+                "structure_version": 1,
+                "conflicts_scanned_version": 0,
+                "created_at": created_at,
+                "updated_at": self._after(created_at, 300),
+            }
+
+            # Log-normal size, capped by the brand's unused domains
+            size = max(2, min(int(self.rng.lognormvariate(mu, 1.0)), 3000))
+            self.entries_by_network[network["id"]] = self._build_graph(
+                network, size, pool, used_paths
+            )
+            self.networks.append(network)
+            yield network
+
+    def _build_graph(self, network, size, pool, used_paths) -> List[Dict[str, Any]]:
+        """Main node plus tiers growing geometrically; ~15% path nodes, ~1% orphans."""
+        max_tiers = self.volumes["max_tiers"]
+        entries: List[Dict[str, Any]] = []
+        tiers: List[List[Dict[str, Any]]] = []
+        network_domains: List[Dict[str, Any]] = []
+
+        def node(domain, role, target, path=None):
+            created_at = self._after(network["created_at"], 200)
+            keyword = f"{self.rng.choice(_WORDS)} {self.rng.choice(_WORDS)}"
+            ranked = self.rng.random() < 0.25
+            entry = {
+                "id": self._id(),
+                "legacy_domain_id": None,
+                "asset_domain_id": domain["id"],
+                "network_id": network["id"],
+                "optimized_path": path,
+                "domain_role": role,
+                "domain_status": "primary" if role == "main" else self._pick(_SUPPORTING_STATUS),
+                "index_status": "noindex" if role != "main" and self.rng.random() < 0.1 else "index",
+                "target_entry_id": target["id"] if target else None,
+                "target_asset_domain_id": target["asset_domain_id"] if target else None,
+                "ranking_url": None,
+                "primary_keyword": keyword if self.rng.random() < 0.6 else None,
+                "ranking_position": self.rng.randint(1, 100) if ranked else None,
+                "last_rank_check": self._days_ago(30) if ranked else None,
+                "notes": "",
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+            entries.append(entry)
+            return entry
+
+        def path_for(domain):
+            taken = used_paths.setdefault(domain["id"], set())
+            while True:
+                path = f"/{self.rng.choice(_PATH_SEGMENTS)}/{self.rng.choice(_WORDS)}-{self.rng.randint(1, 9999)}"
+                if path not in taken:
+                    taken.add(path)
+                    return path
+
+        main_domain = pool.pop()
+        network_domains.append(main_domain)
+        tiers.append([node(main_domain, "main", None)])
+
+        # Tier sizes grow by a random factor (2-4x) until the network is full
+        remaining = size - 1
+        for tier in range(1, max_tiers + 1):
+            if remaining <= 0:
+                break
+            width = len(tiers[-1]) * self.rng.uniform(2, 4)
+            count = remaining if tier == max_tiers else min(remaining, max(1, int(width)))
+            level = []
+            for _ in range(count):
+                target = self.rng.choice(tiers[-1])
+                if network_domains and (self.rng.random() < 0.15 or not pool):
+                    # Path-level node on a domain already in this network
+                    domain = self.rng.choice(network_domains)
+                    level.append(node(domain, "supporting", target, path_for(domain)))
+                else:
+                    domain = pool.pop()
+                    network_domains.append(domain)
+                    level.append(node(domain, "supporting", target))
+                if self.rng.random() < 0.01:
+                    level[-1]["target_entry_id"] = None
+                    level[-1]["target_asset_domain_id"] = None
+            remaining -= count
+            tiers.append(level)
+        return entries
+
+    def generate_entries(self) -> Iterable[Dict[str, Any]]:
+        for network in self.networks:
+            yield from self.entries_by_network[network["id"]]
+
+    # ==================== OPTIMIZATIONS AND COMPLAINTS ====================
+
+    def generate_optimizations(self, complaints: List[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        """Optimizations spread by network size; their complaints go to `complaints`."""
+        sizes = [len(self.entries_by_network[n["id"]]) for n in self.networks]
+        for _ in range(self.volumes["optimizations"] if self.networks else 0):
+            network = self.rng.choices(self.networks, sizes)[0]
+            author = self._actor()
+            created_at = self._days_ago(365)
+            complaint_status = self._pick(_COMPLAINT_STATUS)
+            activity_type = self._pick(_ACTIVITY_TYPES)
+            entries = self.entries_by_network[network["id"]]
+            optimization = {
+                "id": self._id(),
+                "network_id": network["id"],
+                "brand_id": network["brand_id"],
+                "created_by": {
+                    "user_id": author["id"],
+                    "display_name": author["name"],
+                    "email": author["email"],
+                },
+                "created_at": created_at,
+                "updated_at": self._after(created_at, 30),
+                "activity_type_id": None,
+                "activity_type": activity_type,
+                "activity_type_name": activity_type.replace("-", " ").title(),
+                "title": f"{activity_type.title()} work on {network['name']}",
+                "description": "Synthetic optimization activity for performance testing.",
+                "reason_note": "Generated to reproduce production-scale data volumes.",
+                "affected_scope": self.rng.choice(
+                    ["money_site", "specific_domain", "specific_path", "whole_network"]
+                ),
+                "target_domains": [e["asset_domain_id"] for e in self.rng.sample(entries, min(2, len(entries)))],
+                "keywords": [self.rng.choice(_WORDS) for _ in range(self.rng.randint(0, 3))],
+                "report_urls": [],
+                "expected_impact": ["ranking"],
+                "observed_impact": self.rng.choice([None, "positive", "neutral", "no_impact", "negative"]),
+                "status": self._pick(_OPTIMIZATION_STATUS),
+                "complaint_status": complaint_status,
+                "complaint_note": None,
+                "complaints_count": 0,
+                "telegram_notified_at": None,
+            }
+            if complaint_status != "none":
+                for _ in range(self.rng.randint(1, 3)):
+                    complaints.append(self._complaint(optimization, complaint_status))
+                    optimization["complaints_count"] += 1
+            yield optimization
+
+    def _complaint(self, optimization, complaint_status) -> Dict[str, Any]:
+        author = self._actor()
+        created_at = self._after(optimization["created_at"], 14)
+        resolved = complaint_status == "resolved"
+        return {
+            "id": self._id(),
+            "optimization_id": optimization["id"],
+            "network_id": optimization["network_id"],
+            "brand_id": optimization["brand_id"],
+            "created_by": {"user_id": author["id"], "display_name": author["name"], "email": author["email"]},
+            "created_at": created_at,
+            "reason": "Synthetic complaint about this optimization.",
+            "responsible_user_ids": [optimization["created_by"]["user_id"]],
+            "explicit_responsible_user_ids": [],
+            "auto_assigned_from_network": False,
+            "priority": self.rng.choice(["low", "medium", "medium", "high"]),
+            "report_urls": [],
+            "status": "resolved" if resolved else ("under_review" if complaint_status == "under_review" else "open"),
+            "resolved_at": self._after(created_at, 10) if resolved else None,
+            "telegram_notified_at": None,
+        }
+
+    # ==================== CONFLICTS AND LOGS ====================
+
+    def generate_conflicts(self) -> Iterable[Dict[str, Any]]:
+        candidates = [n for n in self.networks if len(self.entries_by_network[n["id"]]) >= 2]
+        fingerprints = set()
+        for _ in range(self.volumes["conflicts"] if candidates else 0):
+            network = self.rng.choice(candidates)
+            node_a, node_b = self.rng.sample(self.entries_by_network[network["id"]], 2)
+            conflict_type = self._pick(_CONFLICT_TYPES)
+            # Same format as the conflict linker's dedup fingerprint
+            fingerprint = f"{network['id']}|{conflict_type}|{node_a['id']}|{node_b['id']}"
+            if fingerprint in fingerprints:
+                continue
+            fingerprints.add(fingerprint)
+            status = self._pick(_CONFLICT_STATUS)
+            detected_at = self._days_ago(180)
+            yield {
+                "id": self._id(),
+                "dedup_fingerprint": fingerprint,
+                "conflict_type": conflict_type,
+                "severity": self._pick(_CONFLICT_SEVERITY),
+                "status": status,
+                "is_active": status in ("detected", "under_review"),
+                "network_id": network["id"],
+                "network_name": network["name"],
+                "domain_name": "",
+                "node_a_id": node_a["id"],
+                "node_a_path": node_a["optimized_path"],
+                "node_a_label": node_a["optimized_path"] or "/",
+                "node_b_id": node_b["id"],
+                "node_b_path": node_b["optimized_path"],
+                "node_b_label": node_b["optimized_path"] or "/",
+                "affected_nodes": [node_a["id"], node_b["id"]],
+                "description": f"Synthetic {conflict_type.replace('_', ' ')} conflict.",
+                "suggestion": None,
+                "optimization_id": None,
+                "detected_at": detected_at,
+                "first_detected_at": detected_at,
+                "created_at": detected_at,
+                "updated_at": self._after(detected_at, 30),
+                "resolved_at": self._after(detected_at, 30) if status == "resolved" else None,
+                "recurrence_count": 0,
+            }
+
+    def generate_change_logs(self) -> Iterable[Dict[str, Any]]:
+        sizes = [len(self.entries_by_network[n["id"]]) for n in self.networks]
+        for _ in range(self.volumes["change_logs"] if self.networks else 0):
+            network = self.rng.choices(self.networks, sizes)[0]
+            entry = self.rng.choice(self.entries_by_network[network["id"]])
+            actor = self._actor()
+            yield {
+                "id": self._id(),
+                "network_id": network["id"],
+                "brand_id": network["brand_id"],
+                "actor_user_id": actor["id"],
+                "actor_email": actor["email"],
+                "action_type": self._pick(_CHANGE_ACTIONS),
+                "affected_node": entry["optimized_path"] or "/",
+                "before_snapshot": None,
+                "after_snapshot": None,
+                "change_note": "Synthetic structure change for performance testing.",
+                "entry_id": entry["id"],
+                "archived": self.rng.random() < 0.05,
+                "archived_at": None,
+                "notified_at": None,
+                "notification_status": None,
+                "notification_channel": None,
+                "created_at": self._days_ago(365),
+            }
+
+    def generate_activity_logs(self) -> Iterable[Dict[str, Any]]:
+        entity_pools = {
+            "asset_domain": [d["id"] for domains in self.domains_by_brand.values() for d in domains],
+            "seo_network": [n["id"] for n in self.networks],
+            "brand": [b["id"] for b in self.brands],
+            "user": [u["id"] for u in self.users],
+        }
+        entity_pools["seo_structure_entry"] = [
+            e["id"] for n in self.networks for e in self.entries_by_network[n["id"]]
+        ]
+        entity_pools["seo_optimization"] = entity_pools["seo_network"]
+        for _ in range(self.volumes["activity_logs"]):
+            entity_type = self._pick(_LOG_ENTITIES)
+            pool = entity_pools[entity_type] or entity_pools["brand"]
+            yield {
+                "id": self._id(),
+                "actor": self._actor()["email"],
+                "action_type": self._pick(_LOG_ACTIONS),
+                "entity_type": entity_type,
+                "entity_id": self.rng.choice(pool),
+                "before_value": None,
+                "after_value": None,
+                "metadata": {"synthetic": True},
+                "created_at": self._days_ago(365),
+            }
+
+
+def _insert_batched(collection, documents: Iterable[Dict[str, Any]], batch_size: int) -> int:
+    batch, total = [], 0
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            collection.insert_many(batch, ordered=False)
+            total += len(batch)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+        total += len(batch)
+    return total
+
+
+def clear_dataset(db):
+    """Delete every document of the generated collections and synthetic users."""
+    for name in DATASET_COLLECTIONS:
+        db[name].delete_many({})
+    db.users.delete_many({"email": {"$regex": "@" + re.escape(SYNTHETIC_EMAIL_DOMAIN) + "$"}})
+
+
+def generate_dataset(
+    db,
+    seed: int = 42,
+    volumes: Optional[Dict[str, int]] = None,
+    anchor: Optional[datetime] = None,
+    batch_size: int = 5000,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> Dict[str, int]:
+    """Generate and bulk insert the dataset (sync pymongo). Returns inserted counts."""
+    dataset = SyntheticDataset(seed=seed, volumes=volumes, anchor=anchor)
+    categories = list(db.categories.find({}, {"_id": 0, "id": 1}).sort("name", 1))
+    dataset.generate_masters(categories)
+
+    counts: Dict[str, int] = {}
+
+    def insert(name, documents):
+        counts[name] = _insert_batched(db[name], documents, batch_size)
+        if progress:
+            progress(name, counts[name])
+
+    brands = [{k: v for k, v in b.items() if k != "weight"} for b in dataset.brands]
+    insert("brands", brands)
+    insert("users", dataset.users)
+    insert("registrars", dataset.registrars)
+    insert("asset_domains", dataset.generate_domains())
+    insert("seo_networks", dataset.generate_networks())
+    insert("seo_structure_entries", dataset.generate_entries())
+    complaints: List[Dict[str, Any]] = []
+    insert("seo_optimizations", dataset.generate_optimizations(complaints))
+    insert("optimization_complaints", complaints)
+    insert("seo_conflicts", dataset.generate_conflicts())
+    insert("seo_change_logs", dataset.generate_change_logs())
+    insert("activity_logs_v3", dataset.generate_activity_logs())
+    return counts
@@ -15,10 +15,13 @@ Integrates with Telegram for notifications.
 """
 
 import logging
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from services.metrics_service import observe_notification
+
 logger = logging.getLogger(__name__)
 
 # Default thresholds (can be overridden in settings)
@@ -30,6 +33,9 @@ DEFAULT_THRESHOLDS = {
     "check_interval_hours": 24,             # How often to check (daily)
 }
 
+# Oldest stale conflicts included in the metrics (the count is exact)
+STALE_CONFLICTS_LISTED = 50
+
 
 class TeamPerformanceAlertService:
     """
@@ -108,13 +114,13 @@ class TeamPerformanceAlertService:
             })
         
         # 2. Stale Conflicts
-        if metrics["stale_conflicts"]:
+        if metrics["stale_count"]:
             alerts.append({
                 "type": "stale_conflicts",
                 "severity": "MEDIUM",
-                "current_value": len(metrics["stale_conflicts"]),
+                "current_value": metrics["stale_count"],
                 "threshold": thresholds["stale_conflict_days"],
-                "message": f"{len(metrics['stale_conflicts'])} conflicts unresolved for "
+                "message": f"{metrics['stale_count']} conflicts unresolved for "
                           f">{thresholds['stale_conflict_days']} days",
                 "conflict_ids": [c["id"] for c in metrics["stale_conflicts"][:5]]
             })
@@ -158,80 +164,86 @@ class TeamPerformanceAlertService:
         }
     
     async def _gather_performance_metrics(self) -> Dict[str, Any]:
-        """Gather all performance metrics from the database."""
+        """
+        Gather all performance metrics from the database.
+        
+        Open/stale conflicts are counted with one $facet aggregation; the
+        30-day resolution figures come from the daily metrics rollups.
+        """
+        from services.metrics_rollup_service import get_metrics_rollup_service
+        
         thresholds = await self.get_thresholds()
         now = datetime.now(timezone.utc)
         
-        # Get all open conflicts
-        open_conflicts = await self.db.seo_conflicts.find(
-            {
+        # Find stale conflicts (open for > threshold days)
+        stale_threshold = (now - timedelta(days=thresholds["stale_conflict_days"])).isoformat()
+        
+        results = await self.db.seo_conflicts.aggregate([
+            {"$match": {
                 "status": {"$nin": ["resolved", "approved", "ignored"]},
                 "is_active": {"$ne": False}
-            },
-            {"_id": 0}
-        ).to_list(500)
+            }},
+            {"$project": {
+                "_id": 0, "id": 1, "conflict_type": 1, "network_name": 1,
+                "_detected": {"$ifNull": ["$first_detected_at", "$detected_at"]},
+            }},
+            {"$facet": {
+                "open": [{"$count": "count"}],
+                "stale_count": [
+                    {"$match": {"_detected": {"$type": "string", "$lt": stale_threshold}}},
+                    {"$count": "count"},
+                ],
+                "stale": [
+                    {"$match": {"_detected": {"$type": "string", "$lt": stale_threshold}}},
+                    {"$sort": {"_detected": 1}},
+                    {"$limit": STALE_CONFLICTS_LISTED},
+                    {"$addFields": {
+                        "days_open": {"$floor": {"$divide": [
+                            {"$subtract": [now, {"$dateFromString": {
+                                "dateString": "$_detected", "onError": now,
+                            }}]},
+                            24 * 3600 * 1000,
+                        ]}},
+                    }},
+                ],
+            }},
+        ]).to_list(1)
+        facets = results[0] if results else {}
         
-        # Get resolved conflicts in last 30 days for rate calculation
-        thirty_days_ago = (now - timedelta(days=30)).isoformat()
-        resolved_conflicts = await self.db.seo_conflicts.find(
+        stale_conflicts = [
             {
-                "status": {"$in": ["resolved", "approved"]},
-                "resolved_at": {"$gte": thirty_days_ago}
-            },
-            {"_id": 0}
-        ).to_list(500)
+                "id": c["id"],
+                "conflict_type": c.get("conflict_type"),
+                "days_open": int(c["days_open"]),
+                "network_name": c.get("network_name")
+            }
+            for c in facets.get("stale", [])
+        ]
+        
+        # Resolved conflicts in last 30 days for rate calculation
+        rollup = await get_metrics_rollup_service(self.db).get_summary(days=30)
+        resolved_count = rollup["conflicts_resolved"]
+        false_resolution_count = rollup["false_resolutions"]
         
         # Calculate false resolution rate
-        false_resolutions = [c for c in resolved_conflicts if c.get("is_false_resolution")]
         false_resolution_rate = (
-            len(false_resolutions) / len(resolved_conflicts) * 100
-            if resolved_conflicts else 0
+            false_resolution_count / resolved_count * 100
+            if resolved_count else 0
         )
         
-        # Find stale conflicts (open for > threshold days)
-        stale_threshold = now - timedelta(days=thresholds["stale_conflict_days"])
-        stale_conflicts = []
-        for c in open_conflicts:
-            detected_str = c.get("first_detected_at") or c.get("detected_at")
-            if detected_str:
-                try:
-                    detected = datetime.fromisoformat(detected_str.replace("Z", "+00:00"))
-                    if detected < stale_threshold:
-                        days_open = (now - detected).days
-                        stale_conflicts.append({
-                            "id": c["id"],
-                            "conflict_type": c.get("conflict_type"),
-                            "days_open": days_open,
-                            "network_name": c.get("network_name")
-                        })
-                except Exception:
-                    pass
-        
         # Calculate average resolution time
-        resolution_times = []
-        for c in resolved_conflicts:
-            detected_str = c.get("first_detected_at") or c.get("detected_at")
-            resolved_str = c.get("resolved_at")
-            if detected_str and resolved_str:
-                try:
-                    detected = datetime.fromisoformat(detected_str.replace("Z", "+00:00"))
-                    resolved = datetime.fromisoformat(resolved_str.replace("Z", "+00:00"))
-                    hours = (resolved - detected).total_seconds() / 3600
-                    if hours >= 0:
-                        resolution_times.append(hours)
-                except Exception:
-                    pass
-        
+        timed = rollup["conflict_resolution_hours_count"]
         avg_resolution_hours = (
-            sum(resolution_times) / len(resolution_times)
-            if resolution_times else 0
+            rollup["conflict_resolution_hours_sum"] / timed
+            if timed else 0
         )
         
         return {
-            "open_count": len(open_conflicts),
-            "resolved_count_30d": len(resolved_conflicts),
-            "false_resolution_count": len(false_resolutions),
+            "open_count": (facets.get("open") or [{}])[0].get("count", 0),
+            "resolved_count_30d": resolved_count,
+            "false_resolution_count": false_resolution_count,
             "false_resolution_rate_percent": round(false_resolution_rate, 1),
+            "stale_count": (facets.get("stale_count") or [{}])[0].get("count", 0),
             "stale_conflicts": stale_conflicts,
             "avg_resolution_hours": round(avg_resolution_hours, 1),
             "checked_at": now.isoformat()
@@ -274,15 +286,23 @@ class TeamPerformanceAlertService:
             
             # Send via Telegram
             import httpx
+            started = time.perf_counter()
             async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"https://api.telegram.org/bot{bot_token}/sendMessage",
-                    json={
-                        "chat_id": chat_id,
-                        "text": message,
-                        "parse_mode": "HTML"
-                    },
-                    timeout=10
+                try:
+                    response = await client.post(
+                        f"https://api.telegram.org/bot{bot_token}/sendMessage",
+                        json={
+                            "chat_id": chat_id,
+                            "text": message,
+                            "parse_mode": "HTML"
+                        },
+                        timeout=10
+                    )
+                except Exception:
+                    observe_notification("telegram_team_performance", started, False)
+                    raise
+                observe_notification(
+                    "telegram_team_performance", started, response.status_code == 200
                 )
                 
                 if response.status_code == 200:
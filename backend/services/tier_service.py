@@ -50,6 +50,25 @@ class TierCalculationService:
             {"network_id": network_id}, {"_id": 0}
         ).to_list(10000)
 
+        return self.compute_tiers(entries, network_id)
+
+    @classmethod
+    def compute_tiers(
+        cls, entries: List[dict], network_id: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Calculate tiers from already-loaded structure entries.
+
+        Pure (no database access) so callers that already hold the
+        entries can avoid a second load, or run it in an executor.
+
+        Args:
+            entries: Structure entries of a single network
+            network_id: Only used for logging
+
+        Returns:
+            Dictionary mapping entry_id to calculated tier
+        """
         if not entries:
             return {}
 
@@ -97,7 +116,7 @@ class TierCalculationService:
         if not main_entries:
             # No main domain found - all entries are orphans
             logger.warning(f"Network {network_id} has no main domain")
-            return {entry_id: self.MAX_TIER for entry_id in entry_map.keys()}
+            return {entry_id: cls.MAX_TIER for entry_id in entry_map.keys()}
 
         # BFS from main node(s)
         tiers: Dict[str, int] = {}
@@ -117,15 +136,15 @@ class TierCalculationService:
             for source_id in graph.get(current_id, []):
                 if source_id not in visited:
                     visited.add(source_id)
-                    new_tier = min(current_tier + 1, self.MAX_TIER)
+                    new_tier = min(current_tier + 1, cls.MAX_TIER)
                     tiers[source_id] = new_tier
                     queue.append((source_id, new_tier))
 
         # Mark any unvisited entries as max tier (orphans)
         for entry_id in entry_map.keys():
             if entry_id not in tiers:
-                tiers[entry_id] = self.MAX_TIER
-                logger.debug(f"Orphan entry {entry_id} assigned tier {self.MAX_TIER}")
+                tiers[entry_id] = cls.MAX_TIER
+                logger.debug(f"Orphan entry {entry_id} assigned tier {cls.MAX_TIER}")
 
         return tiers
 
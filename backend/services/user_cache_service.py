@@ -0,0 +1,169 @@
+"""
+User Cache Service
+==================
+
+Short-lived in-process cache of authenticated users for get_current_user.
+
+Every authenticated request resolves its JWT subject to a user document
+(the presence heartbeat alone does this every 30s per user). Active users
+are served from memory for USER_CACHE_TTL_SECONDS instead of re-reading
+db.users on each request.
+
+Invalidation:
+- Endpoints that change a user's access (activate/deactivate, role, brand
+  access, menu permissions, delete) call bump_user_version(user_id)
+- A bump drops the local entry at once and increments the user's version
+  in user_cache_versions (updated_at set by the MongoDB server clock)
+- Every worker polls user_cache_versions for recent bumps at most once per
+  USER_CACHE_SYNC_SECONDS and drops entries whose version changed, so other
+  workers stop serving a deactivated user within that interval
+- Only active users are cached; any other status is re-read every request
+"""
+
+import copy
+import logging
+import os
+import time
+from datetime import timedelta
+from typing import Dict, Any, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+# How long an active user is served from memory
+USER_CACHE_TTL_SECONDS = float(os.environ.get("USER_CACHE_TTL_SECONDS", "60"))
+
+# How often each worker checks for version bumps made by other workers
+USER_CACHE_SYNC_SECONDS = float(os.environ.get("USER_CACHE_SYNC_SECONDS", "1"))
+
+# Upper bound on cached users per worker
+USER_CACHE_MAX_ENTRIES = 10000
+
+# Bumps re-read on every sync so writes committed out of order are not missed
+USER_CACHE_SYNC_LOOKBACK = timedelta(seconds=30)
+
+
+class UserCacheService:
+    """
+    Per-worker user cache with cross-worker version invalidation.
+
+    - get_user: cached user document (loads and caches on miss)
+    - bump_user_version: invalidate a user on every worker
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._versions: Dict[str, int] = {}
+        # Incremented on every eviction; a load that raced one is not cached
+        self._generation = 0
+        self._watermark = None
+        self._next_sync = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    async def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a user document by id, from memory when possible.
+
+        Returns a copy, so callers may modify it freely.
+        """
+        await self._sync_versions()
+
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            expires_at, user = entry
+            if expires_at > time.monotonic():
+                self.hits += 1
+                return copy.deepcopy(user)
+            self._entries.pop(user_id, None)
+
+        self.misses += 1
+        generation = self._generation
+        user = await self.db.users.find_one({"id": user_id}, {"_id": 0})
+        if (
+            user is not None
+            and user.get("status", "active") == "active"
+            and generation == self._generation
+        ):
+            self._store(user_id, user)
+        return user
+
+    def _store(self, user_id: str, user: Dict[str, Any]):
+        if len(self._entries) >= USER_CACHE_MAX_ENTRIES:
+            now = time.monotonic()
+            self._entries = {
+                uid: entry for uid, entry in self._entries.items() if entry[0] > now
+            }
+            if len(self._entries) >= USER_CACHE_MAX_ENTRIES:
+                # Still full of live entries - drop the oldest
+                self._entries.pop(next(iter(self._entries)))
+        self._entries[user_id] = (
+            time.monotonic() + USER_CACHE_TTL_SECONDS,
+            copy.deepcopy(user),
+        )
+
+    def _evict(self, user_id: str):
+        self._entries.pop(user_id, None)
+        self._generation += 1
+
+    async def bump_user_version(self, user_id: str):
+        """Invalidate a user's cached document on every worker."""
+        self._evict(user_id)
+        try:
+            doc = await self.db.user_cache_versions.find_one_and_update(
+                {"user_id": user_id},
+                {"$inc": {"version": 1}, "$currentDate": {"updated_at": True}},
+                projection={"_id": 0, "version": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+            self._versions[user_id] = doc["version"]
+        except Exception as e:
+            # Other workers still drop the entry when its TTL expires
+            logger.error(f"Failed to bump user cache version for {user_id}: {e}")
+
+    async def _sync_versions(self):
+        """Drop entries of users bumped by other workers since the last sync."""
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        # Claim the sync before awaiting so concurrent requests skip it
+        self._next_sync = now + USER_CACHE_SYNC_SECONDS
+
+        query = {}
+        if self._watermark is not None:
+            query = {"updated_at": {"$gte": self._watermark - USER_CACHE_SYNC_LOOKBACK}}
+
+        try:
+            docs = await self.db.user_cache_versions.find(
+                query, {"_id": 0, "user_id": 1, "version": 1, "updated_at": 1}
+            ).to_list(None)
+        except Exception as e:
+            # Without version info nothing cached can be trusted
+            logger.warning(f"User cache version sync failed, clearing cache: {e}")
+            self._entries.clear()
+            self._generation += 1
+            return
+
+        for doc in docs:
+            user_id = doc["user_id"]
+            if self._versions.get(user_id) != doc["version"]:
+                self._versions[user_id] = doc["version"]
+                self._evict(user_id)
+            updated_at = doc.get("updated_at")
+            if updated_at and (self._watermark is None or updated_at > self._watermark):
+                self._watermark = updated_at
+
+
+# Global instance
+_user_cache_service: Optional[UserCacheService] = None
+
+
+def get_user_cache_service(db: AsyncIOMotorDatabase) -> UserCacheService:
+    """Get or create the user cache service"""
+    global _user_cache_service
+    if _user_cache_service is None:
+        _user_cache_service = UserCacheService(db)
+    return _user_cache_service
@@ -15,10 +15,13 @@ Recipients: Global admin emails only
 import os
 import asyncio
 import logging
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any, List
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from services.metrics_service import observe_notification
+
 logger = logging.getLogger(__name__)
 
 # Check if resend is available
@@ -622,7 +625,13 @@ class WeeklyDigestService:
                 "html": html_content,
             }
 
-            await asyncio.to_thread(resend.Emails.send, params)
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(resend.Emails.send, params)
+            except Exception:
+                observe_notification("email_digest", started, False)
+                raise
+            observe_notification("email_digest", started, True)
 
             # Update last_sent_at
             await self.db.settings.update_one(
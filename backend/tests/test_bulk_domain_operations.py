@@ -0,0 +1,114 @@
+"""
+Test Bulk Domain Operations
+===========================
+
+Tests for the rules of services/bulk_domain_operation_service.py
+(no database needed):
+1. Operation fields are validated once for the whole request
+2. Domains are split into updates and skips with the single-endpoint rules
+3. The $set of each operation matches its single-domain endpoint
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.bulk_domain_operation_service import (  # noqa: E402
+    BulkOperationError,
+    build_update,
+    plan_operation,
+    validate_operation,
+)
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def _domain(domain_id, lifecycle="active", expiration="2030-01-01", **extra):
+    return {
+        "id": domain_id,
+        "domain_name": f"{domain_id}.com",
+        "lifecycle_status": lifecycle,
+        "expiration_date": expiration,
+        **extra,
+    }
+
+
+class TestBulkDomainOperations:
+    """Test suite for bulk lifecycle / monitoring / brand operations"""
+
+    def test_validation(self):
+        """Missing or invalid operation fields reject the request"""
+        with pytest.raises(BulkOperationError):
+            validate_operation({"operation": "set_lifecycle"})
+        with pytest.raises(BulkOperationError):
+            validate_operation({"operation": "set_lifecycle", "lifecycle_status": "quarantined"})
+        with pytest.raises(BulkOperationError):
+            validate_operation({"operation": "quarantine", "quarantine_category": "unknown"})
+        with pytest.raises(BulkOperationError):
+            validate_operation({"operation": "set_monitoring"})
+
+        spec = validate_operation({
+            "operation": "quarantine", "quarantine_category": "unknown", "quarantine_note": "why",
+        })
+        assert spec["quarantine_category"] == "other"
+
+        print("SUCCESS: Operation validated once per request")
+
+    def test_rules(self):
+        """Expired, not quarantined and unmonitorable domains are skipped"""
+        domains = [
+            _domain("ok"),
+            _domain("expired", expiration="2026-01-01T00:00:00+00:00"),
+            _domain("quarantined", lifecycle="quarantined", quarantine_category="spam"),
+            _domain("released", lifecycle="released", brand_id="b2"),
+        ]
+
+        ids, skipped = plan_operation(
+            domains, {"operation": "set_lifecycle", "lifecycle_status": "active"}, NOW
+        )
+        assert ids == ["ok", "quarantined", "released"]
+        assert [s["id"] for s in skipped] == ["expired"]
+
+        ids, skipped = plan_operation(domains, {"operation": "remove_quarantine"}, NOW)
+        assert ids == ["quarantined"]
+
+        ids, skipped = plan_operation(
+            domains, {"operation": "set_monitoring", "monitoring_enabled": True}, NOW
+        )
+        assert ids == ["ok"]
+        assert skipped[1]["reason"] == "Monitoring is not allowed for quarantined domains"
+        ids, _ = plan_operation(
+            domains, {"operation": "set_monitoring", "monitoring_enabled": False}, NOW
+        )
+        assert len(ids) == 4
+
+        ids, _ = plan_operation(domains, {"operation": "move_brand", "target_brand_id": "b2"}, NOW)
+        assert "released" not in ids
+
+        print("SUCCESS: Lifecycle rules applied per domain")
+
+    def test_updates(self):
+        """Each operation sets the fields of its single-domain endpoint"""
+        now = NOW.isoformat()
+        update = build_update(
+            {"operation": "quarantine", "quarantine_category": "dmca", "quarantine_note": None},
+            "user-1", now,
+        )
+        assert update["lifecycle_status"] == "quarantined"
+        assert update["quarantined_by"] == "user-1"
+        assert update["monitoring_enabled"] is False
+        assert update["released_at"] is None
+
+        update = build_update({"operation": "remove_quarantine"}, "user-1", now)
+        assert update["lifecycle_status"] == "active"
+        assert update["quarantine_category"] is None
+        assert "monitoring_enabled" not in update
+
+        update = build_update({"operation": "move_brand", "target_brand_id": "b2"}, None, now)
+        assert update == {"brand_id": "b2", "updated_at": now}
+
+        print("SUCCESS: Bulk updates mirror the single-domain endpoints")
@@ -0,0 +1,183 @@
+"""
+Test Conflict Linker Writes
+===========================
+
+Tests for the batched writes of services/conflict_optimization_linker_service.py
+(no database needed):
+1. A conflict write that partly fails removes the optimizations of the failed
+   conflicts and keeps the rest
+2. A conflict write that fails completely leaves no optimizations behind
+3. A re-open lost to a concurrent scan is neither counted nor notified
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.conflict_optimization_linker_service import (  # noqa: E402
+    ConflictOptimizationLinkerService,
+)
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return list(self.docs)
+
+
+class FakeCollection:
+    def __init__(self, docs=None):
+        self.docs = list(docs or [])
+
+    async def find_one(self, query, projection=None):
+        return None
+
+    def find(self, query, projection=None):
+        (field, condition), = query.items()
+        values = set(condition["$in"])
+        return FakeCursor([d for d in self.docs if d.get(field) in values])
+
+    async def insert_many(self, docs, ordered=True):
+        self.docs.extend(docs)
+
+    async def delete_many(self, query):
+        ids = set(query["id"]["$in"])
+        self.docs = [d for d in self.docs if d["id"] not in ids]
+
+
+class FailingConflicts(FakeCollection):
+    """bulk_write fails the operations at failed_indexes (or everything)."""
+
+    def __init__(self, docs=None, failed_indexes=None):
+        super().__init__(docs)
+        self.failed_indexes = failed_indexes
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.failed_indexes is None:
+            raise ConnectionError("database unreachable")
+        raise BulkWriteError({
+            "writeErrors": [
+                {"index": i, "code": 11000, "errmsg": "duplicate key"} for i in self.failed_indexes
+            ],
+            "upserted": [
+                {"index": i, "_id": i} for i in range(len(operations))
+                if i not in self.failed_indexes and operations[i]._upsert
+            ],
+        })
+
+
+class RacingConflicts(FakeCollection):
+    """bulk_write where a concurrent scan re-opened lost_ids just before."""
+
+    def __init__(self, docs, lost_ids):
+        super().__init__(docs)
+        self.lost_ids = lost_ids
+
+    async def bulk_write(self, operations, ordered=True):
+        upserted = {}
+        for index, operation in enumerate(operations):
+            if operation._upsert:
+                upserted[index] = index
+                continue
+            conflict_id = operation._filter.get("id")
+            for doc in self.docs:
+                if doc["id"] != conflict_id:
+                    continue
+                if conflict_id in self.lost_ids:
+                    # The other scan won: the status guard no longer matches
+                    doc.update(status="under_review", optimization_id="opt-other")
+                else:
+                    doc.update(operation._doc["$set"])
+        return SimpleNamespace(upserted_ids=upserted)
+
+
+class FakeDb:
+    def __init__(self, conflicts):
+        self.seo_networks = FakeCollection()
+        self.seo_optimization_activity_types = FakeCollection()
+        self.seo_optimizations = FakeCollection()
+        self.seo_conflicts = conflicts
+
+
+def _conflict(node, conflict_type="orphan"):
+    return {"conflict_type": conflict_type, "node_a_id": node, "severity": "high"}
+
+
+def _service(db):
+    service = ConflictOptimizationLinkerService(db)
+    service.notified = []
+    service._schedule_notification_batch = (
+        lambda notifications, *args: service.notified.extend(notifications)
+    )
+    return service
+
+
+class TestConflictLinkerWrites:
+    """Test suite for failures of the conflict bulk write"""
+
+    def test_partial_failure(self):
+        """Optimizations of failed conflict writes are removed"""
+        resolved = {
+            "id": "c-old", "dedup_fingerprint": "net-1|orphan|n3|",
+            "status": "resolved", "recurrence_count": 0,
+        }
+        # Operations: new n1 (0), new n2 (1), re-open n3 (2) - n2 and n3 fail
+        db = FakeDb(FailingConflicts([resolved], failed_indexes={1, 2}))
+        service = _service(db)
+
+        summary = asyncio.run(service.process_detected_conflicts(
+            [_conflict("n1"), _conflict("n2"), _conflict("n3")], "net-1"
+        ))
+
+        assert summary["new_conflicts"] == 1
+        assert summary["recurring_conflicts"] == 0
+        assert summary["optimizations_created"] == 1
+        assert len(db.seo_optimizations.docs) == 1
+        assert [n["conflict"]["node_a_id"] for n in service.notified] == ["n1"]
+
+        print("SUCCESS: Partial conflict write failure cleaned up")
+
+    def test_complete_failure(self):
+        """No optimization survives a conflict write that fails entirely"""
+        db = FakeDb(FailingConflicts())
+        service = _service(db)
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(service.process_detected_conflicts(
+                [_conflict("n1"), _conflict("n2")], "net-1"
+            ))
+        assert db.seo_optimizations.docs == []
+        assert service.notified == []
+
+        print("SUCCESS: Failed conflict write left no optimizations")
+
+    def test_reopen_lost_to_concurrent_scan(self):
+        """A re-open another scan applied first leaves no optimization behind"""
+        resolved = [
+            {"id": f"c-{node}", "dedup_fingerprint": f"net-1|orphan|{node}|",
+             "status": "resolved", "recurrence_count": 0}
+            for node in ("n1", "n2")
+        ]
+        db = FakeDb(RacingConflicts(resolved, lost_ids={"c-n2"}))
+        service = _service(db)
+
+        summary = asyncio.run(service.process_detected_conflicts(
+            [_conflict("n1"), _conflict("n2")], "net-1"
+        ))
+
+        assert summary["recurring_conflicts"] == 1
+        assert summary["optimizations_created"] == 1
+        assert [o["id"] for o in db.seo_optimizations.docs] == [
+            db.seo_conflicts.docs[0]["optimization_id"]
+        ]
+        assert [n["conflict"]["node_a_id"] for n in service.notified] == ["n1"]
+
+        print("SUCCESS: Lost re-open cleaned up")
@@ -226,6 +226,28 @@ class TestConflictMetricsEndpoint:
         print(f"✓ 7-day period: {data_7['total_conflicts']} conflicts")
         print(f"✓ 30-day period: {data_30['total_conflicts']} conflicts")
 
+    def test_dashboard_includes_conflict_rollups(self):
+        """Verify /metrics/dashboard reports rolled-up conflict metrics"""
+        response = requests.get(
+            f"{BASE_URL}/api/v3/metrics/dashboard",
+            headers=self.headers
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        assert "seo_conflicts" in data
+        conflicts = data["seo_conflicts"]
+        for field in [
+            "detected_30d",
+            "resolved_30d",
+            "avg_resolution_time_hours",
+            "false_resolution_rate_percent",
+        ]:
+            assert field in conflicts, f"Missing field: {field}"
+        assert conflicts["resolved_30d"] >= 0
+
+        print(f"✓ Dashboard: {conflicts['detected_30d']} detected, {conflicts['resolved_30d']} resolved in 30d")
+
 
 class TestMigrationEndpoint:
     """Test POST /api/v3/conflicts/migrate-approved endpoint"""
@@ -0,0 +1,167 @@
+"""
+Test Domain Import Planning
+===========================
+
+Tests for the validation pass of services/domain_import_service.py
+(no database needed):
+1. Rows become InsertOne / UpdateOne operations in row order
+2. Unknown brands are created once per name, duplicates are skipped
+3. create_new / update_existing flags skip rows instead of writing them
+4. Batched planning and preview share duplicates and row numbers
+5. Rows a failed chunk write did not apply become errors; later chunks
+   are still written
+"""
+
+import asyncio
+import os
+import sys
+
+from pymongo import InsertOne, UpdateOne
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.domain_import_service import DomainImportService, parse_expiration_date  # noqa: E402
+
+LOOKUPS = {
+    "brands": {"acme": {"id": "brand-acme", "name": "Acme"}},
+    "categories": {"money": {"id": "category-money", "name": "Money"}},
+    "registrars": {},
+}
+EXISTING = {"old.com": {"id": "domain-old", "domain_name": "old.com", "lifecycle_status": "active"}}
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return list(self.docs)
+
+
+class FlakyDomains:
+    """asset_domains whose first bulk_write applies one row, then fails."""
+
+    def __init__(self):
+        self.failures = 1
+        self.docs = []
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.failures:
+            self.failures -= 1
+            self.docs.append(operations[0]._doc)
+            raise ConnectionError("connection reset")
+        self.docs.extend(op._doc for op in operations)
+
+    def find(self, query, projection=None):
+        ids = set(query["id"]["$in"])
+        return FakeCursor([d for d in self.docs if d["id"] in ids])
+
+
+class FakeDb:
+    def __init__(self):
+        self.asset_domains = FlakyDomains()
+
+
+class TestDomainImportPlan:
+    """Test suite for the bulk domain import planner"""
+
+    def test_rows_become_bulk_operations(self):
+        """New rows insert, existing rows update only the provided fields"""
+        service = DomainImportService(db=None)
+        rows = [
+            {"domain_name": "old.com", "lifecycle_status": "Released", "expiration_date": "31/01/2027"},
+            {"domain_name": "new.com", "brand_name": "ACME", "category_name": "money",
+             "monitoring_enabled": "on"},
+        ]
+        operations, new_brands, result = service.plan(rows, LOOKUPS, EXISTING, now="2026-01-01")
+
+        assert [op["status"] for op in operations] == ["updated", "created"]
+        update, insert = operations[0]["request"], operations[1]["request"]
+        assert isinstance(update, UpdateOne) and isinstance(insert, InsertOne)
+        assert update._doc["$set"] == {
+            "updated_at": "2026-01-01",
+            "lifecycle_status": "released",
+            "expiration_date": "2027-01-31T00:00:00Z",
+        }
+        assert insert._doc["brand_id"] == "brand-acme"
+        assert insert._doc["category_id"] == "category-money"
+        assert insert._doc["monitoring_enabled"] is True
+        assert new_brands == [] and result["details"] == []
+
+        print("SUCCESS: Rows planned as bulk operations")
+
+    def test_new_brands_and_duplicates(self):
+        """An unknown brand is created once; a repeated domain is skipped"""
+        service = DomainImportService(db=None)
+        rows = [
+            {"domain_name": "a.com", "brand_name": "Fresh"},
+            {"domain_name": "b.com", "brand_name": "fresh "},
+            {"domain_name": " A.COM "},
+            {"domain_name": ""},
+        ]
+        operations, new_brands, result = service.plan(rows, LOOKUPS, {})
+
+        assert len(new_brands) == 1 and new_brands[0]["name"] == "Fresh"
+        assert {op["request"]._doc["brand_id"] for op in operations} == {new_brands[0]["id"]}
+        assert result["skipped"] == 1
+        assert result["details"][0]["reason"] == "duplicate of row 2"
+
+        print("SUCCESS: New brands deduplicated, duplicate rows skipped")
+
+    def test_flags_skip_rows(self):
+        """create_new=False / update_existing=False report skipped rows"""
+        service = DomainImportService(db=None)
+        rows = [{"domain_name": "old.com"}, {"domain_name": "new.com"}]
+
+        operations, _, result = service.plan(rows, LOOKUPS, EXISTING, create_new=False)
+        assert [op["domain"] for op in operations] == ["old.com"]
+        assert result["details"][0]["reason"] == "create_new is false"
+
+        operations, _, result = service.plan(rows, LOOKUPS, EXISTING, update_existing=False)
+        assert [op["domain"] for op in operations] == ["new.com"]
+        assert result["details"][0]["reason"] == "update_existing is false"
+
+        assert parse_expiration_date("2027-01-31T10:00:00Z").day == 31
+        assert parse_expiration_date("31.01.2027") is None
+
+        print("SUCCESS: Skip flags honoured")
+
+    def test_batches_share_duplicates_and_row_numbers(self):
+        """Planning and previewing batch by batch numbers rows file-wide"""
+        service = DomainImportService(db=None)
+        seen = {}
+        service.plan([{"domain_name": "a.com"}, {"domain_name": "b.com"}], LOOKUPS, {}, seen=seen)
+        operations, _, result = service.plan(
+            [{"domain_name": "c.com"}, {"domain_name": "A.com"}], LOOKUPS, {},
+            seen=seen, row_offset=2,
+        )
+        assert [op["domain"] for op in operations] == ["c.com"]
+        assert result["details"][0]["reason"] == "duplicate of row 2"
+
+        preview = service.preview(
+            [{"domain_name": "old.com", "lifecycle_status": "released"},
+             {"domain_name": "x.com", "monitoring_enabled": "maybe"}],
+            LOOKUPS, EXISTING, row_offset=100,
+        )
+        assert preview["updated_domains"][0]["row"] == 102
+        assert preview["updated_domains"][0]["changes"] == ["lifecycle: active → released"]
+        assert preview["errors"][0]["row"] == 103
+        assert preview["summary"]["error_count"] == 1
+
+        print("SUCCESS: Batches share duplicate detection and row numbers")
+
+    def test_failed_chunk_continues(self):
+        """Only unapplied rows of a failed chunk are errors, the next chunk is written"""
+        service = DomainImportService(db=FakeDb())
+        operations, new_brands, result = service.plan(
+            [{"domain_name": f"d{i}.com"} for i in range(5)], LOOKUPS, {}
+        )
+
+        asyncio.run(service.write(operations, new_brands, result, "tester", batch_size=2))
+
+        assert result["errors"] == [{"domain": "d1.com", "error": "Write failed: connection reset"}]
+        assert [d["domain"] for d in result["details"]] == ["d0.com", "d2.com", "d3.com", "d4.com"]
+        assert result["created"] == 4
+        assert len(service.db.asset_domains.docs) == 4
+
+        print("SUCCESS: Import continued after a failed chunk")
@@ -0,0 +1,61 @@
+"""
+Test Domain Keys
+================
+
+Tests for services/domain_key_service.py (no database needed):
+1. Case, whitespace, trailing dots and IDNA forms map to one key
+2. Full hostname searches are key prefixes, other searches match domain_name
+"""
+
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.domain_key_service import (  # noqa: E402
+    domain_search_filter,
+    normalize_domain_key,
+    with_domain_key,
+)
+
+
+class TestDomainKey:
+    """Test suite for the normalized domain key"""
+
+    def test_normalization(self):
+        """Spellings of the same domain share one key"""
+        assert normalize_domain_key(" Example.COM. ") == "example.com"
+        assert normalize_domain_key("example.com") == "example.com"
+        assert normalize_domain_key("Bücher.de") == "xn--bcher-kva.de"
+        assert normalize_domain_key("xn--bcher-kva.de") == "xn--bcher-kva.de"
+        # Not a valid IDNA name: the lowercase form is kept
+        assert normalize_domain_key("A..B") == "a..b"
+        assert normalize_domain_key(None) == ""
+        assert normalize_domain_key(" . ") == ""
+
+        asset = with_domain_key({"domain_name": "Shop.Example.com"})
+        assert asset["domain_key"] == "shop.example.com"
+        assert "domain_key" not in with_domain_key({"domain_name": ""})
+
+        print("SUCCESS: Domain names normalized to a single key")
+
+    def test_search_filter(self):
+        """Full hostnames match anywhere in the key; other text keeps the domain_name regex"""
+        condition = domain_search_filter(" Example.COM ")
+        pattern = re.compile(condition["domain_key"]["$regex"])
+        assert pattern.search("example.com") and pattern.search("www.example.com")
+        assert pattern.search("blog.example.com")
+        assert not pattern.search("examplexcom")
+
+        pattern = re.compile(domain_search_filter("bücher.de")["domain_key"]["$regex"])
+        assert pattern.search("shop.xn--bcher-kva.de")
+
+        # Fragments, Unicode fragments and regexes search domain_name as before
+        assert domain_search_filter("exam") == {
+            "domain_name": {"$regex": "exam", "$options": "i"}
+        }
+        assert "domain_name" in domain_search_filter("bücher")
+        assert "domain_name" in domain_search_filter("^shop.*\\.com$")
+
+        print("SUCCESS: Search filter matches hostnames within the key")
@@ -0,0 +1,80 @@
+"""
+Test Fake Internet Harness
+==========================
+
+Tests for benchmarks/fake_internet.py and the availability resolver
+override (no database needed):
+1. Host names round-trip to their profile and the mix is honoured
+2. Checks routed through ResolveOverrideTransport reach the virtual host
+   and classify like the monitoring engine expects
+"""
+
+import asyncio
+import os
+import sys
+from collections import Counter
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_internet import (  # noqa: E402
+    EXPECTED_STATUS,
+    FakeInternet,
+    assign_profiles,
+    host_name,
+    profile_for,
+)
+from services.monitoring_service import (  # noqa: E402
+    AvailabilityMonitoringService,
+    ResolveOverrideTransport,
+)
+
+
+class TestFakeInternet:
+    """Test suite for the fake-internet benchmark harness"""
+
+    def test_profiles_round_trip(self):
+        """Every profile is recoverable from its host name; mix sizes add up"""
+        for profile in EXPECTED_STATUS:
+            assert profile_for(host_name(profile, 7)) == profile
+        assert profile_for("example.com") is None
+
+        profiles = assign_profiles(1000, {"ok": 90, "timeout": 10})
+        assert len(profiles) == 1000
+        assert Counter(profiles.values()) == {"ok": 900, "timeout": 100}
+
+        print("SUCCESS: Host profiles round-trip")
+
+    def test_override_reaches_virtual_hosts(self):
+        """https://<host>/ is served locally with the host's behaviour"""
+        async def fetch_all():
+            server = FakeInternet(latency_ms=0, jitter_ms=0, large_kb=64)
+            host, port = await server.start()
+            transport = ResolveOverrideTransport(f"{host}:{port}")
+            try:
+                async with httpx.AsyncClient(
+                    transport=transport, follow_redirects=True, timeout=5
+                ) as client:
+                    return {
+                        profile: await client.get(f"https://{host_name(profile, 1)}/")
+                        for profile in ("ok", "large", "redirect", "cloudflare", "captcha",
+                                        "server_error")
+                    }
+            finally:
+                await server.stop()
+
+        responses = asyncio.run(fetch_all())
+        assert responses["ok"].status_code == 200
+        assert len(responses["large"].content) == 64 * 1024
+        assert responses["redirect"].status_code == 200
+        assert responses["redirect"].url.path == "/home"
+        assert responses["server_error"].status_code >= 500
+
+        # Soft-block detection only reads class-level patterns - no db needed
+        checker = AvailabilityMonitoringService.__new__(AvailabilityMonitoringService)
+        assert checker._detect_soft_block(responses["ok"].text, 200) is None
+        assert checker._detect_soft_block(responses["captcha"].text, 200) == "captcha"
+        assert checker._detect_soft_block(responses["cloudflare"].text, 403) is not None
+
+        print("SUCCESS: Resolver override routes checks to virtual hosts")
@@ -0,0 +1,57 @@
+"""
+Test Hot Path Micro-Benchmarks
+==============================
+
+Tests for benchmarks/hot_paths.py (no database needed):
+1. The growth exponent fit tells linear from quadratic
+2. A quadratic case is flagged as a complexity regression
+3. Every case runs on a small synthetic fixture
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.hot_paths import CASES, Case, build_fixture, fit_exponent, run_case  # noqa: E402
+
+
+def points(exponent):
+    return [{"size": n, "best_s": 1e-7 * n ** exponent} for n in (100, 1000, 10000, 100000)]
+
+
+class TestHotPathBenchmarks:
+    """Test suite for the micro-benchmark harness"""
+
+    def test_fit_exponent(self):
+        """Slope of log(time) over log(size) recovers the growth order"""
+        assert abs(fit_exponent(points(1)) - 1) < 1e-6
+        assert abs(fit_exponent(points(2)) - 2) < 1e-6
+        assert fit_exponent(points(1)[:1]) is None
+
+        print("SUCCESS: Exponent fit separates linear and quadratic growth")
+
+    def test_quadratic_case_flagged(self):
+        """A case doing pairwise work over all nodes is marked as regressed"""
+        def setup(fixture):
+            entries = fixture["entries"]
+            return lambda: sum(1 for a in entries for b in entries if a is b)
+
+        fixtures = {n: build_fixture(n, seed=1) for n in (200, 400, 800)}
+        result = run_case(Case("pairwise", setup), fixtures)
+
+        assert result["fitted_exponent"] > 1.5
+        assert result["complexity_regression"]
+
+        print(f"SUCCESS: Pairwise case flagged (exponent {result['fitted_exponent']})")
+
+    def test_cases_run_on_fixture(self):
+        """Every registered case accepts a fixture and runs"""
+        fixture = build_fixture(50, seed=1)
+        assert len(fixture["entries"]) == 50
+        assert len(fixture["bodies"]) == 50
+
+        for case in CASES:
+            case.setup(fixture)()
+
+        print(f"SUCCESS: {len(CASES)} cases run on a 50-node fixture")
@@ -0,0 +1,117 @@
+"""
+Test Import Jobs
+================
+
+Tests for the chunk planning of services/import_job_service.py and
+services/node_import_service.py (no database needed):
+1. Nodes are ordered so targets come before the nodes pointing at them
+2. Repeated domain rows are dropped before chunking; chunks keep row order
+3. The lease is renewed while a chunk runs; a lost lease stops the chunk
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import services.import_job_service as import_job_module  # noqa: E402
+from services.import_job_service import (  # noqa: E402
+    ImportJobLeaseLost,
+    ImportJobService,
+    chunk_rows,
+    dedupe_domain_rows,
+)
+from services.node_import_service import order_nodes_by_target  # noqa: E402
+
+
+def _node(domain, path=None, target_domain=None, target_path=None):
+    return {
+        "domain_name": domain,
+        "optimized_path": path,
+        "target_domain": target_domain,
+        "target_path": target_path,
+    }
+
+
+class TestImportJobs:
+    """Test suite for background import job chunking"""
+
+    def test_targets_ordered_first(self):
+        """A chain listed leaf-first is reordered root-first"""
+        nodes = [
+            _node("tier2.com", target_domain="tier1.com", target_path="/blog"),
+            _node("tier1.com", "/blog", target_domain="main.com"),
+            _node("other.com", target_domain="external.com"),
+            _node("main.com"),
+        ]
+        ordered = [n["domain_name"] for n in order_nodes_by_target(nodes)]
+
+        assert ordered.index("main.com") < ordered.index("tier1.com") < ordered.index("tier2.com")
+        # Targets outside the import keep their place among the roots
+        assert ordered[:2] == ["other.com", "main.com"]
+
+        # Cycles do not loop forever
+        cycle = [_node("a.com", target_domain="b.com"), _node("b.com", target_domain="a.com")]
+        assert len(order_nodes_by_target(cycle)) == 2
+
+        print("SUCCESS: Node targets ordered before their sources")
+
+    def test_domain_rows_deduped_and_chunked(self):
+        """First row of a domain key wins; blank rows are dropped"""
+        rows = [
+            {"domain_name": "a.com", "notes": "first"},
+            {"domain_name": "b.com"},
+            {"domain_name": " A.com ", "notes": "second"},
+            {"domain_name": ""},
+            {"domain_name": "c.com"},
+            {"domain_name": "C.com."},
+            {"domain_name": "bücher.de"},
+            {"domain_name": "xn--bcher-kva.de"},
+        ]
+        kept, skipped = dedupe_domain_rows(rows)
+
+        assert [r["domain_name"] for r in kept] == ["a.com", "b.com", "c.com", "bücher.de"]
+        assert kept[0]["notes"] == "first" and skipped == 3
+
+        chunks = chunk_rows(kept, 3)
+        assert [len(c) for c in chunks] == [3, 1]
+        assert chunks[1][0]["domain_name"] == "bücher.de"
+        assert chunk_rows([], 2) == []
+
+        print("SUCCESS: Domain rows deduped and chunked in order")
+
+    def test_lease_renewed_while_chunk_runs(self, monkeypatch):
+        """Heartbeats keep the lease during a long chunk; losing it cancels the chunk"""
+        monkeypatch.setattr(import_job_module, "IMPORT_JOB_HEARTBEAT_SECONDS", 0.01)
+        service = ImportJobService(db=None)
+        renewals = []
+        owned = {"value": True}
+
+        async def renew(job_id):
+            renewals.append(job_id)
+            return owned["value"]
+
+        service._renew_lease = renew
+        writes = []
+
+        async def chunk(seconds):
+            await asyncio.sleep(seconds)
+            writes.append(seconds)
+            return seconds
+
+        async def run():
+            assert await service._run_leased("job-1", chunk(0.05)) == 0.05
+            assert len(renewals) >= 2
+
+            owned["value"] = False
+            with pytest.raises(ImportJobLeaseLost):
+                await service._run_leased("job-1", chunk(5))
+
+        asyncio.run(run())
+        # The chunk of the lost lease never wrote
+        assert writes == [0.05]
+
+        print("SUCCESS: Import job lease kept and lost")
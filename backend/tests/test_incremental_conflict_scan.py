@@ -0,0 +1,153 @@
+"""
+Test Incremental Conflict Scan
+==============================
+
+Tests for dirty-network tracking in conflict detection:
+1. POST /api/v3/conflicts/process - only re-scans networks whose structure changed
+2. POST /api/v3/conflicts/process?force=true - re-scans every network
+3. GET /api/v3/reports/conflicts - served from precomputed snapshots
+4. GET /api/v3/conflicts/scans/{scan_id} - background scan progress
+5. POST /api/v3/conflicts/scans/{scan_id}/cancel - scan cancellation
+"""
+
+import pytest
+import requests
+import os
+
+BASE_URL = os.environ.get("REACT_APP_BACKEND_URL", "").rstrip("/")
+
+
+class TestIncrementalConflictScan:
+    """Test suite for incremental conflict scanning"""
+
+    @pytest.fixture(scope="class")
+    def auth_token(self):
+        """Get authentication token for test user"""
+        response = requests.post(
+            f"{BASE_URL}/api/auth/login",
+            json={"email": "testadmin@test.com", "password": "test"}
+        )
+        if response.status_code != 200:
+            pytest.skip("Authentication failed - skipping authenticated tests")
+        return response.json().get("access_token") or response.json().get("token")
+
+    @pytest.fixture(scope="class")
+    def auth_headers(self, auth_token):
+        """Auth headers for requests"""
+        return {"Authorization": f"Bearer {auth_token}"}
+
+    def test_process_returns_scan_summary(self, auth_headers):
+        """Process endpoint reports scanned and skipped networks"""
+        response = requests.post(
+            f"{BASE_URL}/api/v3/conflicts/process",
+            headers=auth_headers
+        )
+
+        if response.status_code == 403:
+            pytest.skip("User lacks permission to process conflicts")
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
+
+        data = response.json()
+        for field in [
+            "success", "networks_scanned", "networks_skipped",
+            "conflicts_processed", "new_conflicts", "optimizations_created"
+        ]:
+            assert field in data, f"Response missing field: {field}"
+
+        print(f"SUCCESS: Scanned {data['networks_scanned']}, skipped {data['networks_skipped']}")
+
+    def test_second_process_skips_unchanged_networks(self, auth_headers):
+        """Without structure changes, a second scan re-detects nothing"""
+        first = requests.post(
+            f"{BASE_URL}/api/v3/conflicts/process",
+            headers=auth_headers
+        )
+        if first.status_code == 403:
+            pytest.skip("User lacks permission to process conflicts")
+
+        second = requests.post(
+            f"{BASE_URL}/api/v3/conflicts/process",
+            headers=auth_headers
+        )
+        assert second.status_code == 200
+
+        data = second.json()
+        assert data["networks_scanned"] == 0, f"Expected no dirty networks, got {data}"
+        assert data["new_conflicts"] == 0
+
+        print(f"SUCCESS: Second scan skipped {data['networks_skipped']} unchanged networks")
+
+    def test_force_process_rescans_all_networks(self, auth_headers):
+        """force=true re-scans every network regardless of version"""
+        response = requests.post(
+            f"{BASE_URL}/api/v3/conflicts/process",
+            params={"force": "true"},
+            headers=auth_headers
+        )
+        if response.status_code == 403:
+            pytest.skip("User lacks permission to process conflicts")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["networks_skipped"] == 0, f"Forced scan should skip nothing, got {data}"
+
+        print(f"SUCCESS: Forced scan covered {data['networks_scanned']} networks")
+
+    def test_report_conflicts_from_snapshots(self, auth_headers):
+        """Report endpoint keeps its response shape when served from snapshots"""
+        response = requests.get(
+            f"{BASE_URL}/api/v3/reports/conflicts",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}: {response.text}"
+
+        data = response.json()
+        assert "conflicts" in data
+        assert "total" in data
+        assert "by_type" in data
+        assert "by_severity" in data
+        assert data["total"] == len(data["conflicts"])
+
+        print(f"SUCCESS: Report returned {data['total']} conflicts")
+
+    def test_background_scan_reports_progress(self, auth_headers):
+        """background=true returns a scan_id whose progress can be polled"""
+        response = requests.post(
+            f"{BASE_URL}/api/v3/conflicts/process",
+            params={"background": "true", "force": "true"},
+            headers=auth_headers
+        )
+        if response.status_code == 403:
+            pytest.skip("User lacks permission to process conflicts")
+        assert response.status_code == 200
+
+        scan_id = response.json()["scan_id"]
+
+        progress = requests.get(
+            f"{BASE_URL}/api/v3/conflicts/scans/{scan_id}",
+            headers=auth_headers
+        )
+        if progress.status_code == 404:
+            pytest.skip("Scan record not written yet")
+        assert progress.status_code == 200
+
+        run = progress.json()
+        assert run["id"] == scan_id
+        assert run["status"] in ["running", "completed", "cancelled"]
+        assert "networks_done" in run
+        assert "total_networks" in run
+
+        print(f"SUCCESS: Scan {scan_id} is {run['status']} ({run['networks_done']}/{run['total_networks']})")
+
+    def test_cancel_unknown_scan_returns_404(self, auth_headers):
+        """Cancelling a scan that is not running returns 404"""
+        response = requests.post(
+            f"{BASE_URL}/api/v3/conflicts/scans/does-not-exist/cancel",
+            headers=auth_headers
+        )
+        if response.status_code == 403:
+            pytest.skip("User lacks permission to cancel scans")
+        assert response.status_code == 404
+
+        print("SUCCESS: Unknown scan cancel returns 404")
@@ -0,0 +1,63 @@
+"""
+Test Index Registry
+===================
+
+Tests for services/index_registry_service.py (no database needed):
+1. Computed fields are not indexed
+2. Every hot query in the catalog is served by a registered index (ESR)
+3. No registered index is a redundant prefix of another
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.index_registry_service import (  # noqa: E402
+    INDEX_REGISTRY,
+    QUERY_CATALOG,
+    index_key,
+    redundant_indexes,
+    registered_index_for,
+    suggest_index,
+)
+
+
+class TestIndexRegistry:
+    """Test suite for the declarative index registry"""
+
+    def test_computed_fields_not_indexed(self):
+        """domain_active_status is derived from expiration_date at read time"""
+        for model in INDEX_REGISTRY["asset_domains"]:
+            assert "domain_active_status" not in dict(index_key(model))
+
+        print("SUCCESS: Computed fields are not indexed")
+
+    def test_hot_compound_indexes_registered(self):
+        """Compound indexes for complaint counts and node uniqueness exist"""
+        optimizations = [index_key(m) for m in INDEX_REGISTRY["seo_optimizations"]]
+        assert [("network_id", 1), ("complaint_status", 1)] in optimizations
+
+        entries = [index_key(m) for m in INDEX_REGISTRY["seo_structure_entries"]]
+        assert any(
+            key[:2] == [("asset_domain_id", 1), ("optimized_path", 1)] for key in entries
+        )
+
+        print("SUCCESS: Hot compound indexes registered")
+
+    def test_catalog_queries_are_served(self):
+        """Every catalog query has a registered index matching its ESR shape"""
+        missing = [
+            (q["name"], suggest_index(q))
+            for q in QUERY_CATALOG
+            if registered_index_for(q) is None
+        ]
+        assert not missing, missing
+
+        print(f"SUCCESS: {len(QUERY_CATALOG)} catalog queries served by registered indexes")
+
+    def test_no_redundant_prefix_indexes(self):
+        """Single-field indexes covered by a compound index are not registered"""
+        assert redundant_indexes() == []
+
+        print("SUCCESS: No redundant registered indexes")
@@ -0,0 +1,133 @@
+"""
+Test Log Writer
+===============
+
+Tests for services/log_writer_service.py (no database needed):
+1. Queued entries are written with one insert_many per collection
+2. A full queue makes the caller insert directly (overflow)
+3. Failed flushes keep their entries; stop() drains the queue
+4. write_many queues what fits and inserts the rest directly
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.log_writer_service import LogWriter  # noqa: E402
+
+
+class FakeCollection:
+    """Motor collection recording its inserts."""
+
+    def __init__(self, name: str, fail: int = 0):
+        self.name = name
+        self.fail = fail
+        self.inserts = []
+        self.docs = []
+
+    async def insert_one(self, doc):
+        self.inserts.append(1)
+        self.docs.append(doc)
+
+    async def insert_many(self, docs, ordered=True):
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("database unreachable")
+        self.inserts.append(len(docs))
+        self.docs.extend(docs)
+
+
+class TestLogWriter:
+    """Test suite for the buffered activity / audit log writer"""
+
+    def test_batches_per_collection(self):
+        """Entries wait in memory and are flushed per collection"""
+        activity, audit = FakeCollection("activity_logs_v3"), FakeCollection("audit_logs")
+
+        async def run():
+            writer = LogWriter(queue_size=100, batch_size=4, flush_seconds=60)
+            writer.start()
+            for i in range(3):
+                await writer.write(activity, {"id": f"a{i}"})
+            await writer.write(audit, {"id": "x"})
+            assert activity.inserts == [] and writer.pending == 4
+
+            # The batch size wakes the flush task before the timer
+            await asyncio.sleep(0.05)
+            assert writer.pending == 0
+            await writer.stop()
+
+        asyncio.run(run())
+        assert activity.inserts == [3]
+        assert [d["id"] for d in activity.docs] == ["a0", "a1", "a2"]
+        assert audit.inserts == [1]
+
+        print("SUCCESS: Log entries written in batches")
+
+    def test_overflow_and_unstarted(self):
+        """Without a flush task or room in the queue, writes go straight through"""
+        activity = FakeCollection("activity_logs_v3")
+
+        async def run():
+            writer = LogWriter(queue_size=2, batch_size=100, flush_seconds=60)
+            await writer.write(activity, {"id": "direct"})
+            assert activity.inserts == [1]
+
+            writer.start()
+            for i in range(3):
+                await writer.write(activity, {"id": f"q{i}"})
+            assert writer.pending == 2
+            assert [d["id"] for d in activity.docs] == ["direct", "q2"]
+            await writer.stop()
+
+        asyncio.run(run())
+        assert activity.inserts == [1, 1, 2]
+
+        print("SUCCESS: Overflow written directly")
+
+    def test_failed_flush_and_drain(self):
+        """A failed flush keeps its entries and stop() writes them"""
+        activity = FakeCollection("activity_logs_v3", fail=1)
+
+        async def run():
+            writer = LogWriter(queue_size=10, batch_size=100, flush_seconds=60)
+            writer.start()
+            await writer.write(activity, {"id": "a"})
+            assert await writer.flush() == 0
+            await writer.write(activity, {"id": "b"})
+            assert writer.pending == 2
+
+            await writer.stop()
+            assert writer.pending == 0
+            # Stopped: inserted directly again
+            await writer.write(activity, {"id": "c"})
+
+        asyncio.run(run())
+        assert [d["id"] for d in activity.docs] == ["a", "b", "c"]
+        assert activity.inserts == [2, 1]
+
+        print("SUCCESS: Queue drained on shutdown")
+
+    def test_write_many(self):
+        """Several entries share the queue and its overflow rule"""
+        activity = FakeCollection("activity_logs_v3")
+
+        async def run():
+            writer = LogWriter(queue_size=3, batch_size=100, flush_seconds=60)
+            await writer.write_many(activity, [{"id": "d0"}, {"id": "d1"}])
+            assert activity.inserts == [2]
+
+            writer.start()
+            await writer.write(activity, {"id": "q0"})
+            await writer.write_many(activity, [{"id": f"q{i}"} for i in range(1, 5)])
+            assert writer.pending == 3
+            assert activity.inserts == [2, 2]
+            await writer.stop()
+
+        asyncio.run(run())
+        assert [d["id"] for d in activity.docs] == ["d0", "d1", "q3", "q4", "q0", "q1", "q2"]
+        assert activity.inserts == [2, 2, 3]
+
+        print("SUCCESS: Batches of entries queued with overflow")
@@ -0,0 +1,106 @@
+"""
+Test API Responsiveness During Login Bursts
+===========================================
+
+bcrypt runs on a dedicated thread pool, so a burst of logins must not
+stall the event loop:
+1. GET /api/health stays fast while many logins are in flight
+2. Concurrent logins succeed (or are shed with 503, never time out)
+3. GET /api/system/password-hashing reports queue depth and timings
+"""
+
+import pytest
+import requests
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_URL = os.environ.get("REACT_APP_BACKEND_URL", "").rstrip("/")
+
+ADMIN_EMAIL = "admin@test.com"
+ADMIN_PASSWORD = "admin123"
+
+CONCURRENT_LOGINS = int(os.environ.get("LOAD_TEST_CONCURRENT_LOGINS", "40"))
+
+# p95 of /api/health while the burst runs
+MAX_HEALTH_P95_MS = float(os.environ.get("LOAD_TEST_MAX_HEALTH_P95_MS", "250"))
+
+
+def _login():
+    response = requests.post(
+        f"{BASE_URL}/api/auth/login",
+        json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+        timeout=60,
+    )
+    return response.status_code
+
+
+class TestLoginLoad:
+    """Load scenario: concurrent logins vs. a latency probe"""
+
+    @pytest.fixture(scope="class")
+    def auth_headers(self):
+        """Super Admin auth headers"""
+        response = requests.post(
+            f"{BASE_URL}/api/auth/login",
+            json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+        )
+        if response.status_code != 200:
+            pytest.skip(f"Admin login failed: {response.status_code} - {response.text}")
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def test_health_responsive_during_login_burst(self, auth_headers):
+        """Health checks stay fast while CONCURRENT_LOGINS logins run"""
+        latencies = []
+        done = threading.Event()
+
+        def probe():
+            while not done.is_set():
+                started = time.perf_counter()
+                response = requests.get(f"{BASE_URL}/api/health", timeout=30)
+                latencies.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200
+                time.sleep(0.02)
+
+        prober = threading.Thread(target=probe)
+        prober.start()
+        try:
+            with ThreadPoolExecutor(max_workers=CONCURRENT_LOGINS) as pool:
+                statuses = list(pool.map(lambda _: _login(), range(CONCURRENT_LOGINS)))
+        finally:
+            done.set()
+            prober.join()
+
+        assert all(s in (200, 503) for s in statuses), f"Unexpected login statuses: {statuses}"
+        assert statuses.count(200) > 0, "No login succeeded during the burst"
+
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0]
+        assert p95 < MAX_HEALTH_P95_MS, (
+            f"/api/health p95 {p95:.0f}ms during login burst (limit {MAX_HEALTH_P95_MS:.0f}ms)"
+        )
+
+        print(
+            f"SUCCESS: {statuses.count(200)}/{CONCURRENT_LOGINS} logins ok, "
+            f"health p95 {p95:.0f}ms over {len(latencies)} probes"
+        )
+
+    def test_password_hashing_stats(self, auth_headers):
+        """Stats endpoint reports queue depth and per-operation timings"""
+        response = requests.get(
+            f"{BASE_URL}/api/system/password-hashing", headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        for field in ["workers", "pending", "queue_depth", "peak_pending", "rejected", "operations"]:
+            assert field in data, f"Missing field: {field}"
+        verify = data["operations"]["verify"]
+        assert verify["count"] > 0
+        assert verify["avg_duration_ms"] > 0
+
+        print(
+            f"SUCCESS: {verify['count']} verifications, avg {verify['avg_duration_ms']}ms, "
+            f"peak pending {data['peak_pending']}"
+        )
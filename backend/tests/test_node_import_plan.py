@@ -0,0 +1,81 @@
+"""
+Test Node Import Planning
+=========================
+
+Tests for the planning pass of services/node_import_service.py
+(no database needed):
+1. Existing (domain, path) keys are skipped, unknown domains are errors
+2. Targets resolve by exact key, forward in the same import, or by
+   domain only when no target path is given
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.node_import_service import plan_entries  # noqa: E402
+
+DOMAIN_IDS = {"main.com": "d-main", "tier1.com": "d-tier1", "tier2.com": "d-tier2"}
+
+
+def _node(domain, path=None, target_domain=None, target_path=None):
+    return {
+        "domain_name": domain,
+        "optimized_path": path,
+        "target_domain": target_domain,
+        "target_path": target_path,
+    }
+
+
+class TestNodeImportPlan:
+    """Test suite for the bulk node import planner"""
+
+    def test_skips_and_errors(self):
+        """Rows matching existing entries are skipped; unknown domains error"""
+        lookup = {("main.com", ""): "e-main"}
+        entries, results = plan_entries(
+            "net-1",
+            [_node("MAIN.com"), _node("tier1.com", "/blog"), _node("unknown.com"),
+             _node("tier1.com", "/blog")],
+            DOMAIN_IDS,
+            lookup,
+            now="2026-01-01",
+        )
+
+        assert [e["asset_domain_id"] for _, e in entries] == ["d-tier1"]
+        assert entries[0][1]["network_id"] == "net-1"
+        assert entries[0][1]["domain_role"] == "supporting"
+        assert [s["domain"] for s in results["skipped"]] == ["MAIN.com", "tier1.com"]
+        assert results["errors"] == [
+            {"domain": "unknown.com", "error": "Domain not found: unknown.com"}
+        ]
+        assert lookup[("tier1.com", "/blog")] == entries[0][1]["id"]
+
+        print("SUCCESS: Existing entries skipped, unknown domains reported")
+
+    def test_target_resolution(self):
+        """Exact keys, forward references and domain-only fallback"""
+        lookup = {("main.com", ""): "e-main"}
+        entries, _ = plan_entries(
+            "net-1",
+            [
+                _node("tier2.com", target_domain="tier1.com", target_path="/blog"),
+                _node("tier1.com", "/blog", target_domain="Main.com"),
+                _node("tier1.com", "/other", target_domain="tier1.com"),
+                _node("tier2.com", "/x", target_domain="main.com", target_path="/missing"),
+            ],
+            DOMAIN_IDS,
+            lookup,
+        )
+        by_key = {(e["asset_domain_id"], e["optimized_path"]): e for _, e in entries}
+
+        tier1_blog = by_key[("d-tier1", "/blog")]
+        assert by_key[("d-tier2", None)]["target_entry_id"] == tier1_blog["id"]
+        assert tier1_blog["target_entry_id"] == "e-main"
+        # No target path: first entry of the domain
+        assert by_key[("d-tier1", "/other")]["target_entry_id"] == tier1_blog["id"]
+        # A target path that does not exist is left unresolved
+        assert by_key[("d-tier2", "/x")]["target_entry_id"] is None
+
+        print("SUCCESS: Targets resolved from the in-memory key map")
@@ -0,0 +1,74 @@
+"""
+Test Presence Flush
+===================
+
+Tests for PresenceService.flush in services/presence_service.py (no database
+needed):
+1. Every flush writes the buffered heartbeats to user_presence
+2. users.last_online is written once per LAST_ONLINE_WRITE_SECONDS, not on
+   every heartbeat
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import services.presence_service as presence_module  # noqa: E402
+from services.presence_service import PresenceService  # noqa: E402
+
+
+class FakeCollection:
+    """Motor collection recording its bulk writes."""
+
+    def __init__(self):
+        self.writes = []
+
+    async def bulk_write(self, operations, ordered=True):
+        self.writes.append(list(operations))
+
+
+class FakeDb:
+    def __init__(self):
+        self.user_presence = FakeCollection()
+        self.users = FakeCollection()
+
+
+def _heartbeat(service, user_id, at):
+    service.record_heartbeat({"id": user_id, "email": f"{user_id}@test.com"})
+    service._pending[user_id]["last_seen"] = at.isoformat()
+
+
+class TestPresenceFlush:
+    """Test suite for the throttled users.last_online write"""
+
+    def test_last_online_written_once_per_window(self, monkeypatch):
+        """Heartbeats inside the window only update user_presence"""
+        monkeypatch.setattr(presence_module, "publish_event", lambda *args, **kwargs: None)
+        db = FakeDb()
+        service = PresenceService(db)
+        start = datetime.now(timezone.utc)
+
+        async def run():
+            # Three heartbeats 30s apart: only the first writes last_online
+            for seconds in (0, 30, 59):
+                _heartbeat(service, "u1", start + timedelta(seconds=seconds))
+                assert await service.flush() == 1
+
+            # Past the window: written again, with a filter on the stored age
+            _heartbeat(service, "u1", start + timedelta(seconds=61))
+            _heartbeat(service, "u2", start + timedelta(seconds=61))
+            assert await service.flush() == 2
+
+        asyncio.run(run())
+        assert len(db.user_presence.writes) == 4
+        assert [len(ops) for ops in db.users.writes] == [1, 2]
+
+        update = db.users.writes[1][0]
+        threshold = (start + timedelta(seconds=1)).isoformat()
+        assert update._filter["$or"][0] == {"last_online": {"$lt": threshold}}
+        assert update._doc["$set"]["last_online"] == (start + timedelta(seconds=61)).isoformat()
+
+        print("SUCCESS: last_online written once per window")
@@ -0,0 +1,126 @@
+"""
+Test User Cache Invalidation
+============================
+
+get_current_user serves active users from a short-lived in-process cache.
+Tests that access changes still take effect immediately:
+1. Repeated authenticated requests keep working (cache hits)
+2. PATCH /api/users/{id}/deactivate - the user loses access at once
+3. PATCH /api/users/{id}/activate - the user regains access at once
+4. PUT /api/users/{id} - role changes are visible on the next request
+"""
+
+import pytest
+import requests
+import os
+import uuid
+
+BASE_URL = os.environ.get("REACT_APP_BACKEND_URL", "").rstrip("/")
+
+ADMIN_EMAIL = "admin@test.com"
+ADMIN_PASSWORD = "admin123"
+
+
+class TestUserCacheInvalidation:
+    """Test suite for cached user invalidation"""
+
+    @pytest.fixture(scope="class")
+    def auth_headers(self):
+        """Super Admin auth headers"""
+        response = requests.post(
+            f"{BASE_URL}/api/auth/login",
+            json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+        )
+        if response.status_code != 200:
+            pytest.skip(f"Admin login failed: {response.status_code} - {response.text}")
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    @pytest.fixture(scope="class")
+    def test_user(self, auth_headers):
+        """Create an active viewer and log in as them"""
+        brands = requests.get(f"{BASE_URL}/api/brands", headers=auth_headers)
+        brand_ids = [b["id"] for b in brands.json()[:1]] if brands.status_code == 200 else []
+        if not brand_ids:
+            pytest.skip("No brands available for testing")
+
+        email = f"TEST_cache_{uuid.uuid4().hex[:8]}@test.com"
+        created = requests.post(
+            f"{BASE_URL}/api/users/create",
+            headers=auth_headers,
+            json={
+                "email": email,
+                "name": "Cache Test User",
+                "role": "viewer",
+                "brand_scope_ids": brand_ids,
+            },
+        )
+        assert created.status_code == 200, f"Create user failed: {created.text}"
+        data = created.json()
+
+        login = requests.post(
+            f"{BASE_URL}/api/auth/login",
+            json={"email": email, "password": data["generated_password"]},
+        )
+        assert login.status_code == 200
+
+        yield {
+            "id": data["user"]["id"],
+            "headers": {"Authorization": f"Bearer {login.json()['access_token']}"},
+        }
+
+        requests.delete(f"{BASE_URL}/api/users/{data['user']['id']}", headers=auth_headers)
+
+    def test_repeated_requests_succeed(self, test_user):
+        """Cached lookups keep serving the same user"""
+        for _ in range(3):
+            response = requests.get(f"{BASE_URL}/api/auth/me", headers=test_user["headers"])
+            assert response.status_code == 200
+            assert response.json()["id"] == test_user["id"]
+
+        print("SUCCESS: Repeated /auth/me requests served")
+
+    def test_deactivation_revokes_access_immediately(self, auth_headers, test_user):
+        """A cached user loses access as soon as they are deactivated"""
+        warm = requests.get(f"{BASE_URL}/api/auth/me", headers=test_user["headers"])
+        assert warm.status_code == 200
+
+        response = requests.patch(
+            f"{BASE_URL}/api/users/{test_user['id']}/deactivate", headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        me = requests.get(f"{BASE_URL}/api/auth/me", headers=test_user["headers"])
+        assert me.status_code == 403, f"Deactivated user still has access: {me.status_code}"
+
+        print("SUCCESS: Deactivated user rejected on the next request")
+
+    def test_activation_restores_access_immediately(self, auth_headers, test_user):
+        """A reactivated user regains access on the next request"""
+        response = requests.patch(
+            f"{BASE_URL}/api/users/{test_user['id']}/activate", headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        me = requests.get(f"{BASE_URL}/api/auth/me", headers=test_user["headers"])
+        assert me.status_code == 200
+
+        print("SUCCESS: Reactivated user accepted on the next request")
+
+    def test_role_change_visible_immediately(self, auth_headers, test_user):
+        """Role changes are not hidden by the cache"""
+        warm = requests.get(f"{BASE_URL}/api/auth/me", headers=test_user["headers"])
+        assert warm.status_code == 200
+        assert warm.json()["role"] == "viewer"
+
+        response = requests.put(
+            f"{BASE_URL}/api/users/{test_user['id']}",
+            headers=auth_headers,
+            json={"role": "admin"},
+        )
+        assert response.status_code == 200
+
+        me = requests.get(f"{BASE_URL}/api/auth/me", headers=test_user["headers"])
+        assert me.status_code == 200
+        assert me.json()["role"] == "admin"
+
+        print("SUCCESS: Role change visible on the next request")
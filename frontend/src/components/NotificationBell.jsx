@@ -1,6 +1,7 @@
 import { useState, useEffect, useCallback } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { notificationsAPI } from '../lib/api';
+import { subscribeLive, isLiveConnected } from '../lib/liveEvents';
 import { Button } from './ui/button';
 import { Badge } from './ui/badge';
 import { ScrollArea } from './ui/scroll-area';
@@ -35,10 +36,18 @@ export function NotificationBell() {
     // Load notifications on mount and when popover opens
     useEffect(() => {
         loadNotifications();
-        
-        // Poll for new notifications every 30 seconds
-        const interval = setInterval(loadNotifications, 30000);
-        return () => clearInterval(interval);
+
+        // Reload when the live stream reports a change in unread count
+        const unsubscribe = subscribeLive('notifications', loadNotifications);
+
+        // Poll for new notifications every 30 seconds while the stream is down
+        const interval = setInterval(() => {
+            if (!isLiveConnected()) loadNotifications();
+        }, 30000);
+        return () => {
+            clearInterval(interval);
+            unsubscribe();
+        };
     }, [loadNotifications]);
 
     const handleMarkAsRead = async (notificationId) => {
@@ -1,5 +1,6 @@
 import { useState, useEffect, useCallback } from 'react';
 import { presenceAPI } from '../lib/api';
+import { subscribeLive, isLiveConnected } from '../lib/liveEvents';
 import { useAuth } from '../lib/auth';
 import { ScrollArea } from './ui/scroll-area';
 import {
@@ -26,23 +27,34 @@ export function OnlineUsers() {
         return () => clearInterval(heartbeatInterval);
     }, [user]);
 
+    const applyPresence = useCallback((data) => {
+        setOnlineUsers(data.online || []);
+        setRecentlyActive(data.recently_active || []);
+        setOnlineCount(data.online_count || 0);
+    }, []);
+
     const fetchOnlineUsers = useCallback(async () => {
         try {
             const res = await presenceAPI.getOnlineUsers();
-            setOnlineUsers(res.data.online || []);
-            setRecentlyActive(res.data.recently_active || []);
-            setOnlineCount(res.data.online_count || 0);
+            applyPresence(res.data);
         } catch (err) {
             console.error('Failed to fetch online users:', err);
         }
-    }, []);
+    }, [applyPresence]);
 
     useEffect(() => {
         if (!user) return;
         fetchOnlineUsers();
-        const interval = setInterval(fetchOnlineUsers, 30000);
-        return () => clearInterval(interval);
-    }, [user, fetchOnlineUsers]);
+        const unsubscribe = subscribeLive('presence', applyPresence);
+        // Poll only while the live stream is down
+        const interval = setInterval(() => {
+            if (!isLiveConnected()) fetchOnlineUsers();
+        }, 30000);
+        return () => {
+            clearInterval(interval);
+            unsubscribe();
+        };
+    }, [user, fetchOnlineUsers, applyPresence]);
 
     useEffect(() => {
         if (open) fetchOnlineUsers();
@@ -0,0 +1,79 @@
+/**
+ * Live updates over Server-Sent Events (/api/v3/events/stream).
+ *
+ * One shared EventSource per tab. Components subscribe to a section
+ * (dashboard_stats, monitoring_stats, presence, notifications) and keep
+ * their polling only as a fallback while the stream is disconnected.
+ */
+
+const STREAM_URL = process.env.REACT_APP_BACKEND_URL + '/api/v3/events/stream';
+const SECTIONS = ['dashboard_stats', 'monitoring_stats', 'presence', 'notifications'];
+
+let source = null;
+let connected = false;
+const listeners = {};
+
+const notify = (section, data) => {
+    (listeners[section] || new Set()).forEach((handler) => {
+        try {
+            handler(data);
+        } catch (err) {
+            console.error(`Live ${section} handler failed:`, err);
+        }
+    });
+};
+
+const open = () => {
+    const token = localStorage.getItem('seo_nexus_token');
+    if (!token || typeof EventSource === 'undefined') return;
+
+    source = new EventSource(`${STREAM_URL}?token=${encodeURIComponent(token)}`);
+    source.onopen = () => {
+        connected = true;
+        notify('status', { connected });
+    };
+    source.onerror = () => {
+        // EventSource reconnects on its own; poll meanwhile
+        connected = false;
+        notify('status', { connected });
+    };
+    SECTIONS.forEach((section) => {
+        source.addEventListener(section, (event) => {
+            try {
+                notify(section, JSON.parse(event.data));
+            } catch (err) {
+                console.error(`Invalid live ${section} event:`, err);
+            }
+        });
+    });
+};
+
+const close = () => {
+    if (source) {
+        source.close();
+        source = null;
+    }
+    connected = false;
+};
+
+const hasListeners = () => SECTIONS.some((section) => listeners[section]?.size);
+
+/**
+ * Subscribe to a live section (or 'status' for connection changes).
+ * Returns an unsubscribe function.
+ */
+export function subscribeLive(section, handler) {
+    if (!listeners[section]) listeners[section] = new Set();
+    listeners[section].add(handler);
+    if (!source && hasListeners()) open();
+
+    return () => {
+        listeners[section].delete(handler);
+        if (!hasListeners()) close();
+    };
+}
+
+/** True while the stream is open (polling can be skipped). */
+export function isLiveConnected() {
+    return connected;
+}
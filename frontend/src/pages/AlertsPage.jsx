@@ -57,7 +57,8 @@ const CONFLICT_TYPE_LABELS = {
     'redirect_loop': 'Redirect Loop',
     'multiple_parents_to_main': 'Multiple Parents to Main',
     'canonical_redirect_conflict': 'Canonical-Redirect Conflict',
-    'index_noindex_mismatch': 'Index/Noindex Mismatch'
+    'index_noindex_mismatch': 'Index/Noindex Mismatch',
+    'near_duplicate_keyword': 'Near-Duplicate Keyword'
 };
 
 // Status colors and flow for stored conflicts
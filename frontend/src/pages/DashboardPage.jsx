@@ -2,6 +2,7 @@ import { useState, useEffect, useRef, useCallback } from 'react';
 import { Link } from 'react-router-dom';
 import { useAuth } from '../lib/auth';
 import { reportsAPI, seedAPI, brandsAPI, monitoringAPI, alertsAPI, dashboardSettingsAPI, v3ReportsAPI } from '../lib/api';
+import { subscribeLive, isLiveConnected } from '../lib/liveEvents';
 import { Layout } from '../components/Layout';
 import { Button } from '../components/ui/button';
 import { Card, CardContent, CardHeader, CardTitle } from '../components/ui/card';
@@ -79,50 +80,58 @@ export default function DashboardPage() {
         loadRefreshSetting();
     }, []);
 
+    const applyStats = useCallback((data) => {
+        setStats(prev => ({
+            ...prev,
+            total_domains: data.total_domains,
+            total_networks: data.total_networks,
+            monitored: data.monitored_count,
+            indexed: data.indexed_count,
+            noindex: data.noindex_count,
+            ping_up: data.ping_up,
+            ping_down: data.ping_down,
+            critical_alerts: data.critical_alerts,
+            critical_alert_details: data.critical_alert_details,
+            active_alerts: data.active_alerts
+        }));
+        setLastRefresh(new Date());
+    }, []);
+
     // Lightweight stats refresh (no heavy re-renders)
     const refreshStatsOnly = useCallback(async () => {
         if (isRefreshing) return;
         setIsRefreshing(true);
         try {
             const { data } = await dashboardSettingsAPI.getStats();
-            setStats(prev => ({
-                ...prev,
-                total_domains: data.total_domains,
-                total_networks: data.total_networks,
-                monitored: data.monitored_count,
-                indexed: data.indexed_count,
-                noindex: data.noindex_count,
-                ping_up: data.ping_up,
-                ping_down: data.ping_down,
-                critical_alerts: data.critical_alerts,
-                critical_alert_details: data.critical_alert_details,
-                active_alerts: data.active_alerts
-            }));
-            setLastRefresh(new Date());
+            applyStats(data);
         } catch (err) {
             console.error('Stats refresh failed:', err);
         } finally {
             setIsRefreshing(false);
         }
-    }, [isRefreshing]);
+    }, [isRefreshing, applyStats]);
 
-    // Setup auto-refresh timer
+    // Setup auto-refresh: live pushes, polling only while the stream is down
     useEffect(() => {
         if (refreshTimerRef.current) {
             clearInterval(refreshTimerRef.current);
             refreshTimerRef.current = null;
         }
         
-        if (refreshInterval > 0) {
-            refreshTimerRef.current = setInterval(refreshStatsOnly, refreshInterval * 1000);
-        }
+        if (refreshInterval <= 0) return undefined;
+
+        const unsubscribe = subscribeLive('dashboard_stats', applyStats);
+        refreshTimerRef.current = setInterval(() => {
+            if (!isLiveConnected()) refreshStatsOnly();
+        }, refreshInterval * 1000);
         
         return () => {
+            unsubscribe();
             if (refreshTimerRef.current) {
                 clearInterval(refreshTimerRef.current);
             }
         };
-    }, [refreshInterval, refreshStatsOnly]);
+    }, [refreshInterval, refreshStatsOnly, applyStats]);
 
     // Handle refresh interval change
     const handleRefreshIntervalChange = async (value) => {
@@ -16,6 +16,7 @@ import {
 } from 'lucide-react';
 import { useToast } from '../hooks/use-toast';
 import { forcedMonitoringAPI, domainsAPI } from '../lib/api';
+import { subscribeLive } from '../lib/liveEvents';
 
 const API_URL = process.env.REACT_APP_BACKEND_URL;
 
@@ -46,6 +47,9 @@ export default function MonitoringSettingsPage() {
         loadData();
     }, []);
 
+    // Keep the stats cards current from the live stream
+    useEffect(() => subscribeLive('monitoring_stats', setStats), []);
+
     const loadData = async () => {
         setLoading(true);
         try {